@@ -1,4 +1,5 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -6,6 +7,7 @@ from app.config.settings import settings
 
 # Use the new property to get the database URL
 SQLALCHEMY_DATABASE_URL = settings.get_database_url
+ASYNC_SQLALCHEMY_DATABASE_URL = settings.get_async_database_url
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
@@ -13,4 +15,24 @@ engine = create_engine(
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-Base = declarative_base()
\ No newline at end of file
+# Async engine for request handlers that must not block the event loop
+# (aiomysql / asyncpg in production, aiosqlite for local and test databases).
+async_engine = create_async_engine(
+    ASYNC_SQLALCHEMY_DATABASE_URL,
+    pool_pre_ping=True,
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+Base = declarative_base()
+
+
+# Every session comes from here, so this is where the listeners that keep derived
+# tables (URL fingerprints, text bands, fraud rescan marks) in step with writes are installed.
+from app.database.hooks import install_hooks  # noqa: E402
+
+install_hooks()
@@ -2,6 +2,8 @@
 from pydantic_settings import BaseSettings
 from pydantic import field_validator
 from typing import List, Optional
+from functools import lru_cache
+import os
 import secrets
 
 class Settings(BaseSettings):
@@ -27,6 +29,10 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: Optional[str] = None
     EMAIL_FROM: Optional[str] = None
     MAIL_SUPPORT: Optional[str] = None
+    SMTP_USE_TLS: bool = True  # STARTTLS after connecting; disable for local sinks
+    SMTP_TIMEOUT: int = 30
+    MAIL_QUEUE_BATCH_SIZE: int = 50
+    MAIL_QUEUE_MAX_ATTEMPTS: int = 5
 
     # Twilio
     TWILIO_ACCOUNT_SID: Optional[str] = None
@@ -40,6 +46,10 @@ class Settings(BaseSettings):
 
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
+    # Upper bound on how stale the homepage stats snapshot can get from writes that bypass the repositories
+    PLATFORM_STATS_TTL_SECONDS: int = 60
+    # Lifetime of cached anonymous profile responses; writes purge them earlier
+    RESPONSE_CACHE_TTL_SECONDS: int = 300
 
     # Verification
     VERIFICATION_TOKEN_EXPIRE_HOURS: int = 24
@@ -49,6 +59,8 @@ class Settings(BaseSettings):
     UPLOAD_DIR: str = "uploads"
     MAX_FILE_SIZE: int = 5_242_880
     ALLOWED_IMAGE_TYPES: List[str] = ["jpg", "jpeg", "png", "gif"]
+    # Worker processes that render profile image variants off the event loop
+    IMAGE_PROCESS_WORKERS: int = 2
     STORAGE_TYPE: str = "local"
     AWS_ACCESS_KEY_ID: Optional[str] = None
     AWS_SECRET_ACCESS_KEY: Optional[str] = None
@@ -57,11 +69,60 @@ class Settings(BaseSettings):
     CLOUDINARY_API_KEY: Optional[str] = None
     CLOUDINARY_API_SECRET: Optional[str] = None
 
+    # Profile search backend: auto (by database dialect), mysql, postgresql, memory, like
+    PROFILE_SEARCH_BACKEND: str = "auto"
+    # memory backend: best-scoring matches a search returns (bounds the SQL id list it builds)
+    PROFILE_SEARCH_MAX_MATCHES: int = 1000
+
     # Rate limiting
     RATE_LIMIT_PER_MINUTE: int = 60
 
+    # Resume PDF parsing: input caps, early stop and worker processes (only for documents over PDF_INLINE_MAX_PAGES)
+    RESUME_MAX_BYTES: int = 10 * 1024 * 1024
+    RESUME_MAX_PAGES: int = 20
+    RESUME_TARGET_TEXT_CHARS: int = 30_000
+    PDF_EXTRACT_WORKERS: int = 2
+    PDF_INLINE_MAX_PAGES: int = 6
+    # Resume analyses cached by PDF content hash: per-process LRU in front of the shared cache
+    RESUME_CACHE_TTL_SECONDS: int = 7 * 24 * 60 * 60
+    RESUME_CACHE_LOCAL_ENTRIES: int = 256
+    # Heuristic results produced while OpenAI is configured (API down) expire sooner so it is retried
+    RESUME_CACHE_FALLBACK_TTL_SECONDS: int = 600
+    # Background parse-resume jobs: concurrent analyses per process and how long job status is kept
+    RESUME_JOB_WORKERS: int = 4
+    RESUME_JOB_TTL_SECONDS: int = 60 * 60
+    # Bulk resume import (admin zip upload and app/scripts/ingest_resumes.py)
+    RESUME_INGEST_CONCURRENCY: int = 4
+    RESUME_INGEST_BATCH_SIZE: int = 50
+    RESUME_INGEST_MAX_FILES: int = 1000
+
     # OpenAI (for AI features)
     OPENAI_API_KEY: Optional[str] = None
+    # Any OpenAI-compatible endpoint; scripts/fake_openai.py serves one locally
+    OPENAI_BASE_URL: str = "https://api.openai.com/v1"
+    OPENAI_TIMEOUT_SECONDS: float = 30.0
+    # Calls in flight per process, shared by every feature; also the connection pool size
+    OPENAI_MAX_CONCURRENCY: int = 8
+    # Circuit breaker: consecutive failures (errors, timeouts, 429/5xx, slow calls) before falling back
+    OPENAI_BREAKER_FAILURES: int = 5
+    OPENAI_BREAKER_RESET_SECONDS: float = 30.0
+    OPENAI_SLOW_CALL_SECONDS: float = 15.0
+    # Profile reviews cached by a fingerprint of the reviewed fields; editing any field misses
+    PROFILE_REVIEW_CACHE_TTL_SECONDS: int = 24 * 60 * 60
+    PROFILE_REVIEW_CACHE_LOCAL_ENTRIES: int = 1024
+    # Professional matching: how many of the heuristic's best candidates go to the model
+    MATCH_LLM_SHORTLIST: int = 100
+    # In-memory candidate features follow profile writes; a full reload also catches writes outside the ORM
+    MATCH_FEATURE_STORE_RELOAD_SECONDS: int = 15 * 60
+    # Shortlists precomputed per service request: stored length (headroom over the endpoints' limits),
+    # and how often open requests are re-ranked after the candidate pool changed (0 = never)
+    MATCH_PRECOMPUTE_TOP_K: int = 30
+    MATCH_POOL_REFRESH_SECONDS: int = 30 * 60
+    # Background fraud scans: users per chunk (one transaction each), chunks scored in parallel,
+    # and how long a running scan may go without a heartbeat before it counts as interrupted
+    FRAUD_SCAN_CHUNK_SIZE: int = 200
+    FRAUD_SCAN_WORKERS: int = 4
+    FRAUD_SCAN_STALE_SECONDS: int = 5 * 60
 
     # Public URLs (production email links)
     API_PUBLIC_URL: str = "https://api.prozlab.com"
@@ -107,6 +168,24 @@ class Settings(BaseSettings):
             f"@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
         )
 
+    @property
+    def get_async_database_url(self) -> str:
+        """Same database as ``get_database_url`` but through an asyncio driver."""
+        url = self.get_database_url
+        async_drivers = {
+            "mysql+pymysql://": "mysql+aiomysql://",
+            "mysql://": "mysql+aiomysql://",
+            "mariadb+pymysql://": "mariadb+aiomysql://",
+            "postgresql+psycopg2://": "postgresql+asyncpg://",
+            "postgresql://": "postgresql+asyncpg://",
+            "postgres://": "postgresql+asyncpg://",
+            "sqlite://": "sqlite+aiosqlite://",
+        }
+        for sync_prefix, async_prefix in async_drivers.items():
+            if url.startswith(sync_prefix):
+                return async_prefix + url[len(sync_prefix):]
+        return url
+
     def is_sms_enabled(self) -> bool:
         return all([self.TWILIO_ACCOUNT_SID, self.TWILIO_AUTH_TOKEN, self.TWILIO_PHONE_NUMBER])
 
@@ -116,6 +195,28 @@ class Settings(BaseSettings):
 # at the very bottom:
 settings = Settings()
 
+
+@lru_cache(maxsize=None)
+def load_env_files() -> None:
+    """Export .env / .env.production into os.environ once per process (no overrides).
+
+    For services that read keys with os.getenv rather than through settings.
+    """
+    try:
+        from dotenv import load_dotenv  # type: ignore
+    except ImportError:
+        return
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+    for path in (
+        os.path.join(project_root, '.env'),
+        os.path.join(project_root, '.env.production'),
+        os.path.join(os.getcwd(), '.env'),
+    ):
+        try:
+            load_dotenv(path, override=False)
+        except Exception:
+            pass
+
 # Debug: Print loaded values (remove this in production)
 if __name__ == "__main__":
     print("=== Settings Debug ===")
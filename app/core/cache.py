@@ -0,0 +1,285 @@
+# app/core/cache.py
+"""Shared key/value cache: Redis when reachable, an in-process TTL store otherwise.
+
+Values are JSON documents or flat numeric hashes. Hashes support atomic
+``incr_hash`` so several workers can apply deltas to one snapshot; it is a
+no-op when the hash is missing, so a partially-built snapshot never appears.
+Version keys (``stamp_versions``) get a fresh, never-repeating value on every
+stamp and expire like any other key.
+
+When Redis is unreachable the cache logs once, serves from the in-process
+store and retries Redis after ``retry_seconds``. The fallback is per process,
+so cached values are only as consistent as their TTL across workers.
+Connections come from the shared pools in ``app.core.redis_pool``.
+"""
+
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+
+from app.core import redis_pool
+
+if redis_pool.REDIS_AVAILABLE:
+    import redis
+
+logger = logging.getLogger(__name__)
+
+Number = float
+
+# Apply HINCRBYFLOAT deltas only if the hash exists: ARGV = field, delta, field, delta, ...
+_INCR_IF_EXISTS = """
+if redis.call('EXISTS', KEYS[1]) == 0 then return 0 end
+for i = 1, #ARGV, 2 do redis.call('HINCRBYFLOAT', KEYS[1], ARGV[i], ARGV[i + 1]) end
+return 1
+"""
+
+
+def _new_version() -> int:
+    # Nanoseconds: a key that expired and is stamped again never gets back a value it had.
+    return time.time_ns()
+
+
+class MemoryCache:
+    """Thread-safe in-process store with per-key expiry."""
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._entries: Dict[str, Tuple[Optional[float], Any]] = {}
+        self._lock = threading.Lock()
+
+    def _store(self, key: str, ttl: Optional[float], value: Any) -> None:
+        if key not in self._entries and len(self._entries) >= self.max_entries:
+            now = time.monotonic()
+            self._entries = {k: v for k, v in self._entries.items() if v[0] is None or v[0] > now}
+            if len(self._entries) >= self.max_entries:
+                # Still full of live entries: evict the oldest insertions.
+                for stale in list(self._entries)[: len(self._entries) // 10 + 1]:
+                    del self._entries[stale]
+        self._entries[key] = (self._expiry(ttl), value)
+
+    def _live(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        return value
+
+    @staticmethod
+    def _expiry(ttl: Optional[float]) -> Optional[float]:
+        return time.monotonic() + ttl if ttl else None
+
+    def get_json(self, key: str) -> Optional[Any]:
+        with self._lock:
+            value = self._live(key)
+        return json.loads(value) if value is not None else None
+
+    def set_json(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        with self._lock:
+            self._store(key, ttl, json.dumps(value, default=str))
+
+    def get_hash(self, key: str) -> Optional[Dict[str, Number]]:
+        with self._lock:
+            value = self._live(key)
+            return dict(value) if value is not None else None
+
+    def set_hash(self, key: str, mapping: Mapping[str, Number], ttl: Optional[float] = None) -> None:
+        with self._lock:
+            self._store(key, ttl, {k: float(v) for k, v in mapping.items()})
+
+    def incr_hash(self, key: str, deltas: Mapping[str, Number]) -> bool:
+        with self._lock:
+            value = self._live(key)
+            if value is None:
+                return False
+            for field, delta in deltas.items():
+                value[field] = value.get(field, 0.0) + float(delta)
+            return True
+
+    def get_versions(self, keys: Sequence[str]) -> List[Optional[int]]:
+        with self._lock:
+            return [self._live(key) for key in keys]
+
+    def stamp_versions(self, keys: Iterable[str], ttl: float, version: Optional[int] = None) -> None:
+        version = version or _new_version()
+        with self._lock:
+            for key in keys:
+                self._store(key, ttl, version)
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisCache:
+    """Redis-backed cache with a ``MemoryCache`` fallback while Redis is down."""
+
+    def __init__(self, retry_seconds: float = 30.0):
+        self.retry_seconds = retry_seconds
+        self.fallback = MemoryCache()
+        self._client = redis_pool.client()
+        self._async_client = redis_pool.async_client()
+        self._incr_script = self._client.register_script(_INCR_IF_EXISTS)
+        self._down_until = 0.0
+
+    # -- availability -------------------------------------------------------
+
+    def _usable(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def _mark_down(self, exc: Exception) -> None:
+        if self._usable():
+            logger.warning("Redis cache unavailable (%s); using in-process cache for %ss", exc, self.retry_seconds)
+        self._down_until = time.monotonic() + self.retry_seconds
+
+    def _call(self, operation: str, *args):
+        if self._usable():
+            try:
+                return True, getattr(self, f"_redis_{operation}")(*args)
+            except redis.RedisError as exc:
+                self._mark_down(exc)
+        return False, getattr(self.fallback, operation)(*args)
+
+    # -- sync API -----------------------------------------------------------
+
+    def get_json(self, key: str) -> Optional[Any]:
+        return self._call("get_json", key)[1]
+
+    def set_json(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self._call("set_json", key, value, ttl)
+
+    def get_hash(self, key: str) -> Optional[Dict[str, Number]]:
+        return self._call("get_hash", key)[1]
+
+    def set_hash(self, key: str, mapping: Mapping[str, Number], ttl: Optional[float] = None) -> None:
+        self._call("set_hash", key, mapping, ttl)
+
+    def incr_hash(self, key: str, deltas: Mapping[str, Number]) -> bool:
+        return bool(self._call("incr_hash", key, deltas)[1])
+
+    def get_versions(self, keys: Sequence[str]) -> List[Optional[int]]:
+        return self._call("get_versions", keys)[1]
+
+    def stamp_versions(self, keys: Iterable[str], ttl: float, version: Optional[int] = None) -> None:
+        # Also stamp the fallback so entries cached there during an outage go stale.
+        keys, version = list(keys), version or _new_version()
+        self._call("stamp_versions", keys, ttl, version)
+        self.fallback.stamp_versions(keys, ttl, version)
+
+    def delete(self, *keys: str) -> None:
+        self._call("delete", *keys)
+        self.fallback.delete(*keys)
+
+    def clear(self) -> None:
+        self.fallback.clear()
+
+    def _redis_get_json(self, key):
+        value = self._client.get(key)
+        return json.loads(value) if value is not None else None
+
+    def _redis_set_json(self, key, value, ttl):
+        self._client.set(key, json.dumps(value, default=str), ex=int(ttl) if ttl else None)
+
+    def _redis_get_hash(self, key):
+        value = self._client.hgetall(key)
+        return {k: float(v) for k, v in value.items()} if value else None
+
+    def _redis_set_hash(self, key, mapping, ttl):
+        pipe = self._client.pipeline()
+        pipe.delete(key)
+        if mapping:
+            pipe.hset(key, mapping={k: float(v) for k, v in mapping.items()})
+            if ttl:
+                pipe.expire(key, int(ttl))
+        pipe.execute()
+
+    def _redis_incr_hash(self, key, deltas):
+        args = [part for field, delta in deltas.items() for part in (field, float(delta))]
+        return self._incr_script(keys=[key], args=args) if args else 1
+
+    def _redis_get_versions(self, keys):
+        values = self._client.mget(list(keys)) if keys else []
+        return [int(v) if v is not None else None for v in values]
+
+    def _redis_stamp_versions(self, keys, ttl, version):
+        pipe = self._client.pipeline(transaction=False)
+        for key in keys:
+            pipe.set(key, version, ex=int(ttl))
+        pipe.execute()
+
+    def _redis_delete(self, *keys):
+        if keys:
+            self._client.delete(*keys)
+
+    # -- async API (reads on the event loop) --------------------------------
+
+    async def aget_json(self, key: str) -> Optional[Any]:
+        if self._usable():
+            try:
+                value = await self._async_client.get(key)
+                return json.loads(value) if value is not None else None
+            except redis.RedisError as exc:
+                self._mark_down(exc)
+        return self.fallback.get_json(key)
+
+    async def aset_json(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        if self._usable():
+            try:
+                await self._async_client.set(key, json.dumps(value, default=str), ex=int(ttl) if ttl else None)
+                return
+            except redis.RedisError as exc:
+                self._mark_down(exc)
+        self.fallback.set_json(key, value, ttl)
+
+    async def aget_hash(self, key: str) -> Optional[Dict[str, Number]]:
+        if self._usable():
+            try:
+                value = await self._async_client.hgetall(key)
+                return {k: float(v) for k, v in value.items()} if value else None
+            except redis.RedisError as exc:
+                self._mark_down(exc)
+        return self.fallback.get_hash(key)
+
+    async def aget_versions(self, keys: Sequence[str]) -> List[Optional[int]]:
+        if self._usable():
+            try:
+                values = await self._async_client.mget(list(keys)) if keys else []
+                return [int(v) if v is not None else None for v in values]
+            except redis.RedisError as exc:
+                self._mark_down(exc)
+        return self.fallback.get_versions(keys)
+
+
+class _AsyncMemoryCache(MemoryCache):
+    """``MemoryCache`` with the async read API of ``RedisCache``."""
+
+    async def aget_json(self, key: str) -> Optional[Any]:
+        return self.get_json(key)
+
+    async def aset_json(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self.set_json(key, value, ttl)
+
+    async def aget_hash(self, key: str) -> Optional[Dict[str, Number]]:
+        return self.get_hash(key)
+
+    async def aget_versions(self, keys: Sequence[str]) -> List[Optional[int]]:
+        return self.get_versions(keys)
+
+
+def _create_cache():
+    if redis_pool.configured():
+        return RedisCache()
+    return _AsyncMemoryCache()
+
+
+cache = _create_cache()
@@ -0,0 +1,125 @@
+# app/core/container.py
+"""Application-scoped service instances.
+
+Services are built once (eagerly by ``startup()`` in the app lifespan, or on
+first use from scripts) and share one ``EmailService`` and the Redis pool in
+``app.core.redis_pool``. Routes receive them through the ``get_*``
+dependencies below; background tasks and module code use ``container``.
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Any, Callable, Dict
+
+from app.core import redis_pool
+from app.modules.auth.services.otp_service import OTPService
+from app.modules.auth.services.fraud_scan_jobs import fraud_scan_jobs
+from app.modules.auth.services.password_reset_service import PasswordResetService
+from app.modules.tasks.services.service_request_matches import match_precomputer
+from app.modules.tasks.services.task_request_service import TaskRequestService
+from app.services.ai_profile_service import AIProfileService
+from app.services.candidate_features import candidate_features
+from app.services.email_service import EmailService
+from app.services.image_pipeline import image_pipeline
+from app.services.llm_client import llm_client
+from app.services.mail_queue import mail_queue
+from app.services.notification_service import NotificationService
+from app.services.pdf_text import pdf_text_extractor
+from app.services.resume_jobs import resume_jobs
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceContainer:
+    def __init__(self):
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    def _get(self, name: str, factory: Callable[[], Any]) -> Any:
+        instance = self._instances.get(name)
+        if instance is None:
+            with self._lock:
+                instance = self._instances.get(name)
+                if instance is None:
+                    instance = self._instances[name] = factory()
+        return instance
+
+    @property
+    def email_service(self) -> EmailService:
+        return self._get("email", lambda: EmailService(redis_client=redis_pool.reachable_client()))
+
+    @property
+    def notification_service(self) -> NotificationService:
+        return self._get("notification", lambda: NotificationService(self.email_service))
+
+    @property
+    def otp_service(self) -> OTPService:
+        return self._get("otp", lambda: OTPService(self.email_service))
+
+    @property
+    def password_reset_service(self) -> PasswordResetService:
+        return self._get("password_reset", lambda: PasswordResetService(self.otp_service, self.email_service))
+
+    @property
+    def task_request_service(self) -> TaskRequestService:
+        return self._get("task_request", lambda: TaskRequestService(self.email_service))
+
+    @property
+    def ai_profile_service(self) -> AIProfileService:
+        return self._get("ai_profile", AIProfileService)
+
+    def startup(self) -> None:
+        """Build every service so the first requests don't pay for it."""
+        for name in (
+            "email_service", "notification_service", "otp_service",
+            "password_reset_service", "task_request_service", "ai_profile_service",
+        ):
+            getattr(self, name)
+        # Loads verified professionals' match features in the background
+        candidate_features.start()
+        # Ranks new and changed service requests in the background
+        match_precomputer.start(self.ai_profile_service)
+        logger.info("Service container started (redis: %s)", self.email_service.use_redis)
+
+    async def shutdown(self) -> None:
+        """Stop the background workers, close pooled connections and drop the instances."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, mail_queue.stop)
+        await loop.run_in_executor(None, image_pipeline.shutdown)
+        await loop.run_in_executor(None, resume_jobs.shutdown)
+        await loop.run_in_executor(None, fraud_scan_jobs.shutdown)
+        await loop.run_in_executor(None, pdf_text_extractor.shutdown)
+        await loop.run_in_executor(None, match_precomputer.stop)
+        await loop.run_in_executor(None, candidate_features.stop)
+        await loop.run_in_executor(None, llm_client.close)
+        await redis_pool.close()
+        with self._lock:
+            self._instances.clear()
+
+
+container = ServiceContainer()
+
+
+def get_email_service() -> EmailService:
+    return container.email_service
+
+
+def get_notification_service() -> NotificationService:
+    return container.notification_service
+
+
+def get_otp_service() -> OTPService:
+    return container.otp_service
+
+
+def get_password_reset_service() -> PasswordResetService:
+    return container.password_reset_service
+
+
+def get_task_request_service() -> TaskRequestService:
+    return container.task_request_service
+
+
+def get_ai_profile_service() -> AIProfileService:
+    return container.ai_profile_service
@@ -0,0 +1,179 @@
+# app/core/pagination.py
+"""Keyset (cursor) pagination helpers.
+
+A cursor is an opaque, URL-safe token holding the sort-key values of the last
+row on the page, always ending with the row id as tie-breaker. The next page
+is the rows strictly after that tuple in the listing's ORDER BY, so every page
+costs one index range scan instead of OFFSET + COUNT(*).
+
+Listings opt in with the ``cursor`` query parameter; an empty value requests
+the first page. Totals in cursor mode come from a short-lived count cache.
+"""
+
+import base64
+import json
+import threading
+import time
+from datetime import date, datetime
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import DateTime, and_, literal, or_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+from app.core.exceptions import BadRequestException
+
+# (sort expression, descending?) pairs, ending with the id column.
+KeysetOrder = Sequence[Tuple[Any, bool]]
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+def _decode_value(value: Any) -> Any:
+    """Inverse of ``_encode_value``; ValueError/TypeError on anything it cannot have produced."""
+    if isinstance(value, dict):
+        if value.keys() == {"dt"}:
+            return datetime.fromisoformat(value["dt"])
+        if value.keys() == {"d"}:
+            return date.fromisoformat(value["d"])
+        raise ValueError(f"unknown cursor value {value!r}")
+    if isinstance(value, list):
+        raise ValueError("nested list in cursor")
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """Decode a cursor produced for an ORDER BY of ``size`` keys."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, UnicodeDecodeError):
+        raise BadRequestException("Invalid pagination cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise BadRequestException("Pagination cursor does not match this listing's sort order")
+    try:
+        return [_decode_value(v) for v in values]
+    except (ValueError, TypeError):
+        raise BadRequestException("Invalid pagination cursor")
+
+
+def order_by_clauses(order: KeysetOrder) -> List[Any]:
+    return [expr.desc() if descending else expr.asc() for expr, descending in order]
+
+
+class comparable_datetime(FunctionElement):
+    """A datetime operand normalised for comparison.
+
+    A no-op except on SQLite, which stores datetimes as text: server-default
+    timestamps lack the microseconds SQLAlchemy binds, so equal instants would
+    compare unequal.
+    """
+
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(comparable_datetime)
+def _compile_comparable_datetime(element, compiler, **kw):
+    return compiler.process(element.clauses, **kw)
+
+
+@compiles(comparable_datetime, "sqlite")
+def _compile_comparable_datetime_sqlite(element, compiler, **kw):
+    return "strftime('%%Y-%%m-%%d %%H:%%M:%%f', %s)" % compiler.process(element.clauses, **kw)
+
+
+def _comparison_operands(expr, value):
+    if isinstance(getattr(expr, "type", None), DateTime) and value is not None:
+        return comparable_datetime(expr), comparable_datetime(literal(value, expr.type))
+    return expr, value
+
+
+def keyset_filter(order: KeysetOrder, values: Sequence[Any]):
+    """Rows strictly after ``values`` in ``order``: (a, b, id) > (va, vb, vid), lexicographically."""
+    operands = [_comparison_operands(expr, value) for (expr, _), value in zip(order, values)]
+    clauses = []
+    for i, (_, descending) in enumerate(order):
+        equal_prefix = [operands[j][0] == operands[j][1] for j in range(i)]
+        expr, value = operands[i]
+        after = expr < value if descending else expr > value
+        clauses.append(and_(*equal_prefix, after) if equal_prefix else after)
+    return or_(*clauses)
+
+
+def apply_keyset(query, order: KeysetOrder, cursor: Optional[str]):
+    """Order ``query`` (a ``Query`` or ``Select``) by ``order`` and seek past ``cursor``."""
+    if cursor:
+        condition = keyset_filter(order, decode_cursor(cursor, len(order)))
+        query = query.filter(condition) if hasattr(query, "filter") else query.where(condition)
+    return query.order_by(*order_by_clauses(order))
+
+
+def next_cursor(rows: Sequence[Any], limit: int, key: Callable[[Any], Sequence[Any]]) -> Optional[str]:
+    """Cursor for the page after ``rows``, or None when this was the last page.
+
+    Callers fetch ``limit + 1`` rows; the extra row only signals that more exist
+    and must be dropped from the response (see ``split_page``).
+    """
+    if len(rows) <= limit:
+        return None
+    return encode_cursor(key(rows[limit - 1]))
+
+
+def split_page(rows: Sequence[Any], limit: int, key: Callable[[Any], Sequence[Any]]) -> Tuple[List[Any], Optional[str]]:
+    return list(rows[:limit]), next_cursor(rows, limit, key)
+
+
+class CountCache:
+    """Per-process TTL cache for listing totals shown alongside cursor pages."""
+
+    def __init__(self, ttl_seconds: float = 30.0, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                return entry[1]
+            return None
+
+    def set(self, key: Hashable, value: int) -> int:
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                now = time.monotonic()
+                self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+                if len(self._entries) >= self.max_entries:
+                    self._entries.clear()
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        return value
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], int]) -> int:
+        cached = self.get(key)
+        return cached if cached is not None else self.set(key, compute())
+
+    async def get_or_compute_async(self, key: Hashable, compute: Callable[[], Awaitable[int]]) -> int:
+        cached = self.get(key)
+        return cached if cached is not None else self.set(key, await compute())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+count_cache = CountCache()
@@ -0,0 +1,53 @@
+# app/core/process_pool.py
+"""Lazily started process pools for CPU-bound work called from request handlers.
+
+Pools use the ``spawn`` start method: the API process runs threads (mail
+queue, Redis pools) that ``fork`` would copy in an arbitrary state. A pool
+whose worker died is discarded and replaced on the next submit. Where
+processes cannot be started at all the pool degrades to threads.
+"""
+
+import logging
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LazyProcessPool:
+    def __init__(self, name: str, max_workers: Callable[[], int]):
+        self.name = name
+        self.max_workers = max_workers
+        self._executor: Optional[Executor] = None
+
+    def executor(self) -> Executor:
+        if self._executor is None:
+            workers = max(1, self.max_workers())
+            try:
+                self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn'))
+            except (OSError, NotImplementedError) as exc:
+                logger.warning(f"{self.name}: process pool unavailable ({exc}); using threads")
+                self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=self.name)
+        return self._executor
+
+    def submit(self, fn, *args) -> Future:
+        executor = self.executor()
+        try:
+            return executor.submit(fn, *args)
+        except BrokenProcessPool:
+            self.discard(executor)
+            return self.executor().submit(fn, *args)
+
+    def discard(self, executor: Optional[Executor] = None) -> None:
+        """Drop ``executor`` (default: the current one) if it is still current, after a worker crash."""
+        executor = executor or self._executor
+        if executor is not None and self._executor is executor:
+            self._executor = None
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self, wait: bool = True) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
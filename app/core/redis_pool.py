@@ -0,0 +1,103 @@
+# app/core/redis_pool.py
+"""Process-wide Redis connection pools.
+
+Every Redis user (the cache, email verification tokens, SMS OTPs) borrows
+connections from the same pool instead of calling ``redis.from_url`` and
+``ping()`` per instance. ``reachable_client()`` pings at most once per
+``RETRY_SECONDS`` and returns ``None`` while Redis is down, so callers keep
+their in-memory fallbacks. ``close()`` runs from the application lifespan.
+"""
+
+import logging
+import threading
+import time
+from typing import Optional
+
+from app.config.settings import settings
+
+try:
+    import redis
+    import redis.asyncio as redis_asyncio
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+SOCKET_TIMEOUT = 1.0
+RETRY_SECONDS = 30.0
+
+_lock = threading.Lock()
+_pool = None
+_async_pool = None
+_reachable: Optional[bool] = None
+_checked_at = 0.0
+
+
+def configured() -> bool:
+    return REDIS_AVAILABLE and bool(settings.REDIS_URL)
+
+
+def connection_pool():
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = redis.ConnectionPool.from_url(
+                settings.REDIS_URL,
+                decode_responses=True,
+                socket_timeout=SOCKET_TIMEOUT,
+                socket_connect_timeout=SOCKET_TIMEOUT,
+            )
+        return _pool
+
+
+def async_connection_pool():
+    global _async_pool
+    with _lock:
+        if _async_pool is None:
+            _async_pool = redis_asyncio.ConnectionPool.from_url(
+                settings.REDIS_URL,
+                decode_responses=True,
+                socket_timeout=SOCKET_TIMEOUT,
+                socket_connect_timeout=SOCKET_TIMEOUT,
+            )
+        return _async_pool
+
+
+def client():
+    """A client on the shared pool (connections are opened lazily)."""
+    return redis.Redis(connection_pool=connection_pool())
+
+
+def async_client():
+    return redis_asyncio.Redis(connection_pool=async_connection_pool())
+
+
+def reachable_client():
+    """A shared-pool client if Redis answered a recent ping, else ``None``."""
+    global _reachable, _checked_at
+    if not configured():
+        return None
+    now = time.monotonic()
+    if _reachable is None or now - _checked_at >= RETRY_SECONDS:
+        try:
+            client().ping()
+            reachable = True
+        except redis.RedisError as exc:
+            if _reachable is not False:
+                logger.error(f"Redis connection failed: {exc}. Using in-memory storage.")
+            reachable = False
+        _reachable, _checked_at = reachable, now
+    return client() if _reachable else None
+
+
+async def close() -> None:
+    """Disconnect both pools; they are recreated on next use."""
+    global _pool, _async_pool, _reachable
+    with _lock:
+        pool, async_pool = _pool, _async_pool
+        _pool = _async_pool = _reachable = None
+    if pool is not None:
+        pool.disconnect()
+    if async_pool is not None:
+        await async_pool.disconnect()
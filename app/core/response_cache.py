@@ -0,0 +1,136 @@
+# app/core/response_cache.py
+"""Cache of serialized JSON responses for anonymous, viewer-independent endpoints.
+
+Entries are keyed on the route path and its sorted query string and hold the
+response bytes, a strong ETag and the version of every tag they depend on
+(e.g. ``profile:<id>``). ``purge(*tags)`` stamps those versions anew, so
+entries built from older data stop matching without having to find their
+keys. Each tag version is its own key and expires ``TAG_TTL_FACTOR`` times
+the response TTL after its last purge, by which time every entry that could
+have read the previous version has expired too.
+
+Every purge also stamps ``ALL_TAGS``. ``lookup`` reads it before the route
+loads anything and ``store`` caches only if it has not moved: a response
+built while some purge landed might hold the data from before it.
+
+A hit costs two cache reads and no database work; a request whose
+``If-None-Match`` matches the ETag gets a bodiless 304.
+"""
+
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from app.config.settings import settings
+from app.core.cache import cache
+
+TAG_KEY_PREFIX = "resp:tag:"
+ALL_TAGS = "*"
+TAG_TTL_FACTOR = 2
+CACHE_CONTROL = "public, no-cache"
+
+
+def serialize(content: Any) -> bytes:
+    """JSON bytes for a response model or a list of them, as FastAPI would render them."""
+    if isinstance(content, BaseModel):
+        return content.model_dump_json().encode()
+    if isinstance(content, list):
+        return b"[" + b",".join(serialize(item) for item in content) + b"]"
+    return json.dumps(content, separators=(",", ":"), default=str).encode()
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+class ResponseCache:
+    def __init__(self, namespace: str, ttl_seconds: Optional[int] = None):
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+
+    @property
+    def ttl(self) -> int:
+        # Never longer than the response TTL the tag versions are kept for.
+        return min(self.ttl_seconds or settings.RESPONSE_CACHE_TTL_SECONDS, settings.RESPONSE_CACHE_TTL_SECONDS)
+
+    def key(self, request: Request) -> str:
+        query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+        raw = f"{request.url.path}?{query}"
+        return f"resp:{self.namespace}:{hashlib.sha1(raw.encode()).hexdigest()}"
+
+    async def tag_versions(self, tags: Sequence[str]) -> Dict[str, int]:
+        tags = list(dict.fromkeys(tags))
+        values = await cache.aget_versions([TAG_KEY_PREFIX + tag for tag in tags])
+        return {tag: value or 0 for tag, value in zip(tags, values)}
+
+    def _response(self, request: Request, body: bytes, etag: str) -> Response:
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    async def lookup(self, request: Request) -> Optional[Response]:
+        """The cached response (or a 304) if the entry exists and none of its tags were purged.
+
+        On a miss, remembers the latest purge on ``request.state`` for ``store``.
+        """
+        entry = await cache.aget_json(self.key(request))
+        versions = await self.tag_versions(list(entry["tags"] if entry else []) + [ALL_TAGS])
+        request.state.response_cache_purge = versions.pop(ALL_TAGS)
+        if not entry or versions != entry["tags"]:
+            return None
+        return self._response(request, entry["body"].encode(), entry["etag"])
+
+    async def store(
+        self,
+        request: Request,
+        content: Any,
+        tags: Iterable[str],
+        updated_at: Iterable[Optional[datetime]] = (),
+    ) -> Response:
+        """Cache ``content`` under the request's key and return it as a response.
+
+        Nothing is cached unless ``lookup`` ran first and no purge has landed
+        since. The ETag is derived from the key, the ``updated_at`` of every
+        profile in the response and the tag versions, so it changes whenever
+        the data does and stays stable across cache rebuilds.
+        """
+        body = serialize(content)
+        versions = await self.tag_versions(list(tags) + [ALL_TAGS])
+        purged = versions.pop(ALL_TAGS) != getattr(request.state, "response_cache_purge", None)
+        key = self.key(request)
+        validator = "|".join(
+            [key]
+            + [value.isoformat() if value else "-" for value in updated_at]
+            + [f"{tag}={version}" for tag, version in sorted(versions.items())]
+        )
+        etag = f'"{hashlib.sha256(validator.encode()).hexdigest()[:32]}"'
+        if not purged:
+            await cache.aset_json(key, {"body": body.decode(), "etag": etag, "tags": versions}, ttl=self.ttl)
+        return self._response(request, body, etag)
+
+
+def purge(*tags: str) -> None:
+    """Invalidate every cached response that depends on any of ``tags``."""
+    if tags:
+        ttl = settings.RESPONSE_CACHE_TTL_SECONDS * TAG_TTL_FACTOR
+        cache.stamp_versions([TAG_KEY_PREFIX + tag for tag in tags + (ALL_TAGS,)], ttl)
+
+
+def profile_tag(profile_id: Any) -> str:
+    return f"profile:{profile_id}"
+
+
+def purge_profiles(profile_ids: Iterable[Any], *extra_tags: str) -> List[str]:
+    tags = [profile_tag(pid) for pid in profile_ids] + list(extra_tags)
+    purge(*tags)
+    return tags
@@ -0,0 +1,23 @@
+# app/database/hooks.py
+"""Session hooks that keep derived tables in step with ORM writes.
+
+URL fingerprints, profile text bands and fraud rescan marks are written by
+``Session`` event listeners in the modules below, in the same transaction
+as the profile or user write. ``app.config.database``, where every session
+factory is created, calls ``install_hooks()``, so any code that can open a
+session (the API, scripts, seeds) has them installed.
+"""
+
+import importlib
+
+HOOK_MODULES = (
+    "app.modules.proz.url_fingerprints",
+    "app.modules.proz.text_similarity",
+    "app.modules.auth.services.fraud_rescan",
+)
+
+
+def install_hooks() -> None:
+    """Import the hook modules; their listeners register on import, once."""
+    for name in HOOK_MODULES:
+        importlib.import_module(name)
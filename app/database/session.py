@@ -1,7 +1,7 @@
 # app/database/session.py
 from sqlalchemy.orm import Session
 
-from app.config.database import SessionLocal
+from app.config.database import AsyncSessionLocal, SessionLocal
 
 
 def get_db():
@@ -11,22 +11,7 @@ def get_db():
     finally:
         db.close()
 
-# app/database/base_class.py
-from typing import Any
-import uuid
-from sqlalchemy.ext.declarative import as_declarative, declared_attr
-from sqlalchemy import Column, String, DateTime
-from sqlalchemy.sql import func
 
-
-@as_declarative()
-class Base:
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
-    __name__: str
-    
-    # Generate tablename automatically
-    @declared_attr
-    def __tablename__(cls) -> str:
-        return cls.__name__.lower()
\ No newline at end of file
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
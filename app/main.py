@@ -1,4 +1,6 @@
 # app/main.py - Add static file serving
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles  # Add this import
@@ -6,11 +8,22 @@ import os
 from pathlib import Path
 
 from app.config.settings import settings
+from app.core.container import container
 from app.routes import api_router
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build shared services (and the Redis pool) once; flush mail and close pools on shutdown
+    container.startup()
+    yield
+    await container.shutdown()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_PREFIX}/openapi.json",
+    lifespan=lifespan,
 )
 
 # Set all CORS origins
@@ -14,15 +14,14 @@ from app.modules.auth.services.auth_service import (
     get_current_user_allow_unverified,
     get_current_superuser,
 )
-from app.services.email_service import EmailService
+from app.core.container import container
 
 router = APIRouter()
-email_service = EmailService()
 
 
 def _send_registration_verification(email: str, user_name: str | None, user_id: str) -> None:
     try:
-        email_service.send_verification_email(
+        container.email_service.send_verification_email(
             email=email,
             user_name=user_name,
             user_id=user_id,
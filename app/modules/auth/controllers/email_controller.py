@@ -19,11 +19,10 @@ from app.modules.auth.schemas.email import (
 )
 from app.services.email_service import EmailService
 from app.services.notification_service import NotificationService
+from app.core.container import get_email_service, get_notification_service
 from app.config.settings import settings
 
 router = APIRouter()
-email_service = EmailService()
-notification_service = NotificationService()
 user_repository = UserRepository()
 
 
@@ -37,7 +36,7 @@ class ProfileVerificationNotificationRequest(BaseModel):
 
 
 @router.get("/status", response_model=EmailServiceStatus)
-def get_email_service_status() -> Any:
+def get_email_service_status(email_service: EmailService = Depends(get_email_service)) -> Any:
     """Get email service status"""
     try:
         raw = email_service.get_service_status()
@@ -68,6 +67,7 @@ def send_verification_email(
     db: Session = Depends(get_db),
     email_request: EmailVerificationRequest,
     current_user: User = Depends(get_current_user_allow_unverified),
+    email_service: EmailService = Depends(get_email_service),
 ) -> Any:
     """Send email verification"""
     try:
@@ -95,6 +95,7 @@ def request_verification_email(
     *,
     db: Session = Depends(get_db),
     email_request: EmailVerificationRequest,
+    email_service: EmailService = Depends(get_email_service),
 ) -> Any:
     """Public endpoint to request a verification email without logging in."""
     user = user_repository.get_by_email(db, email_request.email)
@@ -120,6 +121,7 @@ def request_verification_email(
 @router.post("/send-verification-notification")
 def send_profile_verification_notification(
     request: ProfileVerificationNotificationRequest,
+    notification_service: NotificationService = Depends(get_notification_service),
 ) -> Any:
     """Send profile approval/rejection notification (used by admin dashboard)."""
     user_name = f"{request.first_name} {request.last_name}".strip() or "Professional"
@@ -161,7 +163,8 @@ def verify_email_from_link(
 def verify_email_token(
     *,
     db: Session = Depends(get_db),
-    verify_request: EmailVerifyTokenRequest = Body(...)
+    verify_request: EmailVerifyTokenRequest = Body(...),
+    email_service: EmailService = Depends(get_email_service),
 ) -> Any:
     """Verify email token (API endpoint)"""
     try:
@@ -185,7 +188,8 @@ def resend_verification_email(
     *,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user_allow_unverified),
-    resend_request: EmailResendRequest = Body(default=EmailResendRequest())
+    resend_request: EmailResendRequest = Body(default=EmailResendRequest()),
+    email_service: EmailService = Depends(get_email_service),
 ) -> Any:
     """Resend verification email to current user"""
     try:
@@ -1,10 +1,12 @@
 from datetime import datetime, timezone
-from typing import Any, List, Optional
+from typing import Any, List, Literal, Optional, Union
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import and_, func, select
 from sqlalchemy.orm import Session
 
+from app.core.pagination import apply_keyset, order_by_clauses, split_page
 from app.database.session import get_db
 from app.modules.auth.models.user import User
 from app.modules.auth.schemas.fraud import (
@@ -12,17 +14,23 @@ from app.modules.auth.schemas.fraud import (
     FraudActionResponse,
     FraudCandidateItem,
     FraudCandidateListResponse,
+    FraudScanJobResponse,
     FraudScanResponse,
     FraudSignal,
 )
 from app.modules.auth.services.auth_service import get_current_superuser
 from app.modules.auth.services.fraud_detection_service import (
     AUTO_FLAG_THRESHOLD,
+    RISK_LEVEL_THRESHOLDS,
     apply_scan_result,
+    candidate_item,
+    profiles_for_users,
+    risk_level_expr,
     scan_user,
-    to_candidate_item,
     _risk_level,
 )
+from app.modules.auth.models.fraud_scan import FraudScanJob
+from app.modules.auth.services.fraud_scan_jobs import ScanJobConflict, fraud_scan_jobs, job_to_dict
 
 router = APIRouter(prefix="/fraud", tags=["Admin - Fraud Detection"])
 
@@ -36,71 +44,173 @@ def _get_user_or_404(db: Session, user_id: UUID) -> User:
     return user
 
 
+def _candidate_status_filter(filter: Optional[str], is_flagged, is_banned, score):
+    """SQL condition for the ``filter`` tab (the summary applies the same rules to its grouped keys)."""
+    if filter == "flagged":
+        return and_(is_flagged, ~is_banned)
+    if filter == "banned":
+        return is_banned
+    if filter == "high_risk":
+        return and_(score >= AUTO_FLAG_THRESHOLD, ~is_banned)
+    return None
+
+
 @router.get("/candidates", response_model=FraudCandidateListResponse)
 async def list_fraud_candidates(
     filter: Optional[str] = Query(None, description="flagged, banned, high_risk, all"),
     search: Optional[str] = Query(None),
+    min_risk: Optional[Literal["low", "medium", "high", "critical"]] = Query(
+        None, description="Only candidates at or above this risk level"
+    ),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="Keyset pagination: pass empty for the first page, then next_cursor"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_superuser),
 ) -> Any:
-    query = db.query(User).filter(User.is_superuser == False)  # noqa: E712
-
+    score = func.coalesce(User.fraud_score, 0)
+    is_flagged = func.coalesce(User.is_flagged, False)
+    is_banned = func.coalesce(User.is_banned, False)
+    scope = [User.is_superuser == False]  # noqa: E712
     if search:
-        query = query.filter(
+        scope.append(
             (User.email.ilike(f"%{search}%"))
             | (User.first_name.ilike(f"%{search}%"))
             | (User.last_name.ilike(f"%{search}%"))
         )
 
-    users: List[User] = query.order_by(User.fraud_score.desc(), User.updated_at.desc()).all()
-
-    candidates = [to_candidate_item(db, u) for u in users]
+    # Summary counts and the filtered total from one grouped aggregate over the search scope
+    keys = (
+        is_flagged.label("flagged"),
+        is_banned.label("banned"),
+        (score >= AUTO_FLAG_THRESHOLD).label("high_risk"),
+        risk_level_expr(score).label("risk_level"),
+    )
+    ranks = {level: rank for rank, (level, _) in enumerate(reversed(RISK_LEVEL_THRESHOLDS))}
+    flagged_count = banned_count = high_risk_count = total = 0
+    for g in db.execute(select(*keys, func.count().label("n")).where(*scope).group_by(*keys)):
+        flagged, banned, high_risk = bool(g.flagged), bool(g.banned), bool(g.high_risk)
+        flagged_count += g.n if flagged and not banned else 0
+        banned_count += g.n if banned else 0
+        high_risk_count += g.n if high_risk else 0
+        in_tab = {
+            "flagged": flagged and not banned,
+            "banned": banned,
+            "high_risk": high_risk and not banned,
+        }.get(filter, True)
+        if in_tab and (min_risk is None or ranks[g.risk_level] >= ranks[min_risk]):
+            total += g.n
 
-    if filter == "flagged":
-        candidates = [c for c in candidates if c["is_flagged"] and not c["is_banned"]]
-    elif filter == "banned":
-        candidates = [c for c in candidates if c["is_banned"]]
-    elif filter == "high_risk":
-        candidates = [c for c in candidates if c["fraud_score"] >= AUTO_FLAG_THRESHOLD and not c["is_banned"]]
+    query = db.query(User).filter(*scope)
+    status_filter = _candidate_status_filter(filter, is_flagged, is_banned, score)
+    if status_filter is not None:
+        query = query.filter(status_filter)
+    if min_risk:
+        query = query.filter(score >= dict(RISK_LEVEL_THRESHOLDS)[min_risk])
 
-    flagged_count = sum(1 for c in candidates if c["is_flagged"] and not c["is_banned"])
-    banned_count = sum(1 for c in candidates if c["is_banned"])
-    high_risk_count = sum(1 for c in candidates if c["fraud_score"] >= AUTO_FLAG_THRESHOLD)
+    order = [(score, True), (User.updated_at, True), (User.id, True)]
+    next_page_cursor = None
+    if cursor is None:
+        users = query.order_by(*order_by_clauses(order)).offset((page - 1) * page_size).limit(page_size).all()
+    else:
+        rows = apply_keyset(query, order, cursor).limit(page_size + 1).all()
+        users, next_page_cursor = split_page(
+            rows, page_size, key=lambda u: [u.fraud_score or 0, u.updated_at, u.id]
+        )
 
+    profiles = profiles_for_users(db, users)
     return FraudCandidateListResponse(
-        candidates=[FraudCandidateItem(**c) for c in candidates],
-        total=len(candidates),
+        candidates=[FraudCandidateItem(**candidate_item(u, profiles.get(u.id))) for u in users],
+        total=total,
         flagged_count=flagged_count,
         banned_count=banned_count,
         high_risk_count=high_risk_count,
+        page=page,
+        page_size=page_size,
+        next_cursor=next_page_cursor,
     )
 
 
-@router.post("/scan", response_model=List[FraudScanResponse])
+@router.post("/scan", response_model=Union[List[FraudScanResponse], FraudScanJobResponse])
 async def scan_candidates(
-    user_id: Optional[UUID] = Query(None, description="Scan single user; omit to scan all non-admin users"),
+    response: Response,
+    user_id: Optional[UUID] = Query(None, description="Scan single user; omit to start a background scan of all non-admin users"),
     auto_flag: bool = Query(True),
+    incremental: bool = Query(False, description="Background scan of only the users changed since the last completed scan"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_superuser),
 ) -> Any:
-    if user_id:
-        users = [_get_user_or_404(db, user_id)]
-    else:
-        users = db.query(User).filter(User.is_superuser == False).all()  # noqa: E712
-
-    results: List[FraudScanResponse] = []
-    for user in users:
-        score, signals, auto_flagged = apply_scan_result(db, user, auto_flag=auto_flag)
-        results.append(
-            FraudScanResponse(
-                user_id=user.id,
-                fraud_score=score,
-                risk_level=_risk_level(score),
-                signals=[FraudSignal(**s) for s in signals],
-                auto_flagged=auto_flagged,
-            )
+    if not user_id:
+        # Everyone (or everyone changed): a chunked background job (202); poll /fraud/scan-jobs/{job_id}
+        try:
+            job = fraud_scan_jobs.start(db, auto_flag=auto_flag, started_by=current_user.id, incremental=incremental)
+        except ScanJobConflict as e:
+            raise HTTPException(status_code=409, detail={"message": str(e), "job_id": str(e.job.id) if e.job else None})
+        response.status_code = status.HTTP_202_ACCEPTED
+        return FraudScanJobResponse(**job_to_dict(job))
+
+    user = _get_user_or_404(db, user_id)
+    score, signals, auto_flagged = apply_scan_result(db, user, auto_flag=auto_flag)
+    return [
+        FraudScanResponse(
+            user_id=user.id,
+            fraud_score=score,
+            risk_level=_risk_level(score),
+            signals=[FraudSignal(**s) for s in signals],
+            auto_flagged=auto_flagged,
         )
-    return results
+    ]
+
+
+def _get_job_or_404(db: Session, job_id: UUID) -> FraudScanJob:
+    job = db.get(FraudScanJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Scan job not found")
+    return job
+
+
+@router.get("/scan-jobs", response_model=List[FraudScanJobResponse])
+async def list_scan_jobs(
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_superuser),
+) -> Any:
+    jobs = db.query(FraudScanJob).order_by(FraudScanJob.created_at.desc()).limit(limit).all()
+    return [FraudScanJobResponse(**job_to_dict(job)) for job in jobs]
+
+
+@router.get("/scan-jobs/{job_id}", response_model=FraudScanJobResponse)
+async def get_scan_job(
+    job_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_superuser),
+) -> Any:
+    return FraudScanJobResponse(**job_to_dict(_get_job_or_404(db, job_id)))
+
+
+@router.post("/scan-jobs/{job_id}/cancel", response_model=FraudScanJobResponse)
+async def cancel_scan_job(
+    job_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_superuser),
+) -> Any:
+    job = fraud_scan_jobs.cancel(db, _get_job_or_404(db, job_id).id)
+    return FraudScanJobResponse(**job_to_dict(job))
+
+
+@router.post("/scan-jobs/{job_id}/resume", response_model=FraudScanJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def resume_scan_job(
+    job_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_superuser),
+) -> Any:
+    """Continue a cancelled, interrupted or failed scan after its checkpoint."""
+    job = _get_job_or_404(db, job_id)
+    try:
+        job = fraud_scan_jobs.resume(db, job.id)
+    except ScanJobConflict as e:
+        raise HTTPException(status_code=409, detail={"message": str(e), "job_id": str(e.job.id) if e.job else None})
+    return FraudScanJobResponse(**job_to_dict(job))
 
 
 @router.post("/users/{user_id}/flag", response_model=FraudActionResponse)
@@ -8,13 +8,13 @@ from app.modules.auth.models.user import User
 from app.modules.auth.services.auth_service import auth_service, get_current_user, get_current_superuser
 from app.modules.auth.schemas.otp import OTPRequest, OTPVerification, OTPResponse
 from app.modules.auth.services.otp_service import OTPService
+from app.core.container import get_otp_service
 
 router = APIRouter()
-otp_service = OTPService()
 
 
 @router.get("/status")
-def get_sms_service_status() -> Any:
+def get_sms_service_status(otp_service: OTPService = Depends(get_otp_service)) -> Any:
     """Get SMS service status"""
     try:
         status = otp_service.get_service_status()
@@ -30,7 +30,8 @@ def get_sms_service_status() -> Any:
 def send_otp(
     *,
     db: Session = Depends(get_db),
-    otp_request: OTPRequest
+    otp_request: OTPRequest,
+    otp_service: OTPService = Depends(get_otp_service),
 ) -> Any:
     """Send OTP to phone number"""
     try:
@@ -56,7 +57,8 @@ def send_otp(
 def verify_otp(
     *,
     db: Session = Depends(get_db),
-    otp_verification: OTPVerification
+    otp_verification: OTPVerification,
+    otp_service: OTPService = Depends(get_otp_service),
 ) -> Any:
     """Verify OTP code"""
     try:
@@ -84,7 +86,8 @@ def verify_otp_and_update_profile(
     *,
     db: Session = Depends(get_db),
     otp_verification: OTPVerification,
-    current_user: User = Depends(get_current_user)  # Fixed dependency
+    current_user: User = Depends(get_current_user),  # Fixed dependency
+    otp_service: OTPService = Depends(get_otp_service),
 ) -> Any:
     """Verify OTP and update user profile with phone number"""
     try:
@@ -111,7 +114,8 @@ def verify_otp_and_update_profile(
 def resend_otp(
     *,
     db: Session = Depends(get_db),
-    otp_request: OTPRequest
+    otp_request: OTPRequest,
+    otp_service: OTPService = Depends(get_otp_service),
 ) -> Any:
     """Resend OTP to phone number"""
     try:
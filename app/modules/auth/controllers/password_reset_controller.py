@@ -5,6 +5,7 @@ from typing import Any
 
 from app.database.session import get_db
 from app.modules.auth.services.password_reset_service import PasswordResetService
+from app.core.container import get_password_reset_service
 from app.modules.auth.schemas.password_reset import (
     ForgotPasswordRequest,
     ResetPasswordRequest,
@@ -16,7 +17,6 @@ from app.modules.auth.schemas.password_reset import (
 )
 
 router = APIRouter()
-password_reset_service = PasswordResetService()
 
 
 @router.post("/forgot", response_model=ForgotPasswordResponse)
@@ -24,6 +24,7 @@ def forgot_password(
     *,
     db: Session = Depends(get_db),
     request: ForgotPasswordRequest,
+    password_reset_service: PasswordResetService = Depends(get_password_reset_service),
 ) -> Any:
     """
     Request a password reset OTP.
@@ -63,6 +64,7 @@ def verify_otp(
     *,
     db: Session = Depends(get_db),
     request: VerifyOTPRequest,
+    password_reset_service: PasswordResetService = Depends(get_password_reset_service),
 ) -> Any:
     """
     Verify password reset OTP.
@@ -100,6 +102,7 @@ def reset_password_with_otp(
     *,
     db: Session = Depends(get_db),
     request: ResetPasswordWithOTPRequest,
+    password_reset_service: PasswordResetService = Depends(get_password_reset_service),
 ) -> Any:
     """
     Reset password using OTP.
@@ -137,6 +140,7 @@ def reset_password(
     *,
     db: Session = Depends(get_db),
     request: ResetPasswordRequest,
+    password_reset_service: PasswordResetService = Depends(get_password_reset_service),
 ) -> Any:
     """
     Reset password using a valid reset token.
@@ -192,6 +196,7 @@ def validate_reset_token(
     *,
     db: Session = Depends(get_db),
     token: str = Query(..., description="Password reset token to validate"),
+    password_reset_service: PasswordResetService = Depends(get_password_reset_service),
 ) -> Any:
     """
     Validate a password reset token.
@@ -2,5 +2,6 @@
 from .user import User
 from .otp import OTPVerification
 from .password_reset import PasswordResetToken
+from .fraud_scan import FraudRescanMark, FraudScanJob
 
-__all__ = ["User", "OTPVerification", "PasswordResetToken"]
+__all__ = ["User", "OTPVerification", "PasswordResetToken", "FraudScanJob", "FraudRescanMark"]
@@ -0,0 +1,69 @@
+# app/modules/auth/models/fraud_scan.py
+from sqlalchemy import Boolean, Column, String, DateTime, ForeignKey, Integer, Text
+from sqlalchemy.sql import func
+import uuid
+
+from app.database.base_class import Base
+from app.database.types import PortableUUID
+
+
+class FraudScanJob(Base):
+    """A background fraud scan over all non-admin users, with its progress and resume checkpoint."""
+    __tablename__ = "fraud_scan_jobs"
+
+    id = Column(PortableUUID, primary_key=True, default=uuid.uuid4, index=True)
+    status = Column(String(20), nullable=False, default="queued", index=True)  # queued, running, completed, cancelled, interrupted, failed
+    mode = Column(String(20), nullable=False, default="full")  # full, incremental
+    auto_flag = Column(Boolean, default=True, nullable=False)
+    started_by = Column(PortableUUID, nullable=True)  # admin user id
+
+    # Progress
+    total = Column(Integer, default=0, nullable=False)
+    processed = Column(Integer, default=0, nullable=False)
+    flagged = Column(Integer, default=0, nullable=False)  # auto-flagged by this job
+    high_risk = Column(Integer, default=0, nullable=False)
+    # Every user with an id up to this one has been scored; a resumed job continues after it
+    checkpoint_user_id = Column(PortableUUID, nullable=True)
+    # Database time when the job started: the next incremental scan picks up changes from here
+    watermark = Column(DateTime(timezone=True), nullable=True)
+    # Incremental only: the watermark of the last completed scan it continues from
+    since = Column(DateTime(timezone=True), nullable=True)
+
+    cancel_requested = Column(Boolean, default=False, nullable=False)
+    error = Column(Text, nullable=True)
+    # Written after every chunk; a running job whose heartbeat is stale was interrupted
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<FraudScanJob(id={self.id}, status={self.status}, processed={self.processed}/{self.total})>"
+
+
+class FraudRescanMark(Base):
+    """A user whose fraud score may be stale; removed when a scan scores the user."""
+    __tablename__ = "fraud_rescan_marks"
+
+    id = Column(PortableUUID, primary_key=True, default=uuid.uuid4)
+    user_id = Column(PortableUUID, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    reason = Column(String(30), nullable=False)  # user, profile, shared_link, similar_text, watermark, new_user, signal_expiry
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<FraudRescanMark(user_id={self.user_id}, reason={self.reason})>"
+
+
+class FraudRescanKey(Base):
+    """A shared link or text bucket a profile added or dropped; ``collect`` marks the other profiles' owners."""
+    __tablename__ = "fraud_rescan_keys"
+
+    id = Column(PortableUUID, primary_key=True, default=uuid.uuid4)
+    reason = Column(String(30), nullable=False)  # shared_link (key: url_hash), similar_text (key: text bucket)
+    key = Column(String(64), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<FraudRescanKey(reason={self.reason}, key={self.key})>"
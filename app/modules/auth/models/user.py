@@ -30,11 +30,11 @@ class User(Base):
     fraud_notes = Column(Text, nullable=True)
     flagged_at = Column(DateTime(timezone=True), nullable=True)
     banned_at = Column(DateTime(timezone=True), nullable=True)
-    fraud_scanned_at = Column(DateTime(timezone=True), nullable=True)
+    fraud_scanned_at = Column(DateTime(timezone=True), nullable=True, index=True)
     
     # Timestamps (override base class if needed)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True)
     
     # Relationships
     password_reset_tokens = relationship("PasswordResetToken", back_populates="user", cascade="all, delete-orphan")
@@ -42,6 +42,9 @@ class FraudCandidateListResponse(BaseModel):
     flagged_count: int
     banned_count: int
     high_risk_count: int
+    page: int = 1
+    page_size: int = 50
+    next_cursor: Optional[str] = None
 
 
 class FraudScanResponse(BaseModel):
@@ -64,3 +67,23 @@ class FraudActionResponse(BaseModel):
     is_flagged: bool
     is_banned: bool
     is_active: bool
+
+
+class FraudScanJobResponse(BaseModel):
+    job_id: UUID
+    status: Literal["queued", "running", "completed", "cancelled", "interrupted", "failed"]
+    mode: Literal["full", "incremental"] = "full"
+    auto_flag: bool
+    total: int
+    processed: int
+    flagged: int
+    high_risk: int
+    percent: float
+    checkpoint_user_id: Optional[UUID] = None
+    since: Optional[datetime] = None  # incremental: changes after this watermark
+    cancel_requested: bool = False
+    error: Optional[str] = None
+    started_by: Optional[UUID] = None
+    heartbeat_at: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
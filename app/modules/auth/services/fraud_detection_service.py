@@ -2,10 +2,14 @@ from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
+from sqlalchemy import case
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
 
 from app.modules.auth.models.user import User
+from app.modules.proz import text_similarity, url_fingerprints
 from app.modules.proz.models.proz import ProzProfile
+from app.modules.proz.url_fingerprints import profile_urls
 from app.modules.proz.services.verification_helpers import evidences
 
 DISPOSABLE_DOMAINS = {
@@ -21,18 +25,26 @@ DISPOSABLE_DOMAINS = {
 SEVERITY_WEIGHTS = {"low": 10, "medium": 20, "high": 35, "critical": 50}
 AUTO_FLAG_THRESHOLD = 55
 HIGH_RISK_THRESHOLD = 40
+# Accounts younger than this with a long claimed career and little proof get "experience_inconsistency"
+NEW_ACCOUNT_DAYS = 14
+
+
+# Lowest score of each risk level, highest level first
+RISK_LEVEL_THRESHOLDS = (("critical", 70), ("high", HIGH_RISK_THRESHOLD), ("medium", 20), ("low", 0))
 
 
 def _risk_level(score: int) -> str:
-    if score >= 70:
-        return "critical"
-    if score >= HIGH_RISK_THRESHOLD:
-        return "high"
-    if score >= 20:
-        return "medium"
+    for level, threshold in RISK_LEVEL_THRESHOLDS:
+        if score >= threshold:
+            return level
     return "low"
 
 
+def risk_level_expr(score):
+    """``_risk_level`` as a SQL expression over a score column."""
+    return case(*[(score >= threshold, level) for level, threshold in RISK_LEVEL_THRESHOLDS[:-1]], else_="low")
+
+
 def _get_profile(db: Session, user: User) -> Optional[ProzProfile]:
     return (
         db.query(ProzProfile)
@@ -41,6 +53,23 @@ def _get_profile(db: Session, user: User) -> Optional[ProzProfile]:
     )
 
 
+def profiles_for_users(db: Session, users: List[User]) -> Dict[Any, Optional[ProzProfile]]:
+    """``{user id: profile}`` for a batch of users in one query, matched like ``_get_profile``.
+
+    A profile linked by ``user_id`` wins over one that only shares the email.
+    """
+    ids = [u.id for u in users]
+    emails = [u.email for u in users if u.email]
+    if not ids:
+        return {}
+    rows = db.query(ProzProfile).filter(ProzProfile.user_id.in_(ids) | ProzProfile.email.in_(emails)).all()
+    by_user = {p.user_id: p for p in rows if p.user_id is not None}
+    by_email = {}
+    for p in rows:
+        by_email.setdefault(p.email, p)
+    return {u.id: by_user.get(u.id) or by_email.get(u.email) for u in users}
+
+
 def _signal(code: str, severity: str, message: str) -> Dict[str, Any]:
     return {
         "code": code,
@@ -50,30 +79,19 @@ def _signal(code: str, severity: str, message: str) -> Dict[str, Any]:
     }
 
 
-def _duplicate_urls(db: Session, profile: ProzProfile, user_id: UUID) -> List[Dict[str, Any]]:
-    signals: List[Dict[str, Any]] = []
-    urls: set[str] = set()
-
-    for field in ("linkedin", "website"):
-        val = getattr(profile, field, None)
-        if val and val.startswith("http"):
-            urls.add(val.strip().lower())
-
-    for item in evidences(profile):
-        url = item.get("url")
-        if url and url.startswith("http"):
-            urls.add(url.strip().lower())
+def _duplicate_urls(db: Session, profile: ProzProfile, user_id: UUID,
+                    shared: Optional[Dict[str, int]] = None) -> List[Dict[str, Any]]:
+    """One signal per profile URL (any field, canonicalized) that other profiles also use.
 
+    ``shared`` is the profile's entry from ``url_fingerprints.duplicate_counts_many`` when a batch
+    scan looked it up already.
+    """
+    signals: List[Dict[str, Any]] = []
+    urls = profile_urls(profile)
+    if shared is None:
+        shared = url_fingerprints.duplicate_counts(db, profile.id, urls)
     for url in urls:
-        others = (
-            db.query(ProzProfile)
-            .filter(ProzProfile.id != profile.id)
-            .filter(
-                (ProzProfile.linkedin.ilike(f"%{url}%"))
-                | (ProzProfile.website.ilike(f"%{url}%"))
-            )
-            .count()
-        )
+        others = shared.get(url, 0)
         if others > 0:
             signals.append(
                 _signal(
@@ -85,13 +103,43 @@ def _duplicate_urls(db: Session, profile: ProzProfile, user_id: UUID) -> List[Di
     return signals
 
 
+TEXT_FIELD_LABELS = {"bio": "Bio", "certifications": "Certifications", "education": "Education"}
+
+
+def _near_duplicate_text(db: Session, profile: ProzProfile,
+                         similar: Optional[Dict[str, int]] = None) -> List[Dict[str, Any]]:
+    """One signal per text field (bio, certifications, education) nearly identical to other profiles' text.
+
+    ``similar`` is the profile's entry from ``text_similarity.near_duplicates_many`` when a batch scan
+    looked it up already.
+    """
+    if similar is None:
+        similar = text_similarity.near_duplicates(db, profile)
+    return [
+        _signal(
+            "near_duplicate_profile_text",
+            "high",
+            f"{TEXT_FIELD_LABELS.get(field, field)} text is nearly identical to {others} other candidate(s)",
+        )
+        for field, others in similar.items()
+    ]
+
+
 def scan_user(db: Session, user: User) -> Tuple[int, List[Dict[str, Any]]]:
     """Return fraud score and signal list for a user."""
+    if user.is_superuser:
+        return 0, []
+    return scan_user_with_profile(db, user, _get_profile(db, user))
+
+
+def scan_user_with_profile(db: Session, user: User, profile: Optional[ProzProfile],
+                           shared_urls: Optional[Dict[str, int]] = None,
+                           similar_texts: Optional[Dict[str, int]] = None) -> Tuple[int, List[Dict[str, Any]]]:
+    """``scan_user`` with the profile (and optionally its shared-URL and similar-text counts) loaded in a batch."""
     if user.is_superuser:
         return 0, []
 
     signals: List[Dict[str, Any]] = []
-    profile = _get_profile(db, user)
 
     domain = (user.email or "").split("@")[-1].lower()
     if domain in DISPOSABLE_DOMAINS:
@@ -136,7 +184,7 @@ def scan_user(db: Session, user: User) -> Tuple[int, List[Dict[str, Any]]]:
 
         if profile.years_experience and profile.years_experience > 15:
             account_age_days = (datetime.now(timezone.utc) - user.created_at.replace(tzinfo=timezone.utc)).days
-            if account_age_days < 14 and len(items) < 2:
+            if account_age_days < NEW_ACCOUNT_DAYS and len(items) < 2:
                 signals.append(
                     _signal(
                         "experience_inconsistency",
@@ -154,7 +202,8 @@ def scan_user(db: Session, user: User) -> Tuple[int, List[Dict[str, Any]]]:
                 )
             )
 
-        signals.extend(_duplicate_urls(db, profile, user.id))
+        signals.extend(_duplicate_urls(db, profile, user.id, shared_urls))
+        signals.extend(_near_duplicate_text(db, profile, similar_texts))
 
     if user.is_flagged:
         signals.append(_signal("manually_flagged", "medium", "Previously flagged by an administrator"))
@@ -165,23 +214,33 @@ def scan_user(db: Session, user: User) -> Tuple[int, List[Dict[str, Any]]]:
 
 def apply_scan_result(db: Session, user: User, auto_flag: bool = True) -> Tuple[int, List[Dict[str, Any]], bool]:
     score, signals = scan_user(db, user)
+    auto_flagged = record_scan_result(user, score, signals, auto_flag=auto_flag)
+    db.commit()
+    db.refresh(user)
+    return score, signals, auto_flagged
+
+
+def record_scan_result(user: User, score: int, signals: List[Dict[str, Any]], auto_flag: bool = True) -> bool:
+    """Store a scan on ``user`` without committing; returns whether it auto-flagged the user."""
     user.fraud_score = score
     user.fraud_signals = signals
-    user.fraud_scanned_at = datetime.now(timezone.utc)
+    # The same now() as the onupdate of updated_at, so the scan's own write is not a change to rescan
+    user.fraud_scanned_at = func.now()
 
     auto_flagged = False
     if auto_flag and score >= AUTO_FLAG_THRESHOLD and not user.is_banned and not user.is_superuser:
         user.is_flagged = True
         user.flagged_at = datetime.now(timezone.utc)
         auto_flagged = True
-
-    db.commit()
-    db.refresh(user)
-    return score, signals, auto_flagged
+    return auto_flagged
 
 
 def to_candidate_item(db: Session, user: User) -> Dict[str, Any]:
-    profile = _get_profile(db, user)
+    return candidate_item(user, _get_profile(db, user))
+
+
+def candidate_item(user: User, profile: Optional[ProzProfile]) -> Dict[str, Any]:
+    """``to_candidate_item`` with the profile already loaded (``profiles_for_users`` for a page)."""
     signals = user.fraud_signals if isinstance(user.fraud_signals, list) else []
     score = user.fraud_score or 0
     return {
@@ -0,0 +1,247 @@
+# app/modules/auth/services/fraud_rescan.py
+"""Which users an incremental fraud scan has to score again.
+
+``fraud_rescan_marks`` is the dirty set. Two things write to it:
+
+- write paths: the session hooks below mark a user when a flush changes a
+  field the scan reads, on the user or on their profile (evidence
+  included). The links and text buckets the profile adds or drops go to
+  ``fraud_rescan_keys``: the owners of other profiles sharing one have a
+  duplicate-link or near-duplicate-text signal that changes with it, but a
+  common bucket can have thousands, too many to look up in the writer's
+  transaction;
+- ``collect()``, at the start of an incremental scan, marks the owners of
+  profiles sharing a recorded key (and deletes the keys it read), users
+  never scanned, users and profiles whose ``updated_at`` is past both
+  the last completed scan's watermark and the user's ``fraud_scanned_at``
+  (writes that bypassed the ORM), and users whose new-account signal
+  expired since.
+
+A scan writes ``fraud_scanned_at`` with the same ``now()`` the row's
+``updated_at`` gets, so scoring a user is not itself a change. Each scan
+chunk reads the marks of its users before scoring them and deletes exactly
+those; a mark written meanwhile stays for the next scan.
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, List, Set
+
+from sqlalchemy import delete, distinct, event, func, insert, inspect, or_, select
+from sqlalchemy.orm import Session
+
+from app.modules.auth.models.fraud_scan import FraudRescanKey, FraudRescanMark
+from app.modules.auth.models.user import User
+from app.modules.auth.services.fraud_detection_service import NEW_ACCOUNT_DAYS
+from app.modules.proz import text_similarity, url_fingerprints
+from app.modules.proz.models.proz import ProfileTextBand, ProfileUrlFingerprint, ProzProfile
+
+# Fields scan_user_with_profile reads (is_banned decides whether it may auto-flag)
+USER_FIELDS = ("email", "is_superuser", "is_flagged", "is_banned")
+PROFILE_FIELDS = (
+    "user_id", "email", "verification_status", "skill_verification_status", "years_experience",
+) + text_similarity.TEXT_FIELDS + url_fingerprints.URL_FIELDS
+BATCH_SIZE = 500
+# CURRENT_TIMESTAMP has one-second resolution on some databases
+CLOCK_SLACK = timedelta(seconds=1)
+
+_MARKS = FraudRescanMark.__table__
+_KEYS = FraudRescanKey.__table__
+# reason -> the index column its keys are looked up in
+KEY_COLUMNS = {
+    "shared_link": ProfileUrlFingerprint.__table__.c.url_hash,
+    "similar_text": ProfileTextBand.__table__.c.bucket,
+}
+
+
+def _batches(items: List[Any], size: int = BATCH_SIZE) -> Iterable[List[Any]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def mark(connection, reasons: Dict[Any, str]) -> int:
+    """Write one mark per ``{user id: reason}``."""
+    rows = [{"user_id": user_id, "reason": reason} for user_id, reason in reasons.items()]
+    for batch in _batches(rows):
+        connection.execute(insert(_MARKS), batch)
+    return len(rows)
+
+
+def record_keys(connection, keys: Dict[str, Set[str]]) -> int:
+    """Write one row per ``{reason: keys}`` key, for ``collect`` to resolve to the users sharing it."""
+    rows = [{"reason": reason, "key": key} for reason, values in keys.items() for key in sorted(values)]
+    for batch in _batches(rows):
+        connection.execute(insert(_KEYS), batch)
+    return len(rows)
+
+
+def discard_keys(db: Session, before: datetime) -> None:
+    """Delete the keys recorded before ``before``: a full scan that started then has scored their users."""
+    db.execute(delete(FraudRescanKey).where(FraudRescanKey.created_at < before))
+
+
+def pending_marks(db: Session, user_ids: List[Any]) -> List[Any]:
+    """Ids of the marks on these users; read before scoring them, deleted with ``clear``."""
+    return list(db.scalars(select(FraudRescanMark.id).where(FraudRescanMark.user_id.in_(user_ids))))
+
+
+def clear(db: Session, mark_ids: List[Any]) -> None:
+    for batch in _batches(mark_ids):
+        db.execute(delete(FraudRescanMark).where(FraudRescanMark.id.in_(batch)))
+
+
+def _marked_users():
+    return (
+        select(distinct(FraudRescanMark.user_id))
+        .join(User, User.id == FraudRescanMark.user_id)
+        .where(User.is_superuser == False)  # noqa: E712
+    )
+
+
+def marked_count(db: Session) -> int:
+    return db.scalar(select(func.count()).select_from(_marked_users().subquery())) or 0
+
+
+def marked_page(db: Session, after: Any, limit: int) -> List[Any]:
+    """Next ``limit`` marked user ids after ``after``, in id order."""
+    query = _marked_users().order_by(FraudRescanMark.user_id).limit(limit)
+    if after is not None:
+        query = query.where(FraudRescanMark.user_id > after)
+    return list(db.scalars(query))
+
+
+def collect(db: Session, since: datetime, now: datetime) -> int:
+    """Mark users sharing a recorded key, and users changed after ``since`` the hooks may not have seen; returns users marked."""
+    since = since - CLOCK_SLACK
+    found: Dict[Any, str] = {}
+
+    def add(user_ids: Iterable[Any], reason: str) -> None:
+        for user_id in user_ids:
+            found.setdefault(user_id, reason)
+
+    # Keys written after this read stay for the next scan
+    key_rows = db.execute(select(FraudRescanKey.id, FraudRescanKey.reason, FraudRescanKey.key)).all()
+    for reason, column in KEY_COLUMNS.items():
+        keys = {row.key for row in key_rows if row.reason == reason}
+        if keys:
+            add(_sharers(db.connection(), column, keys), reason)
+    for batch in _batches([row.id for row in key_rows]):
+        db.execute(delete(FraudRescanKey).where(FraudRescanKey.id.in_(batch)))
+
+    scanned = User.is_superuser == False  # noqa: E712
+    add(db.scalars(select(User.id).where(scanned, User.fraud_scanned_at.is_(None))), "new_user")
+    add(db.scalars(
+        select(User.id).where(scanned, User.updated_at >= since, User.updated_at > User.fraud_scanned_at)
+    ), "watermark")
+
+    changed = db.execute(
+        select(ProzProfile.user_id, ProzProfile.email, ProzProfile.updated_at).where(ProzProfile.updated_at >= since)
+    ).all()
+    for batch in _batches(changed):
+        by_id = {p.user_id: p.updated_at for p in batch if p.user_id is not None}
+        by_email = {p.email: p.updated_at for p in batch}
+        users = db.execute(
+            select(User.id, User.email, User.fraud_scanned_at)
+            .where(scanned, or_(User.id.in_(list(by_id)), User.email.in_(list(by_email))))
+        )
+        add((u.id for u in users
+             if any(t is not None and u.fraud_scanned_at is not None and t > u.fraud_scanned_at
+                    for t in (by_id.get(u.id), by_email.get(u.email)))), "watermark")
+
+    # experience_inconsistency only applies while the account is new; it lapses without any write.
+    age = timedelta(days=NEW_ACCOUNT_DAYS)
+    aged = db.execute(
+        select(User.id, User.fraud_signals)
+        .where(scanned, User.created_at >= since - age, User.created_at <= now - age)
+    )
+    add((u.id for u in aged
+         if isinstance(u.fraud_signals, list)
+         and any(isinstance(s, dict) and s.get("code") == "experience_inconsistency" for s in u.fraud_signals)),
+        "signal_expiry")
+
+    return mark(db.connection(), found)
+
+
+def _changed(obj: Any, fields: Iterable[str]) -> bool:
+    attrs = inspect(obj).attrs
+    return any(attrs[field].history.has_changes() for field in fields)
+
+
+def _previous(obj: Any, field: str) -> Any:
+    history = inspect(obj).attrs[field].history
+    return history.deleted[0] if history.deleted else getattr(obj, field)
+
+
+def _owners(connection, user_ids: Set[Any], emails: Set[str]) -> Set[Any]:
+    if not user_ids and not emails:
+        return set()
+    return set(connection.execute(
+        select(User.id).where(User.is_superuser == False,  # noqa: E712
+                              or_(User.id.in_(list(user_ids)), User.email.in_(list(emails))))
+    ).scalars())
+
+
+def _sharers(connection, column, keys: Set[str]) -> Set[Any]:
+    """Users whose profiles have any of these URL fingerprints or text buckets (``column`` says which)."""
+    found: Set[Any] = set()
+    for batch in _batches(sorted(keys)):
+        profiles = select(column.table.c.proz_id).where(column.in_(batch))
+        found.update(connection.execute(
+            select(User.id)
+            .join(ProzProfile, or_(ProzProfile.user_id == User.id, ProzProfile.email == User.email))
+            .where(User.is_superuser == False, ProzProfile.id.in_(profiles))  # noqa: E712
+        ).scalars())
+    return found
+
+
+_SCANNED_KEY = "fraud_rescan_scanned"
+
+
+@event.listens_for(Session, "before_flush")
+def _note_scans(session: Session, flush_context, instances) -> None:
+    # A scan's own write (fraud_scanned_at, and is_flagged when it auto-flags) is not a change to rescan.
+    # Noted before the flush: fraud_scanned_at is a SQL expression, expired (no history) once flushed.
+    session.info[_SCANNED_KEY] = {
+        obj.id for obj in session.dirty if isinstance(obj, User) and _changed(obj, ("fraud_scanned_at",))
+    }
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_changed(session: Session, flush_context) -> None:
+    reasons: Dict[Any, str] = {}
+    owner_ids: Set[Any] = set()
+    owner_emails: Set[str] = set()
+    hashes: Set[str] = set()
+    buckets: Set[str] = set()
+
+    scanned = session.info.pop(_SCANNED_KEY, set())
+    for obj in session.dirty:
+        if isinstance(obj, User) and not obj.is_superuser and obj.id not in scanned and _changed(obj, USER_FIELDS):
+            reasons[obj.id] = "user"
+
+    new, deleted = set(session.new), set(session.deleted)
+    for obj in new | deleted | set(session.dirty):
+        if not isinstance(obj, ProzProfile):
+            continue
+        whole = obj in new or obj in deleted
+        if not whole and not _changed(obj, PROFILE_FIELDS):
+            continue
+        for field, values in (("user_id", owner_ids), ("email", owner_emails)):
+            values.update(v for v in (getattr(obj, field), _previous(obj, field)) if v is not None)
+        if whole or _changed(obj, url_fingerprints.URL_FIELDS):
+            before = SimpleNamespace(**{field: _previous(obj, field) for field in url_fingerprints.URL_FIELDS})
+            for urls in (url_fingerprints.profile_urls(obj), url_fingerprints.profile_urls(before)):
+                hashes.update(url_fingerprints.url_hash(url) for url in urls)
+        if whole or _changed(obj, text_similarity.TEXT_FIELDS):
+            before = SimpleNamespace(**{field: _previous(obj, field) for field in text_similarity.TEXT_FIELDS})
+            buckets.update(text_similarity.text_buckets(obj) | text_similarity.text_buckets(before))
+
+    connection = session.connection() if (owner_ids or owner_emails) else None
+    if connection is not None:
+        for user_id in _owners(connection, owner_ids, owner_emails):
+            reasons.setdefault(user_id, "profile")
+        keys = {reason: values for reason, values in (("shared_link", hashes), ("similar_text", buckets)) if values}
+        if keys:
+            record_keys(connection, keys)
+    if reasons:
+        mark(connection or session.connection(), reasons)
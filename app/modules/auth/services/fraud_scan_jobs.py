@@ -0,0 +1,368 @@
+# app/modules/auth/services/fraud_scan_jobs.py
+"""Background fraud scans over every non-admin user, in chunks, with progress, cancel and resume.
+
+A scan used to run inside the ``POST /admin/fraud/scan`` request: every user
+loaded with ``.all()``, then one profile query and one commit per user.
+``FraudScanJobManager.start`` now records a ``FraudScanJob`` row and returns
+at once. A driver thread pages through user ids in id order (keyset pages,
+so no cursor or read transaction stays open) and hands
+``FRAUD_SCAN_CHUNK_SIZE`` of them at a time to ``FRAUD_SCAN_WORKERS``
+threads. Each chunk loads its users and their profiles in one query each,
+looks up shared profile URLs and near-duplicate profile text in batched
+queries, scores every user and commits once.
+
+Chunks finish out of order, so the job's checkpoint only moves past a chunk
+when every chunk before it is done. It is written after each chunk together
+with the counters and a heartbeat. Cancelling (from any worker process,
+through the row), shutting down or failing leaves the checkpoint in place.
+``resume`` continues after it; users past the checkpoint that were already
+scored are scored again, which is harmless. A job whose heartbeat is older
+than ``FRAUD_SCAN_STALE_SECONDS`` lost its process and can be resumed too.
+
+An incremental job (``start(..., incremental=True)``) scores only the users
+in the dirty set kept by ``fraud_rescan``: it first marks what changed since
+the last completed scan's watermark, then pages through the marked users
+instead of all of them. Every job records the database time it started as
+its own watermark, and every chunk deletes the marks of the users it scored.
+"""
+
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.config.settings import settings
+from app.database.session import SessionLocal
+from app.modules.auth.models.fraud_scan import FraudScanJob
+from app.modules.auth.models.user import User
+from app.modules.auth.services import fraud_rescan
+from app.modules.auth.services.fraud_detection_service import (
+    AUTO_FLAG_THRESHOLD,
+    profiles_for_users,
+    record_scan_result,
+    scan_user_with_profile,
+)
+from app.modules.proz import text_similarity, url_fingerprints
+
+logger = logging.getLogger(__name__)
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_COMPLETED = "completed"
+STATUS_CANCELLED = "cancelled"
+STATUS_INTERRUPTED = "interrupted"
+STATUS_FAILED = "failed"
+MODE_FULL = "full"
+MODE_INCREMENTAL = "incremental"
+RESUMABLE_STATUSES = (STATUS_CANCELLED, STATUS_INTERRUPTED, STATUS_FAILED)
+
+
+class ScanJobConflict(Exception):
+    """Another scan is active, or the job is not in a state that allows the action."""
+
+    def __init__(self, message: str, job: Optional[FraudScanJob] = None):
+        super().__init__(message)
+        self.job = job
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _aware(value: Optional[datetime]) -> Optional[datetime]:
+    # SQLite hands back naive datetimes; they were written as UTC.
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def is_stale(job: FraudScanJob) -> bool:
+    """A running job whose process stopped writing heartbeats."""
+    heartbeat = _aware(job.heartbeat_at)
+    return (
+        job.status == STATUS_RUNNING
+        and (heartbeat is None or _now() - heartbeat > timedelta(seconds=settings.FRAUD_SCAN_STALE_SECONDS))
+    )
+
+
+def job_to_dict(job: FraudScanJob) -> Dict[str, Any]:
+    return {
+        "job_id": job.id,
+        "status": STATUS_INTERRUPTED if is_stale(job) else job.status,
+        "mode": job.mode,
+        "since": job.since,
+        "auto_flag": job.auto_flag,
+        "total": job.total,
+        "processed": job.processed,
+        "flagged": job.flagged,
+        "high_risk": job.high_risk,
+        "percent": round(100.0 * job.processed / job.total, 1) if job.total else (100.0 if job.status == STATUS_COMPLETED else 0.0),
+        "checkpoint_user_id": job.checkpoint_user_id,
+        "cancel_requested": job.cancel_requested,
+        "error": job.error,
+        "started_by": job.started_by,
+        "heartbeat_at": job.heartbeat_at,
+        "created_at": job.created_at,
+        "finished_at": job.finished_at,
+    }
+
+
+class FraudScanJobManager:
+    def __init__(self, session_factory: Optional[Callable[[], Session]] = None,
+                 chunk_size: Optional[int] = None, workers: Optional[int] = None):
+        self._session_factory = session_factory or SessionLocal
+        self.chunk_size = chunk_size or settings.FRAUD_SCAN_CHUNK_SIZE
+        self.workers = workers or settings.FRAUD_SCAN_WORKERS
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._drivers: Dict[str, threading.Thread] = {}
+        self._stopping = threading.Event()
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="fraud-scan")
+            return self._executor
+
+    # -- job control ----------------------------------------------------------
+
+    @staticmethod
+    def active_job(db: Session) -> Optional[FraudScanJob]:
+        jobs = db.query(FraudScanJob).filter(FraudScanJob.status.in_((STATUS_QUEUED, STATUS_RUNNING))).all()
+        return next((job for job in jobs if not is_stale(job)), None)
+
+    @staticmethod
+    def last_watermark(db: Session) -> Optional[datetime]:
+        """Where the next incremental scan starts: the watermark of the latest completed scan."""
+        return db.query(func.max(FraudScanJob.watermark)).filter(FraudScanJob.status == STATUS_COMPLETED).scalar()
+
+    def start(self, db: Session, auto_flag: bool = True, started_by: Any = None,
+              incremental: bool = False) -> FraudScanJob:
+        """Create a job for every non-admin user, or only the changed ones, and run it in the background.
+
+        An incremental scan with no completed scan before it runs as a full one.
+        """
+        active = self.active_job(db)
+        if active is not None:
+            raise ScanJobConflict("A fraud scan is already running", active)
+        since = self.last_watermark(db) if incremental else None
+        mode = MODE_INCREMENTAL if since is not None else MODE_FULL
+        total = 0
+        if mode == MODE_FULL:
+            total = db.query(func.count(User.id)).filter(User.is_superuser == False).scalar() or 0  # noqa: E712
+        job = FraudScanJob(status=STATUS_QUEUED, mode=mode, auto_flag=auto_flag, started_by=started_by, total=total,
+                           processed=0, flagged=0, high_risk=0, cancel_requested=False, heartbeat_at=_now(),
+                           watermark=db.scalar(select(func.now())), since=since)
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        self._launch(db, job)
+        return job
+
+    def resume(self, db: Session, job_id: Any) -> FraudScanJob:
+        """Continue a cancelled, interrupted or failed job from its checkpoint."""
+        job = db.get(FraudScanJob, job_id)
+        if job is None:
+            raise LookupError("Scan job not found")
+        if job.status not in RESUMABLE_STATUSES and not is_stale(job):
+            raise ScanJobConflict(f"Scan job is {job.status}", job)
+        active = self.active_job(db)
+        if active is not None and str(active.id) != str(job.id):
+            raise ScanJobConflict("A fraud scan is already running", active)
+        self._launch(db, job)
+        db.refresh(job)
+        return job
+
+    def cancel(self, db: Session, job_id: Any) -> FraudScanJob:
+        """Ask the job to stop after the chunks in flight; seen by whichever process runs it."""
+        job = db.get(FraudScanJob, job_id)
+        if job is None:
+            raise LookupError("Scan job not found")
+        if job.status in (STATUS_QUEUED, STATUS_RUNNING):
+            job.cancel_requested = True
+            if is_stale(job):
+                # Nobody is running it any more.
+                job.status = STATUS_CANCELLED
+                job.finished_at = _now()
+            db.commit()
+            db.refresh(job)
+        return job
+
+    def _launch(self, db: Session, job: FraudScanJob) -> None:
+        # Claim the row so two processes never drive the same job.
+        stale_before = _now() - timedelta(seconds=settings.FRAUD_SCAN_STALE_SECONDS)
+        claimed = db.execute(
+            update(FraudScanJob)
+            .where(
+                FraudScanJob.id == job.id,
+                or_(
+                    FraudScanJob.status.in_((STATUS_QUEUED,) + RESUMABLE_STATUSES),
+                    and_(FraudScanJob.status == STATUS_RUNNING,
+                         or_(FraudScanJob.heartbeat_at.is_(None), FraudScanJob.heartbeat_at < stale_before)),
+                ),
+            )
+            .values(status=STATUS_RUNNING, heartbeat_at=_now(), cancel_requested=False, error=None, finished_at=None)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        if not claimed:
+            raise ScanJobConflict("Scan job was claimed by another worker", job)
+        job_id = str(job.id)
+        thread = threading.Thread(target=self._drive, args=(job.id,), name=f"fraud-scan-{job_id[:8]}", daemon=True)
+        with self._lock:
+            self._drivers[job_id] = thread
+        thread.start()
+
+    # -- scanning -------------------------------------------------------------
+
+    def _scan_chunk(self, user_ids: List[Any], auto_flag: bool) -> Tuple[int, int, int]:
+        """Score one chunk in its own session and commit it; returns (processed, flagged, high_risk)."""
+        db = self._session_factory()
+        try:
+            mark_ids = fraud_rescan.pending_marks(db, user_ids)
+            users = db.query(User).filter(User.id.in_(user_ids), User.is_superuser == False).all()  # noqa: E712
+            profiles = profiles_for_users(db, users)
+            shared = url_fingerprints.duplicate_counts_many(db, {
+                p.id: url_fingerprints.profile_urls(p) for p in profiles.values() if p is not None
+            })
+            similar = text_similarity.near_duplicates_many(db, [p for p in profiles.values() if p is not None])
+            flagged = high_risk = 0
+            for user in users:
+                profile = profiles.get(user.id)
+                score, signals = scan_user_with_profile(
+                    db, user, profile,
+                    shared.get(profile.id) if profile else None,
+                    similar.get(profile.id) if profile else None,
+                )
+                flagged += record_scan_result(user, score, signals, auto_flag=auto_flag)
+                high_risk += score >= AUTO_FLAG_THRESHOLD
+            fraud_rescan.clear(db, mark_ids)
+            db.commit()
+            return len(users), flagged, high_risk
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _drive(self, job_id: Any) -> None:
+        state = self._session_factory()
+        job = state.get(FraudScanJob, job_id)
+        window: Deque[Tuple[Any, Future]] = deque()
+        outcome, error = STATUS_COMPLETED, None
+
+        def settle(block: bool) -> None:
+            # Move the checkpoint over finished chunks at the head of the window, in id order.
+            nonlocal outcome, error
+            while window and (block or window[0][1].done()):
+                last_id, future = window.popleft()
+                try:
+                    processed, flagged, high_risk = future.result()
+                except Exception as e:
+                    logger.exception(f"Fraud scan {job_id} chunk ending at {last_id} failed")
+                    outcome, error = STATUS_FAILED, str(e)
+                    # Later chunks may finish, but the checkpoint must not pass this one.
+                    for _, rest in window:
+                        rest.cancel()
+                    window.clear()
+                    return
+                job.processed += processed
+                job.flagged += flagged
+                job.high_risk += high_risk
+                job.checkpoint_user_id = last_id
+                job.heartbeat_at = _now()
+                state.commit()
+
+        incremental = job.mode == MODE_INCREMENTAL
+        try:
+            last_id = job.checkpoint_user_id
+            if incremental and last_id is None:
+                marked = fraud_rescan.collect(state, job.since, job.watermark)
+                job.total = fraud_rescan.marked_count(state)
+                state.commit()
+                logger.info(f"Fraud scan {job_id}: {marked} users changed since {job.since}, {job.total} to rescan")
+            logger.info(f"Fraud scan {job_id} ({job.mode}) running from {last_id or 'the start'}")
+            while outcome == STATUS_COMPLETED:
+                if self._stopping.is_set():
+                    outcome = STATUS_INTERRUPTED
+                    break
+                state.refresh(job, ["cancel_requested"])
+                if job.cancel_requested:
+                    outcome = STATUS_CANCELLED
+                    break
+                if incremental:
+                    chunk = fraud_rescan.marked_page(state, last_id, self.chunk_size)
+                else:
+                    query = select(User.id).where(User.is_superuser == False).order_by(User.id).limit(self.chunk_size)  # noqa: E712
+                    if last_id is not None:
+                        query = query.where(User.id > last_id)
+                    chunk = list(state.execute(query).scalars())
+                # Short read transactions only: the workers are committing meanwhile.
+                state.commit()
+                if not chunk:
+                    break
+                last_id = chunk[-1]
+                window.append((last_id, self._pool().submit(self._scan_chunk, chunk, job.auto_flag)))
+                # Bounded read-ahead: at most two chunks per worker in flight.
+                while len(window) >= 2 * self.workers:
+                    window[0][1].exception()  # waits for the oldest chunk
+                    settle(block=False)
+                settle(block=False)
+            settle(block=True)
+        except Exception as e:
+            logger.exception(f"Fraud scan {job_id} failed")
+            outcome, error = STATUS_FAILED, str(e)
+            try:
+                settle(block=True)
+            except Exception:
+                state.rollback()
+        finally:
+            try:
+                job.status = outcome
+                job.error = error
+                job.heartbeat_at = _now()
+                if outcome in (STATUS_COMPLETED, STATUS_CANCELLED, STATUS_FAILED):
+                    job.finished_at = _now()
+                if outcome == STATUS_COMPLETED and not incremental:
+                    # Everyone was scored after these were recorded
+                    fraud_rescan.discard_keys(state, job.watermark)
+                state.commit()
+                logger.info(f"Fraud scan {job_id} {outcome}: {job.processed}/{job.total} users, {job.flagged} auto-flagged")
+            finally:
+                state.close()
+                with self._lock:
+                    self._drivers.pop(str(job_id), None)
+
+    # -- lifecycle ------------------------------------------------------------
+
+    def running(self) -> List[str]:
+        with self._lock:
+            return [job_id for job_id, thread in self._drivers.items() if thread.is_alive()]
+
+    def wait(self, job_id: Any, timeout: Optional[float] = None) -> None:
+        """Block until this process's driver for ``job_id`` exits (scripts and benchmarks)."""
+        with self._lock:
+            thread = self._drivers.get(str(job_id))
+        if thread is not None:
+            thread.join(timeout)
+
+    def shutdown(self, timeout: float = 30.0) -> None:
+        """Stop drivers after their chunks in flight; their jobs are left ``interrupted`` and resumable."""
+        self._stopping.set()
+        with self._lock:
+            threads = list(self._drivers.values())
+        for thread in threads:
+            thread.join(timeout)
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        self._stopping.clear()
+
+
+fraud_scan_jobs = FraudScanJobManager()
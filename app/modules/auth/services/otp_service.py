@@ -1,5 +1,5 @@
 # app/modules/auth/services/otp_service.py
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from sqlalchemy.orm import Session
 import random
 import string
@@ -15,11 +15,11 @@ logger = logging.getLogger(__name__)
 class OTPService:
     """OTP service for phone and email verification"""
     
-    def __init__(self):
+    def __init__(self, email_service: Optional[EmailService] = None):
         # In-memory storage for development (use Redis/database in production)
         self.otp_storage = {}
         self.password_reset_otp_repo = PasswordResetOTPRepository()
-        self.email_service = EmailService()
+        self.email_service = email_service or EmailService()
         
     def get_service_status(self) -> Dict[str, Any]:
         """Get OTP service status"""
@@ -159,19 +159,16 @@ class OTPService:
             # Create email content
             subject, html_body, text_body = self._create_password_reset_otp_email(email, otp_obj.otp_code)
             
-            # If Mailtrap or SMTP is configured, send email; otherwise log in dev mode
-            if self.email_service.mailtrap_api_key:
-                self.email_service._send_mailtrap_email(
+            # If Mailtrap or SMTP is configured, queue the email; otherwise log in dev mode
+            if not self.email_service.development_mode:
+                self.email_service.send_email(
                     to_email=email,
-                    to_name=email,
                     subject=subject,
-                    text_body=text_body,
                     html_body=html_body,
+                    text_body=text_body,
+                    to_name=email,
                 )
                 message = "Password reset OTP sent successfully"
-            elif self.email_service.smtp_configured and not self.email_service.development_mode:
-                self.email_service._send_smtp_email(email, subject, html_body, text_body)
-                message = "Password reset OTP sent successfully"
             else:
                 # Development fallback
                 logger.info(f"🔐 DEVELOPMENT MODE - Password reset OTP for {email}: {otp_obj.otp_code}")
@@ -18,11 +18,11 @@ logger = logging.getLogger(__name__)
 
 
 class PasswordResetService:
-    def __init__(self):
+    def __init__(self, otp_service: Optional[OTPService] = None, email_service: Optional[EmailService] = None):
         self.user_repository = UserRepository()
         self.password_reset_repository = PasswordResetRepository()
-        self.otp_service = OTPService()
-        self.email_service = EmailService()
+        self.email_service = email_service or EmailService()
+        self.otp_service = otp_service or OTPService(self.email_service)
     
     def _create_reset_email(self, email: str, token: str, user_name: str = None) -> tuple:
         """Create password reset email content"""
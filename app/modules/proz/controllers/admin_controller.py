@@ -1,17 +1,27 @@
 # app/modules/proz/controllers/admin_controller.py
 from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks, UploadFile, File
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_, desc
-from datetime import datetime, timedelta
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import func, or_, desc
+from datetime import datetime
+import logging
 import math
+import zipfile
 
+from app.core.pagination import apply_keyset, count_cache, order_by_clauses, split_page
 from app.database.session import get_db
 from app.modules.auth.services.auth_service import auth_service, get_current_user, get_current_superuser
 from app.modules.auth.models.user import User
-from app.modules.proz.models.proz import ProzProfile, Specialty, ProzSpecialty, Review
-from app.modules.proz.services.proz_service import resolve_profile_by_identifier
-from app.services.notification_service import NotificationService
+from app.modules.proz.models.proz import ProzProfile, ProzSpecialty, Review
+from app.modules.proz.repositories.proz_repository import SpecialtyRepository
+from app.modules.proz.services import platform_stats
+from app.modules.proz.services.proz_service import profile_columns, resolve_profile_by_identifier
+from app.services.mail_queue import mail_queue
+from app.core.container import container, get_ai_profile_service
+from app.services import stats_service
+from app.services.ai_profile_service import AIProfileService
+from app.services.resume_ingest import ResumeIngestor
 from app.modules.proz.schemas.admin import (
     ProfileVerificationRequest,
     ProfileVerificationResponse,
@@ -26,9 +36,27 @@ from app.modules.proz.schemas.admin import (
 )
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 # auth_service = AuthService()  # Using global instance
 
 
+def _verification_stats(stats: dict) -> VerificationStatsAdmin:
+    """Map a ``stats_service.profile_stats`` row onto the admin stats schema."""
+    return VerificationStatsAdmin(
+        total_profiles=stats["total_profiles"],
+        pending_verification=stats["pending_profiles"],
+        verified_profiles=stats["verified_profiles"],
+        rejected_profiles=stats["rejected_profiles"],
+        profiles_this_week=stats["profiles_this_week"],
+        verifications_this_week=stats["verifications_this_week"],
+        avg_verification_time_hours=24.0,  # Placeholder - would need verification history table
+        pending_oldest_date=stats["pending_oldest_date"],
+        pending_skill_reviews=stats["pending_skill_reviews"],
+        verified_skills=stats["verified_skills"],
+        rejected_skills=stats["rejected_skills"],
+    )
+
+
 @router.get("/dashboard", response_model=AdminDashboardResponse)
 async def get_admin_dashboard(
     db: Session = Depends(get_db),
@@ -38,64 +66,7 @@ async def get_admin_dashboard(
     Get admin dashboard overview with verification statistics.
     """
     # Calculate stats
-    total_profiles = db.query(ProzProfile).count()
-    pending_verification = db.query(ProzProfile).filter(
-        ProzProfile.verification_status == "pending"
-    ).count()
-    verified_profiles = db.query(ProzProfile).filter(
-        ProzProfile.verification_status == "verified"
-    ).count()
-    rejected_profiles = db.query(ProzProfile).filter(
-        ProzProfile.verification_status == "rejected"
-    ).count()
-    
-    # Profiles created this week
-    week_ago = datetime.utcnow() - timedelta(days=7)
-    profiles_this_week = db.query(ProzProfile).filter(
-        ProzProfile.created_at >= week_ago
-    ).count()
-    
-    # Verifications this week (profiles that changed from pending to verified/rejected)
-    verifications_this_week = db.query(ProzProfile).filter(
-        and_(
-            ProzProfile.updated_at >= week_ago,
-            ProzProfile.verification_status.in_(["verified", "rejected"])
-        )
-    ).count()
-    
-    # Average verification time (simplified - could be enhanced with history tracking)
-    avg_verification_time_hours = 24.0  # Placeholder - would need verification history table
-    
-    # Oldest pending profile
-    oldest_pending = db.query(ProzProfile).filter(
-        ProzProfile.verification_status == "pending"
-    ).order_by(ProzProfile.created_at.asc()).first()
-    
-    pending_oldest_date = oldest_pending.created_at if oldest_pending else None
-
-    pending_skill_reviews = db.query(ProzProfile).filter(
-        ProzProfile.skill_verification_status == "pending_review"
-    ).count()
-    verified_skills = db.query(ProzProfile).filter(
-        ProzProfile.skill_verification_status == "verified"
-    ).count()
-    rejected_skills = db.query(ProzProfile).filter(
-        ProzProfile.skill_verification_status.in_(["rejected", "needs_revision"])
-    ).count()
-    
-    stats = VerificationStatsAdmin(
-        total_profiles=total_profiles,
-        pending_verification=pending_verification,
-        verified_profiles=verified_profiles,
-        rejected_profiles=rejected_profiles,
-        profiles_this_week=profiles_this_week,
-        verifications_this_week=verifications_this_week,
-        avg_verification_time_hours=avg_verification_time_hours,
-        pending_oldest_date=pending_oldest_date,
-        pending_skill_reviews=pending_skill_reviews,
-        verified_skills=verified_skills,
-        rejected_skills=rejected_skills,
-    )
+    stats = _verification_stats(stats_service.profile_stats(db))
     
     # Recent submissions (last 10 profiles)
     recent_submissions = db.query(ProzProfile).order_by(
@@ -126,6 +97,7 @@ async def get_profiles_for_verification(
     search: Optional[str] = Query(None, description="Search in name, email"),
     sort_by: str = Query("created_at", description="Sort by: created_at, updated_at, verification_status"),
     sort_order: str = Query("desc", description="Sort order: asc, desc"),
+    cursor: Optional[str] = Query(None, description="Keyset pagination: pass empty for the first page, then next_cursor"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_superuser)
 ) -> Any:
@@ -149,17 +121,25 @@ async def get_profiles_for_verification(
     
     # Apply sorting
     sort_column = getattr(ProzProfile, sort_by, ProzProfile.created_at)
-    if sort_order.lower() == "desc":
-        query_obj = query_obj.order_by(sort_column.desc())
+    descending = sort_order.lower() == "desc"
+    order = [(sort_column, descending), (ProzProfile.id, descending)]
+
+    next_page_cursor = None
+    if cursor is None:
+        # Get total count
+        total_count = query_obj.count()
+
+        # Apply pagination
+        offset = (page - 1) * page_size
+        profiles = query_obj.order_by(*order_by_clauses(order)).offset(offset).limit(page_size).all()
     else:
-        query_obj = query_obj.order_by(sort_column.asc())
-    
-    # Get total count
-    total_count = query_obj.count()
-    
-    # Apply pagination
-    offset = (page - 1) * page_size
-    profiles = query_obj.offset(offset).limit(page_size).all()
+        total_count = count_cache.get_or_compute(
+            ("admin_profiles", verification_status, search), query_obj.count
+        )
+        rows = apply_keyset(query_obj, order, cursor).limit(page_size + 1).all()
+        profiles, next_page_cursor = split_page(
+            rows, page_size, key=lambda p: [getattr(p, sort_column.key), p.id]
+        )
     
     # Calculate pagination info
     total_pages = math.ceil(total_count / page_size)
@@ -169,7 +149,8 @@ async def get_profiles_for_verification(
         "total_count": total_count,
         "page": page,
         "page_size": page_size,
-        "total_pages": total_pages
+        "total_pages": total_pages,
+        "next_cursor": next_page_cursor
     }
 
 
@@ -191,13 +172,11 @@ async def get_profile_for_verification(
         )
 
     # Get specialties
-    specialties = db.query(Specialty.name).join(ProzSpecialty).filter(
-        ProzSpecialty.proz_id == profile.id
-    ).all()
+    specialties = SpecialtyRepository().get_names_by_profile_ids(db, [profile.id])
 
     # Build detailed response
-    profile_data = AdminProfileDetailResponse.model_validate(profile)
-    profile_data.specialties = [s.name for s in specialties]
+    profile_data = AdminProfileDetailResponse.model_validate(profile_columns(profile))
+    profile_data.specialties = specialties.get(str(profile.id), [])
     profile_data.verification_history = []  # Would come from history table
     
     return profile_data
@@ -224,6 +203,7 @@ async def verify_profile(
     
     old_status = profile.verification_status
     new_status = request.verification_status.value
+    stats_before = platform_stats.profile_state(profile)
     
     # Update profile
     profile.verification_status = new_status
@@ -242,6 +222,7 @@ async def verify_profile(
     
     db.commit()
     db.refresh(profile)
+    platform_stats.record_profile_change(stats_before, platform_stats.profile_state(profile))
     
     # Send notification email to user about verification status change
     # Use profile email directly since user relationship might not be loaded
@@ -282,6 +263,8 @@ async def bulk_verify_profiles(
     """
     updated_count = 0
     failed_updates = []
+    stats_changes = []
+    notifications = []
     
     for profile_id in request.profile_ids:
         try:
@@ -289,22 +272,18 @@ async def bulk_verify_profiles(
             
             if profile:
                 old_status = profile.verification_status
+                stats_before = platform_stats.profile_state(profile)
+                stats_changes.append(
+                    (stats_before, stats_before._replace(verification_status=request.verification_status.value))
+                )
                 profile.verification_status = request.verification_status.value
                 profile.updated_at = datetime.utcnow()
                 updated_count += 1
                 
-                # Queue email notification per profile update (no admin notes/rejection reason in bulk)
+                # Email notification per profile update (no admin notes/rejection reason in bulk)
                 user_email = profile.email
                 user_name = f"{profile.first_name} {profile.last_name}".strip() or "Professional"
-                background_tasks.add_task(
-                    send_verification_notification,
-                    user_email,
-                    user_name,
-                    request.verification_status.value,
-                    old_status,
-                    None,
-                    None
-                )
+                notifications.append((user_email, user_name, request.verification_status.value, old_status))
             else:
                 failed_updates.append({
                     "profile_id": str(profile_id),
@@ -317,6 +296,10 @@ async def bulk_verify_profiles(
             })
     
     db.commit()
+    for stats_before, stats_after in stats_changes:
+        platform_stats.record_profile_change(stats_before, stats_after)
+    if notifications:
+        background_tasks.add_task(send_bulk_verification_notifications, notifications)
     
     summary = {
         "total_requested": len(request.profile_ids),
@@ -334,6 +317,35 @@ async def bulk_verify_profiles(
     )
 
 
+@router.post("/profiles/bulk-import", response_model=dict)
+async def bulk_import_resumes(
+    file: UploadFile = File(..., description="Zip archive of resume PDFs"),
+    current_user: User = Depends(get_current_superuser),
+    ai: AIProfileService = Depends(get_ai_profile_service),
+) -> Any:
+    """
+    Create draft profiles from a zip of resume PDFs.
+
+    Each PDF is parsed like /proz/ai/parse-resume; profiles are matched by the
+    email found in the resume. Existing profiles only get empty fields filled.
+    Returns a per-file report and a throughput summary.
+    """
+    if not zipfile.is_zipfile(file.file):
+        raise HTTPException(status_code=400, detail="Upload a .zip archive of PDF resumes")
+    file.file.seek(0)
+
+    report = await run_in_threadpool(ResumeIngestor(ai).ingest_zip, file.file)
+    summary = report.summary()
+    if not summary["pdfs"]:
+        raise HTTPException(status_code=400, detail="Archive contains no PDF resumes")
+    logger.info(f"Bulk resume import by {current_user.email}: {summary}")
+    return {
+        "success": summary["failed"] < summary["files"],
+        "message": f"Imported {summary['files']} files: {summary['created']} created, {summary['updated']} updated.",
+        **report.to_dict(),
+    }
+
+
 @router.post("/profiles/{profile_id}/feature", response_model=dict)
 async def toggle_profile_featured(
     profile_id: str,
@@ -359,9 +371,10 @@ async def toggle_profile_featured(
             detail="Only verified profiles can be featured"
         )
     
-    profile.is_featured = featured
-    profile.updated_at = datetime.utcnow()
-    db.commit()
+    with platform_stats.track(profile):
+        profile.is_featured = featured
+        profile.updated_at = datetime.utcnow()
+        db.commit()
     db.refresh(profile)
     
     return {
@@ -380,44 +393,7 @@ async def get_verification_stats(
     """
     Get detailed verification statistics for admin dashboard.
     """
-    total_profiles = db.query(ProzProfile).count()
-    pending_verification = db.query(ProzProfile).filter(
-        ProzProfile.verification_status == "pending"
-    ).count()
-    verified_profiles = db.query(ProzProfile).filter(
-        ProzProfile.verification_status == "verified"
-    ).count()
-    rejected_profiles = db.query(ProzProfile).filter(
-        ProzProfile.verification_status == "rejected"
-    ).count()
-    
-    # This week stats
-    week_ago = datetime.utcnow() - timedelta(days=7)
-    profiles_this_week = db.query(ProzProfile).filter(
-        ProzProfile.created_at >= week_ago
-    ).count()
-    verifications_this_week = db.query(ProzProfile).filter(
-        and_(
-            ProzProfile.updated_at >= week_ago,
-            ProzProfile.verification_status.in_(["verified", "rejected"])
-        )
-    ).count()
-    
-    # Oldest pending profile
-    oldest_pending = db.query(ProzProfile).filter(
-        ProzProfile.verification_status == "pending"
-    ).order_by(ProzProfile.created_at.asc()).first()
-    
-    return VerificationStatsAdmin(
-        total_profiles=total_profiles,
-        pending_verification=pending_verification,
-        verified_profiles=verified_profiles,
-        rejected_profiles=rejected_profiles,
-        profiles_this_week=profiles_this_week,
-        verifications_this_week=verifications_this_week,
-        avg_verification_time_hours=24.0,  # Placeholder
-        pending_oldest_date=oldest_pending.created_at if oldest_pending else None
-    )
+    return _verification_stats(stats_service.profile_stats(db))
 
 
 @router.delete("/profiles/{profile_id}", response_model=dict)
@@ -453,8 +429,9 @@ async def delete_profile(
     db.query(Review).filter(Review.proz_id == profile.id).delete()
     
     # Delete the profile
-    db.delete(profile)
-    db.commit()
+    with platform_stats.track(profile):
+        db.delete(profile)
+        db.commit()
     
     return {
         "success": True,
@@ -475,7 +452,7 @@ def send_verification_notification(
     Send verification status change notification to user.
     """
     try:
-        notification_service = NotificationService()
+        notification_service = container.notification_service
         
         if new_status == "verified":
             notification_service.send_profile_verification_notification(
@@ -506,4 +483,13 @@ def send_verification_notification(
         print(f"✅ Profile verification email sent to {user_email}")
         
     except Exception as e:
-        print(f"❌ Failed to send verification email to {user_email}: {str(e)}")
\ No newline at end of file
+        print(f"❌ Failed to send verification email to {user_email}: {str(e)}")
+
+
+def send_bulk_verification_notifications(notifications: List[tuple]):
+    """
+    Send (email, name, new_status, old_status) notifications as one mail batch over a single connection.
+    """
+    with mail_queue.batch():
+        for user_email, user_name, new_status, old_status in notifications:
+            send_verification_notification(user_email, user_name, new_status, old_status)
@@ -1,47 +1,96 @@
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-import os
-import tempfile
+from starlette.concurrency import run_in_threadpool
 from typing import Dict, Any, List, Optional
 from pydantic import BaseModel
 
+from app.config.settings import settings
 from app.database.session import get_db
 from app.modules.auth.services.auth_service import get_current_user
 from app.modules.auth.models.user import User
 from app.modules.proz.models.proz import ProzProfile
 from app.modules.proz.schemas.proz import ProzProfileUpdate, ProzProfileResponse
 from app.services.ai_profile_service import AIProfileService
+from app.core.container import get_ai_profile_service
+from app.services.resume_jobs import aget_job, resume_jobs
+from app.services.review_cache import review_payload
 
 router = APIRouter(prefix="/ai")
 
 @router.get("/status")
-async def ai_status():
-    ai = AIProfileService()
+async def ai_status(ai: AIProfileService = Depends(get_ai_profile_service)):
     return {"success": True, **ai.status()}
 
+async def _read_resume_upload(file: UploadFile) -> bytes:
+    if not file.filename.lower().endswith('.pdf'):
+        raise HTTPException(status_code=400, detail="Only PDF files are supported")
+
+    contents = await file.read(settings.RESUME_MAX_BYTES + 1)
+    if len(contents) > settings.RESUME_MAX_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"PDF is too large. Maximum size is {settings.RESUME_MAX_BYTES // (1024 * 1024)}MB"
+        )
+    return contents
+
 @router.post("/parse-resume")
 async def parse_resume(
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
+    ai: AIProfileService = Depends(get_ai_profile_service),
 ) -> Dict[str, Any]:
-    if not file.filename.lower().endswith('.pdf'):
-        raise HTTPException(status_code=400, detail="Only PDF files are supported")
+    contents = await _read_resume_upload(file)
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        contents = await file.read()
-        tmp.write(contents)
-        tmp_path = tmp.name
+    # Parse from memory off the event loop; page extraction runs in worker processes
+    result = await run_in_threadpool(ai.analyze_resume_bytes, contents)
+    return {"success": True, **result}
 
-    try:
-        ai = AIProfileService()
-        result = ai.analyze_resume(tmp_path)
-        return {"success": True, **result}
-    finally:
-        try:
-            os.remove(tmp_path)
-        except Exception:
-            pass
+@router.post("/parse-resume/jobs", status_code=202)
+async def create_parse_resume_job(
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_user),
+    ai: AIProfileService = Depends(get_ai_profile_service),
+) -> Dict[str, Any]:
+    """Queue a resume for parsing and return at once; follow it via the status or events URL."""
+    contents = await _read_resume_upload(file)
+    job = resume_jobs.submit(ai, str(current_user.id), contents, file.filename)
+    base = f"{settings.API_V1_PREFIX}/proz/ai/parse-resume/jobs/{job['job_id']}"
+    return {
+        "success": True,
+        "job_id": job["job_id"],
+        "stage": job["stage"],
+        "status_url": base,
+        "events_url": f"{base}/events",
+    }
+
+async def _get_owned_job(job_id: str, current_user: User) -> Dict[str, Any]:
+    job = await aget_job(job_id)
+    if job is None or job.get("user_id") != str(current_user.id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.get("/parse-resume/jobs/{job_id}")
+async def get_parse_resume_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+) -> Dict[str, Any]:
+    job = await _get_owned_job(job_id, current_user)
+    return {"success": True, **{k: v for k, v in job.items() if k != "user_id"}}
+
+@router.get("/parse-resume/jobs/{job_id}/events")
+async def stream_parse_resume_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    """Server-Sent Events: one event per stage (queued, extracted, analyzed, done/failed)."""
+    await _get_owned_job(job_id, current_user)
+    return StreamingResponse(
+        resume_jobs.stream(job_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 @router.post("/apply-suggestions", response_model=ProzProfileResponse)
 async def apply_suggestions(
@@ -123,8 +172,10 @@ async def apply_suggestions(
 
 @router.post("/review-profile")
 async def review_profile(
+    refresh: bool = False,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
+    ai: AIProfileService = Depends(get_ai_profile_service),
 ):
     profile = (
         db.query(ProzProfile)
@@ -135,58 +186,30 @@ async def review_profile(
     )
     if not profile:
         raise HTTPException(status_code=404, detail="Professional profile not found. Please create a profile first.")
-    ai = AIProfileService()
-    payload = {
-        "first_name": profile.first_name,
-        "last_name": profile.last_name,
-        "email": profile.email,
-        "phone_number": profile.phone_number,
-        "location": profile.location,
-        "years_experience": profile.years_experience,
-        "hourly_rate": profile.hourly_rate,
-        "availability": profile.availability,
-        "bio": profile.bio,
-        "education": profile.education,
-        "certifications": profile.certifications,
-        "website": profile.website,
-        "linkedin": profile.linkedin,
-        "preferred_contact_method": profile.preferred_contact_method,
-    }
-    result = ai.review_profile(payload)
+    payload = review_payload(profile)
+    # Unchanged profiles reuse the last review; refresh=true asks for a new one
+    result = await ai.review_profile_async(payload, refresh=refresh)
     return {"success": True, **result}
 
 
 class RephraseApplyRequest(BaseModel):
     fields: Optional[List[str]] = None  # which fields to auto-apply; defaults to ['bio']
+    reuse_review: bool = True  # apply the cached review of the current fields when there is one
 
 @router.post("/rephrase-apply", response_model=ProzProfileResponse)
 async def rephrase_and_apply(
     payload: RephraseApplyRequest | None = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
+    ai: AIProfileService = Depends(get_ai_profile_service),
 ):
     profile = db.query(ProzProfile).filter(ProzProfile.email == current_user.email).first()
     if not profile:
         raise HTTPException(status_code=404, detail="Professional profile not found")
 
-    ai = AIProfileService()
-    curr = {
-        "first_name": profile.first_name,
-        "last_name": profile.last_name,
-        "email": profile.email,
-        "phone_number": profile.phone_number,
-        "location": profile.location,
-        "years_experience": profile.years_experience,
-        "hourly_rate": profile.hourly_rate,
-        "availability": profile.availability,
-        "bio": profile.bio,
-        "education": profile.education,
-        "certifications": profile.certifications,
-        "website": profile.website,
-        "linkedin": profile.linkedin,
-        "preferred_contact_method": profile.preferred_contact_method,
-    }
-    review = ai.review_profile(curr)
+    curr = review_payload(profile)
+    reuse = payload.reuse_review if payload else True
+    review = await ai.review_profile_async(curr, refresh=not reuse)
     suggested = review.get("suggested_updates", {}) if isinstance(review, dict) else {}
 
     to_apply = set((payload.fields if payload and payload.fields else ["bio"]))
@@ -246,27 +269,16 @@ class DraftProfile(BaseModel):
 @router.post("/review-draft")
 async def review_draft(
     draft: DraftProfile,
+    refresh: bool = False,
     current_user: User = Depends(get_current_user),
+    ai: AIProfileService = Depends(get_ai_profile_service),
 ):
-    ai = AIProfileService()
     # Merge user defaults for missing email/name to improve AI context
-    payload = {
-        "first_name": draft.first_name or getattr(current_user, 'first_name', None),
-        "last_name": draft.last_name or getattr(current_user, 'last_name', None),
-        "email": draft.email or current_user.email,
-        "phone_number": draft.phone_number,
-        "location": draft.location,
-        "years_experience": draft.years_experience,
-        "hourly_rate": draft.hourly_rate,
-        "availability": draft.availability,
-        "bio": draft.bio,
-        "education": draft.education,
-        "certifications": draft.certifications,
-        "website": draft.website,
-        "linkedin": draft.linkedin,
-        "preferred_contact_method": draft.preferred_contact_method,
-    }
-    result = ai.review_profile(payload)
+    payload = review_payload(draft)
+    payload["first_name"] = draft.first_name or getattr(current_user, 'first_name', None)
+    payload["last_name"] = draft.last_name or getattr(current_user, 'last_name', None)
+    payload["email"] = draft.email or current_user.email
+    result = await ai.review_profile_async(payload, refresh=refresh)
     return {"success": True, **result}
 
 
@@ -8,8 +8,9 @@ from app.modules.auth.services.auth_service import auth_service, get_current_use
 from app.modules.auth.models.user import User
 from app.modules.proz.models.proz import ProzProfile
 from app.modules.proz.schemas.files import (
-    FileUploadResponse, ProfileImageResponse, ProfileImageUpdateRequest
+    FileUploadResponse, ProfileImageResponse, ProfileImageStatusResponse, ProfileImageUpdateRequest
 )
+from app.services import image_pipeline
 from app.services.file_service import FileService
 
 router = APIRouter()
@@ -26,6 +27,8 @@ async def upload_profile_image(
     """
     Upload a profile image for the current user.
     Supports JPG, JPEG, PNG, GIF formats up to 5MB.
+    Responds once the original is stored; the resized versions are rendered
+    in the background (see /profile-image-status/{file_name}).
     """
     # Get user's profile
     profile = db.query(ProzProfile).filter(ProzProfile.email == current_user.email).first()
@@ -36,7 +39,7 @@ async def upload_profile_image(
         )
     
     # Upload and process image
-    result = file_service.upload_profile_image(file, profile.id)
+    result = await file_service.upload_profile_image_async(file, profile.id)
     
     if not result["success"]:
         if result.get("error_code") == "INVALID_FILE":
@@ -66,10 +69,36 @@ async def upload_profile_image(
         message=result["message"],
         file_url=result["primary_url"],
         file_name=result["file_name"],
-        file_size=result["file_size"]
+        file_size=result["file_size"],
+        variants_status=result["variants_status"],
+        image_urls=result["image_urls"]
     )
 
 
+@router.get("/profile-image-status/{file_name}", response_model=ProfileImageStatusResponse)
+async def get_profile_image_status(
+    file_name: str,
+    current_user: User = Depends(get_current_user)
+) -> Any:
+    """
+    Report whether the resized versions of an uploaded profile image are ready.
+    """
+    status_info = image_pipeline.get_status(file_name)
+    if status_info is None:
+        # Status expired (or another cache): fall back to what is on disk
+        image_info = file_service.get_image_info(file_name)
+        if not image_info:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Image not found."
+            )
+        status_info = {
+            "status": image_pipeline.STATUS_READY,
+            "image_urls": {name: info["url"] for name, info in image_info["available_sizes"].items()},
+        }
+    return ProfileImageStatusResponse(file_name=file_name, **status_info)
+
+
 @router.delete("/delete-profile-image", response_model=ProfileImageResponse)
 async def delete_profile_image(
     db: Session = Depends(get_db),
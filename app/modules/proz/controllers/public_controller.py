@@ -1,14 +1,25 @@
 # app/modules/proz/controllers/public_controller.py
 from typing import Any, List, Optional
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
+from sqlalchemy import func, and_, case, select
 import math
 
-from app.database.session import get_db
+from app.core import response_cache
+from app.core.pagination import apply_keyset, count_cache, order_by_clauses, split_page
+from app.database.session import get_db, get_async_db
+from app.modules.proz import events as profile_events
 from app.modules.proz.models.proz import ProzProfile, Specialty, ProzSpecialty, Review
-from app.modules.proz.services.proz_service import resolve_profile_by_identifier
+from app.modules.proz.repositories.proz_repository import SpecialtyRepository
+from app.modules.proz.services import platform_stats
+from app.modules.proz.services.profile_search import get_search_backend
+from app.modules.proz.services.proz_service import (
+    profile_columns,
+    resolve_profile_by_identifier,
+    resolve_profile_by_identifier_async,
+)
 from app.modules.proz.schemas.public import (
     PublicProzProfileResponse,
     PublicProzProfileCard,
@@ -25,6 +36,52 @@ from app.modules.proz.schemas.public import (
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
+specialty_repo = SpecialtyRepository()
+public_responses = response_cache.ResponseCache("proz-public")
+
+FEATURED_TAG = "featured"
+
+
+@profile_events.subscribe
+def _purge_public_responses(changed_ids, deleted_ids) -> None:
+    # Any profile change may move it into or out of the featured listing.
+    response_cache.purge_profiles(changed_ids | deleted_ids, FEATURED_TAG)
+
+NULLABLE_SORT_DEFAULTS = {"hourly_rate": -1.0, "years_experience": -1}
+
+
+async def _build_profile_cards(db: AsyncSession, profiles) -> List[PublicProzProfileCard]:
+    """Profile cards with specialties loaded in a single batched query."""
+    names_by_id = await specialty_repo.get_names_by_profile_ids_async(db, [p.id for p in profiles])
+    cards = []
+    for profile in profiles:
+        card = PublicProzProfileCard.model_validate(profile_columns(profile))
+        card.specialties = names_by_id.get(str(profile.id), [])
+        cards.append(card)
+    return cards
+
+
+def _search_order(sort_by: str, sort_order: str, search) -> list:
+    """(expression, descending) sort keys for profile search, ending with the id tie-breaker."""
+    descending = sort_order.lower() == "desc"
+    if sort_by == "relevance":
+        if search is not None and search.rank is not None:
+            return [(search.rank, True), (ProzProfile.rating, True), (ProzProfile.id, True)]
+        return [(ProzProfile.rating, True), (ProzProfile.id, True)]
+    if sort_by == "verification_status":
+        status_rank = case(
+            (ProzProfile.verification_status == "verified", 1),
+            (ProzProfile.verification_status == "pending", 2),
+            (ProzProfile.verification_status == "rejected", 3),
+            else_=4
+        )
+        descending = sort_order.lower() != "asc"
+        return [(status_rank, descending), (ProzProfile.id, descending)]
+    sort_column = getattr(ProzProfile, sort_by, ProzProfile.rating)
+    if sort_by in NULLABLE_SORT_DEFAULTS:
+        # Keyset comparisons cannot step over NULLs, so rank them as the lowest value.
+        sort_column = func.coalesce(sort_column, NULLABLE_SORT_DEFAULTS[sort_by])
+    return [(sort_column, descending), (ProzProfile.id, descending)]
 
 
 @router.get("/profiles", response_model=ProfileSearchResponse)
@@ -41,9 +98,10 @@ async def search_public_profiles(
     is_featured: Optional[bool] = Query(None, description="Featured profiles only"),
     verification_status: Optional[str] = Query("verified", description="Verification status: verified, pending, rejected, all"),
     show_unverified: Optional[bool] = Query(False, description="Include unverified profiles"),
-    sort_by: str = Query("rating", description="Sort by: rating, experience, hourly_rate, created_at, verification_status"),
+    sort_by: str = Query("rating", description="Sort by: relevance, rating, experience, hourly_rate, created_at, verification_status"),
     sort_order: str = Query("desc", description="Sort order: asc, desc"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Keyset pagination: pass empty for the first page, then next_cursor"),
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Search and filter public Proz profiles with verification status.
@@ -62,84 +120,71 @@ async def search_public_profiles(
     )
 
     try:
-        query_obj = db.query(ProzProfile)
+        stmt = select(ProzProfile)
 
         if verification_status and verification_status.lower() != "all":
             if verification_status.lower() == "verified":
-                query_obj = query_obj.filter(ProzProfile.verification_status == "verified")
+                stmt = stmt.where(ProzProfile.verification_status == "verified")
             elif verification_status.lower() == "pending":
-                query_obj = query_obj.filter(ProzProfile.verification_status == "pending")
+                stmt = stmt.where(ProzProfile.verification_status == "pending")
             elif verification_status.lower() == "rejected":
-                query_obj = query_obj.filter(ProzProfile.verification_status == "rejected")
+                stmt = stmt.where(ProzProfile.verification_status == "rejected")
         elif not show_unverified:
-            query_obj = query_obj.filter(ProzProfile.verification_status == "verified")
+            stmt = stmt.where(ProzProfile.verification_status == "verified")
 
+        search = None
         if query:
-            search_filter = or_(
-                ProzProfile.first_name.ilike(f"%{query}%"),
-                ProzProfile.last_name.ilike(f"%{query}%"),
-                ProzProfile.bio.ilike(f"%{query}%"),
-                ProzProfile.location.ilike(f"%{query}%")
-            )
-            query_obj = query_obj.filter(search_filter)
+            backend = get_search_backend(db.bind.dialect.name)
+            await db.run_sync(backend.ensure_ready)
+            search = backend.clause(query)
+            stmt = stmt.where(search.where)
 
         if location:
-            query_obj = query_obj.filter(ProzProfile.location.ilike(f"%{location}%"))
+            stmt = stmt.where(ProzProfile.location.ilike(f"%{location}%"))
 
         if specialty:
-            query_obj = query_obj.join(ProzSpecialty).join(Specialty).filter(
+            stmt = stmt.join(ProzSpecialty).join(Specialty).where(
                 Specialty.name.ilike(f"%{specialty}%")
             )
 
         if min_rating is not None:
-            query_obj = query_obj.filter(ProzProfile.rating >= min_rating)
+            stmt = stmt.where(ProzProfile.rating >= min_rating)
 
         if max_hourly_rate is not None:
-            query_obj = query_obj.filter(ProzProfile.hourly_rate <= max_hourly_rate)
+            stmt = stmt.where(ProzProfile.hourly_rate <= max_hourly_rate)
 
         if min_experience is not None:
-            query_obj = query_obj.filter(ProzProfile.years_experience >= min_experience)
+            stmt = stmt.where(ProzProfile.years_experience >= min_experience)
 
         if availability:
-            query_obj = query_obj.filter(ProzProfile.availability == availability)
+            stmt = stmt.where(ProzProfile.availability == availability)
 
         if is_featured is not None:
-            query_obj = query_obj.filter(ProzProfile.is_featured == is_featured)
-
-        if sort_by == "verification_status":
-            query_obj = query_obj.order_by(
-                func.case(
-                    (ProzProfile.verification_status == "verified", 1),
-                    (ProzProfile.verification_status == "pending", 2),
-                    (ProzProfile.verification_status == "rejected", 3),
-                    else_=4
-                ).asc() if sort_order.lower() == "asc" else func.case(
-                    (ProzProfile.verification_status == "verified", 1),
-                    (ProzProfile.verification_status == "pending", 2),
-                    (ProzProfile.verification_status == "rejected", 3),
-                    else_=4
-                ).desc()
-            )
+            stmt = stmt.where(ProzProfile.is_featured == is_featured)
+
+        async def count_matches() -> int:
+            return (
+                await db.execute(select(func.count()).select_from(stmt.subquery()))
+            ).scalar() or 0
+
+        order = _search_order(sort_by, sort_order, search)
+        next_page_cursor = None
+        if cursor is None:
+            total_count = await count_matches()
+            offset = (page - 1) * page_size
+            stmt = stmt.order_by(*order_by_clauses(order))
+            profiles = (await db.execute(stmt.offset(offset).limit(page_size))).scalars().all()
         else:
-            sort_column = getattr(ProzProfile, sort_by, ProzProfile.rating)
-            if sort_order.lower() == "desc":
-                query_obj = query_obj.order_by(sort_column.desc())
-            else:
-                query_obj = query_obj.order_by(sort_column.asc())
-
-        total_count = query_obj.count()
-        offset = (page - 1) * page_size
-        profiles = query_obj.offset(offset).limit(page_size).all()
-
-        profile_cards = []
-        for profile in profiles:
-            specialties = db.query(Specialty.name).join(ProzSpecialty).filter(
-                ProzSpecialty.proz_id == profile.id
-            ).all()
-
-            profile_data = PublicProzProfileCard.model_validate(profile)
-            profile_data.specialties = [s.name for s in specialties]
-            profile_cards.append(profile_data)
+            count_key = ("public_profiles", query, location, specialty, min_rating, max_hourly_rate,
+                         min_experience, availability, is_featured, verification_status, show_unverified)
+            total_count = await count_cache.get_or_compute_async(count_key, count_matches)
+            sort_keys = [expr.label(f"sort_key_{i}") for i, (expr, _) in enumerate(order[:-1])]
+            keyed = apply_keyset(stmt.add_columns(*sort_keys), order, cursor)
+            rows = (await db.execute(keyed.limit(page_size + 1))).all()
+            rows, next_page_cursor = split_page(rows, page_size, key=lambda row: [*row[1:], row[0].id])
+            profiles = [row[0] for row in rows]
+
+        profile_cards = await _build_profile_cards(db, profiles)
 
         total_pages = math.ceil(total_count / page_size) if page_size else 0
 
@@ -149,8 +194,11 @@ async def search_public_profiles(
             page=page,
             page_size=page_size,
             total_pages=total_pages,
-            filters_applied=filters_applied
+            filters_applied=filters_applied,
+            next_cursor=next_page_cursor
         )
+    except HTTPException:
+        raise
     except Exception:
         logger.exception("Failed to fetch public profile search results; returning empty fallback response.")
         return ProfileSearchResponse(
@@ -165,14 +213,19 @@ async def search_public_profiles(
 
 @router.get("/profiles/{profile_id}", response_model=PublicProzProfileWithReviews)
 async def get_public_profile(
+    request: Request,
     profile_id: str,
     include_unverified: bool = Query(False, description="Include unverified profiles"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Get detailed public profile by ID with verification status consideration.
     """
-    profile = resolve_profile_by_identifier(
+    cached = await public_responses.lookup(request)
+    if cached is not None:
+        return cached
+
+    profile = await resolve_profile_by_identifier_async(
         db,
         profile_id,
         verified_only=not include_unverified,
@@ -185,65 +238,67 @@ async def get_public_profile(
         )
     
     # Get specialties
-    specialties = db.query(Specialty.name).join(ProzSpecialty).filter(
-        ProzSpecialty.proz_id == profile.id
-    ).all()
+    specialties = (await specialty_repo.get_names_by_profile_ids_async(db, [profile.id])).get(str(profile.id), [])
     
     # Get approved reviews (only for verified profiles)
     reviews = []
     if profile.verification_status == "verified":
-        reviews = db.query(Review).filter(
-            and_(
-                Review.proz_id == profile.id,
-                Review.is_approved == True
-            )
-        ).order_by(Review.created_at.desc()).limit(10).all()
+        reviews = (await db.execute(
+            select(Review).where(
+                and_(
+                    Review.proz_id == profile.id,
+                    Review.is_approved == True
+                )
+            ).order_by(Review.created_at.desc()).limit(10)
+        )).scalars().all()
     
     # Build response
-    profile_data = PublicProzProfileWithReviews.model_validate(profile)
-    profile_data.specialties = [s.name for s in specialties]
+    profile_data = PublicProzProfileWithReviews.model_validate(profile_columns(profile))
+    profile_data.specialties = specialties
     profile_data.reviews = [PublicReviewResponse.model_validate(r) for r in reviews]
     
-    return profile_data
+    return await public_responses.store(
+        request, profile_data, tags=[response_cache.profile_tag(profile.id)], updated_at=[profile.updated_at]
+    )
 
 
 @router.get("/featured", response_model=FeaturedProfilesResponse)
 async def get_featured_profiles(
+    request: Request,
     limit: int = Query(6, ge=1, le=20, description="Number of featured profiles"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Get featured profiles for homepage display.
     """
-    featured_profiles = db.query(ProzProfile).filter(
-        and_(
-            ProzProfile.is_featured == True,
-            ProzProfile.verification_status == "verified"
-        )
-    ).order_by(ProzProfile.rating.desc()).limit(limit).all()
+    cached = await public_responses.lookup(request)
+    if cached is not None:
+        return cached
+
+    featured_filter = and_(
+        ProzProfile.is_featured == True,
+        ProzProfile.verification_status == "verified"
+    )
+    featured_profiles = (await db.execute(
+        select(ProzProfile).where(featured_filter).order_by(ProzProfile.rating.desc()).limit(limit)
+    )).scalars().all()
     
-    # Get specialties for each profile
-    profile_cards = []
-    for profile in featured_profiles:
-        specialties = db.query(Specialty.name).join(ProzSpecialty).filter(
-            ProzSpecialty.proz_id == profile.id
-        ).all()
-        
-        profile_data = PublicProzProfileCard.model_validate(profile)
-        profile_data.specialties = [s.name for s in specialties]
-        profile_cards.append(profile_data)
+    profile_cards = await _build_profile_cards(db, featured_profiles)
     
-    total_featured = db.query(ProzProfile).filter(
-        and_(
-            ProzProfile.is_featured == True,
-            ProzProfile.verification_status == "verified"
-        )
-    ).count()
+    total_featured = (await db.execute(
+        select(func.count(ProzProfile.id)).where(featured_filter)
+    )).scalar() or 0
     
-    return FeaturedProfilesResponse(
+    response = FeaturedProfilesResponse(
         featured_profiles=profile_cards,
         total_featured=total_featured
     )
+    return await public_responses.store(
+        request,
+        response,
+        tags=[FEATURED_TAG] + [response_cache.profile_tag(p.id) for p in featured_profiles],
+        updated_at=[p.updated_at for p in featured_profiles],
+    )
 
 
 @router.get("/categories", response_model=ProfileCategoriesResponse)
@@ -253,19 +308,7 @@ async def get_profile_categories(
     """
     Get available categories and filters for the frontend.
     """
-    specialty_names = [
-        row.name
-        for row in db.query(Specialty.name).order_by(Specialty.name.asc()).all()
-    ]
-    
-    # Get all locations from verified profiles
-    locations = db.query(ProzProfile.location).filter(
-        and_(
-            ProzProfile.location.isnot(None),
-            ProzProfile.verification_status == "verified"
-        )
-    ).distinct().all()
-    location_names = [l.location for l in locations if l.location]
+    snapshot = platform_stats.get_snapshot(db)
     
     # Availability options
     availability_options = ["full-time", "part-time", "contract", "unavailable"]
@@ -286,8 +329,8 @@ async def get_profile_categories(
     ]
     
     return ProfileCategoriesResponse(
-        specialties=sorted(specialty_names),
-        locations=sorted(location_names),
+        specialties=platform_stats.specialties(snapshot),
+        locations=platform_stats.locations(snapshot),
         availability_options=availability_options,
         experience_ranges=experience_ranges,
         rating_ranges=rating_ranges
@@ -296,64 +339,13 @@ async def get_profile_categories(
 
 @router.get("/stats", response_model=ProfileStatsResponse)
 async def get_profile_stats(
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Get public statistics for the platform including verification stats.
     """
-    # Total profiles
-    total_profiles = db.query(ProzProfile).count()
-    
-    # Verified profiles
-    verified_profiles = db.query(ProzProfile).filter(
-        ProzProfile.verification_status == "verified"
-    ).count()
-    
-    # Pending profiles  
-    pending_profiles = db.query(ProzProfile).filter(
-        ProzProfile.verification_status == "pending"
-    ).count()
-    
-    # Rejected profiles
-    rejected_profiles = db.query(ProzProfile).filter(
-        ProzProfile.verification_status == "rejected"
-    ).count()
-    
-    # Featured profiles
-    featured_profiles = db.query(ProzProfile).filter(
-        and_(
-            ProzProfile.is_featured == True,
-            ProzProfile.verification_status == "verified"
-        )
-    ).count()
-    
-    # Specialties count
-    specialties_count = db.query(Specialty).count()
-    
-    # Average rating (only verified profiles)
-    avg_rating_result = db.query(func.avg(ProzProfile.rating)).filter(
-        ProzProfile.verification_status == "verified"
-    ).scalar()
-    average_rating = round(float(avg_rating_result or 0), 2)
-    
-    # Unique locations count (only verified profiles)
-    locations_count = db.query(ProzProfile.location).filter(
-        and_(
-            ProzProfile.location.isnot(None),
-            ProzProfile.verification_status == "verified"
-        )
-    ).distinct().count()
-    
-    return ProfileStatsResponse(
-        total_profiles=total_profiles,
-        verified_profiles=verified_profiles,
-        pending_profiles=pending_profiles,
-        rejected_profiles=rejected_profiles,
-        featured_profiles=featured_profiles,
-        specialties_count=specialties_count,
-        average_rating=average_rating,
-        locations_count=locations_count
-    )
+    snapshot = await platform_stats.get_snapshot_async(db)
+    return ProfileStatsResponse(**platform_stats.public_stats(snapshot))
 
 
 @router.get("/verification-info", response_model=VerificationStatsResponse)
@@ -389,12 +381,11 @@ async def get_verification_info(
     ]
     
     # Get stats by verification status
-    stats_by_status = {}
-    for status_info in verification_statuses:
-        count = db.query(ProzProfile).filter(
-            ProzProfile.verification_status == status_info.status
-        ).count()
-        stats_by_status[status_info.status] = count
+    snapshot = platform_stats.get_snapshot(db)
+    stats_by_status = {
+        status_info.status: platform_stats.status_count(snapshot, status_info.status)
+        for status_info in verification_statuses
+    }
     
     return VerificationStatsResponse(
         verification_statuses=verification_statuses,
@@ -408,7 +399,8 @@ async def get_verified_profiles_only(
     page_size: int = Query(12, ge=1, le=50),
     sort_by: str = Query("rating", description="Sort by: rating, experience, hourly_rate, created_at"),
     sort_order: str = Query("desc"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Keyset pagination: pass empty for the first page, then next_cursor"),
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Get only verified profiles (simplified endpoint for public website).
@@ -416,9 +408,19 @@ async def get_verified_profiles_only(
     return await search_public_profiles(
         page=page,
         page_size=page_size,
+        query=None,
+        location=None,
+        specialty=None,
+        min_rating=None,
+        max_hourly_rate=None,
+        min_experience=None,
+        availability=None,
+        is_featured=None,
         verification_status="verified",
+        show_unverified=False,
         sort_by=sort_by,
         sort_order=sort_order,
+        cursor=cursor,
         db=db
     )
 
@@ -429,7 +431,8 @@ async def get_pending_verification_profiles(
     page_size: int = Query(12, ge=1, le=50),
     sort_by: str = Query("created_at"),
     sort_order: str = Query("desc"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Keyset pagination: pass empty for the first page, then next_cursor"),
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Get profiles pending verification (for admin/review purposes).
@@ -437,16 +440,26 @@ async def get_pending_verification_profiles(
     return await search_public_profiles(
         page=page,
         page_size=page_size,
+        query=None,
+        location=None,
+        specialty=None,
+        min_rating=None,
+        max_hourly_rate=None,
+        min_experience=None,
+        availability=None,
+        is_featured=None,
         verification_status="pending",
         show_unverified=True,
         sort_by=sort_by,
         sort_order=sort_order,
+        cursor=cursor,
         db=db
     )
 
 
 @router.get("/profiles/{profile_id}/reviews", response_model=List[PublicReviewResponse])
 async def get_profile_reviews(
+    request: Request,
     profile_id: str,
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=50),
@@ -455,6 +468,10 @@ async def get_profile_reviews(
     """
     Get paginated reviews for a specific profile.
     """
+    cached = await public_responses.lookup(request)
+    if cached is not None:
+        return cached
+
     profile = resolve_profile_by_identifier(db, profile_id, verified_only=True)
 
     if not profile:
@@ -472,7 +489,12 @@ async def get_profile_reviews(
         )
     ).order_by(Review.created_at.desc()).offset(offset).limit(page_size).all()
     
-    return [PublicReviewResponse.model_validate(review) for review in reviews]
+    return await public_responses.store(
+        request,
+        [PublicReviewResponse.model_validate(review) for review in reviews],
+        tags=[response_cache.profile_tag(profile.id)],
+        updated_at=[profile.updated_at],
+    )
 
 
 @router.get("/search-suggestions")
@@ -489,16 +511,20 @@ async def get_search_suggestions(
         "locations": []
     }
     
+    backend = get_search_backend(db.get_bind().dialect.name)
+    backend.ensure_ready(db)
+
     # Profile name suggestions
-    profiles = db.query(ProzProfile.first_name, ProzProfile.last_name).filter(
+    name_search = backend.clause(q, fields="name")
+    profiles_query = db.query(ProzProfile.first_name, ProzProfile.last_name).filter(
         and_(
-            or_(
-                ProzProfile.first_name.ilike(f"%{q}%"),
-                ProzProfile.last_name.ilike(f"%{q}%")
-            ),
+            name_search.where,
             ProzProfile.verification_status == "verified"
         )
-    ).limit(5).all()
+    )
+    if name_search.rank is not None:
+        profiles_query = profiles_query.order_by(name_search.rank.desc())
+    profiles = profiles_query.limit(5).all()
     
     suggestions["profiles"] = [f"{p.first_name} {p.last_name}" for p in profiles]
     
@@ -512,7 +538,7 @@ async def get_search_suggestions(
     # Location suggestions
     locations = db.query(ProzProfile.location).filter(
         and_(
-            ProzProfile.location.ilike(f"%{q}%"),
+            backend.clause(q, fields="location").where,
             ProzProfile.verification_status == "verified"
         )
     ).distinct().limit(5).all()
@@ -0,0 +1,89 @@
+# app/modules/proz/events.py
+"""Commit-time notifications for changed Proz profiles.
+
+In-process caches and indexes subscribe here instead of being called from
+every write path. Ids are collected on flush and delivered only after the
+transaction commits, so subscribers never see rolled-back changes. The hook
+is installed on the ``Session`` class and therefore also covers the sync
+session behind every ``AsyncSession``.
+"""
+
+import logging
+import threading
+from typing import Callable, List, Set
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.modules.proz.models.proz import ProzProfile, ProzSpecialty, Review
+
+logger = logging.getLogger(__name__)
+
+ProfileChangeCallback = Callable[[Set[str], Set[str]], None]
+
+_SESSION_KEY = "proz_profile_changes"
+_subscribers: List[ProfileChangeCallback] = []
+_lock = threading.Lock()
+
+
+def subscribe(callback: ProfileChangeCallback) -> ProfileChangeCallback:
+    """Register ``callback(changed_ids, deleted_ids)``; usable as a decorator."""
+    with _lock:
+        if callback not in _subscribers:
+            _subscribers.append(callback)
+    return callback
+
+
+def unsubscribe(callback: ProfileChangeCallback) -> None:
+    with _lock:
+        if callback in _subscribers:
+            _subscribers.remove(callback)
+
+
+def _pending(session: Session):
+    return session.info.setdefault(_SESSION_KEY, (set(), set()))
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_profile_changes(session: Session, flush_context) -> None:
+    changed, deleted = _pending(session)
+    for obj in session.new.union(session.dirty):
+        if isinstance(obj, ProzProfile):
+            changed.add(str(obj.id))
+        elif isinstance(obj, (ProzSpecialty, Review)) and obj.proz_id is not None:
+            changed.add(str(obj.proz_id))
+    for obj in session.deleted:
+        if isinstance(obj, ProzProfile):
+            deleted.add(str(obj.id))
+        elif isinstance(obj, (ProzSpecialty, Review)) and obj.proz_id is not None:
+            changed.add(str(obj.proz_id))
+
+
+def _dispatch(changed: Set[str], deleted: Set[str]) -> None:
+    changed = changed - deleted
+    if not changed and not deleted:
+        return
+    with _lock:
+        subscribers = list(_subscribers)
+    for callback in subscribers:
+        try:
+            callback(set(changed), set(deleted))
+        except Exception:
+            logger.exception("Profile change subscriber %r failed", callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_profile_changes(session: Session) -> None:
+    changes = session.info.pop(_SESSION_KEY, None)
+    if changes:
+        _dispatch(*changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_profile_changes(session: Session) -> None:
+    session.info.pop(_SESSION_KEY, None)
+
+
+def publish(changed_ids=(), deleted_ids=()) -> None:
+    """Notify subscribers directly, for bulk ``query.update()/delete()`` paths."""
+    _dispatch({str(i) for i in changed_ids}, {str(i) for i in deleted_ids})
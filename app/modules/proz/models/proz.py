@@ -2,7 +2,7 @@
 import uuid
 import enum
 
-from sqlalchemy import Column, String, Text, Integer, ForeignKey, Boolean, Float, DateTime, func
+from sqlalchemy import Column, String, Text, Integer, ForeignKey, Boolean, Float, DateTime, UniqueConstraint, func
 from sqlalchemy.orm import relationship
 
 from app.database.base_class import Base
@@ -69,7 +69,7 @@ class ProzProfile(Base):
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True)
 
     def __repr__(self):
         return f"<ProzProfile(id={self.id}, name={self.first_name} {self.last_name}, email={self.email})>"
@@ -142,3 +142,35 @@ class Review(Base):
     
     def __repr__(self):
         return f"<Review(id={self.id}, proz_id={self.proz_id}, rating={self.rating})>"
+
+
+class ProfileUrlFingerprint(Base):
+    """Canonical host+path of a URL on a profile, for duplicate-link lookups by hash.
+
+    Rows are written by the session hooks in ``app.modules.proz.url_fingerprints``.
+    """
+    __tablename__ = "profile_url_fingerprints"
+    __table_args__ = (UniqueConstraint("proz_id", "url_hash", name="uq_profile_url_fingerprints_proz_hash"),)
+
+    id = Column(PortableUUID, primary_key=True, default=uuid.uuid4)
+    proz_id = Column(PortableUUID, ForeignKey("proz_profiles.id", ondelete="CASCADE"), nullable=False, index=True)
+    url_hash = Column(String(64), nullable=False, index=True)  # sha256 of url
+    url = Column(String(500), nullable=False)  # canonical host+path, e.g. linkedin.com/in/jane-doe
+    source = Column(String(20), nullable=False)  # linkedin, website, portfolio, evidence
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class ProfileTextBand(Base):
+    """One MinHash LSH band of a profile's bio, certifications or education text.
+
+    Profiles whose text shares a bucket are near-duplicate candidates. Rows are
+    written by the session hooks in ``app.modules.proz.text_similarity``.
+    """
+    __tablename__ = "profile_text_bands"
+    __table_args__ = (UniqueConstraint("proz_id", "bucket", name="uq_profile_text_bands_proz_bucket"),)
+
+    id = Column(PortableUUID, primary_key=True, default=uuid.uuid4)
+    proz_id = Column(PortableUUID, ForeignKey("proz_profiles.id", ondelete="CASCADE"), nullable=False, index=True)
+    field = Column(String(20), nullable=False)  # bio, certifications, education
+    bucket = Column(String(16), nullable=False, index=True)  # hash of (field, band number, band values)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
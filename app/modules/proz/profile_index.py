@@ -0,0 +1,90 @@
+# app/modules/proz/profile_index.py
+"""Tables of rows derived from a few profile fields, kept in step with the profile.
+
+``url_fingerprints`` (links) and ``text_similarity`` (MinHash bands) each
+store rows computed from some ``ProzProfile`` fields, keyed by ``proz_id``.
+A ``ProfileIndex`` rewrites a profile's rows in the same transaction as the
+profile: its ``Session`` listeners run when a flush inserts a profile or
+changes one of ``fields``, and drop the rows of deleted profiles.
+``rebuild()`` (``python -m app.scripts.rebuild_profile_index {links,text,all}``)
+fills the table for existing profiles and repairs writes that bypassed the
+ORM.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import Table, delete, event, insert, inspect, select
+from sqlalchemy.orm import Session
+
+from app.modules.proz.models.proz import ProzProfile
+
+REBUILD_BATCH_SIZE = 500
+# Rows per INSERT: a profile has up to BANDS rows per text field
+INSERT_BATCH_SIZE = 10000
+
+# (proz id, profile or any row with ``fields``) -> rows to insert
+RowBuilder = Callable[[Any, Any], List[Dict[str, Any]]]
+
+
+class ProfileIndex:
+    def __init__(self, table: Table, fields: Sequence[str], build_rows: RowBuilder):
+        self.table = table
+        self.fields = tuple(fields)
+        self.build_rows = build_rows
+
+    def write(self, connection, replace_ids: List[Any], rows: List[Dict[str, Any]]) -> None:
+        """Delete the rows of ``replace_ids`` (in batches) and insert ``rows``."""
+        for i in range(0, len(replace_ids), REBUILD_BATCH_SIZE):
+            connection.execute(
+                delete(self.table).where(self.table.c.proz_id.in_(replace_ids[i:i + REBUILD_BATCH_SIZE]))
+            )
+        for i in range(0, len(rows), INSERT_BATCH_SIZE):
+            connection.execute(insert(self.table), rows[i:i + INSERT_BATCH_SIZE])
+
+    def rebuild(self, db: Session, batch_size: Optional[int] = None) -> int:
+        """Rewrite the rows of every profile, one transaction per batch; returns profiles processed."""
+        batch_size = batch_size or REBUILD_BATCH_SIZE
+        columns = (ProzProfile.id,) + tuple(getattr(ProzProfile, field) for field in self.fields)
+        processed = 0
+        last_id = None
+        while True:
+            query = select(*columns).order_by(ProzProfile.id).limit(batch_size)
+            if last_id is not None:
+                query = query.where(ProzProfile.id > last_id)
+            batch = db.execute(query).all()
+            if not batch:
+                break
+            rows = [row for profile in batch for row in self.build_rows(profile.id, profile)]
+            self.write(db.connection(), [profile.id for profile in batch], rows)
+            db.commit()
+            processed += len(batch)
+            last_id = batch[-1].id
+        # Rows of profiles deleted outside the ORM
+        db.execute(delete(self.table).where(~self.table.c.proz_id.in_(select(ProzProfile.id))))
+        db.commit()
+        return processed
+
+    def listen(self) -> None:
+        """Register the ``Session`` listeners; call once, at import of the owning module."""
+        event.listen(Session, "before_flush", self._drop_deleted_profiles)
+        event.listen(Session, "after_flush", self._sync_changed_profiles)
+
+    def _drop_deleted_profiles(self, session: Session, flush_context, instances) -> None:
+        # Before the profile rows go, so the foreign key never sees orphans.
+        ids = [obj.id for obj in session.deleted if isinstance(obj, ProzProfile) and obj.id is not None]
+        if ids:
+            self.write(session.connection(), ids, [])
+
+    def _sync_changed_profiles(self, session: Session, flush_context) -> None:
+        replace_ids, rows = [], []
+        for obj in session.new:
+            if isinstance(obj, ProzProfile):
+                rows.extend(self.build_rows(obj.id, obj))
+        for obj in session.dirty:
+            if isinstance(obj, ProzProfile):
+                attrs = inspect(obj).attrs
+                if any(attrs[field].history.has_changes() for field in self.fields):
+                    replace_ids.append(obj.id)
+                    rows.extend(self.build_rows(obj.id, obj))
+        if replace_ids or rows:
+            self.write(session.connection(), replace_ids, rows)
@@ -3,14 +3,55 @@ Repository layer for Proz Profile module.
 File location: app/modules/proz/repositories/proz_repository.py
 """
 
-from typing import List, Optional, Dict, Any, Tuple
+from typing import Iterable, List, Optional, Dict, Any, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
+from sqlalchemy import func, and_, or_, select
 
+from app.core.pagination import order_by_clauses
+from app.modules.proz.services import platform_stats
 from app.modules.proz.models.proz import ProzProfile, Specialty, ProzSpecialty, Review, VerificationStatus
 
 
+# Default listing order for profile pages: newest first, id as tie-breaker.
+PROFILE_LIST_ORDER = [(ProzProfile.created_at, True), (ProzProfile.id, True)]
+
+# Bound on the size of one ``IN (...)`` list when batch-loading specialty names.
+SPECIALTY_BATCH_SIZE = 500
+
+
+def _chunked_ids(profile_ids: Iterable[Any]) -> List[List[str]]:
+    ids = list(dict.fromkeys(str(pid) for pid in profile_ids if pid is not None))
+    return [ids[i:i + SPECIALTY_BATCH_SIZE] for i in range(0, len(ids), SPECIALTY_BATCH_SIZE)]
+
+
+def _specialty_names_stmt(profile_ids: List[str]):
+    return (
+        select(ProzSpecialty.proz_id, Specialty.name)
+        .join(Specialty, Specialty.id == ProzSpecialty.specialty_id)
+        .where(ProzSpecialty.proz_id.in_(profile_ids))
+    )
+
+
 class SpecialtyRepository:
+    def get_names_by_profile_ids(self, db: Session, profile_ids: Iterable[Any]) -> Dict[str, List[str]]:
+        """Specialty names for many profiles in one round trip (per 500 ids), keyed by proz id."""
+        names: Dict[str, List[str]] = {}
+        for chunk in _chunked_ids(profile_ids):
+            for proz_id, name in db.execute(_specialty_names_stmt(chunk)):
+                names.setdefault(str(proz_id), []).append(name)
+        return names
+
+    async def get_names_by_profile_ids_async(
+        self, db: AsyncSession, profile_ids: Iterable[Any]
+    ) -> Dict[str, List[str]]:
+        """AsyncSession counterpart of ``get_names_by_profile_ids``."""
+        names: Dict[str, List[str]] = {}
+        for chunk in _chunked_ids(profile_ids):
+            for proz_id, name in await db.execute(_specialty_names_stmt(chunk)):
+                names.setdefault(str(proz_id), []).append(name)
+        return names
+
     def get_by_id(self, db: Session, specialty_id: str) -> Optional[Specialty]:
         """Get a specialty by ID"""
         return db.query(Specialty).filter(Specialty.id == specialty_id).first()
@@ -29,6 +70,7 @@ class SpecialtyRepository:
         db.add(specialty)
         db.commit()
         db.refresh(specialty)
+        platform_stats.record_specialty(specialty.name)
         return specialty
     
     def get_or_create(self, db: Session, name: str) -> Specialty:
@@ -48,20 +90,26 @@ class SpecialtyRepository:
         """Update a specialty"""
         specialty = self.get_by_id(db, specialty_id)
         if specialty:
+            old_name = specialty.name
             if name is not None:
                 specialty.name = name
             if description is not None:
                 specialty.description = description
             db.commit()
             db.refresh(specialty)
+            if specialty.name != old_name:
+                platform_stats.record_specialty(old_name, added=False)
+                platform_stats.record_specialty(specialty.name)
         return specialty
     
     def delete(self, db: Session, specialty_id: str) -> bool:
         """Delete a specialty"""
         specialty = self.get_by_id(db, specialty_id)
         if specialty:
+            name = specialty.name
             db.delete(specialty)
             db.commit()
+            platform_stats.record_specialty(name, added=False)
             return True
         return False
 
@@ -75,22 +123,16 @@ class ProzProfileRepository:
         """Get a profile by email"""
         return db.query(ProzProfile).filter(ProzProfile.email == email).first()
     
-    def get_all(
-        self, 
-        db: Session, 
-        skip: int = 0, 
-        limit: int = 10,
+    def _filtered_query(
+        self,
+        db: Session,
         location: Optional[str] = None,
         specialty: Optional[str] = None,
         min_experience: Optional[int] = None,
         max_rate: Optional[float] = None,
         availability: Optional[str] = None,
         verification_status: VerificationStatus = VerificationStatus.VERIFIED
-    ) -> Tuple[List[ProzProfile], int]:
-        """
-        Get all profiles with optional filtering
-        Returns a tuple of (profiles, total_count)
-        """
+    ):
         query = db.query(ProzProfile)
         
         # Apply filters
@@ -113,14 +155,36 @@ class ProzProfileRepository:
         if availability:
             query = query.filter(ProzProfile.availability.ilike(f"%{availability}%"))
         
+        return query
+
+    def get_all(
+        self, 
+        db: Session, 
+        skip: int = 0, 
+        limit: int = 10,
+        location: Optional[str] = None,
+        specialty: Optional[str] = None,
+        min_experience: Optional[int] = None,
+        max_rate: Optional[float] = None,
+        availability: Optional[str] = None,
+        verification_status: VerificationStatus = VerificationStatus.VERIFIED
+    ) -> Tuple[List[ProzProfile], int]:
+        """
+        Get all profiles with optional filtering
+        Returns a tuple of (profiles, total_count)
+        """
+        query = self._filtered_query(
+            db, location, specialty, min_experience, max_rate, availability, verification_status
+        )
+        
         # Get total count before pagination
         total = query.count()
         
         # Apply pagination
-        profiles = query.offset(skip).limit(limit).all()
+        profiles = query.order_by(*order_by_clauses(PROFILE_LIST_ORDER)).offset(skip).limit(limit).all()
         
         return profiles, total
-    
+
     def get_featured(self, db: Session, limit: int = 10) -> List[ProzProfile]:
         """Get featured profiles"""
         return (
@@ -148,33 +212,36 @@ class ProzProfileRepository:
         
         db.commit()
         db.refresh(profile)
+        platform_stats.record_profile_change(None, platform_stats.profile_state(profile))
         return profile
     
     def update(self, db: Session, profile: ProzProfile, update_data: Dict[str, Any], specialties: List[Specialty] = None) -> ProzProfile:
         """Update a profile with optional specialties"""
-        # Update profile fields
-        for key, value in update_data.items():
-            if hasattr(profile, key) and value is not None:
-                setattr(profile, key, value)
-        
-        # Update specialties if provided
-        if specialties is not None:
-            # Remove existing specialties
-            db.query(ProzSpecialty).filter(ProzSpecialty.proz_id == profile.id).delete()
+        with platform_stats.track(profile):
+            # Update profile fields
+            for key, value in update_data.items():
+                if hasattr(profile, key) and value is not None:
+                    setattr(profile, key, value)
             
-            # Add new specialties
-            for specialty in specialties:
-                proz_specialty = ProzSpecialty(proz_id=profile.id, specialty_id=specialty.id)
-                db.add(proz_specialty)
-        
-        db.commit()
+            # Update specialties if provided
+            if specialties is not None:
+                # Remove existing specialties
+                db.query(ProzSpecialty).filter(ProzSpecialty.proz_id == profile.id).delete()
+                
+                # Add new specialties
+                for specialty in specialties:
+                    proz_specialty = ProzSpecialty(proz_id=profile.id, specialty_id=specialty.id)
+                    db.add(proz_specialty)
+            
+            db.commit()
         db.refresh(profile)
         return profile
     
     def update_verification_status(self, db: Session, profile: ProzProfile, status: VerificationStatus) -> ProzProfile:
         """Update verification status of a profile"""
-        profile.verification_status = status
-        db.commit()
+        with platform_stats.track(profile):
+            profile.verification_status = status
+            db.commit()
         db.refresh(profile)
         return profile
     
@@ -187,8 +254,9 @@ class ProzProfileRepository:
     
     def set_featured(self, db: Session, profile: ProzProfile, is_featured: bool) -> ProzProfile:
         """Set featured status of a profile"""
-        profile.is_featured = is_featured
-        db.commit()
+        with platform_stats.track(profile):
+            profile.is_featured = is_featured
+            db.commit()
         db.refresh(profile)
         return profile
     
@@ -205,8 +273,9 @@ class ProzProfileRepository:
         db.query(Review).filter(Review.proz_id == profile_id).delete()
         
         # Delete profile
-        db.delete(profile)
-        db.commit()
+        with platform_stats.track(profile):
+            db.delete(profile)
+            db.commit()
         return True
 
 
@@ -280,6 +349,7 @@ class ReviewRepository:
         # Update profile
         profile = db.query(ProzProfile).filter(ProzProfile.id == proz_id).first()
         if profile:
-            profile.rating = float(avg_rating)
-            profile.review_count = review_count
-            db.commit()
\ No newline at end of file
+            with platform_stats.track(profile):
+                profile.rating = float(avg_rating)
+                profile.review_count = review_count
+                db.commit()
\ No newline at end of file
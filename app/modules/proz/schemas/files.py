@@ -1,6 +1,6 @@
 # app/modules/proz/schemas/files.py
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Dict, Optional
 from datetime import datetime
 
 
@@ -10,6 +10,17 @@ class FileUploadResponse(BaseModel):
     file_url: Optional[str] = None
     file_name: Optional[str] = None
     file_size: Optional[int] = None
+    # Resized versions are rendered after the response; poll /profile-image-status/{file_name}
+    variants_status: Optional[str] = None
+    image_urls: Optional[Dict[str, str]] = None
+
+
+class ProfileImageStatusResponse(BaseModel):
+    file_name: str
+    status: str
+    image_urls: Dict[str, str] = {}
+    error: Optional[str] = None
+    duration_ms: Optional[int] = None
 
 
 class ProfileImageUpdateRequest(BaseModel):
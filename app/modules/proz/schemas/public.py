@@ -91,6 +91,7 @@ class ProfileSearchResponse(BaseModel):
     page_size: int
     total_pages: int
     filters_applied: ProfileSearchRequest
+    next_cursor: Optional[str] = None
 
 
 class FeaturedProfilesResponse(BaseModel):
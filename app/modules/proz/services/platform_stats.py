@@ -0,0 +1,226 @@
+"""
+Materialized platform statistics for the public homepage endpoints.
+File location: app/modules/proz/services/platform_stats.py
+
+``/proz/public/stats``, ``/categories`` and ``/verification-info`` read one
+cached snapshot instead of aggregating ``proz_profiles`` on every hit. The
+snapshot is a flat numeric hash in ``app.core.cache``:
+
+* ``total`` and ``status:<verification_status>``  - profile counts
+* ``featured``                                     - verified and featured
+* ``rating_sum`` / ``rating_n``                    - over verified profiles
+* ``loc:<location>``                               - verified profiles per location
+* ``specialty:<name>``                             - 1 per specialty
+
+Write paths wrap their change in ``track(profile)`` (or call
+``record_specialty``) and the snapshot is patched with the difference between
+the profile's before and after contribution once the change is committed.
+Writers that bypass the repositories are picked up when the snapshot expires
+(``PLATFORM_STATS_TTL_SECONDS``) and is rebuilt with three grouped queries.
+"""
+
+import logging
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config.settings import settings
+from app.core.cache import cache
+from app.modules.proz.models.proz import ProzProfile, Specialty
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_KEY = "proz:platform_stats:v1"
+VERIFIED = "verified"
+
+
+class ProfileState(NamedTuple):
+    """The columns of a profile that feed the platform statistics."""
+
+    verification_status: Optional[str]
+    is_featured: bool
+    rating: Optional[float]
+    location: Optional[str]
+
+
+def profile_state(profile: Optional[ProzProfile]) -> Optional[ProfileState]:
+    if profile is None:
+        return None
+    status = profile.verification_status
+    return ProfileState(
+        verification_status=getattr(status, "value", status),
+        is_featured=bool(profile.is_featured),
+        rating=profile.rating,
+        location=profile.location,
+    )
+
+
+def contribution(state: Optional[ProfileState]) -> Dict[str, float]:
+    """Snapshot fields one profile adds to the totals."""
+    if state is None:
+        return {}
+    fields = {"total": 1.0, f"status:{state.verification_status}": 1.0}
+    if state.verification_status == VERIFIED:
+        if state.is_featured:
+            fields["featured"] = 1.0
+        if state.rating is not None:
+            fields["rating_sum"] = float(state.rating)
+            fields["rating_n"] = 1.0
+        if state.location:
+            fields[f"loc:{state.location}"] = 1.0
+    return fields
+
+
+def state_delta(before: Optional[ProfileState], after: Optional[ProfileState]) -> Dict[str, float]:
+    delta = contribution(after)
+    for field, value in contribution(before).items():
+        delta[field] = delta.get(field, 0.0) - value
+    return {field: value for field, value in delta.items() if value}
+
+
+def record_profile_change(before: Optional[ProfileState], after: Optional[ProfileState]) -> None:
+    delta = state_delta(before, after)
+    if delta:
+        cache.incr_hash(SNAPSHOT_KEY, delta)
+
+
+def record_specialty(name: str, added: bool = True) -> None:
+    cache.incr_hash(SNAPSHOT_KEY, {f"specialty:{name}": 1.0 if added else -1.0})
+
+
+@contextmanager
+def track(*profiles: Optional[ProzProfile]) -> Iterator[None]:
+    """Patch the snapshot with the committed change to ``profiles``.
+
+    Wrap the mutation *and* its commit; nothing is recorded if the block
+    raises. A profile deleted inside the block counts as removed.
+    """
+    tracked = [p for p in profiles if p is not None]
+    before = [profile_state(p) for p in tracked]
+    yield
+    for profile, old in zip(tracked, before):
+        try:
+            new = None if _is_deleted(profile) else profile_state(profile)
+            record_profile_change(old, new)
+        except Exception:
+            # The snapshot must never fail a write; drop it and rebuild on next read.
+            logger.exception("Could not update platform stats for profile %s", profile.id)
+            invalidate()
+
+
+def _is_deleted(profile: ProzProfile) -> bool:
+    from sqlalchemy import inspect
+
+    state = inspect(profile)
+    return state.was_deleted or state.deleted
+
+
+def invalidate() -> None:
+    cache.delete(SNAPSHOT_KEY)
+
+
+# -- rebuild ---------------------------------------------------------------
+
+def _status_stmt():
+    verified = ProzProfile.verification_status == VERIFIED
+    return select(
+        ProzProfile.verification_status,
+        func.count(ProzProfile.id),
+        func.coalesce(func.sum(case((verified & (ProzProfile.is_featured == True), 1), else_=0)), 0),
+        func.coalesce(func.sum(case((verified, ProzProfile.rating), else_=0)), 0),
+        func.count(case((verified, ProzProfile.rating))),
+    ).group_by(ProzProfile.verification_status)
+
+
+def _locations_stmt():
+    return (
+        select(ProzProfile.location, func.count(ProzProfile.id))
+        .where(ProzProfile.verification_status == VERIFIED, ProzProfile.location.isnot(None))
+        .group_by(ProzProfile.location)
+    )
+
+
+def _specialties_stmt():
+    return select(Specialty.name)
+
+
+def _assemble(status_rows, location_rows, specialty_rows) -> Dict[str, float]:
+    fields: Dict[str, float] = {"total": 0.0, "featured": 0.0, "rating_sum": 0.0, "rating_n": 0.0}
+    for status, count, featured, rating_sum, rating_n in status_rows:
+        fields["total"] += count
+        fields[f"status:{status}"] = float(count)
+        fields["featured"] += featured
+        fields["rating_sum"] += float(rating_sum or 0)
+        fields["rating_n"] += rating_n
+    for location, count in location_rows:
+        if location:
+            fields[f"loc:{location}"] = float(count)
+    for (name,) in specialty_rows:
+        fields[f"specialty:{name}"] = 1.0
+    return fields
+
+
+def rebuild(db: Session) -> Dict[str, float]:
+    fields = _assemble(db.execute(_status_stmt()), db.execute(_locations_stmt()), db.execute(_specialties_stmt()))
+    cache.set_hash(SNAPSHOT_KEY, fields, ttl=settings.PLATFORM_STATS_TTL_SECONDS)
+    return fields
+
+
+async def rebuild_async(db: AsyncSession) -> Dict[str, float]:
+    fields = _assemble(
+        await db.execute(_status_stmt()),
+        await db.execute(_locations_stmt()),
+        await db.execute(_specialties_stmt()),
+    )
+    cache.set_hash(SNAPSHOT_KEY, fields, ttl=settings.PLATFORM_STATS_TTL_SECONDS)
+    return fields
+
+
+def get_snapshot(db: Session) -> Dict[str, float]:
+    return cache.get_hash(SNAPSHOT_KEY) or rebuild(db)
+
+
+async def get_snapshot_async(db: AsyncSession) -> Dict[str, float]:
+    return await cache.aget_hash(SNAPSHOT_KEY) or await rebuild_async(db)
+
+
+# -- views -----------------------------------------------------------------
+
+def _names(snapshot: Dict[str, float], prefix: str) -> List[str]:
+    # Counts can briefly dip below zero under concurrent deltas; only positive ones exist.
+    return sorted(field[len(prefix):] for field, value in snapshot.items() if field.startswith(prefix) and value > 0.5)
+
+
+def _count(snapshot: Dict[str, float], field: str) -> int:
+    return max(int(round(snapshot.get(field, 0.0))), 0)
+
+
+def status_count(snapshot: Dict[str, float], status: str) -> int:
+    return _count(snapshot, f"status:{status}")
+
+
+def locations(snapshot: Dict[str, float]) -> List[str]:
+    return _names(snapshot, "loc:")
+
+
+def specialties(snapshot: Dict[str, float]) -> List[str]:
+    return _names(snapshot, "specialty:")
+
+
+def public_stats(snapshot: Dict[str, float]) -> Dict[str, Any]:
+    """Fields of ``ProfileStatsResponse``."""
+    rating_n = snapshot.get("rating_n", 0.0)
+    average = snapshot.get("rating_sum", 0.0) / rating_n if rating_n >= 0.5 else 0.0
+    return {
+        "total_profiles": _count(snapshot, "total"),
+        "verified_profiles": status_count(snapshot, VERIFIED),
+        "pending_profiles": status_count(snapshot, "pending"),
+        "rejected_profiles": status_count(snapshot, "rejected"),
+        "featured_profiles": _count(snapshot, "featured"),
+        "specialties_count": len(specialties(snapshot)),
+        "average_rating": round(average, 2),
+        "locations_count": len(locations(snapshot)),
+    }
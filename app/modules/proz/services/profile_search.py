@@ -0,0 +1,290 @@
+"""
+Full-text search backends for public profile search.
+File location: app/modules/proz/services/profile_search.py
+
+Every backend turns the free-text ``query`` parameter into a WHERE clause plus
+an optional relevance expression, so the search endpoints stay dialect-free:
+
+* ``mysql``      - MATCH ... AGAINST in boolean mode over the FULLTEXT indexes
+* ``postgresql`` - to_tsvector/to_tsquery over the GIN expression indexes
+* ``memory``     - an in-process inverted index (SQLite, tests, local dev)
+* ``like``       - the original leading-wildcard ILIKE predicates
+
+Query terms are prefix-matched ("pyth" finds "python") and all terms must
+match. The indexes are created by migration f1a9c3d5e7b2.
+"""
+
+import bisect
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, case, false, literal_column, or_, select
+from sqlalchemy.orm import Session
+
+from app.config.settings import settings
+from app.modules.proz import events as profile_events
+from app.modules.proz.models.proz import ProzProfile
+
+# Column groups that have their own full-text index.
+FIELD_GROUPS: Dict[str, Tuple] = {
+    "profile": (ProzProfile.first_name, ProzProfile.last_name, ProzProfile.bio, ProzProfile.location),
+    "name": (ProzProfile.first_name, ProzProfile.last_name),
+    "location": (ProzProfile.location,),
+}
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return _TOKEN_RE.findall(text.lower()) if text else []
+
+
+@dataclass
+class SearchClause:
+    """WHERE criterion for a search, plus a relevance score when the backend has one."""
+
+    where: object
+    rank: Optional[object] = None
+
+
+class LikeSearchBackend:
+    """Substring match with ILIKE; no index use and no relevance."""
+
+    name = "like"
+
+    def ensure_ready(self, db: Session) -> None:
+        """Hook for backends that need to load state before building a clause."""
+
+    def clause(self, query: str, fields: str = "profile") -> SearchClause:
+        return SearchClause(where=self._like(query, FIELD_GROUPS[fields]))
+
+    @staticmethod
+    def _like(term: str, columns: Iterable) -> object:
+        return or_(*[column.ilike(f"%{term}%") for column in columns])
+
+
+class MySQLFullTextBackend(LikeSearchBackend):
+    """MATCH ... AGAINST over ft_proz_profiles_{profile,name,location}."""
+
+    name = "mysql"
+    # InnoDB ignores tokens shorter than innodb_ft_min_token_size (default 3).
+    min_token_size = 3
+
+    def clause(self, query: str, fields: str = "profile") -> SearchClause:
+        from sqlalchemy.dialects.mysql import match
+
+        columns = FIELD_GROUPS[fields]
+        tokens = tokenize(query)
+        indexed = [t for t in tokens if len(t) >= self.min_token_size]
+        short = [t for t in tokens if len(t) < self.min_token_size]
+        if not indexed:
+            return SearchClause(where=self._like(query, columns))
+
+        relevance = match(*columns, against=" ".join(f"+{t}*" for t in indexed)).in_boolean_mode()
+        where = relevance
+        if short:
+            where = and_(relevance, *[self._like(t, columns) for t in short])
+        return SearchClause(where=where, rank=relevance)
+
+
+class PostgresFullTextBackend(LikeSearchBackend):
+    """to_tsvector('simple', ...) @@ to_tsquery over the ix_proz_profiles_fts_* indexes."""
+
+    name = "postgresql"
+
+    @staticmethod
+    def document(columns: Iterable) -> object:
+        # Must stay textually identical to the index expressions in the migration.
+        text = " || ' ' || ".join(f"coalesce(proz_profiles.{column.key}, '')" for column in columns)
+        return literal_column(f"to_tsvector('simple', {text})")
+
+    def clause(self, query: str, fields: str = "profile") -> SearchClause:
+        from sqlalchemy import func
+
+        tokens = tokenize(query)
+        if not tokens:
+            return SearchClause(where=self._like(query, FIELD_GROUPS[fields]))
+        document = self.document(FIELD_GROUPS[fields])
+        tsquery = func.to_tsquery(literal_column("'simple'"), " & ".join(f"{t}:*" for t in tokens))
+        return SearchClause(where=document.op("@@")(tsquery), rank=func.ts_rank(document, tsquery))
+
+
+class InMemorySearchBackend(LikeSearchBackend):
+    """Inverted index kept in process memory, refreshed from profile commit events.
+
+    Built lazily on the first search and patched per changed profile afterwards.
+    Each worker process holds its own copy, so it is meant for SQLite and local
+    development rather than multi-process deployments.
+
+    ``ensure_ready`` also runs on the event loop thread (``run_sync``), where
+    two searches interleave at every query; the lock is a plain Lock held only
+    while the index is patched, never across a query. A search matches at
+    most ``PROFILE_SEARCH_MAX_MATCHES`` profiles, the best scored, so the id
+    list in its SQL stays within the database's parameter limit.
+    """
+
+    name = "memory"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._built = False
+        self._dirty: Set[str] = set()
+        # group -> token -> {profile_id: term frequency}
+        self._postings: Dict[str, Dict[str, Dict[str, int]]] = {g: {} for g in FIELD_GROUPS}
+        # group -> profile_id -> Counter(tokens), to unindex on change
+        self._documents: Dict[str, Dict[str, Counter]] = {g: {} for g in FIELD_GROUPS}
+        self._vocabulary: Dict[str, List[str]] = {g: [] for g in FIELD_GROUPS}
+        self._vocabulary_stale = True
+        profile_events.subscribe(self._on_profiles_changed)
+
+    def _on_profiles_changed(self, changed: Set[str], deleted: Set[str]) -> None:
+        with self._lock:
+            for profile_id in deleted:
+                self._remove(profile_id)
+            # Also while a build is reading: it may have read the rows before this change.
+            self._dirty |= changed | deleted
+
+    def reset(self) -> None:
+        with self._lock:
+            self._built = False
+            self._dirty.clear()
+            for group in FIELD_GROUPS:
+                self._postings[group].clear()
+                self._documents[group].clear()
+            self._vocabulary_stale = True
+
+    def ensure_ready(self, db: Session) -> None:
+        with self._lock:
+            build = not self._built
+            if not build and not self._dirty:
+                return
+            dirty, self._dirty = self._dirty, set()
+        # Read without the lock; changes committed meanwhile are dirty again for the next search.
+        rows = self._read(db, None if build else dirty)
+        with self._lock:
+            if build and self._built:
+                self._dirty |= dirty  # a concurrent search built it first; its read may predate these
+                return
+            for profile_id in dirty:
+                self._remove(profile_id)
+            self._built = True
+            self._load(rows)
+
+    @staticmethod
+    def _read(db: Session, profile_ids: Optional[Set[str]]) -> list:
+        stmt = select(
+            ProzProfile.id, ProzProfile.first_name, ProzProfile.last_name,
+            ProzProfile.bio, ProzProfile.location,
+        )
+        if profile_ids is not None:
+            stmt = stmt.where(ProzProfile.id.in_(list(profile_ids)))
+        return db.execute(stmt).all()
+
+    def _load(self, rows: list) -> None:
+        # Caller holds self._lock
+        for row in rows:
+            values = {"first_name": row.first_name, "last_name": row.last_name,
+                      "bio": row.bio, "location": row.location}
+            for group, columns in FIELD_GROUPS.items():
+                text = " ".join(values[c.key] or "" for c in columns)
+                self._add(group, str(row.id), Counter(tokenize(text)))
+        self._vocabulary_stale = True
+
+    def _add(self, group: str, profile_id: str, tokens: Counter) -> None:
+        if not tokens:
+            return
+        self._documents[group][profile_id] = tokens
+        postings = self._postings[group]
+        for token, tf in tokens.items():
+            postings.setdefault(token, {})[profile_id] = tf
+
+    def _remove(self, profile_id: str) -> None:
+        for group in FIELD_GROUPS:
+            tokens = self._documents[group].pop(profile_id, None)
+            if not tokens:
+                continue
+            postings = self._postings[group]
+            for token in tokens:
+                docs = postings.get(token)
+                if docs is not None:
+                    docs.pop(profile_id, None)
+                    if not docs:
+                        del postings[token]
+        self._vocabulary_stale = True
+
+    def _prefix_terms(self, group: str, prefix: str) -> List[str]:
+        if self._vocabulary_stale:
+            for g in FIELD_GROUPS:
+                self._vocabulary[g] = sorted(self._postings[g])
+            self._vocabulary_stale = False
+        vocabulary = self._vocabulary[group]
+        start = bisect.bisect_left(vocabulary, prefix)
+        end = bisect.bisect_left(vocabulary, prefix + "\U0010ffff")
+        return vocabulary[start:end]
+
+    def scores(self, query: str, fields: str = "profile") -> Dict[str, float]:
+        """TF-IDF score per matching profile id; every query term must prefix-match."""
+        tokens = tokenize(query)
+        if not tokens:
+            return {}
+        with self._lock:
+            postings = self._postings[fields]
+            total_docs = max(len(self._documents[fields]), 1)
+            scores: Optional[Dict[str, float]] = None
+            for token in tokens:
+                term_scores: Dict[str, float] = {}
+                for term in self._prefix_terms(fields, token):
+                    docs = postings[term]
+                    idf = math.log(1 + total_docs / len(docs))
+                    for profile_id, tf in docs.items():
+                        term_scores[profile_id] = term_scores.get(profile_id, 0.0) + tf * idf
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {pid: s + term_scores[pid] for pid, s in scores.items() if pid in term_scores}
+                if not scores:
+                    return {}
+            return scores or {}
+
+    def clause(self, query: str, fields: str = "profile") -> SearchClause:
+        if not self._built:
+            return SearchClause(where=self._like(query, FIELD_GROUPS[fields]))
+        if not tokenize(query):
+            return SearchClause(where=self._like(query, FIELD_GROUPS[fields]))
+        scores = self.scores(query, fields)
+        if not scores:
+            return SearchClause(where=false())
+        limit = settings.PROFILE_SEARCH_MAX_MATCHES
+        if len(scores) > limit:
+            scores = dict(heapq.nlargest(limit, scores.items(), key=lambda item: item[1]))
+        rank = case(scores, value=ProzProfile.id, else_=0.0)
+        return SearchClause(where=ProzProfile.id.in_(list(scores)), rank=rank)
+
+
+_BACKENDS = {
+    "like": LikeSearchBackend,
+    "mysql": MySQLFullTextBackend,
+    "mariadb": MySQLFullTextBackend,
+    "postgresql": PostgresFullTextBackend,
+    "memory": InMemorySearchBackend,
+}
+_instances: Dict[str, LikeSearchBackend] = {}
+_instances_lock = threading.Lock()
+
+
+def get_search_backend(dialect_name: str) -> LikeSearchBackend:
+    """Backend from PROFILE_SEARCH_BACKEND, or chosen by dialect when it is ``auto``."""
+    configured = (settings.PROFILE_SEARCH_BACKEND or "auto").lower()
+    name = configured if configured != "auto" else dialect_name
+    if name not in _BACKENDS:
+        name = "memory" if configured == "auto" else "like"
+    with _instances_lock:
+        backend = _instances.get(name)
+        if backend is None:
+            backend = _instances[name] = _BACKENDS[name]()
+        return backend
@@ -8,6 +8,8 @@ from fastapi import UploadFile, HTTPException, status
 import os
 import uuid
 from datetime import datetime
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.modules.proz.repositories.proz_repository import (
@@ -22,6 +24,15 @@ from app.modules.auth.models.user import User
 from app.config.settings import settings
 
 
+def profile_columns(profile: ProzProfile) -> Dict[str, Any]:
+    """Column values of a loaded profile, without touching lazy relationships.
+
+    Response schemas declare ``specialties``/``reviews`` as plain lists, so they
+    are validated from this dict and the batched specialty names are set after.
+    """
+    return {attr.key: getattr(profile, attr.key) for attr in inspect(ProzProfile).column_attrs}
+
+
 def resolve_profile_by_identifier(
     db: Session,
     identifier: str,
@@ -48,6 +59,32 @@ def resolve_profile_by_identifier(
     return None
 
 
+async def resolve_profile_by_identifier_async(
+    db: AsyncSession,
+    identifier: str,
+    *,
+    verified_only: bool = False,
+) -> Optional[ProzProfile]:
+    """Async counterpart of ``resolve_profile_by_identifier`` for AsyncSession handlers."""
+    stmt = select(ProzProfile)
+    if verified_only:
+        stmt = stmt.where(ProzProfile.verification_status == "verified")
+
+    profile = (await db.execute(stmt.where(ProzProfile.id == identifier).limit(1))).scalars().first()
+    if profile:
+        return profile
+
+    profile = (await db.execute(stmt.where(ProzProfile.user_id == identifier).limit(1))).scalars().first()
+    if profile:
+        return profile
+
+    user_email = (await db.execute(select(User.email).where(User.id == identifier).limit(1))).scalar()
+    if user_email:
+        return (await db.execute(stmt.where(ProzProfile.email == user_email).limit(1))).scalars().first()
+
+    return None
+
+
 class ProzService:
     """
     Service class for Proz Profile operations
@@ -0,0 +1,159 @@
+# app/modules/proz/text_similarity.py
+"""MinHash LSH index of profile text, for near-duplicate bio / certification / education detection.
+
+Each of ``TEXT_FIELDS`` is normalised (lower case, words only) and cut into
+overlapping ``SHINGLE_WORDS``-word shingles. A ``NUM_PERM``-value MinHash
+signature of the shingle set is split into ``BANDS`` bands of ``ROWS``
+values, and every band is stored as one hashed bucket in
+``profile_text_bands``. Two texts with Jaccard similarity ``s`` share at
+least one bucket with probability ``1 - (1 - s**ROWS)**BANDS``: 0.999 at 0.7,
+0.80 at 0.5 and 0.18 at 0.3. So "which profiles have text like this" is an indexed
+lookup of ``BANDS`` buckets instead of a comparison with every profile.
+Candidates are then confirmed by the exact Jaccard similarity of their
+shingles, at least ``NEAR_DUPLICATE_THRESHOLD``.
+
+Texts shorter than ``MIN_SHINGLES`` shingles are not indexed: short
+education lines ("BSc Computer Science") are legitimately shared.
+
+The bands are rewritten with the profile by a ``ProfileIndex`` (see
+``app.modules.proz.profile_index``).
+"""
+
+import hashlib
+import re
+from typing import Any, Dict, FrozenSet, Iterable, List, Set, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.modules.proz.models.proz import ProfileTextBand, ProzProfile
+from app.modules.proz.profile_index import REBUILD_BATCH_SIZE, ProfileIndex
+
+TEXT_FIELDS = ("bio", "certifications", "education")
+SHINGLE_WORDS = 3
+MIN_SHINGLES = 8
+NUM_PERM = 100
+BANDS = 25
+ROWS = NUM_PERM // BANDS
+NEAR_DUPLICATE_THRESHOLD = 0.7
+# Candidates confirmed per field; a template text shared by thousands is reported as "at least" this many
+MAX_CANDIDATES = 100
+
+_WORDS = re.compile(r"[a-z0-9]+")
+_TABLE = ProfileTextBand.__table__
+
+
+def _permutations() -> Tuple[np.ndarray, np.ndarray]:
+    # Fixed 64-bit (a, b) for multiply-shift hashing, derived from their index so every process agrees.
+    params = [
+        int.from_bytes(hashlib.sha256(f"minhash:{name}:{i}".encode()).digest()[:8], "little") | 1
+        for name in ("a", "b") for i in range(NUM_PERM)
+    ]
+    return (np.array(params[:NUM_PERM], dtype=np.uint64).reshape(-1, 1),
+            np.array(params[NUM_PERM:], dtype=np.uint64).reshape(-1, 1))
+
+
+_A, _B = _permutations()
+
+
+def shingles(text: Any) -> FrozenSet[str]:
+    """The text's ``SHINGLE_WORDS``-word shingles; empty when it has fewer than ``MIN_SHINGLES``."""
+    if not isinstance(text, str):
+        return frozenset()
+    words = _WORDS.findall(text.lower())
+    found = frozenset(" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1))
+    return found if len(found) >= MIN_SHINGLES else frozenset()
+
+
+def signature(found: Iterable[str]) -> np.ndarray:
+    """MinHash signature (``NUM_PERM`` values) of a shingle set."""
+    hashed = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little") for s in found),
+        dtype=np.uint64,
+    )
+    # h(x) = top 32 bits of (a * x + b) mod 2**64; uint64 arithmetic wraps, which is the mod.
+    return ((_A * hashed + _B) >> np.uint64(32)).min(axis=1)
+
+
+def buckets(field: str, found: FrozenSet[str]) -> List[str]:
+    if not found:
+        return []
+    values = signature(found)
+    return [
+        hashlib.blake2b(f"{field}:{band}:".encode() + values[band * ROWS:(band + 1) * ROWS].tobytes(),
+                        digest_size=8).hexdigest()
+        for band in range(BANDS)
+    ]
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+def profile_shingles(profile: Any) -> Dict[str, FrozenSet[str]]:
+    """``{field: shingles}`` for the indexed text fields of a profile (or any row with them)."""
+    found = {field: shingles(getattr(profile, field, None)) for field in TEXT_FIELDS}
+    return {field: values for field, values in found.items() if values}
+
+
+def _rows(proz_id: Any, profile: Any) -> List[Dict[str, Any]]:
+    return [{"proz_id": proz_id, "field": field, "bucket": bucket}
+            for field, found in profile_shingles(profile).items() for bucket in buckets(field, found)]
+
+
+def near_duplicates_many(db: Session, profiles: Iterable[Any]) -> Dict[Any, Dict[str, int]]:
+    """``{profile id: {field: number of other profiles with near-identical text}}``; fields without any are left out.
+
+    One bucket lookup for the whole batch, then one query for the candidates' text.
+    """
+    texts = {p.id: profile_shingles(p) for p in profiles}
+    wanted: Dict[str, List[Tuple[Any, str]]] = {}
+    for proz_id, found in texts.items():
+        for field, values in found.items():
+            for bucket in buckets(field, values):
+                wanted.setdefault(bucket, []).append((proz_id, field))
+    # (proz id, field) -> {candidate id: buckets shared}
+    hits: Dict[Tuple[Any, str], Dict[str, int]] = {}
+    keys = list(wanted)
+    for i in range(0, len(keys), REBUILD_BATCH_SIZE):
+        rows = db.execute(
+            select(_TABLE.c.bucket, _TABLE.c.proz_id).where(_TABLE.c.bucket.in_(keys[i:i + REBUILD_BATCH_SIZE]))
+        )
+        for bucket, other in rows:
+            for proz_id, field in wanted[bucket]:
+                if str(other) != str(proz_id):
+                    shared = hits.setdefault((proz_id, field), {})
+                    shared[str(other)] = shared.get(str(other), 0) + 1
+
+    # Confirm with exact Jaccard, most shared buckets first
+    chosen = {key: sorted(shared, key=shared.get, reverse=True)[:MAX_CANDIDATES] for key, shared in hits.items()}
+    candidate_ids = sorted({other for ids in chosen.values() for other in ids})
+    candidate_text: Dict[str, Dict[str, FrozenSet[str]]] = {}
+    columns = (ProzProfile.id,) + tuple(getattr(ProzProfile, field) for field in TEXT_FIELDS)
+    for i in range(0, len(candidate_ids), REBUILD_BATCH_SIZE):
+        for row in db.execute(select(*columns).where(ProzProfile.id.in_(candidate_ids[i:i + REBUILD_BATCH_SIZE]))):
+            candidate_text[str(row.id)] = profile_shingles(row)
+
+    result: Dict[Any, Dict[str, int]] = {proz_id: {} for proz_id in texts}
+    for (proz_id, field), ids in chosen.items():
+        mine = texts[proz_id][field]
+        similar = sum(1 for other in ids
+                      if jaccard(mine, candidate_text.get(other, {}).get(field, frozenset())) >= NEAR_DUPLICATE_THRESHOLD)
+        if similar:
+            result[proz_id][field] = similar
+    return result
+
+
+def near_duplicates(db: Session, profile: Any) -> Dict[str, int]:
+    return near_duplicates_many(db, [profile]).get(profile.id, {})
+
+
+def text_buckets(profile: Any) -> Set[str]:
+    """Every bucket of a profile's current text (``fraud_rescan`` marks the profiles sharing them)."""
+    return {bucket for field, found in profile_shingles(profile).items() for bucket in buckets(field, found)}
+
+
+index = ProfileIndex(_TABLE, TEXT_FIELDS, _rows)
+index.listen()
+rebuild = index.rebuild
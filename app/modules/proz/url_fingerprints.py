@@ -0,0 +1,135 @@
+# app/modules/proz/url_fingerprints.py
+"""Canonical URL fingerprints of Proz profiles, for duplicate-link detection.
+
+Every URL on a profile (``linkedin``, ``website``, ``portfolio_links`` and
+verification evidence) is reduced to a lower-cased host+path: no scheme,
+query, fragment, port, ``www.``/``m.`` prefix or trailing slash, and any
+``*.linkedin.com`` host becomes ``linkedin.com``. The sha256 of that string
+is stored in ``profile_url_fingerprints``, so "which other profiles use this
+link" is an indexed equality lookup instead of a ``LIKE '%url%'`` scan of
+the profiles table.
+
+The rows are rewritten with the profile by a ``ProfileIndex`` (see
+``app.modules.proz.profile_index``; its hooks are installed with the
+session factories, see ``app.database.hooks``).
+"""
+
+import hashlib
+import re
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+from sqlalchemy import distinct, func, select
+from sqlalchemy.orm import Session
+
+from app.modules.proz.models.proz import ProfileUrlFingerprint
+from app.modules.proz.profile_index import REBUILD_BATCH_SIZE, ProfileIndex
+from app.modules.proz.services.verification_helpers import evidences
+
+URL_FIELDS = ("linkedin", "website", "portfolio_links", "verification_evidences")
+# Bare hosts shared by everyone on a platform: only a path on them identifies a person.
+SHARED_HOSTS = {
+    "linkedin.com", "github.com", "gitlab.com", "bitbucket.org", "behance.net", "dribbble.com",
+    "medium.com", "facebook.com", "twitter.com", "x.com", "instagram.com", "youtube.com",
+    "google.com", "drive.google.com", "docs.google.com", "dropbox.com",
+}
+MAX_URL_LENGTH = 500
+
+_SLASHES = re.compile(r"/{2,}")
+_TABLE = ProfileUrlFingerprint.__table__
+
+
+def canonical_url(raw: Any) -> Optional[str]:
+    """``host/path`` of ``raw``, or None when it is not an http(s) URL that identifies something."""
+    if not isinstance(raw, str):
+        return None
+    value = raw.strip().lower()
+    if not value or any(ch.isspace() for ch in value):
+        return None
+    if "://" not in value:
+        # "linkedin.com/in/jane" as typed into a form
+        value = "//" + value.lstrip("/")
+    try:
+        parts = urlsplit(value)
+        host = parts.hostname or ""
+    except ValueError:
+        return None
+    if parts.scheme not in ("", "http", "https") or "." not in host:
+        return None
+    for prefix in ("www.", "m."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    if host.endswith(".linkedin.com"):
+        host = "linkedin.com"
+    path = _SLASHES.sub("/", parts.path).rstrip("/")
+    if not path and host in SHARED_HOSTS:
+        return None
+    return (host + path)[:MAX_URL_LENGTH]
+
+
+def url_hash(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+def profile_urls(profile: Any) -> Dict[str, str]:
+    """``{canonical url: source}`` for a profile (or any row with the URL fields); first source wins."""
+    found: Dict[str, str] = {}
+
+    def add(raw: Any, source: str) -> None:
+        url = canonical_url(raw)
+        if url and url not in found:
+            found[url] = source
+
+    add(profile.linkedin, "linkedin")
+    add(profile.website, "website")
+    links = profile.portfolio_links
+    for link in links if isinstance(links, list) else []:
+        add(link.get("url") if isinstance(link, dict) else link, "portfolio")
+    for item in evidences(profile):
+        add(item.get("url"), "evidence")
+    return found
+
+
+def _rows(proz_id: Any, profile: Any) -> List[Dict[str, Any]]:
+    return [{"proz_id": proz_id, "url_hash": url_hash(url), "url": url, "source": source}
+            for url, source in profile_urls(profile).items()]
+
+
+def duplicate_counts(db: Session, proz_id: Any, urls: Iterable[str]) -> Dict[str, int]:
+    """``{url: number of other profiles using it}`` for the given canonical URLs; unshared ones are left out."""
+    by_hash = {url_hash(url): url for url in urls}
+    if not by_hash:
+        return {}
+    rows = db.execute(
+        select(_TABLE.c.url_hash, func.count(distinct(_TABLE.c.proz_id)))
+        .where(_TABLE.c.url_hash.in_(list(by_hash)), _TABLE.c.proz_id != proz_id)
+        .group_by(_TABLE.c.url_hash)
+    )
+    return {by_hash[h]: count for h, count in rows}
+
+
+def duplicate_counts_many(db: Session, urls_by_profile: Dict[Any, Iterable[str]]) -> Dict[Any, Dict[str, int]]:
+    """``duplicate_counts`` for a batch of profiles in one query per ``REBUILD_BATCH_SIZE`` hashes."""
+    urls_by_profile = {proz_id: list(urls) for proz_id, urls in urls_by_profile.items()}
+    hashes = sorted({url_hash(url) for urls in urls_by_profile.values() for url in urls})
+    owners: Dict[str, set] = {}
+    for i in range(0, len(hashes), REBUILD_BATCH_SIZE):
+        rows = db.execute(
+            select(_TABLE.c.url_hash, _TABLE.c.proz_id).where(_TABLE.c.url_hash.in_(hashes[i:i + REBUILD_BATCH_SIZE]))
+        )
+        for h, proz_id in rows:
+            owners.setdefault(h, set()).add(str(proz_id))
+    result = {}
+    for proz_id, urls in urls_by_profile.items():
+        counts = {}
+        for url in urls:
+            others = len(owners.get(url_hash(url), set()) - {str(proz_id)})
+            if others:
+                counts[url] = others
+        result[proz_id] = counts
+    return result
+
+
+index = ProfileIndex(_TABLE, URL_FIELDS, _rows)
+index.listen()
+rebuild = index.rebuild
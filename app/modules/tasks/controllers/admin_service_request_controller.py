@@ -31,9 +31,9 @@ from app.modules.tasks.schemas.service_request_admin import (
 )
 from app.modules.tasks.schemas.task import ServiceRequestResponse, TaskAssignmentResponse
 from app.services.notification_service import NotificationService
+from app.core.container import get_notification_service
 
 router = APIRouter()
-notification_service = NotificationService()
 
 PROPOSAL_UPLOAD_DIR = Path(settings.UPLOAD_DIR) / "proposals"
 ALLOWED_PROPOSAL_EXTENSIONS = {".pdf", ".doc", ".docx", ".png", ".jpg", ".jpeg"}
@@ -155,6 +155,7 @@ async def create_service_request_message(
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_superuser),
+    notification_service: NotificationService = Depends(get_notification_service),
 ) -> Any:
     service_request = _get_request_or_404(db, request_id)
     admin_name = f"{current_user.first_name or ''} {current_user.last_name or ''}".strip() or "Prozlab Admin"
@@ -323,6 +324,7 @@ async def send_service_request_proposal(
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_superuser),
+    notification_service: NotificationService = Depends(get_notification_service),
 ) -> Any:
     proposal = db.query(ServiceRequestProposal).filter(ServiceRequestProposal.id == proposal_id).first()
     if not proposal:
@@ -1,19 +1,25 @@
 # app/modules/tasks/controllers/task_controller.py
 from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_, desc
-from datetime import datetime, timedelta
+from sqlalchemy import and_, desc, select
+from datetime import datetime
 import math
+from starlette.concurrency import run_in_threadpool
 
-from app.database.session import get_db
+from app.core.pagination import apply_keyset, count_cache, order_by_clauses, split_page
+from app.database.session import get_db, get_async_db
 from app.modules.auth.services.auth_service import auth_service, get_current_user, get_current_superuser
 from app.modules.auth.models.user import User
-from app.modules.proz.models.proz import ProzProfile, Specialty, ProzSpecialty
-from app.modules.tasks.models.task import ServiceRequest, TaskAssignment, TaskNotification, TaskStatus, TaskPriority
+from app.modules.proz.models.proz import ProzProfile
+from app.modules.tasks.models.task import ServiceRequest, ServiceRequestMatch, TaskAssignment, TaskNotification, TaskStatus
 from app.modules.tasks.services.task_request_service import TaskRequestService
+from app.modules.tasks.services.service_request_matches import AI_MATCH, AUTO_SUGGEST, match_precomputer
 from app.services.notification_service import NotificationService
 from app.services.ai_profile_service import AIProfileService
+from app.core.container import container, get_ai_profile_service, get_notification_service, get_task_request_service
+from app.services import stats_service
 from app.modules.tasks.schemas.task import (
     ServiceRequestCreate,
     ServiceRequestResponse,
@@ -37,12 +43,13 @@ router = APIRouter()
 async def create_service_request(
     request: ServiceRequestCreate,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    task_request_service: TaskRequestService = Depends(get_task_request_service),
+    notification_service: NotificationService = Depends(get_notification_service),
 ) -> Any:
     """
     Create a new service request from a company/client.
     """
-    task_request_service = TaskRequestService()
     from app.modules.tasks.schemas.task_request import BusinessTaskRequestCreate
 
     payload = task_request_service._normalize_request_payload(
@@ -62,7 +69,7 @@ async def create_service_request(
         admin_user = db.query(User).filter(User.is_superuser == True).first()
         if admin_user:
             background_tasks.add_task(
-                NotificationService().send_service_request_notification,
+                notification_service.send_service_request_notification,
                 admin_user.email,
                 f"{admin_user.first_name} {admin_user.last_name}",
                 service_request.company_name,
@@ -75,7 +82,7 @@ async def create_service_request(
             )
         # primary ops
         background_tasks.add_task(
-            NotificationService().send_service_request_notification,
+            notification_service.send_service_request_notification,
             "alex@mista.io",
             "Alex",
             service_request.company_name,
@@ -130,6 +137,7 @@ async def get_service_requests_admin(
     status: Optional[str] = Query(None),
     priority: Optional[str] = Query(None),
     category: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="Keyset pagination: pass empty for the first page, then next_cursor"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_superuser)
 ) -> Any:
@@ -147,12 +155,20 @@ async def get_service_requests_admin(
         query_obj = query_obj.filter(ServiceRequest.service_category.ilike(f"%{category}%"))
     
     # Sort newest requests first
-    query_obj = query_obj.order_by(ServiceRequest.created_at.desc())
+    order = [(ServiceRequest.created_at, True), (ServiceRequest.id, True)]
     
     # Pagination
-    total_count = query_obj.count()
-    offset = (page - 1) * page_size
-    requests = query_obj.offset(offset).limit(page_size).all()
+    next_page_cursor = None
+    if cursor is None:
+        total_count = query_obj.count()
+        offset = (page - 1) * page_size
+        requests = query_obj.order_by(*order_by_clauses(order)).offset(offset).limit(page_size).all()
+    else:
+        total_count = count_cache.get_or_compute(
+            ("admin_service_requests", status, priority, category), query_obj.count
+        )
+        rows = apply_keyset(query_obj, order, cursor).limit(page_size + 1).all()
+        requests, next_page_cursor = split_page(rows, page_size, key=lambda r: [r.created_at, r.id])
     
     # Add assignments count for each request
     requests_with_counts = []
@@ -169,7 +185,8 @@ async def get_service_requests_admin(
         "total_count": total_count,
         "page": page,
         "page_size": page_size,
-        "total_pages": math.ceil(total_count / page_size)
+        "total_pages": math.ceil(total_count / page_size),
+        "next_cursor": next_page_cursor
     }
 
 
@@ -284,6 +301,7 @@ async def get_task_assignments_admin(
     page_size: int = Query(20, ge=1, le=100),
     status: Optional[str] = Query(None),
     proz_id: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="Keyset pagination: pass empty for the first page, then next_cursor"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_superuser)
 ) -> Any:
@@ -297,11 +315,17 @@ async def get_task_assignments_admin(
     if proz_id:
         query_obj = query_obj.filter(TaskAssignment.proz_id == proz_id)
     
-    query_obj = query_obj.order_by(desc(TaskAssignment.assigned_at))
+    order = [(TaskAssignment.assigned_at, True), (TaskAssignment.id, True)]
     
-    total_count = query_obj.count()
-    offset = (page - 1) * page_size
-    assignments = query_obj.offset(offset).limit(page_size).all()
+    next_page_cursor = None
+    if cursor is None:
+        total_count = query_obj.count()
+        offset = (page - 1) * page_size
+        assignments = query_obj.order_by(*order_by_clauses(order)).offset(offset).limit(page_size).all()
+    else:
+        total_count = count_cache.get_or_compute(("admin_assignments", status, proz_id), query_obj.count)
+        rows = apply_keyset(query_obj, order, cursor).limit(page_size + 1).all()
+        assignments, next_page_cursor = split_page(rows, page_size, key=lambda a: [a.assigned_at, a.id])
     
     # Build response with full details
     assignments_response = []
@@ -317,7 +341,8 @@ async def get_task_assignments_admin(
         "total_count": total_count,
         "page": page,
         "page_size": page_size,
-        "total_pages": math.ceil(total_count / page_size)
+        "total_pages": math.ceil(total_count / page_size),
+        "next_cursor": next_page_cursor
     }
 
 
@@ -329,50 +354,7 @@ async def get_admin_task_stats(
     """
     Get task management statistics for admin dashboard.
     """
-    total_requests = db.query(ServiceRequest).count()
-    pending_requests = db.query(ServiceRequest).filter(
-        ServiceRequest.status == TaskStatus.PENDING
-    ).count()
-    assigned_requests = db.query(ServiceRequest).filter(
-        ServiceRequest.status.in_([TaskStatus.ASSIGNED, TaskStatus.ACCEPTED, TaskStatus.IN_PROGRESS])
-    ).count()
-    completed_requests = db.query(ServiceRequest).filter(
-        ServiceRequest.status == TaskStatus.COMPLETED
-    ).count()
-    urgent_requests = db.query(ServiceRequest).filter(
-        ServiceRequest.priority == TaskPriority.URGENT
-    ).count()
-    
-    # Unassigned requests (no assignments)
-    unassigned_requests = db.query(ServiceRequest).filter(
-        and_(
-            ServiceRequest.status == TaskStatus.PENDING,
-            ~ServiceRequest.assignments.any()
-        )
-    ).count()
-    
-    # Active professionals (have assignments in last 30 days)
-    thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-    active_professionals = db.query(ProzProfile).join(TaskAssignment).filter(
-        TaskAssignment.assigned_at >= thirty_days_ago
-    ).distinct().count()
-    
-    # Requests this week
-    week_ago = datetime.utcnow() - timedelta(days=7)
-    requests_this_week = db.query(ServiceRequest).filter(
-        ServiceRequest.created_at >= week_ago
-    ).count()
-    
-    return AdminTaskStatsResponse(
-        total_requests=total_requests,
-        pending_requests=pending_requests,
-        assigned_requests=assigned_requests,
-        completed_requests=completed_requests,
-        urgent_requests=urgent_requests,
-        unassigned_requests=unassigned_requests,
-        active_professionals=active_professionals,
-        requests_this_week=requests_this_week
-    )
+    return AdminTaskStatsResponse(**stats_service.task_request_stats(db))
 
 
 # ==================== PROFESSIONAL ENDPOINTS ====================
@@ -616,96 +598,28 @@ async def mark_notification_read(
 
 @router.get("/professional/dashboard-stats", response_model=DashboardStatsResponse)
 async def get_professional_dashboard_stats(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ) -> Any:
     """
     Get dashboard statistics for the current professional.
     """
     # Get professional profile
-    professional = db.query(ProzProfile).filter(
-        ProzProfile.email == current_user.email
-    ).first()
+    professional = (await db.execute(
+        select(ProzProfile).where(ProzProfile.email == current_user.email).limit(1)
+    )).scalars().first()
     
     if not professional:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Professional profile not found"
         )
-    
-    # Calculate stats
-    total_assignments = db.query(TaskAssignment).filter(
-        TaskAssignment.proz_id == professional.id
-    ).count()
-    
-    pending_assignments = db.query(TaskAssignment).filter(
-        and_(
-            TaskAssignment.proz_id == professional.id,
-            TaskAssignment.status == TaskStatus.ASSIGNED
-        )
-    ).count()
-    
-    active_assignments = db.query(TaskAssignment).filter(
-        and_(
-            TaskAssignment.proz_id == professional.id,
-            TaskAssignment.status.in_([TaskStatus.ACCEPTED, TaskStatus.IN_PROGRESS])
-        )
-    ).count()
-    
-    completed_assignments = db.query(TaskAssignment).filter(
-        and_(
-            TaskAssignment.proz_id == professional.id,
-            TaskAssignment.status == TaskStatus.COMPLETED
-        )
-    ).count()
-    
-    unread_notifications = db.query(TaskNotification).filter(
-        and_(
-            TaskNotification.proz_id == professional.id,
-            TaskNotification.is_read == False
-        )
-    ).count()
-    
-    # Calculate earnings (simplified - would need payment tracking)
-    week_ago = datetime.utcnow() - timedelta(days=7)
-    month_ago = datetime.utcnow() - timedelta(days=30)
-    
-    # This week earnings (based on completed tasks - simplified calculation)
-    this_week_completed = db.query(TaskAssignment).filter(
-        and_(
-            TaskAssignment.proz_id == professional.id,
-            TaskAssignment.status == TaskStatus.COMPLETED,
-            TaskAssignment.completed_at >= week_ago
-        )
-    ).all()
-    
-    this_week_earnings = sum([
-        (assignment.estimated_hours or 0) * (assignment.proposed_rate or 0)
-        for assignment in this_week_completed
-    ])
-    
-    # This month earnings
-    this_month_completed = db.query(TaskAssignment).filter(
-        and_(
-            TaskAssignment.proz_id == professional.id,
-            TaskAssignment.status == TaskStatus.COMPLETED,
-            TaskAssignment.completed_at >= month_ago
-        )
-    ).all()
-    
-    this_month_earnings = sum([
-        (assignment.estimated_hours or 0) * (assignment.proposed_rate or 0)
-        for assignment in this_month_completed
-    ])
+
+    # Assignment counters and completed-task earnings in one aggregate
+    stats = await stats_service.professional_stats_async(db, professional.id)
     
     return DashboardStatsResponse(
-        total_assignments=total_assignments,
-        pending_assignments=pending_assignments,
-        active_assignments=active_assignments,
-        completed_assignments=completed_assignments,
-        unread_notifications=unread_notifications,
-        this_week_earnings=this_week_earnings,
-        this_month_earnings=this_month_earnings,
+        **stats,
         average_rating=professional.rating or 0.0
     )
 
@@ -799,7 +713,7 @@ async def send_assignment_notification(
     This is a background task.
     """
     try:
-        notification_service = NotificationService()
+        notification_service = container.notification_service
         result = notification_service.send_task_assignment_notification(
             professional_email=professional_email,
             professional_name=professional_name,
@@ -836,7 +750,7 @@ async def send_task_accepted_notification(
     This is a background task.
     """
     try:
-        notification_service = NotificationService()
+        notification_service = container.notification_service
         result = notification_service.send_task_accepted_notification(
             admin_email=admin_email,
             admin_name=admin_name,
@@ -870,7 +784,7 @@ async def send_task_rejected_notification(
     This is a background task.
     """
     try:
-        notification_service = NotificationService()
+        notification_service = container.notification_service
         result = notification_service.send_task_rejected_notification(
             admin_email=admin_email,
             admin_name=admin_name,
@@ -893,12 +807,17 @@ async def send_task_rejected_notification(
 @router.get("/auto-suggest-professionals", response_model=List[dict])
 async def auto_suggest_professionals(
     service_request_id: str,
+    response: Response,
     limit: int = Query(5, le=10),
+    recompute: bool = Query(False, description="Re-rank the current pool instead of reading the stored shortlist"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_superuser)
+    current_user: User = Depends(get_current_superuser),
+    ai_profile_service: AIProfileService = Depends(get_ai_profile_service),
 ) -> Any:
     """
     Auto-suggest professionals for a service request based on skills, location, etc.
+
+    Reads the shortlist precomputed when the request was created or last changed.
     """
     # Normalize and validate service_request_id to avoid UUID parse errors from stray whitespace
     sr_id = (service_request_id or "").strip()
@@ -914,75 +833,27 @@ async def auto_suggest_professionals(
             detail="Service request not found"
         )
     
-    # Find matching professionals
-    query_obj = db.query(ProzProfile).filter(
-        ProzProfile.verification_status == "verified"
+    # Stored shortlist minus professionals assigned or unverified since; computed now if missing or stale
+    matches, stored = await run_in_threadpool(
+        match_precomputer.shortlist, db, service_request, AUTO_SUGGEST, limit, ai_profile_service, recompute
     )
-    
-    # Match by specialty/category
-    if service_request.service_category:
-        query_obj = query_obj.join(ProzSpecialty).join(Specialty).filter(
-            Specialty.name.ilike(f"%{service_request.service_category}%")
-        )
-    
-    # Match by location (if not remote)
-    if not service_request.remote_work_allowed and service_request.location_preference:
-        query_obj = query_obj.filter(
-            ProzProfile.location.ilike(f"%{service_request.location_preference}%")
-        )
-    
-    # Match by hourly rate (if budget specified)
-    if service_request.budget_max:
-        # Assuming budget is total project, estimate hourly based on expected duration
-        estimated_hours = 40  # Default estimate, could be smarter
-        max_hourly = service_request.budget_max / estimated_hours
-        query_obj = query_obj.filter(
-            or_(
-                ProzProfile.hourly_rate <= max_hourly,
-                ProzProfile.hourly_rate.is_(None)
-            )
-        )
-    
-    # Order by rating and exclude already assigned
-    assigned_proz_ids = db.query(TaskAssignment.proz_id).filter(
-        TaskAssignment.service_request_id == sr_id
-    ).subquery()
-    
-    professionals = query_obj.filter(
-        ~ProzProfile.id.in_(assigned_proz_ids)
-    ).order_by(
-        desc(ProzProfile.rating),
-        desc(ProzProfile.years_experience)
-    ).limit(limit).all()
-    
+    _set_match_headers(response, stored)
+
     # Build suggestions with match reasons
     suggestions = []
-    for professional in professionals:
-        # Get specialties
-        specialties = db.query(Specialty.name).join(ProzSpecialty).filter(
-            ProzSpecialty.proz_id == professional.id
-        ).all()
-        
-        match_reasons = []
-        if any(service_request.service_category.lower() in s.name.lower() for s in specialties):
-            match_reasons.append("Matching specialty")
-        if professional.location and service_request.location_preference:
-            if service_request.location_preference.lower() in professional.location.lower():
-                match_reasons.append("Local professional")
-        if professional.rating >= 4.0:
-            match_reasons.append("High rating")
-        
+    for match in matches:
+        professional = match["candidate"]
         suggestions.append({
-            "id": str(professional.id),
-            "name": f"{professional.first_name} {professional.last_name}",
-            "email": professional.email,
-            "location": professional.location,
-            "rating": professional.rating,
-            "years_experience": professional.years_experience,
-            "hourly_rate": professional.hourly_rate,
-            "specialties": [s.name for s in specialties],
-            "match_reasons": match_reasons,
-            "profile_image_url": professional.profile_image_url
+            "id": professional["id"],
+            "name": f"{professional['first_name']} {professional['last_name']}",
+            "email": professional["email"],
+            "location": professional["location"],
+            "rating": professional["rating"],
+            "years_experience": professional["years_experience"],
+            "hourly_rate": professional["hourly_rate"],
+            "specialties": professional["specialties"],
+            "match_reasons": match["reasons"],
+            "profile_image_url": professional["profile_image_url"]
         })
     
     return suggestions
@@ -991,13 +862,17 @@ async def auto_suggest_professionals(
 @router.get("/admin/ai-match", response_model=List[dict])
 async def ai_match_professionals(
     service_request_id: str,
+    response: Response,
     limit: int = Query(10, le=20),
+    recompute: bool = Query(False, description="Re-rank the current pool instead of reading the stored shortlist"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_superuser)
+    current_user: User = Depends(get_current_superuser),
+    ai_profile_service: AIProfileService = Depends(get_ai_profile_service),
 ) -> Any:
     """AI-enhanced ranking of qualified, verified professionals for a service request.
 
-    Returns top N candidates with score and reasons.
+    Returns top N candidates with score and reasons, from the shortlist
+    precomputed when the request was created or last changed.
     """
     # Normalize and validate service_request_id to avoid UUID parse errors from stray whitespace
     sr_id = (service_request_id or "").strip()
@@ -1007,46 +882,12 @@ async def ai_match_professionals(
     if not sr:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Service request not found")
 
-    # Base pool: verified, not already assigned
-    assigned_proz_ids = db.query(TaskAssignment.proz_id).filter(
-        TaskAssignment.service_request_id == sr_id
-    ).subquery()
-
-    base_q = db.query(ProzProfile).filter(
-        and_(
-            ProzProfile.verification_status == "verified",
-            ~ProzProfile.id.in_(assigned_proz_ids)
-        )
-    ).order_by(desc(ProzProfile.rating), desc(ProzProfile.years_experience)).limit(100)
-
-    # Build candidate dicts
-    candidates = []
-    for p in base_q.all():
-        # Fetch specialties names
-        spec_names = [s.name for s in db.query(Specialty).join(ProzSpecialty).filter(ProzSpecialty.proz_id == p.id).all()]
-        candidates.append({
-            "id": str(p.id),
-            "first_name": p.first_name,
-            "last_name": p.last_name,
-            "email": p.email,
-            "location": p.location,
-            "years_experience": p.years_experience,
-            "hourly_rate": p.hourly_rate,
-            "rating": p.rating,
-            "specialties": spec_names,
-            "profile_image_url": p.profile_image_url,
-        })
-
-    sr_dict = {
-        "service_title": sr.service_title,
-        "service_description": sr.service_description,
-        "service_category": sr.service_category,
-        "location_preference": sr.location_preference,
-        "budget_max": sr.budget_max,
-        "remote_work_allowed": sr.remote_work_allowed,
-    }
+    # Stored shortlist minus professionals assigned or unverified since; computed now if missing or stale
+    ranked, stored = await run_in_threadpool(
+        match_precomputer.shortlist, db, sr, AI_MATCH, limit, ai_profile_service, recompute
+    )
+    _set_match_headers(response, stored)
 
-    ranked = AIProfileService().rank_professionals(sr_dict, candidates, top_k=limit)
     # Attach proz_id and return
     out = []
     for r in ranked:
@@ -1064,4 +905,10 @@ async def ai_match_professionals(
             "score": r.get("score", 0),
             "reasons": r.get("reasons", []),
         })
-    return out
\ No newline at end of file
+    return out
+
+
+def _set_match_headers(response: Response, stored: ServiceRequestMatch) -> None:
+    computed_at = stored.computed_at
+    response.headers["X-Match-Computed-At"] = computed_at.isoformat() if computed_at else ""
+    response.headers["X-Match-Analyzer"] = stored.analyzer or ""
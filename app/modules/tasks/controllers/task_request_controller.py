@@ -7,7 +7,7 @@ from app.database.session import get_db
 from app.modules.auth.services.auth_service import get_current_user, get_current_superuser
 from app.modules.auth.models.user import User
 from app.modules.tasks.services.task_request_service import TaskRequestService
-from app.services.notification_service import NotificationService
+from app.core.container import container, get_task_request_service
 from app.modules.tasks.schemas.task_request import (
     BusinessTaskRequestCreate,
     BusinessTaskRequestResponse,
@@ -21,7 +21,6 @@ from app.modules.tasks.models.task import ServiceRequest, TaskAssignment
 from sqlalchemy import and_
 
 router = APIRouter()
-task_request_service = TaskRequestService()
 
 
 # ==================== PUBLIC ENDPOINTS ====================
@@ -30,7 +29,8 @@ task_request_service = TaskRequestService()
 async def create_business_task_request(
     request: BusinessTaskRequestCreate,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    task_request_service: TaskRequestService = Depends(get_task_request_service),
 ) -> Any:
     """
     Create a new business task request.
@@ -143,8 +143,10 @@ async def get_business_task_requests_admin(
     status: Optional[TaskStatusEnum] = Query(None, description="Filter by status"),
     priority: Optional[TaskPriorityEnum] = Query(None, description="Filter by priority"),
     company_name: Optional[str] = Query(None, description="Filter by company name"),
+    cursor: Optional[str] = Query(None, description="Keyset pagination: pass empty for the first page, then next_cursor"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_superuser)
+    current_user: User = Depends(get_current_superuser),
+    task_request_service: TaskRequestService = Depends(get_task_request_service),
 ) -> Any:
     """
     Get business task requests for admin review.
@@ -158,10 +160,13 @@ async def get_business_task_requests_admin(
             limit=limit,
             status=status,
             priority=priority,
-            company_name=company_name
+            company_name=company_name,
+            cursor=cursor
         )
         return result
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"❌ Error getting business task requests: {str(e)}")
         raise HTTPException(
@@ -175,7 +180,8 @@ async def assign_task_to_professional(
     assignment: TaskAssignmentProposalCreate,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_superuser)
+    current_user: User = Depends(get_current_superuser),
+    task_request_service: TaskRequestService = Depends(get_task_request_service),
 ) -> Any:
     """
     Assign a task to a professional (Admin only).
@@ -276,7 +282,8 @@ async def get_task_assignments_admin(
 async def get_my_task_assignments(
     status: Optional[TaskStatusEnum] = Query(None, description="Filter by status"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    task_request_service: TaskRequestService = Depends(get_task_request_service),
 ) -> Any:
     """
     Get task assignments for the current professional.
@@ -305,7 +312,8 @@ async def update_assignment_status(
     new_status: TaskStatusEnum = Query(..., description="New status: accepted, rejected, in_progress, completed"),
     proz_response: Optional[str] = Query(None, description="Professional response/notes"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    task_request_service: TaskRequestService = Depends(get_task_request_service),
 ) -> Any:
     """
     Update task assignment status (Professional only).
@@ -406,8 +414,7 @@ async def send_service_request_notification(
     This is a background task.
     """
     try:
-        notification_service = NotificationService()
-        result = notification_service.send_service_request_notification(
+        result = container.notification_service.send_service_request_notification(
             admin_email=admin_email,
             admin_name=admin_name,
             company_name=company_name,
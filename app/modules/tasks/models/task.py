@@ -1,5 +1,5 @@
 # app/modules/tasks/models/task.py
-from sqlalchemy import Column, String, Text, DateTime, Float, Boolean, ForeignKey, Enum, Integer, JSON
+from sqlalchemy import Column, String, Text, DateTime, Float, Boolean, ForeignKey, Enum, Integer, JSON, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import uuid
@@ -79,6 +79,7 @@ class ServiceRequest(Base):
     assignments = relationship("TaskAssignment", back_populates="service_request", cascade="all, delete-orphan")
     messages = relationship("ServiceRequestMessage", back_populates="service_request", cascade="all, delete-orphan")
     proposals = relationship("ServiceRequestProposal", back_populates="service_request", cascade="all, delete-orphan")
+    matches = relationship("ServiceRequestMatch", back_populates="service_request", cascade="all, delete-orphan")
 
 
 class TaskAssignment(Base):
@@ -195,3 +196,32 @@ class ServiceRequestProposal(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     service_request = relationship("ServiceRequest", back_populates="proposals")
+
+
+class ServiceRequestMatch(Base):
+    """Precomputed professional shortlist for a service request, one row per matcher."""
+    __tablename__ = "service_request_matches"
+    __table_args__ = (UniqueConstraint("service_request_id", "kind", name="uq_service_request_matches_request_kind"),)
+
+    id = Column(PortableUUID, primary_key=True, default=uuid.uuid4)
+    service_request_id = Column(PortableUUID, ForeignKey("service_requests.id"), nullable=False, index=True)
+    kind = Column(String(20), nullable=False)  # ai_match, auto_suggest
+    matches = Column(JSON, nullable=False)  # [{proz_id, score, reasons}], best first
+    analyzer = Column(String(50), nullable=True)  # model name or "heuristic"
+    request_fingerprint = Column(String(64), nullable=False)  # hash of the request's matching fields
+    # ai_match: hash of the shortlist sent to the model; a pool sweep skips the model while it is unchanged
+    input_fingerprint = Column(String(64), nullable=True)
+    pool_size = Column(Integer, nullable=True)
+    duration_ms = Column(Integer, nullable=True)
+    computed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    service_request = relationship("ServiceRequest", back_populates="matches")
+
+
+class MatchPoolSweep(Base):
+    """The candidate pool open requests were last re-ranked against; the worker that updates it runs the sweep."""
+    __tablename__ = "match_pool_sweeps"
+
+    name = Column(String(50), primary_key=True)
+    pool_fingerprint = Column(String(64), nullable=False)  # candidate_features.fingerprint()
+    swept_at = Column(DateTime(timezone=True), nullable=False)
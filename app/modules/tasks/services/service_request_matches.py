@@ -0,0 +1,408 @@
+# app/modules/tasks/services/service_request_matches.py
+"""Precomputed professional shortlists for service requests.
+
+Ranking used to run when an admin opened ``/tasks/admin/ai-match`` or
+``/tasks/auto-suggest-professionals``. Now a background thread ranks every
+new service request as soon as it is committed (through either create
+path: the hooks below are on the ``Session`` class) and stores both
+shortlists, with scores and reasons, in ``service_request_matches``. The
+endpoints read the stored rows.
+
+A shortlist is recomputed when:
+
+- the request's matching fields change (title, description, category,
+  location, budget, remote); reads also compare a fingerprint of those
+  fields, so an edit is never served a stale list;
+- an assignment is removed, since that professional is eligible again;
+- the candidate pool changed: a verified professional joined or left, or
+  a field ranking looks at changed (``candidate_features.generation``).
+  Open requests are re-ranked at most every ``MATCH_POOL_REFRESH_SECONDS``,
+  by one worker process: the first to record the new pool fingerprint in
+  ``match_pool_sweeps`` runs the sweep. A sweep only calls the model for
+  requests whose shortlist (the candidates the model would see) changed;
+- an admin asks for it (``recompute=true``).
+
+Reads drop professionals that were assigned or lost their verification
+since the list was computed, and fill names, rates etc. from the feature
+store. ``MATCH_PRECOMPUTE_TOP_K`` entries are stored so that a few of those
+can drop out before a read has to recompute.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from app.config.settings import settings
+from app.database.session import SessionLocal
+from app.modules.tasks.models.task import (
+    MatchPoolSweep, ServiceRequest, ServiceRequestMatch, TaskAssignment, TaskStatus,
+)
+from app.services import candidate_scorer
+from app.services.candidate_features import candidate_features
+
+logger = logging.getLogger(__name__)
+
+AI_MATCH = "ai_match"
+AUTO_SUGGEST = "auto_suggest"
+KINDS = (AI_MATCH, AUTO_SUGGEST)
+
+# Requests still being staffed; only these are re-ranked when the pool changes.
+OPEN_STATUSES = (TaskStatus.PENDING, TaskStatus.ASSIGNED)
+MATCH_FIELDS = (
+    "service_title",
+    "service_description",
+    "service_category",
+    "location_preference",
+    "budget_max",
+    "remote_work_allowed",
+)
+# Seconds before retrying after a failed sweep (database unavailable).
+RETRY_SECONDS = 30.0
+# match_pool_sweeps row shared by every worker process
+SWEEP_NAME = "open_requests"
+
+
+def request_terms(service_request: ServiceRequest) -> Dict[str, Any]:
+    """The fields matching looks at, as the dict the rankers take."""
+    return {field: getattr(service_request, field) for field in MATCH_FIELDS}
+
+
+def request_fingerprint(terms: Dict[str, Any]) -> str:
+    # 2000 and 2000.0 are the same budget whether it came from the API or the database.
+    canonical = {k: int(v) if isinstance(v, float) and v.is_integer() else v for k, v in terms.items()}
+    encoded = json.dumps(canonical, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _shortlist_fingerprint(terms: Dict[str, Any], shortlist: List[Dict[str, Any]]) -> str:
+    encoded = json.dumps([terms, shortlist], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _suggestion_reasons(match: Dict[str, Any]) -> List[str]:
+    reasons = []
+    if match["specialty"]:
+        reasons.append("Matching specialty")
+    if match["local"]:
+        reasons.append("Local professional")
+    if (match["candidate"]["rating"] or 0) >= 4.0:
+        reasons.append("High rating")
+    return reasons
+
+
+class MatchPrecomputer:
+    def __init__(self, session_factory: Optional[Callable[[], Session]] = None,
+                 top_k: Optional[int] = None, pool_refresh_seconds: Optional[float] = None):
+        self._session_factory = session_factory or SessionLocal
+        self.top_k = top_k or settings.MATCH_PRECOMPUTE_TOP_K
+        self.pool_refresh_seconds = (
+            settings.MATCH_POOL_REFRESH_SECONDS if pool_refresh_seconds is None else pool_refresh_seconds
+        )
+        self._ai_service = None
+        self._lock = threading.Lock()
+        self._pending: Set[str] = set()
+        self._computed = 0
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # -- computing ------------------------------------------------------------
+
+    def compute(self, db: Session, service_request: ServiceRequest, ai_service,
+                kinds: Iterable[str] = KINDS, sweep: bool = False) -> Dict[str, ServiceRequestMatch]:
+        """Rank the current pool for ``service_request`` and store the shortlists; returns the rows by kind.
+
+        With ``sweep``, a stored ``ai_match`` list whose model input is unchanged is kept as it is.
+        """
+        terms = request_terms(service_request)
+        assigned_ids = [str(pid) for (pid,) in db.query(TaskAssignment.proz_id).filter(
+            TaskAssignment.service_request_id == service_request.id
+        )]
+        pool = candidate_features.snapshot(assigned_ids)
+        values = {}
+        for kind in kinds:
+            started = time.monotonic()
+            if kind == AI_MATCH:
+                shortlist = ai_service.llm_shortlist(terms, pool)
+                input_fingerprint = None if shortlist is None else _shortlist_fingerprint(terms, shortlist)
+                if sweep and input_fingerprint is not None:
+                    row = self.stored(db, service_request.id, AI_MATCH)
+                    if row is not None and row.input_fingerprint == input_fingerprint:
+                        continue
+                ranked, analyzer = ai_service.rank_professionals_with_analyzer(
+                    terms, pool if shortlist is None else shortlist, top_k=self.top_k
+                )
+                matches = [
+                    {"proz_id": r["candidate"].get("id"), "score": r.get("score", 0), "reasons": r.get("reasons", [])}
+                    for r in ranked
+                ]
+                # A heuristic fallback (model unavailable) is retried by the next sweep
+                extra = {"input_fingerprint": None if analyzer == "heuristic" else input_fingerprint}
+            else:
+                analyzer = "rules"
+                matches = [
+                    {"proz_id": m["candidate"]["id"], "score": None, "reasons": _suggestion_reasons(m)}
+                    for m in candidate_scorer.filter_matches(pool, terms, self.top_k)
+                ]
+                extra = {}
+            values[kind] = {
+                "matches": matches,
+                "analyzer": analyzer,
+                "pool_size": len(pool),
+                "duration_ms": int((time.monotonic() - started) * 1000),
+                **extra,
+            }
+        rows = self._store(db, service_request.id, request_fingerprint(terms), values) if values else {}
+        with self._lock:
+            self._computed += 1
+        return rows
+
+    def _store(self, db: Session, service_request_id, fingerprint: str,
+               values: Dict[str, Dict[str, Any]]) -> Dict[str, ServiceRequestMatch]:
+        # Another worker process may insert the same (request, kind) first; then update its row.
+        for attempt in range(2):
+            existing = {
+                row.kind: row for row in db.query(ServiceRequestMatch).filter(
+                    ServiceRequestMatch.service_request_id == service_request_id,
+                    ServiceRequestMatch.kind.in_(list(values)),
+                )
+            }
+            rows = {}
+            for kind, fields in values.items():
+                row = existing.get(kind)
+                if row is None:
+                    row = ServiceRequestMatch(service_request_id=service_request_id, kind=kind)
+                    db.add(row)
+                for name, value in fields.items():
+                    setattr(row, name, value)
+                row.request_fingerprint = fingerprint
+                # Database clock, like the request's own timestamps
+                row.computed_at = func.now()
+                rows[kind] = row
+            try:
+                db.commit()
+            except IntegrityError:
+                db.rollback()
+                if attempt:
+                    raise
+                continue
+            for row in rows.values():
+                db.refresh(row)
+            return rows
+
+    # -- reads ----------------------------------------------------------------
+
+    def stored(self, db: Session, service_request_id, kind: str) -> Optional[ServiceRequestMatch]:
+        return db.query(ServiceRequestMatch).filter(
+            ServiceRequestMatch.service_request_id == service_request_id,
+            ServiceRequestMatch.kind == kind,
+        ).first()
+
+    def _current(self, db: Session, service_request_id, matches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        assigned = {str(pid) for (pid,) in db.query(TaskAssignment.proz_id).filter(
+            TaskAssignment.service_request_id == service_request_id
+        )}
+        candidates = candidate_features.candidates_by_id(m["proz_id"] for m in matches)
+        return [
+            {"candidate": candidates[m["proz_id"]], "score": m["score"], "reasons": m["reasons"]}
+            for m in matches
+            if m["proz_id"] in candidates and m["proz_id"] not in assigned
+        ]
+
+    def shortlist(self, db: Session, service_request: ServiceRequest, kind: str, limit: int, ai_service,
+                  recompute: bool = False) -> Tuple[List[Dict[str, Any]], ServiceRequestMatch]:
+        """``([{candidate, score, reasons}], row)``: the stored shortlist, computed first when missing or stale.
+
+        Blocks on the database and, for ``ai_match`` computations, on the model.
+        """
+        row = None if recompute else self.stored(db, service_request.id, kind)
+        computed = False
+        if row is None or row.request_fingerprint != request_fingerprint(request_terms(service_request)):
+            row = self.compute(db, service_request, ai_service, kinds=(kind,))[kind]
+            computed = True
+        entries = self._current(db, service_request.id, row.matches)
+        if len(entries) < limit and len(row.matches) >= self.top_k and not computed:
+            # Assignments or verification changes used up the stored headroom.
+            row = self.compute(db, service_request, ai_service, kinds=(kind,))[kind]
+            entries = self._current(db, service_request.id, row.matches)
+        return entries[:limit], row
+
+    # -- background thread ----------------------------------------------------
+
+    def enqueue(self, service_request_ids: Iterable[str]) -> None:
+        """Queue requests for recomputation; a no-op unless the thread runs (reads compute on a miss)."""
+        if self._thread is None:
+            return
+        with self._lock:
+            self._pending.update(str(i) for i in service_request_ids)
+        self._wake.set()
+
+    def start(self, ai_service) -> None:
+        """Compute queued requests and re-rank open ones on pool changes until ``stop()``."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._ai_service = ai_service
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="service-request-matches", daemon=True)
+            self._thread.start()
+
+    def _compute_one(self, service_request_id: str, sweep: bool = False) -> None:
+        db = self._session_factory()
+        try:
+            service_request = db.get(ServiceRequest, service_request_id)
+            if service_request is None or service_request.status not in OPEN_STATUSES:
+                return
+            self.compute(db, service_request, self._ai_service, sweep=sweep)
+        except Exception:
+            db.rollback()
+            logger.exception(f"Precomputing matches for service request {service_request_id} failed")
+        finally:
+            db.close()
+
+    def _open_request_ids(self) -> List[str]:
+        db = self._session_factory()
+        try:
+            return [str(i) for (i,) in db.query(ServiceRequest.id).filter(ServiceRequest.status.in_(OPEN_STATUSES))]
+        finally:
+            db.close()
+
+    def _claim_sweep(self, fingerprint: str) -> Optional[bool]:
+        """Record ``fingerprint`` as the pool open requests are ranked against.
+
+        True: this process recorded it and runs the sweep. False: nothing to
+        sweep (already recorded, or the first record, taken as the baseline).
+        None: another process swept less than ``pool_refresh_seconds`` ago;
+        try again later.
+        """
+        db = self._session_factory()
+        try:
+            # Conditional update, so only one worker process claims each pool change.
+            claimed = db.execute(
+                update(MatchPoolSweep)
+                .where(
+                    MatchPoolSweep.name == SWEEP_NAME,
+                    MatchPoolSweep.pool_fingerprint != fingerprint,
+                    MatchPoolSweep.swept_at < _now() - timedelta(seconds=self.pool_refresh_seconds),
+                )
+                .values(pool_fingerprint=fingerprint, swept_at=_now())
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.commit()
+            if claimed:
+                return True
+            recorded = db.get(MatchPoolSweep, SWEEP_NAME)
+            if recorded is None:
+                db.add(MatchPoolSweep(name=SWEEP_NAME, pool_fingerprint=fingerprint, swept_at=_now()))
+                try:
+                    db.commit()
+                except IntegrityError:
+                    db.rollback()  # another process recorded its baseline first
+                return False
+            return None if recorded.pool_fingerprint != fingerprint else False
+        finally:
+            db.close()
+
+    def _run(self) -> None:
+        # The local pool generation last checked against match_pool_sweeps; None until the store's first load.
+        swept_generation = None
+        sweeping: Set[str] = set()
+        next_sweep = time.monotonic() + (self.pool_refresh_seconds or 0)
+        while not self._stopping.is_set():
+            with self._lock:
+                pending, self._pending = self._pending, set()
+            for service_request_id in sorted(pending | sweeping):
+                if self._stopping.is_set():
+                    return
+                # Requests queued by a write are computed in full, even while a sweep is running
+                self._compute_one(service_request_id, sweep=service_request_id not in pending)
+            sweeping = set()
+
+            if self.pool_refresh_seconds and candidate_features.loaded and time.monotonic() >= next_sweep:
+                next_sweep = time.monotonic() + self.pool_refresh_seconds
+                try:
+                    fingerprint = candidate_features.fingerprint()
+                    generation = candidate_features.generation
+                    if generation != swept_generation:
+                        claimed = self._claim_sweep(fingerprint)
+                        if claimed is not None:
+                            swept_generation = generation
+                        if claimed:
+                            sweeping = set(self._open_request_ids())
+                except Exception:
+                    logger.exception(f"Checking the candidate pool for a sweep failed; retrying in {RETRY_SECONDS:.0f}s")
+                    next_sweep = time.monotonic() + RETRY_SECONDS
+                if sweeping:
+                    logger.info(f"Candidate pool changed; re-ranking {len(sweeping)} open service requests")
+                    continue
+
+            timeout = max(0.0, next_sweep - time.monotonic()) if self.pool_refresh_seconds else None
+            self._wake.wait(timeout)
+            self._wake.clear()
+
+    def stop(self) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._stopping.set()
+        self._wake.set()
+        thread.join(timeout=5)
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "running": self._thread is not None and self._thread.is_alive(),
+                "pending": len(self._pending),
+                "computed": self._computed,
+            }
+
+
+match_precomputer = MatchPrecomputer()
+
+
+_SESSION_KEY = "service_request_match_changes"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_request_changes(session: Session, flush_context) -> None:
+    changed = set()
+    for obj in session.new:
+        if isinstance(obj, ServiceRequest):
+            changed.add(str(obj.id))
+    for obj in session.dirty:
+        if isinstance(obj, ServiceRequest):
+            attrs = inspect(obj).attrs
+            if any(attrs[field].history.has_changes() for field in MATCH_FIELDS):
+                changed.add(str(obj.id))
+    for obj in session.deleted:
+        # The professional is eligible again; matches are only re-ranked on request edits otherwise.
+        if isinstance(obj, TaskAssignment) and obj.service_request_id is not None:
+            changed.add(str(obj.service_request_id))
+    if changed:
+        session.info.setdefault(_SESSION_KEY, set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_request_changes(session: Session) -> None:
+    changed = session.info.pop(_SESSION_KEY, None)
+    if changed:
+        match_precomputer.enqueue(changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_request_changes(session: Session) -> None:
+    session.info.pop(_SESSION_KEY, None)
@@ -17,6 +17,7 @@ from app.modules.tasks.schemas.task_request import (
 )
 from app.services.email_service import EmailService
 from app.core.exceptions import NotFoundException
+from app.core.pagination import apply_keyset, count_cache, order_by_clauses, split_page
 
 logger = logging.getLogger(__name__)
 
@@ -24,8 +25,8 @@ logger = logging.getLogger(__name__)
 class TaskRequestService:
     """Service for handling business task requests and assignments"""
     
-    def __init__(self):
-        self.email_service = EmailService()
+    def __init__(self, email_service: Optional[EmailService] = None):
+        self.email_service = email_service or EmailService()
 
     def _normalize_request_payload(self, request_data: BusinessTaskRequestCreate) -> dict:
         data = request_data.model_dump(exclude_unset=True)
@@ -89,9 +90,14 @@ class TaskRequestService:
         limit: int = 20,
         status: Optional[TaskStatusEnum] = None,
         priority: Optional[TaskPriorityEnum] = None,
-        company_name: Optional[str] = None
+        company_name: Optional[str] = None,
+        cursor: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Get business task requests with filtering and pagination"""
+        """Get business task requests with filtering and pagination.
+
+        Passing ``cursor`` (empty for the first page) switches to keyset pagination
+        on (created_at, id); the total then comes from a short-lived count cache.
+        """
         try:
             query = db.query(ServiceRequest)
             
@@ -103,12 +109,21 @@ class TaskRequestService:
             if company_name:
                 query = query.filter(ServiceRequest.company_name.ilike(f"%{company_name}%"))
             
-            # Get total count
-            total = query.count()
-            
-            # Apply pagination
-            skip = (page - 1) * limit
-            requests = query.offset(skip).limit(limit).all()
+            order = [(ServiceRequest.created_at, True), (ServiceRequest.id, True)]
+            next_page_cursor = None
+            if cursor is None:
+                # Get total count
+                total = query.count()
+                
+                # Apply pagination
+                skip = (page - 1) * limit
+                requests = query.order_by(*order_by_clauses(order)).offset(skip).limit(limit).all()
+            else:
+                total = count_cache.get_or_compute(
+                    ("business_task_requests", status, priority, company_name), query.count
+                )
+                rows = apply_keyset(query, order, cursor).limit(limit + 1).all()
+                requests, next_page_cursor = split_page(rows, limit, key=lambda r: [r.created_at, r.id])
             
             # Convert to response format
             response_requests = []
@@ -135,7 +150,8 @@ class TaskRequestService:
                 "total": total,
                 "page": page,
                 "limit": limit,
-                "total_pages": (total + limit - 1) // limit
+                "total_pages": (total + limit - 1) // limit,
+                "next_cursor": next_page_cursor
             }
             
         except Exception as e:
@@ -366,25 +382,17 @@ class TaskRequestService:
             Task Management System
             """
             
-            # Send email via Mailtrap if available, else SMTP, else log in dev mode
+            # Queue email for Mailtrap/SMTP delivery, else log in dev mode
             try:
-                if self.email_service.mailtrap_api_key:
-                    self.email_service._send_mailtrap_email(
-                        to_email=professional.email,
-                        to_name=f"{professional.first_name} {professional.last_name}".strip() or professional.email,
-                        subject=subject,
-                        text_body=text_body,
-                        html_body=html_body,
-                    )
-                    logger.info(f"📧 Task assignment email sent via Mailtrap to {professional.email}")
-                elif self.email_service.smtp_configured and not self.email_service.development_mode:
-                    self.email_service._send_smtp_email(
+                if not self.email_service.development_mode:
+                    self.email_service.send_email(
                         to_email=professional.email,
                         subject=subject,
                         html_body=html_body,
-                        text_body=text_body
+                        text_body=text_body,
+                        to_name=f"{professional.first_name} {professional.last_name}".strip() or professional.email,
                     )
-                    logger.info(f"📧 Task assignment email sent via SMTP to {professional.email}")
+                    logger.info(f"📧 Task assignment email queued for {professional.email}")
                 else:
                     logger.info(f"📧 DEVELOPMENT MODE - Task assignment email for {professional.email}")
                     logger.info(f"📧 Subject: {subject}")
@@ -0,0 +1,71 @@
+import os
+import json
+import sys
+
+try:
+    from dotenv import load_dotenv  # optional
+    load_dotenv(os.path.join(os.path.dirname(__file__), '..', '..', '.env'))
+except Exception:
+    pass
+
+# Ensure relationship targets are registered before ProzProfile is mapped
+from app.modules.auth.models.user import User  # noqa: F401
+try:
+    from app.modules.tasks.models.task import TaskAssignment, TaskNotification  # noqa: F401
+except Exception:
+    pass
+
+from app.config.settings import settings
+from app.core.container import container
+from app.services.pdf_text import pdf_text_extractor
+from app.services.resume_ingest import IngestResult, ResumeIngestor
+
+
+def print_result(result: IngestResult) -> None:
+    detail = result.email or result.error or ""
+    print(f"{result.status:<9} {result.duration_ms:>6}ms  {result.file_name}  {detail}", flush=True)
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Create draft Proz profiles from a zip or directory of resume PDFs")
+    parser.add_argument("source", help="Path to a .zip archive or a directory of PDFs")
+    parser.add_argument("--concurrency", type=int, default=settings.RESUME_INGEST_CONCURRENCY, help="Resumes parsed in parallel")
+    parser.add_argument("--batch-size", type=int, default=settings.RESUME_INGEST_BATCH_SIZE, help="Profiles written per transaction")
+    parser.add_argument("--report", type=str, default=None, help="Write the full JSON report to this path")
+    parser.add_argument("--quiet", action="store_true", help="Only print the summary")
+    args = parser.parse_args()
+
+    ingestor = ResumeIngestor(
+        container.ai_profile_service,
+        concurrency=args.concurrency,
+        batch_size=args.batch_size,
+        on_result=None if args.quiet else print_result,
+    )
+    try:
+        if os.path.isdir(args.source):
+            report = ingestor.ingest_directory(args.source)
+        else:
+            report = ingestor.ingest_zip(args.source)
+    finally:
+        pdf_text_extractor.shutdown()
+
+    summary = report.summary()
+    print(
+        f"\n{summary['files']} files in {summary['elapsed_seconds']}s "
+        f"({summary['files_per_second']} files/s, {summary['megabytes']} MB): "
+        f"{summary['created']} created, {summary['updated']} updated, {summary['unchanged']} unchanged, "
+        f"{summary['skipped']} skipped, {summary['failed']} failed"
+    )
+    if args.report:
+        out_dir = os.path.dirname(args.report)
+        if out_dir and not os.path.exists(out_dir):
+            os.makedirs(out_dir, exist_ok=True)
+        with open(args.report, "w") as f:
+            json.dump(report.to_dict(), f, indent=2)
+        print(f"Report -> {args.report}")
+    return 1 if summary["failed"] and summary["failed"] == summary["files"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
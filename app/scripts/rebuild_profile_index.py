@@ -0,0 +1,48 @@
+import os
+import sys
+import time
+
+try:
+    from dotenv import load_dotenv  # optional
+    load_dotenv(os.path.join(os.path.dirname(__file__), '..', '..', '.env'))
+except Exception:
+    pass
+
+# Ensure relationship targets are registered before ProzProfile is mapped
+from app.modules.auth.models.user import User  # noqa: F401
+try:
+    from app.modules.tasks.models.task import TaskAssignment, TaskNotification  # noqa: F401
+except Exception:
+    pass
+
+from app.database.session import SessionLocal
+from app.modules.proz import text_similarity, url_fingerprints
+from app.modules.proz.profile_index import REBUILD_BATCH_SIZE
+
+TARGETS = {
+    "links": url_fingerprints.index,  # profile_url_fingerprints (duplicate-link detection)
+    "text": text_similarity.index,  # profile_text_bands (near-duplicate text detection)
+}
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Recompute a derived index of every Proz profile")
+    parser.add_argument("target", choices=sorted(TARGETS) + ["all"], help="Index to rebuild")
+    parser.add_argument("--batch-size", type=int, default=REBUILD_BATCH_SIZE, help="Profiles written per transaction")
+    args = parser.parse_args()
+
+    names = sorted(TARGETS) if args.target == "all" else [args.target]
+    db = SessionLocal()
+    try:
+        for name in names:
+            started = time.perf_counter()
+            processed = TARGETS[name].rebuild(db, batch_size=args.batch_size)
+            print(f"Indexed {processed} profiles ({name}) in {time.perf_counter() - started:.1f}s")
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
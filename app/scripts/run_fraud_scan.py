@@ -0,0 +1,50 @@
+import os
+import sys
+import time
+
+try:
+    from dotenv import load_dotenv  # optional
+    load_dotenv(os.path.join(os.path.dirname(__file__), '..', '..', '.env'))
+except Exception:
+    pass
+
+# Ensure relationship targets are registered before ProzProfile is mapped
+from app.modules.auth.models.user import User  # noqa: F401
+try:
+    from app.modules.tasks.models.task import TaskAssignment, TaskNotification  # noqa: F401
+except Exception:
+    pass
+
+from app.database.session import SessionLocal
+from app.modules.auth.services.fraud_scan_jobs import STATUS_COMPLETED, ScanJobConflict, fraud_scan_jobs
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(
+        description="Run a fraud scan and wait for it; incremental by default (for cron), --full rescans everyone"
+    )
+    parser.add_argument("--full", action="store_true", help="Score every non-admin user, not only the changed ones")
+    parser.add_argument("--no-auto-flag", action="store_true", help="Store scores without flagging high-risk users")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        try:
+            job = fraud_scan_jobs.start(db, auto_flag=not args.no_auto_flag, incremental=not args.full)
+        except ScanJobConflict as e:
+            print(f"{e}: {e.job.id if e.job else ''}")
+            return 1
+        fraud_scan_jobs.wait(job.id)
+        db.refresh(job)
+    finally:
+        db.close()
+        fraud_scan_jobs.shutdown()
+    print(f"{job.mode.capitalize()} fraud scan {job.status}: {job.processed}/{job.total} users, "
+          f"{job.flagged} auto-flagged, {job.high_risk} high risk in {time.perf_counter() - started:.1f}s")
+    return 0 if job.status == STATUS_COMPLETED else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
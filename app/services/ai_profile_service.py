@@ -1,23 +1,30 @@
 import os
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, Optional, Union
 import logging
 
+from app.config.settings import settings as app_settings
+from app.services import candidate_scorer, resume_segmenter
+from app.services.candidate_scorer import CandidateMatrix
+from app.services.llm_client import DEFAULT_MODEL, LLMClient, llm_client
+from app.services.pdf_text import pdf_text_extractor
+from app.services.resume_cache import content_hash, resume_analysis_cache
+from app.services.review_cache import profile_review_cache, review_fingerprint
+
 logger = logging.getLogger(__name__)
 
-class AIProfileService:
-    def __init__(self):
-        # Best-effort load of .env like EmailService so server picks up keys without process-level export
-        try:
-            from dotenv import load_dotenv  # type: ignore
-            project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
-            load_dotenv(os.path.join(project_root, '.env'), override=False)
-            load_dotenv(os.path.join(project_root, '.env.production'), override=False)
-            load_dotenv(os.path.join(os.getcwd(), '.env'), override=False)
-        except Exception:
-            pass
+# Bump when the resume prompt, model or heuristics change so cached analyses are recomputed
+RESUME_ANALYZER_VERSION = "1"
+RESUME_MODEL = "gpt-4o-mini"
+# Same for the profile review prompt and heuristics
+REVIEW_VERSION = "1"
 
+class AIProfileService:
+    def __init__(self, llm: Optional[LLMClient] = None):
+        self.llm = llm or llm_client
         try:
-            from app.config.settings import settings  # type: ignore
+            from app.config.settings import load_env_files, settings  # type: ignore
+            # Pick up keys from .env files without process-level export (once per process)
+            load_env_files()
         except Exception:
             settings = None  # type: ignore
         # Support common env var names
@@ -30,246 +37,44 @@ class AIProfileService:
         )
 
     def _extract_text(self, file_path: str) -> (str, str):
-        """Try multiple libraries to extract text; return (text, method_used)."""
-        # 1) PyPDF2
-        try:
-            from PyPDF2 import PdfReader  # type: ignore
-            reader = PdfReader(file_path)
-            text_parts = []
-            for page in reader.pages:
-                text_parts.append(page.extract_text() or "")
-            extracted = "\n".join(text_parts).strip()
-            if extracted:
-                return extracted, "pypdf2"
-        except Exception as e:
-            logger.warning(f"PyPDF2 failed: {e}")
-
-        # 2) pdfplumber (good at layout)
-        try:
-            import pdfplumber  # type: ignore
-            text_parts = []
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    text_parts.append(page.extract_text() or "")
-            extracted = "\n".join(text_parts).strip()
-            if extracted:
-                return extracted, "pdfplumber"
-        except Exception as e:
-            logger.warning(f"pdfplumber failed: {e}")
+        """Extract text from a PDF on disk; return (text, method_used)."""
+        with open(file_path, "rb") as fh:
+            return self._extract_text_from_bytes(fh.read())
 
-        # 3) pdfminer.six (robust text extraction)
-        try:
-            from pdfminer.high_level import extract_text  # type: ignore
-            mined = extract_text(file_path) or ""
-            mined = mined.strip()
-            if mined:
-                return mined, "pdfminer.six"
-        except Exception as e:
-            logger.warning(f"pdfminer failed: {e}")
-
-        return "", "none"
+    def _extract_text_from_bytes(self, data: bytes) -> (str, str):
+        """PyPDF2 -> pdfplumber -> pdfminer per page, pages split across worker processes."""
+        return pdf_text_extractor.extract(data)
 
     def extract_text_from_pdf(self, file_path: str) -> str:
         text, _ = self._extract_text(file_path)
         return text
 
     def _call_openai(self, resume_text: str) -> Optional[Dict[str, Any]]:
-        if not self.openai_api_key:
-            return None
-        try:
-            import http.client, json
-            conn = http.client.HTTPSConnection("api.openai.com")
-            payload = {
-                "model": "gpt-4o-mini",
-                "messages": [
-                    {"role": "system", "content": "You are an expert tech recruiter and career coach. Analyze resumes and suggest improvements and profile fields."},
-                    {"role": "user", "content": f"Resume text:\n\n{resume_text}\n\nExtract structured fields (name, email, phone, location, years_experience, skills, bio summary). Suggest improvements and rephrase the summary in 2 variants. Return JSON with keys: extracted, suggestions, rephrased_summaries (array)."}
-                ],
-                "response_format": {"type": "json_object"}
-            }
-            headers = {
-                'Content-Type': 'application/json',
-                'Authorization': f'Bearer {self.openai_api_key}'
-            }
-            conn.request("POST", "/v1/chat/completions", body=json.dumps(payload), headers=headers)
-            res = conn.getresponse()
-            data = res.read()
-            if res.status >= 400:
-                logger.error(f"OpenAI API error {res.status}: {data.decode('utf-8')}")
-                return None
-            raw = data.decode('utf-8')
-            import json as _json
-            obj = _json.loads(raw)
-            content = obj['choices'][0]['message']['content']
-            return _json.loads(content)
-        except Exception as e:
-            logger.error(f"OpenAI call failed: {e}")
-            return None
+        # Runs in worker threads (parse-resume, jobs, bulk import); the shared client does the I/O.
+        messages = [
+            {"role": "system", "content": "You are an expert tech recruiter and career coach. Analyze resumes and suggest improvements and profile fields."},
+            {"role": "user", "content": f"Resume text:\n\n{resume_text}\n\nExtract structured fields (name, email, phone, location, years_experience, skills, bio summary). Suggest improvements and rephrase the summary in 2 variants. Return JSON with keys: extracted, suggestions, rephrased_summaries (array)."}
+        ]
+        return self.llm.chat_json_sync(self.openai_api_key, messages, model=RESUME_MODEL, purpose="resume analysis")
 
     def heuristic_analyze(self, resume_text: str) -> Dict[str, Any]:
-        # Enhanced heuristic extraction for common profile fields
-        import re
-        lines = [l.strip() for l in resume_text.splitlines() if l.strip()]
-
-        def first_nonempty() -> str:
-            for l in lines:
-                # skip lines that are section headers
-                if re.search(r"^(education|experience|skills|summary|objective)[:\s]", l, re.I):
-                    continue
-                if len(l.split()) >= 2 and len(l) <= 80:
-                    return l
-            return ""
-
-        # Name (best-effort): take first non-empty, non-header line that looks like a name
-        name_line = first_nonempty()
-        first_name = last_name = ""
-        if name_line and not re.search(r"@|\d", name_line):
-            parts = re.sub(r"\s+", " ", name_line).split(" ")
-            if 2 <= len(parts) <= 4:
-                first_name = parts[0].strip(",()[]{}")
-                last_name = parts[-1].strip(",()[]{}")
-
-        # Email
-        email_match = re.search(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}", resume_text)
-        email = email_match.group(0) if email_match else ""
-
-        # Phone (supports +, spaces, dashes, parentheses)
-        phone_match = re.search(r"(\+?\d[\d \-()]{7,}\d)", resume_text)
-        phone = phone_match.group(0).strip() if phone_match else ""
-
-        # Location: look for 'Location:' or a line with City, Country pattern
-        location = ""
-        for l in lines[:30]:
-            m = re.search(r"location\s*[:\-]\s*(.+)", l, re.I)
-            if m:
-                location = m.group(1).strip()
-                break
-            if re.search(r",\s*[A-Za-z]{2,}($|[^A-Za-z])", l) and not re.search(r"@|\d{3,}", l):
-                # looks like 'City, Country/State'
-                location = l
-                break
-        # Clean composite lines like: '■ Kigali, Rwanda | ■ 8+ Years ...'
-        if location and '|' in location:
-            location = location.split('|')[0]
-        location = re.sub(r"^[•■\-\s]+", "", location).strip()
-
-        # Years of experience
-        years_experience = None
-        ym = re.search(r"(\d{1,2})\+?\s+years?", resume_text, re.I)
-        if ym:
-            try:
-                years_experience = float(ym.group(1))
-            except Exception:
-                years_experience = None
-
-        # Skills: collect from 'Skills'/'Technologies' sections and comma lists following
-        skills: list[str] = []
-        lower = [l.lower() for l in lines]
-        for idx, l in enumerate(lower):
-            if l.startswith("skills") or l.startswith("technical skills") or "technologies" in l:
-                # take current line after ':' and next 3 lines for lists
-                block = lines[idx: idx + 4]
-                for bl in block:
-                    after_colon = bl.split(":", 1)[-1] if ":" in bl else bl
-                    parts = [p.strip(" ,;•\t") for p in re.split(r",|\u2022|\|", after_colon)]
-                    for p in parts:
-                        if p and 2 <= len(p) <= 40 and not re.search(r"^skills", p, re.I):
-                            skills.append(p)
-        skills = list(dict.fromkeys(skills))[:50]
-
-        # Education and Certifications sections (simple block capture)
-        def capture_section(title: str) -> str:
-            content: list[str] = []
-            start = False
-            for l in lines:
-                if re.match(fr"^{title}[:\s]*$", l, re.I) or re.match(fr"^{title}[:\s]", l, re.I):
-                    start = True
-                    # keep text after ':' if on same line
-                    after = l.split(":", 1)
-                    if len(after) == 2 and after[1].strip():
-                        content.append(after[1].strip())
-                    continue
-                if start:
-                    if re.match(r"^(experience|work experience|skills|projects|summary|objective)[:\s]", l, re.I):
-                        break
-                    content.append(l)
-            return "\n".join(content).strip()
-
-        education = capture_section("education|education and qualifications|qualifications")
-        certifications = capture_section("certifications|certification|licenses|licences|licensing")
-
-        # Parse experience section into items
-        def capture_experience_items() -> list[dict]:
-            block = capture_section("experience|work experience|employment history|professional experience")
-            if not block:
-                return []
-            items: list[dict] = []
-            # Split on bullet/blank lines
-            raw_items = re.split(r"\n\s*(?:[•\u2022\-\*]|\d+\.)\s+|\n\s*\n", block)
-            for it in raw_items:
-                t = it.strip()
-                if not t:
-                    continue
-                # Try to extract role — company (dates)
-                role = company = period = ""
-                # Common pattern: Role — Company (YYYY–YYYY)
-                m = re.search(r"^(?P<role>[^\n\-–—]{3,}?)\s*[\-–—]\s*(?P<company>[^\n(]{2,}?)(?:\s*\((?P<period>[^)]+)\))?", t)
-                if m:
-                    role = m.group('role').strip()
-                    company = m.group('company').strip()
-                    period = (m.group('period') or '').strip()
-                else:
-                    # Fallback: detect date-like spans for period
-                    pm = re.search(r"(\d{4}[^\n]{0,20}?\d{4}|\d{4}\s*[-–]\s*Present|Present)", t, re.I)
-                    if pm:
-                        period = pm.group(0).strip()
-                    # Heuristic split by ' at ' or ' @ '
-                    hm = re.search(r"^(?P<role>[^@\nat]{3,}?)(?:\s+at\s+|\s+@\s+)(?P<company>[^\n]+)$", t, re.I)
-                    if hm:
-                        role = hm.group('role').strip()
-                        company = hm.group('company').strip()
-                items.append({
-                    "role": role,
-                    "company": company,
-                    "period": period,
-                    "description": t,
-                })
-            return items
-
-        experiences = capture_experience_items()
-
-        # Parse education into items by splitting lines that look like entries
-        def education_items_from_text(txt: str) -> list[dict]:
-            results: list[dict] = []
-            if not txt:
-                return results
-            for line in [l.strip() for l in txt.splitlines() if l.strip()]:
-                # Expect patterns like 'University — Degree (years)'
-                em = re.search(r"^(?P<institution>[^\u2014\-–—(]{3,}?)[\s\-–—]+(?P<degree>[^()\n]{2,}?)(?:\s*\((?P<period>[^)]+)\))?", line)
-                if em:
-                    results.append({
-                        "institution": em.group('institution').strip(),
-                        "degree": em.group('degree').strip(),
-                        "period": (em.group('period') or '').strip(),
-                        "raw": line,
-                    })
-                else:
-                    # Add as raw if contains university/college keywords
-                    if re.search(r"university|college|school|institute", line, re.I):
-                        results.append({"institution": "", "degree": "", "period": "", "raw": line})
-            return results
-
-        education_items = education_items_from_text(education)
-
-        # Websites
-        website_match = re.search(r"https?://[\w\-\./?#%&=]+", resume_text, re.I)
-        website = website_match.group(0) if website_match else ""
-
-        linkedin_match = re.search(r"https?://(www\.)?linkedin\.com/[^\s]+", resume_text, re.I)
-        linkedin = linkedin_match.group(0) if linkedin_match else ""
+        # Enhanced heuristic extraction for common profile fields; one segmentation pass feeds every extractor
+        doc = resume_segmenter.segment(resume_text)
+        first_name, last_name = resume_segmenter.name_parts(doc)
+        email = resume_segmenter.first_match(resume_segmenter.EMAIL, doc)
+        phone = resume_segmenter.first_match(resume_segmenter.PHONE, doc).strip()
+        location = resume_segmenter.location(doc)
+        years_experience = resume_segmenter.years_experience(doc)
+        skills = resume_segmenter.skills(doc)
+        education = doc.sections["education"]
+        certifications = doc.sections["certifications"]
+        experiences = resume_segmenter.experience_items(doc)
+        education_items = resume_segmenter.education_items(doc)
+        website = resume_segmenter.first_match(resume_segmenter.WEBSITE, doc)
+        linkedin = resume_segmenter.first_match(resume_segmenter.LINKEDIN, doc)
 
         # Bio summary: first few non-header lines
-        summary = " ".join(lines[:5])[:600]
+        summary = " ".join(doc.lines[:5])[:600]
 
         return {
             "extracted": {
@@ -300,37 +105,114 @@ class AIProfileService:
         }
 
     def analyze_resume(self, file_path: str) -> Dict[str, Any]:
-        text, method = self._extract_text(file_path)
+        with open(file_path, "rb") as fh:
+            return self.analyze_resume_bytes(fh.read())
+
+    def analyze_resume_bytes(self, data: bytes, progress: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """Analyze an uploaded resume PDF held in memory (no temp file).
+
+        Results are cached by content hash, so re-uploading the same CV
+        skips extraction and never calls OpenAI twice. ``progress`` is called
+        with ``("extracted", details)`` and ``("analyzed", details)``.
+        """
+        report = progress or (lambda stage, details: None)
+        digest = content_hash(data)
+        analyzer = RESUME_MODEL if self.openai_api_key else "heuristic"
+        version = f"{RESUME_ANALYZER_VERSION}:{analyzer}"
+        result, tier = resume_analysis_cache.get_or_compute(digest, version, lambda: self._analyze_uncached(data, report))
+        meta = result.setdefault("meta", {})
+        meta.update({"sha256": digest, "cache": tier})
+        if tier != "miss":
+            report("extracted", {"extraction_method": meta.get("extraction_method"), "text_chars": meta.get("text_chars"), "cache": tier})
+            report("analyzed", {"analyzer": "cache", "cache": tier})
+        return result
+
+    def _analyze_uncached(self, data: bytes, report: Callable[[str, Dict[str, Any]], None]) -> (Dict[str, Any], Optional[float]):
+        """Return (analysis, cache_ttl); ttl is None for the default lifetime."""
+        result, ttl = self._analyze_text(*self._extract_text_from_bytes(data), report)
+        report("analyzed", {"analyzer": result.get("meta", {}).get("analyzer")})
+        return result, ttl
+
+    def _analyze_text(self, text: str, method: str, report: Callable[[str, Dict[str, Any]], None]) -> (Dict[str, Any], Optional[float]):
         meta = {"extraction_method": method, "text_chars": len(text)}
+        report("extracted", dict(meta))
         if not text:
             # Try OpenAI even without text to return useful templates/suggestions
             ai = self._call_openai("The uploaded PDF text could not be extracted. Provide a generic, high-quality professional profile summary template and suggestions.")
             if ai:
-                ai.setdefault("meta", meta)
-                return ai
+                ai.setdefault("meta", {**meta, "analyzer": RESUME_MODEL})
+                return ai, None
         ai = self._call_openai(text) if text else None
         if ai:
-            ai.setdefault("meta", meta)
-            return ai
+            ai.setdefault("meta", {**meta, "analyzer": RESUME_MODEL})
+            return ai, None
+        # With a key configured, landing here means the API call failed: cache briefly so it is retried
+        fallback_ttl = app_settings.RESUME_CACHE_FALLBACK_TTL_SECONDS if self.openai_api_key else None
         if text:
             result = self.heuristic_analyze(text)
-            result.setdefault("meta", meta)
-            return result
-        return {"extracted": {}, "suggestions": ["Could not read PDF text. Please upload a text-based PDF (not a scanned image)."], "rephrased_summaries": [], "meta": meta}
+            result.setdefault("meta", {**meta, "analyzer": "heuristic"})
+            return result, fallback_ttl
+        return {"extracted": {}, "suggestions": ["Could not read PDF text. Please upload a text-based PDF (not a scanned image)."], "rephrased_summaries": [], "meta": {**meta, "analyzer": "none"}}, fallback_ttl
 
     def status(self) -> Dict[str, Any]:
-        return {"openai_configured": bool(self.openai_api_key)}
+        return {"openai_configured": bool(self.openai_api_key), "llm": self.llm.status()}
 
-    def review_profile(self, profile: Dict[str, Any]) -> Dict[str, Any]:
+    def review_profile(self, profile: Dict[str, Any], refresh: bool = False) -> Dict[str, Any]:
         """Review an existing profile and suggest targeted improvements.
 
         Returns:
           {
             suggested_updates: { field: value, ... },
             suggestions: [..human-readable tips..],
-            rephrased_bio: [..options..]
+            rephrased_bio: [..options..],
+            meta: { analyzer, fingerprint, cache }
           }
+
+        Reviews are cached by a fingerprint of the reviewed fields (see
+        ``app.services.review_cache``); ``refresh`` asks for a new one.
+        Blocks on the OpenAI call; async routes use ``review_profile_async``.
         """
+        digest, version = review_fingerprint(profile), self._review_version()
+
+        def compute() -> (Dict[str, Any], Optional[float]):
+            reviewed = self.llm.chat_json_sync(self.openai_api_key, self._review_messages(profile), purpose="review_profile")
+            return self._review_result(reviewed, profile)
+
+        if refresh:
+            result, ttl = compute()
+            profile_review_cache.set(digest, version, result, ttl)
+            tier = "refresh"
+        else:
+            result, tier = profile_review_cache.get_or_compute(digest, version, compute)
+        return {**result, "meta": {**result.get("meta", {}), "fingerprint": digest, "cache": tier}}
+
+    async def review_profile_async(self, profile: Dict[str, Any], refresh: bool = False) -> Dict[str, Any]:
+        digest, version = review_fingerprint(profile), self._review_version()
+
+        async def compute() -> (Dict[str, Any], Optional[float]):
+            reviewed = await self.llm.chat_json(self.openai_api_key, self._review_messages(profile), purpose="review_profile")
+            return self._review_result(reviewed, profile)
+
+        if refresh:
+            result, ttl = await compute()
+            await profile_review_cache.aset(digest, version, result, ttl)
+            tier = "refresh"
+        else:
+            result, tier = await profile_review_cache.aget_or_compute(digest, version, compute)
+        return {**result, "meta": {**result.get("meta", {}), "fingerprint": digest, "cache": tier}}
+
+    def _review_version(self) -> str:
+        return f"{REVIEW_VERSION}:{DEFAULT_MODEL if self.openai_api_key else 'heuristic'}"
+
+    def _review_result(self, reviewed: Optional[Dict[str, Any]], profile: Dict[str, Any]) -> (Dict[str, Any], Optional[float]):
+        """The review to cache and its TTL (``None`` for the default)."""
+        if reviewed is not None:
+            return {**reviewed, "meta": {"analyzer": DEFAULT_MODEL}}, None
+        # OpenAI configured but unavailable: keep the heuristic review briefly so the model is retried.
+        fallback_ttl = app_settings.RESUME_CACHE_FALLBACK_TTL_SECONDS if self.openai_api_key else None
+        return {**self._review_heuristic(profile), "meta": {"analyzer": "heuristic"}}, fallback_ttl
+
+    def _review_messages(self, profile: Dict[str, Any]) -> list[Dict[str, str]]:
         # Build input text
         fields = [
             f"Name: {profile.get('first_name','')} {profile.get('last_name','')}",
@@ -349,38 +231,17 @@ class AIProfileService:
         ]
         input_text = "\n".join(fields)
 
-        # If OpenAI is available, ask for structured JSON with suggested_updates per field
-        if self.openai_api_key:
-            try:
-                import http.client, json
-                conn = http.client.HTTPSConnection("api.openai.com")
-                payload = {
-                    "model": "gpt-4o-mini",
-                    "messages": [
-                        {"role": "system", "content": "You are a senior recruiter and profile optimization expert."},
-                        {"role": "user", "content": (
-                            "Here is a professional profile. Critique it and suggest targeted improvements.\n"
-                            "Return JSON with keys: suggested_updates (object of only fields that should change: bio, location, years_experience, hourly_rate, availability, education, certifications, website, linkedin, preferred_contact_method),"
-                            " suggestions (array of concise tips), rephrased_bio (array of 2-3 improved bios).\n\n" + input_text
-                        )}
-                    ],
-                    "response_format": {"type": "json_object"}
-                }
-                headers = {
-                    'Content-Type': 'application/json',
-                    'Authorization': f'Bearer {self.openai_api_key}'
-                }
-                conn.request("POST", "/v1/chat/completions", body=json.dumps(payload), headers=headers)
-                res = conn.getresponse()
-                data = res.read()
-                if res.status < 400:
-                    raw = data.decode('utf-8')
-                    obj = json.loads(raw)
-                    content = obj['choices'][0]['message']['content']
-                    return json.loads(content)
-            except Exception as e:
-                logger.error(f"OpenAI review_profile failed: {e}")
+        # Ask for structured JSON with suggested_updates per field
+        return [
+            {"role": "system", "content": "You are a senior recruiter and profile optimization expert."},
+            {"role": "user", "content": (
+                "Here is a professional profile. Critique it and suggest targeted improvements.\n"
+                "Return JSON with keys: suggested_updates (object of only fields that should change: bio, location, years_experience, hourly_rate, availability, education, certifications, website, linkedin, preferred_contact_method),"
+                " suggestions (array of concise tips), rephrased_bio (array of 2-3 improved bios).\n\n" + input_text
+            )}
+        ]
 
+    def _review_heuristic(self, profile: Dict[str, Any]) -> Dict[str, Any]:
         # Heuristic fallback
         suggestions = []
         suggested_updates: Dict[str, Any] = {}
@@ -407,104 +268,95 @@ class AIProfileService:
             ]
         return {"suggested_updates": suggested_updates, "suggestions": suggestions, "rephrased_bio": rephrased_bio}
 
-    def rank_professionals(self, service_request: Dict[str, Any], candidates: list[Dict[str, Any]], top_k: int = 10) -> list[Dict[str, Any]]:
+    def rank_professionals(self, service_request: Dict[str, Any], candidates: Union[list[Dict[str, Any]], CandidateMatrix], top_k: int = 10) -> list[Dict[str, Any]]:
         """Rank professionals for a service request. Uses OpenAI if configured; otherwise heuristic.
 
         service_request: dict with keys like service_title, service_description, service_category,
                          location_preference, budget_max, remote_work_allowed
         candidates: list of dicts each having first_name, last_name, email, location, years_experience,
-                    hourly_rate, rating, specialties (list[str])
+                    hourly_rate, rating, specialties (list[str]); or a packed CandidateMatrix
+                    (e.g. a candidate feature store snapshot)
         Returns: list of {candidate: obj, score: float, reasons: [str]}
-        """
-        # If OpenAI available, request a JSON ranking
-        if self.openai_api_key and candidates:
-            try:
-                import http.client, json
-                conn = http.client.HTTPSConnection("api.openai.com")
-                prompt = {
-                    "request": service_request,
-                    "candidates": candidates,
-                    "instructions": "Rank candidates for best match. Return JSON array sorted desc by score with objects {index, score (0-100), reasons (array of short strings)}. index refers to the index in candidates array. Favor matching specialty/category, sufficient experience, reasonable hourly within budget, local if not remote, higher rating."
-                }
-                payload = {
-                    "model": "gpt-4o-mini",
-                    "messages": [
-                        {"role": "system", "content": "You are a matching engine producing numeric scores and concise reasons."},
-                        {"role": "user", "content": json.dumps(prompt)}
-                    ],
-                    "response_format": {"type": "json_object"}
-                }
-                headers = {
-                    'Content-Type': 'application/json',
-                    'Authorization': f'Bearer {self.openai_api_key}'
-                }
-                conn.request("POST", "/v1/chat/completions", body=json.dumps(payload), headers=headers)
-                res = conn.getresponse()
-                data = res.read()
-                if res.status < 400:
-                    obj = json.loads(data.decode('utf-8'))
-                    content = obj['choices'][0]['message']['content']
-                    ranked = json.loads(content)
-                    # Expect ranked to be {"ranking": [{index, score, reasons:[]}, ...]} or array itself
-                    items = ranked.get("ranking") if isinstance(ranked, dict) else ranked
-                    result = []
-                    for r in (items or []):
-                        try:
-                            idx = int(r.get("index"))
-                            if 0 <= idx < len(candidates):
-                                result.append({
-                                    "candidate": candidates[idx],
-                                    "score": float(r.get("score", 0)),
-                                    "reasons": r.get("reasons", [])
-                                })
-                        except Exception:
-                            continue
-                    return result[:top_k]
-            except Exception as e:
-                logger.error(f"OpenAI rank_professionals failed: {e}")
-
-        # Heuristic fallback
-        results: list[Dict[str, Any]] = []
-        req_cat = (service_request.get("service_category") or "").lower()
-        loc_pref = (service_request.get("location_preference") or "").lower()
-        remote = bool(service_request.get("remote_work_allowed"))
-        budget_max = service_request.get("budget_max")
-        estimated_hours = 40
-        max_hourly = (budget_max / estimated_hours) if budget_max else None
-
-        for c in candidates:
-            score = 0.0
-            reasons: list[str] = []
-            # verification assumed in caller filter
-            # specialty match
-            specialties = [s.lower() for s in (c.get("specialties") or [])]
-            if req_cat and any(req_cat in s for s in specialties):
-                score += 30
-                reasons.append("Matching specialty")
-            # location
-            if not remote and loc_pref and c.get("location"):
-                if loc_pref in c["location"].lower():
-                    score += 15
-                    reasons.append("Local match")
-            # experience
-            y = c.get("years_experience") or 0
-            score += min(25, (y or 0) * 3)
-            if y:
-                reasons.append(f"{y}+ years experience")
-            # rating
-            r = c.get("rating") or 0
-            score += min(20, (r or 0) * 4)
-            if r and r >= 4.0:
-                reasons.append("High rating")
-            # hourly within budget
-            hr = c.get("hourly_rate")
-            if max_hourly is not None:
-                if hr is None or hr <= max_hourly:
-                    score += 10
-                    reasons.append("Within budget")
-            results.append({"candidate": c, "score": score, "reasons": reasons})
-
-        results.sort(key=lambda x: x["score"], reverse=True)
-        return results[:top_k]
 
+        The heuristic scores the whole pool at once; only its best
+        ``MATCH_LLM_SHORTLIST`` candidates are sent to the model.
+        Blocks on the OpenAI call; async routes use ``rank_professionals_async``.
+        """
+        return self.rank_professionals_with_analyzer(service_request, candidates, top_k)[0]
+
+    def rank_professionals_with_analyzer(self, service_request: Dict[str, Any], candidates: Union[list[Dict[str, Any]], CandidateMatrix], top_k: int = 10) -> tuple[list[Dict[str, Any]], str]:
+        """``rank_professionals`` plus the analyzer that produced the ranking (model name or "heuristic")."""
+        matrix = self._candidate_matrix(candidates)
+        if self.openai_api_key and len(matrix):
+            shortlist = self._llm_shortlist(service_request, matrix)
+            ranked = self.llm.chat_json_sync(self.openai_api_key, self._rank_messages(service_request, shortlist), purpose="rank_professionals")
+            result = self._ranking_from_response(ranked, shortlist, top_k)
+            if result is not None:
+                return result, DEFAULT_MODEL
+        return candidate_scorer.rank(matrix, service_request, top_k), "heuristic"
+
+    async def rank_professionals_async(self, service_request: Dict[str, Any], candidates: Union[list[Dict[str, Any]], CandidateMatrix], top_k: int = 10) -> list[Dict[str, Any]]:
+        matrix = self._candidate_matrix(candidates)
+        if self.openai_api_key and len(matrix):
+            shortlist = self._llm_shortlist(service_request, matrix)
+            ranked = await self.llm.chat_json(self.openai_api_key, self._rank_messages(service_request, shortlist), purpose="rank_professionals")
+            result = self._ranking_from_response(ranked, shortlist, top_k)
+            if result is not None:
+                return result
+        return candidate_scorer.rank(matrix, service_request, top_k)
+
+    def llm_shortlist(self, service_request: Dict[str, Any], candidates: Union[list[Dict[str, Any]], CandidateMatrix]) -> Optional[list[Dict[str, Any]]]:
+        """The candidates ranking would send to the model, or None when it would not call one.
+
+        Ranking the shortlist gives the same result as ranking ``candidates``.
+        """
+        matrix = self._candidate_matrix(candidates)
+        if not (self.openai_api_key and len(matrix)):
+            return None
+        return self._llm_shortlist(service_request, matrix)
+
+    @staticmethod
+    def _candidate_matrix(candidates: Union[list[Dict[str, Any]], CandidateMatrix]) -> CandidateMatrix:
+        return candidates if isinstance(candidates, CandidateMatrix) else CandidateMatrix.from_candidates(candidates)
+
+    def _llm_shortlist(self, service_request: Dict[str, Any], matrix: CandidateMatrix) -> list[Dict[str, Any]]:
+        if len(matrix) <= app_settings.MATCH_LLM_SHORTLIST:
+            return list(matrix.candidates)
+        best = candidate_scorer.rank(matrix, service_request, app_settings.MATCH_LLM_SHORTLIST)
+        return [r["candidate"] for r in best]
+
+    def _rank_messages(self, service_request: Dict[str, Any], candidates: list[Dict[str, Any]]) -> list[Dict[str, str]]:
+        import json
+        prompt = {
+            "request": service_request,
+            "candidates": candidates,
+            "instructions": "Rank candidates for best match. Return JSON array sorted desc by score with objects {index, score (0-100), reasons (array of short strings)}. index refers to the index in candidates array. Favor matching specialty/category, sufficient experience, reasonable hourly within budget, local if not remote, higher rating."
+        }
+        return [
+            {"role": "system", "content": "You are a matching engine producing numeric scores and concise reasons."},
+            {"role": "user", "content": json.dumps(prompt, default=str)}
+        ]
 
+    def _ranking_from_response(self, ranked: Any, candidates: list[Dict[str, Any]], top_k: int) -> Optional[list[Dict[str, Any]]]:
+        """Candidates in the model's order, or None when there is no usable response."""
+        if ranked is None:
+            return None
+        try:
+            # Expect ranked to be {"ranking": [{index, score, reasons:[]}, ...]} or array itself
+            items = ranked.get("ranking") if isinstance(ranked, dict) else ranked
+            result = []
+            for r in (items or []):
+                try:
+                    idx = int(r.get("index"))
+                    if 0 <= idx < len(candidates):
+                        result.append({
+                            "candidate": candidates[idx],
+                            "score": float(r.get("score", 0)),
+                            "reasons": r.get("reasons", [])
+                        })
+                except Exception:
+                    continue
+            return result[:top_k]
+        except Exception as e:
+            logger.error(f"OpenAI rank_professionals failed: {e}")
+            return None
@@ -0,0 +1,591 @@
+# app/services/candidate_features.py
+"""In-memory match features of every verified professional.
+
+The matching endpoints used to load candidate rows and their specialty
+names from the database on every click. This store loads them once (in the
+background at startup, or on first use from scripts) and keeps them current
+from profile commit events (``app.modules.proz.events``): changed profile
+ids are re-read on a background thread. Specialty renames and deletions are
+picked up the same way, and a full reload every
+``MATCH_FEATURE_STORE_RELOAD_SECONDS`` catches writes that bypass the ORM.
+
+Each worker process holds its own copy, so commits are also logged in Redis
+(``match:features:changes``, profile id -> version of the change). Before
+serving, a store reads the version counter and re-reads the profiles other
+processes changed since it last looked; a request waits on the database only
+then. While Redis is unreachable the check falls back to the newest
+``updated_at`` and row count of ``proz_profiles``, which sees profile edits
+and deletions but not specialty links until the next reload.
+
+Rows are parallel NumPy arrays (experience, rating, rate, location code)
+plus a specialty bitset per profile; rows freed by profiles that lose their
+verification are reused. ``snapshot()`` hands matching a compact
+``CandidateMatrix`` of the live rows that later writes cannot change.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+import numpy as np
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from app.config.settings import settings
+from app.core import redis_pool
+from app.database.session import SessionLocal
+from app.modules.proz import events as profile_events
+from app.modules.proz.models.proz import ProzProfile, ProzSpecialty, Specialty
+from app.services.candidate_scorer import WORD_BITS, CandidateMatrix, word_count
+
+if redis_pool.REDIS_AVAILABLE:
+    import redis
+
+logger = logging.getLogger(__name__)
+
+VERIFIED = "verified"
+# Bound on the size of one ``IN (...)`` list when re-reading changed profiles.
+REFRESH_BATCH_SIZE = 500
+# Seconds before retrying a load that failed (database unavailable).
+RETRY_SECONDS = 30.0
+
+# Cross-process change log: a version counter and a sorted set of profile ids scored by the version that changed them.
+VERSION_KEY = "match:features:version"
+CHANGES_KEY = "match:features:changes"
+SPECIALTIES_MEMBER = "*specialties"
+# Refreshed on every write; once both keys expire, readers fall back to a full load.
+CHANGE_LOG_TTL_SECONDS = 24 * 60 * 60
+
+# Bump the version and log the members under it in one step: KEYS = version, changes; ARGV = ttl, members...
+_PUBLISH = """
+local version = redis.call('INCR', KEYS[1])
+for i = 2, #ARGV do redis.call('ZADD', KEYS[2], version, ARGV[i]) end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+redis.call('EXPIRE', KEYS[2], ARGV[1])
+return version
+"""
+
+PROFILE_COLUMNS = (
+    ProzProfile.id,
+    ProzProfile.first_name,
+    ProzProfile.last_name,
+    ProzProfile.email,
+    ProzProfile.location,
+    ProzProfile.years_experience,
+    ProzProfile.hourly_rate,
+    ProzProfile.rating,
+    ProzProfile.profile_image_url,
+    ProzProfile.verification_status,
+)
+
+
+def _grown(array: np.ndarray, rows: int) -> np.ndarray:
+    extra = np.zeros((rows - len(array),) + array.shape[1:], dtype=array.dtype)
+    return np.concatenate([array, extra])
+
+
+class _FeatureTable:
+    """Row storage behind the store; callers hold the store lock."""
+
+    def __init__(self, specialty_names: Dict[str, str]):
+        self.specialty_display = dict(specialty_names)  # specialty id -> name
+        self.specialty_bit: Dict[str, int] = {}
+        self.specialty_names: List[Optional[str]] = []  # bit -> lower-cased name
+        self.location_index: Dict[str, int] = {}
+        self.location_names: List[str] = []
+        self.rows: Dict[str, int] = {}
+        # What ranking sees of each row (profile id -> scored fields), to tell real changes from no-op writes
+        self.scored: Dict[str, tuple] = {}
+        self.free: List[int] = []
+        self.candidates: List[Optional[Dict[str, Any]]] = []
+        self.row_specialties: List[List[str]] = []
+        self.years = np.zeros(0, dtype=np.float64)
+        self.ratings = np.zeros(0, dtype=np.float64)
+        self.rates = np.zeros(0, dtype=np.float64)
+        self.location_codes = np.zeros(0, dtype=np.int32)
+        self.active = np.zeros(0, dtype=bool)
+        self.bits = np.zeros((0, 1), dtype=np.uint64)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _bit(self, specialty_id: str) -> int:
+        bit = self.specialty_bit.get(specialty_id)
+        if bit is None:
+            bit = self.specialty_bit[specialty_id] = len(self.specialty_names)
+            name = self.specialty_display.get(specialty_id)
+            self.specialty_names.append(name.lower() if name is not None else None)
+            words = word_count(len(self.specialty_names))
+            if words > self.bits.shape[1]:
+                self.bits = np.hstack([self.bits, np.zeros((len(self.bits), words - self.bits.shape[1]), dtype=np.uint64)])
+        return bit
+
+    def _location(self, location: Optional[str]) -> int:
+        location = (location or "").lower()
+        if not location:
+            return -1
+        code = self.location_index.get(location)
+        if code is None:
+            code = self.location_index[location] = len(self.location_names)
+            self.location_names.append(location)
+        return code
+
+    def _candidate(self, row: Any, specialty_ids: List[str]) -> Dict[str, Any]:
+        return {
+            "id": str(row.id),
+            "first_name": row.first_name,
+            "last_name": row.last_name,
+            "email": row.email,
+            "location": row.location,
+            "years_experience": row.years_experience,
+            "hourly_rate": row.hourly_rate,
+            "rating": row.rating,
+            "specialties": [self.specialty_display[s] for s in specialty_ids if s in self.specialty_display],
+            "profile_image_url": row.profile_image_url,
+        }
+
+    @staticmethod
+    def _scored(row: Any, specialty_ids: List[str]) -> tuple:
+        return (row.years_experience, row.rating, row.hourly_rate, (row.location or "").lower(), tuple(sorted(specialty_ids)))
+
+    def upsert(self, row: Any, specialty_ids: List[str]) -> bool:
+        """Insert or update a verified profile; True if the pool or a scored field changed."""
+        profile_id = str(row.id)
+        scored = self._scored(row, specialty_ids)
+        changed = self.scored.get(profile_id) != scored
+        self.scored[profile_id] = scored
+        index = self.rows.get(profile_id)
+        if index is None:
+            if self.free:
+                index = self.free.pop()
+            else:
+                index = len(self.candidates)
+                self.candidates.append(None)
+                self.row_specialties.append([])
+                if index >= len(self.active):
+                    capacity = max(1024, 2 * len(self.active))
+                    for name in ("years", "ratings", "rates", "location_codes", "active", "bits"):
+                        setattr(self, name, _grown(getattr(self, name), capacity))
+            self.rows[profile_id] = index
+        # Candidate dicts are replaced, never mutated, so snapshots keep their view.
+        self.candidates[index] = self._candidate(row, specialty_ids)
+        self.row_specialties[index] = specialty_ids
+        self.years[index] = row.years_experience or 0
+        self.ratings[index] = row.rating or 0
+        self.rates[index] = np.nan if row.hourly_rate is None else row.hourly_rate
+        self.location_codes[index] = self._location(row.location)
+        self.bits[index] = 0
+        for specialty_id in specialty_ids:
+            bit = self._bit(specialty_id)
+            self.bits[index, bit // WORD_BITS] |= np.uint64(1) << np.uint64(bit % WORD_BITS)
+        self.active[index] = True
+        return changed
+
+    def remove(self, profile_id: str) -> bool:
+        index = self.rows.pop(profile_id, None)
+        self.scored.pop(profile_id, None)
+        if index is None:
+            return False
+        self.active[index] = False
+        self.candidates[index] = None
+        self.row_specialties[index] = []
+        self.free.append(index)
+        return True
+
+    def rename_specialties(self, names: Dict[str, str]) -> bool:
+        """Apply specialty renames and deletions; True if a specialty in the pool changed name."""
+        changed = {s for s in set(names) | set(self.specialty_display) if names.get(s) != self.specialty_display.get(s)}
+        if not changed:
+            return False
+        self.specialty_display = dict(names)
+        for specialty_id in changed:
+            bit = self.specialty_bit.get(specialty_id)
+            if bit is not None:
+                name = names.get(specialty_id)
+                self.specialty_names[bit] = name.lower() if name is not None else None
+        for index, specialty_ids in enumerate(self.row_specialties):
+            candidate = self.candidates[index]
+            if candidate is not None and changed.intersection(specialty_ids):
+                specialties = [names[s] for s in specialty_ids if s in names]
+                self.candidates[index] = {**candidate, "specialties": specialties}
+        return bool(changed.intersection(self.specialty_bit))
+
+    def fingerprint(self) -> str:
+        """Hash of everything ranking sees, equal across processes holding the same pool."""
+        names = {s: self.specialty_display.get(s) for s in self.specialty_bit}
+        encoded = json.dumps([sorted(self.scored.items()), sorted(names.items())], default=str, separators=(",", ":"))
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def snapshot(self, exclude_ids: Iterable[str] = ()) -> CandidateMatrix:
+        live = self.active.copy()
+        for profile_id in exclude_ids:
+            index = self.rows.get(str(profile_id))
+            if index is not None:
+                live[index] = False
+        rows = np.flatnonzero(live)
+        # Best rated, then most experienced first: the order the database pool used,
+        # which decides ties in the scorer.
+        rows = rows[np.lexsort((rows, -self.years[rows], -self.ratings[rows]))]
+        return CandidateMatrix(
+            candidates=[self.candidates[i] for i in rows],
+            years=self.years[rows],
+            ratings=self.ratings[rows],
+            rates=self.rates[rows],
+            location_codes=self.location_codes[rows],
+            location_names=list(self.location_names),
+            specialty_bits=self.bits[rows],
+            specialty_names=list(self.specialty_names),
+        )
+
+
+def _chunks(ids: List[str]) -> List[List[str]]:
+    return [ids[i:i + REFRESH_BATCH_SIZE] for i in range(0, len(ids), REFRESH_BATCH_SIZE)]
+
+
+class CandidateFeatureStore:
+    def __init__(self, session_factory: Optional[Callable[[], Session]] = None,
+                 reload_seconds: Optional[float] = None):
+        self._session_factory = session_factory or SessionLocal
+        self.reload_seconds = settings.MATCH_FEATURE_STORE_RELOAD_SECONDS if reload_seconds is None else reload_seconds
+        self._lock = threading.RLock()
+        self._load_lock = threading.Lock()
+        # One refresh at a time, so an older read is never applied over a newer one.
+        self._refresh_lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        # Last change-log version applied, or (newest updated_at, row count) while Redis is down.
+        self._remote_version: Optional[int] = None
+        self._watermark: Optional[tuple] = None
+        self._table = _FeatureTable({})
+        self._loaded = False
+        self._loaded_at: Optional[float] = None
+        # Bumped when pool membership, a scored field or a specialty name changes (not on no-op writes),
+        # so consumers can tell their results are older.
+        self._generation = 0
+        self._fingerprint: Optional[tuple] = None  # (generation, fingerprint)
+        self._pending: Set[str] = set()
+        self._specialties_stale = False
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        profile_events.subscribe(self._on_profiles_changed)
+
+    # -- change notifications -------------------------------------------------
+
+    def _on_profiles_changed(self, changed: Set[str], deleted: Set[str]) -> None:
+        with self._lock:
+            removed = [profile_id for profile_id in deleted if self._table.remove(profile_id)]
+            if removed:
+                self._generation += 1
+            # Deleted ids too, and even before the first load finishes: it may have read older rows.
+            self._pending |= changed | deleted
+        self._wake.set()
+        self._publish(changed | deleted)
+
+    def specialties_changed(self) -> None:
+        with self._lock:
+            self._specialties_stale = True
+        self._wake.set()
+        self._publish({SPECIALTIES_MEMBER})
+
+    def _publish(self, members: Set[str]) -> None:
+        """Log a commit's changes for the other worker processes."""
+        client = redis_pool.reachable_client()
+        if client is None or not members:
+            return
+        try:
+            version = int(client.register_script(_PUBLISH)(
+                keys=[VERSION_KEY, CHANGES_KEY], args=[CHANGE_LOG_TTL_SECONDS, *sorted(members)],
+            ))
+        except redis.RedisError as exc:
+            logger.warning(f"Could not log candidate changes for other workers: {exc}")
+            return
+        with self._lock:
+            # Nothing was logged in between, and this process already queued these changes.
+            if self._remote_version == version - 1:
+                self._remote_version = version
+
+    # -- other worker processes -----------------------------------------------
+
+    def _log_version(self):
+        """``(client, change log version)``, or ``(None, None)`` while Redis is unreachable."""
+        client = redis_pool.reachable_client()
+        if client is None:
+            return None, None
+        try:
+            return client, int(client.get(VERSION_KEY) or 0)
+        except redis.RedisError as exc:
+            logger.warning(f"Candidate change log unavailable: {exc}")
+            return None, None
+
+    @staticmethod
+    def _read_watermark(db: Session) -> tuple:
+        return tuple(db.execute(select(func.max(ProzProfile.updated_at), func.count(ProzProfile.id))).one())
+
+    def _sync_remote(self) -> None:
+        """Queue the profiles other processes changed since the last check; a full load when that is unknown."""
+        client, version = self._log_version()
+        if client is None:
+            return self._sync_watermark()
+        with self._lock:
+            seen = self._remote_version
+        if version == seen:
+            return
+        if seen is None or version < seen:
+            # First check since Redis came back, or the log expired: changes may be missing.
+            return self.load()
+        try:
+            members = client.zrangebyscore(CHANGES_KEY, f"({seen}", version)
+        except redis.RedisError as exc:
+            logger.warning(f"Candidate change log unavailable: {exc}")
+            return self._sync_watermark()
+        with self._lock:
+            self._pending.update(m for m in members if m != SPECIALTIES_MEMBER)
+            self._specialties_stale |= SPECIALTIES_MEMBER in members
+            self._remote_version = max(version, self._remote_version or 0)
+
+    def _sync_watermark(self) -> None:
+        db = self._session_factory()
+        try:
+            watermark = self._read_watermark(db)
+            with self._lock:
+                previous = self._watermark
+            changed = None
+            if previous is not None and watermark != previous and watermark[1] >= previous[1] and previous[0] is not None:
+                changed = [str(i) for i in db.scalars(
+                    select(ProzProfile.id).where(ProzProfile.updated_at >= previous[0])
+                )]
+        finally:
+            db.close()
+        if previous is None or (watermark != previous and changed is None):
+            # Redis just went away (its log may have missed writes), or a profile was deleted.
+            return self.load()
+        with self._lock:
+            self._pending.update(changed or ())
+            self._watermark = watermark
+
+    # -- loading --------------------------------------------------------------
+
+    def _read(self, db: Session, profile_ids: Optional[List[str]]):
+        """``(profile rows, {profile id: [specialty ids]})``; all verified profiles when ``profile_ids`` is None."""
+        if profile_ids is None:
+            rows = db.execute(select(*PROFILE_COLUMNS).where(ProzProfile.verification_status == VERIFIED)).all()
+            links = db.execute(
+                select(ProzSpecialty.proz_id, ProzSpecialty.specialty_id)
+                .join(ProzProfile, ProzProfile.id == ProzSpecialty.proz_id)
+                .where(ProzProfile.verification_status == VERIFIED)
+            ).all()
+        else:
+            rows, links = [], []
+            for chunk in _chunks(profile_ids):
+                rows.extend(db.execute(select(*PROFILE_COLUMNS).where(ProzProfile.id.in_(chunk))).all())
+                links.extend(db.execute(
+                    select(ProzSpecialty.proz_id, ProzSpecialty.specialty_id).where(ProzSpecialty.proz_id.in_(chunk))
+                ).all())
+        specialties: Dict[str, List[str]] = {}
+        for proz_id, specialty_id in links:
+            specialties.setdefault(str(proz_id), []).append(str(specialty_id))
+        return rows, specialties
+
+    @staticmethod
+    def _specialty_names(db: Session) -> Dict[str, str]:
+        return {str(specialty_id): name for specialty_id, name in db.execute(select(Specialty.id, Specialty.name))}
+
+    def load(self) -> None:
+        """Read every verified profile and replace the table."""
+        with self._load_lock:
+            started = time.monotonic()
+            with self._lock:
+                self._specialties_stale = False
+            # Read before the rows, so changes committed during the load are applied after it.
+            _, version = self._log_version()
+            db = self._session_factory()
+            try:
+                watermark = self._read_watermark(db) if version is None else None
+                names = self._specialty_names(db)
+                rows, specialties = self._read(db, None)
+            finally:
+                db.close()
+            table = _FeatureTable(names)
+            for row in rows:
+                table.upsert(row, specialties.get(str(row.id), []))
+            fingerprint = table.fingerprint()
+            with self._lock:
+                if not self._loaded or self._current_fingerprint() != fingerprint:
+                    self._generation += 1
+                self._table = table
+                self._fingerprint = (self._generation, fingerprint)
+                self._loaded = True
+                self._loaded_at = time.time()
+                self._remote_version, self._watermark = version, watermark
+            logger.info(f"Candidate feature store loaded {len(table)} profiles in {time.monotonic() - started:.2f}s")
+
+    def refresh(self) -> int:
+        """Re-read profiles changed since the last refresh (and specialty names if stale); returns profiles read."""
+        with self._refresh_lock:
+            return self._refresh()
+
+    def _refresh(self) -> int:
+        with self._lock:
+            pending, self._pending = self._pending, set()
+            specialties_stale, self._specialties_stale = self._specialties_stale, False
+        if not pending and not specialties_stale:
+            return 0
+        db = self._session_factory()
+        try:
+            names = self._specialty_names(db) if specialties_stale else None
+            rows, specialties = self._read(db, sorted(pending)) if pending else ([], {})
+            referenced = sorted({s for ids in specialties.values() for s in ids})
+            if names is None and referenced:
+                # Names of the specialties these profiles link, including ones created since the load.
+                names = {**self._table.specialty_display, **{
+                    str(specialty_id): name
+                    for specialty_id, name in db.execute(select(Specialty.id, Specialty.name).where(Specialty.id.in_(referenced)))
+                }}
+        except Exception:
+            with self._lock:
+                self._pending |= pending
+                self._specialties_stale |= specialties_stale
+            raise
+        finally:
+            db.close()
+        with self._lock:
+            table = self._table
+            changed = names is not None and table.rename_specialties(names)
+            seen = set()
+            for row in rows:
+                profile_id = str(row.id)
+                seen.add(profile_id)
+                if row.verification_status == VERIFIED:
+                    changed |= table.upsert(row, specialties.get(profile_id, []))
+                else:
+                    changed |= table.remove(profile_id)
+            for profile_id in pending - seen:
+                changed |= table.remove(profile_id)
+            if changed:
+                self._generation += 1
+        return len(pending)
+
+    # -- background thread ----------------------------------------------------
+
+    def start(self) -> None:
+        """Load in the background and follow profile writes until ``stop()``."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="candidate-features", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        next_load = 0.0
+        while not self._stopping.is_set():
+            try:
+                if not self._loaded or (self.reload_seconds and time.monotonic() >= next_load):
+                    self.load()
+                    next_load = time.monotonic() + (self.reload_seconds or 0)
+                self.refresh()
+            except Exception:
+                logger.exception(f"Candidate feature store refresh failed; retrying in {RETRY_SECONDS:.0f}s")
+                self._stopping.wait(RETRY_SECONDS)
+                continue
+            timeout = max(0.0, next_load - time.monotonic()) if self.reload_seconds else None
+            self._wake.wait(timeout)
+            self._wake.clear()
+
+    def stop(self) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._stopping.set()
+        self._wake.set()
+        thread.join(timeout=5)
+
+    # -- reads ----------------------------------------------------------------
+
+    def _ensure_current(self) -> None:
+        if not self._loaded:
+            with self._load_lock:
+                loaded = self._loaded
+            if not loaded:
+                self.load()
+        with self._sync_lock:
+            self._sync_remote()
+            if self._pending or self._specialties_stale:
+                self.refresh()
+
+    def snapshot(self, exclude_ids: Iterable[str] = ()) -> CandidateMatrix:
+        """Every verified professional except ``exclude_ids``, best rated first."""
+        self._ensure_current()
+        with self._lock:
+            return self._table.snapshot(exclude_ids)
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def _current_fingerprint(self) -> str:
+        # Caller holds self._lock
+        if self._fingerprint is None or self._fingerprint[0] != self._generation:
+            self._fingerprint = (self._generation, self._table.fingerprint())
+        return self._fingerprint[1]
+
+    def fingerprint(self) -> str:
+        """``_FeatureTable.fingerprint`` of the current pool (other workers' changes applied), cached per generation."""
+        self._ensure_current()
+        with self._lock:
+            return self._current_fingerprint()
+
+    def candidates_by_id(self, profile_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Current candidate dicts of the given verified professionals; others are left out."""
+        self._ensure_current()
+        with self._lock:
+            table = self._table
+            found = {}
+            for profile_id in profile_ids:
+                index = table.rows.get(str(profile_id))
+                if index is not None:
+                    found[str(profile_id)] = table.candidates[index]
+            return found
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "loaded": self._loaded,
+                "generation": self._generation,
+                "loaded_at": self._loaded_at,
+                "profiles": len(self._table),
+                "specialties": len(self._table.specialty_display),
+                "pending": len(self._pending),
+            }
+
+
+candidate_features = CandidateFeatureStore()
+
+
+_SPECIALTY_SESSION_KEY = "candidate_specialty_changes"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_specialty_changes(session: Session, flush_context) -> None:
+    # New specialties reach the store with the first profile that links them.
+    if any(isinstance(obj, Specialty) for obj in session.dirty.union(session.deleted)):
+        session.info[_SPECIALTY_SESSION_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_specialty_changes(session: Session) -> None:
+    if session.info.pop(_SPECIALTY_SESSION_KEY, False):
+        candidate_features.specialties_changed()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_specialty_changes(session: Session) -> None:
+    session.info.pop(_SPECIALTY_SESSION_KEY, None)
@@ -0,0 +1,215 @@
+# app/services/candidate_scorer.py
+"""Vectorized heuristic scoring of professionals for a service request.
+
+Candidates are packed once into NumPy arrays; each request is then scored
+for the whole pool in a handful of array operations and the top ``k`` are
+picked with ``argpartition``. The formula is the one the ranking heuristic
+has always used, evaluated in the same order so the float results are
+bit-identical:
+
+    30  if the request category is a substring of any specialty
+    15  if on-site and the location preference is a substring of the location
+    min(25, 3 * years_experience)
+    min(20, 4 * rating)
+    10  if the request has a budget and the hourly rate is unset or within budget/40
+
+Locations and specialty names are interned: a request's substring tests run
+once per distinct string, and candidates carry a location code and a
+specialty bitset. Ties keep the input order, as the stable sort in the old
+loop did. Reasons are only built for the candidates that are returned.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+ESTIMATED_HOURS = 40
+WORD_BITS = 64
+
+
+def word_count(bits: int) -> int:
+    return max(1, (bits + WORD_BITS - 1) // WORD_BITS)
+
+
+@dataclass
+class CandidateMatrix:
+    candidates: List[Dict[str, Any]]
+    years: np.ndarray  # float64, 0 when unset
+    ratings: np.ndarray  # float64, 0 when unset
+    rates: np.ndarray  # float64, NaN when unset
+    location_codes: np.ndarray  # int32 index into location_names, -1 when unset
+    location_names: List[str]  # lower-cased
+    specialty_bits: np.ndarray  # uint64 (rows, words); bit b set = has specialty_names[b]
+    specialty_names: List[Optional[str]]  # lower-cased; None for a retired bit
+
+    @classmethod
+    def from_candidates(cls, candidates: Sequence[Dict[str, Any]]) -> "CandidateMatrix":
+        candidates = list(candidates)
+        location_index: Dict[str, int] = {}
+        specialty_index: Dict[str, int] = {}
+        codes = []
+        set_rows, set_bits = [], []
+        for row, c in enumerate(candidates):
+            location = (c.get("location") or "").lower()
+            codes.append(location_index.setdefault(location, len(location_index)) if location else -1)
+            for name in c.get("specialties") or []:
+                set_rows.append(row)
+                set_bits.append(specialty_index.setdefault(name.lower(), len(specialty_index)))
+
+        bits = np.zeros((len(candidates), word_count(len(specialty_index))), dtype=np.uint64)
+        if set_rows:
+            positions = np.array(set_bits, dtype=np.uint64)
+            np.bitwise_or.at(
+                bits,
+                (np.array(set_rows), (positions // WORD_BITS).astype(np.intp)),
+                np.left_shift(np.uint64(1), positions % np.uint64(WORD_BITS)),
+            )
+        rates = [c.get("hourly_rate") for c in candidates]
+        return cls(
+            candidates=candidates,
+            years=np.array([c.get("years_experience") or 0 for c in candidates], dtype=np.float64),
+            ratings=np.array([c.get("rating") or 0 for c in candidates], dtype=np.float64),
+            rates=np.array([np.nan if r is None else r for r in rates], dtype=np.float64),
+            location_codes=np.array(codes, dtype=np.int32),
+            location_names=list(location_index),
+            specialty_bits=bits,
+            specialty_names=list(specialty_index),
+        )
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+
+@dataclass
+class RequestTerms:
+    category: str
+    location: str
+    remote: bool
+    max_hourly: Optional[float]
+
+    @classmethod
+    def from_request(cls, service_request: Dict[str, Any]) -> "RequestTerms":
+        budget_max = service_request.get("budget_max")
+        return cls(
+            category=(service_request.get("service_category") or "").lower(),
+            location=(service_request.get("location_preference") or "").lower(),
+            remote=bool(service_request.get("remote_work_allowed")),
+            max_hourly=(budget_max / ESTIMATED_HOURS) if budget_max else None,
+        )
+
+
+def specialty_mask(matrix: CandidateMatrix, needle: str) -> np.ndarray:
+    """Rows with a specialty name containing ``needle``."""
+    words = np.zeros(matrix.specialty_bits.shape[1], dtype=np.uint64)
+    for bit, name in enumerate(matrix.specialty_names):
+        if name is not None and needle in name:
+            words[bit // WORD_BITS] |= np.uint64(1) << np.uint64(bit % WORD_BITS)
+    if not words.any():
+        return np.zeros(len(matrix), dtype=bool)
+    return (matrix.specialty_bits & words).any(axis=1)
+
+
+def location_mask(matrix: CandidateMatrix, needle: str) -> np.ndarray:
+    """Rows whose location contains ``needle``; rows without one never match."""
+    # The extra False at the end is what code -1 indexes.
+    matches = np.fromiter((needle in name for name in matrix.location_names), dtype=bool,
+                          count=len(matrix.location_names))
+    return np.append(matches, False)[matrix.location_codes]
+
+
+def request_masks(matrix: CandidateMatrix, terms: RequestTerms) -> Dict[str, np.ndarray]:
+    """Per-rule masks: ``specialty``, ``local`` and ``within_budget``."""
+    n = len(matrix)
+    specialty = specialty_mask(matrix, terms.category) if terms.category else np.zeros(n, dtype=bool)
+    local = location_mask(matrix, terms.location) if not terms.remote and terms.location else np.zeros(n, dtype=bool)
+    if terms.max_hourly is not None:
+        within_budget = np.isnan(matrix.rates) | (matrix.rates <= terms.max_hourly)
+    else:
+        within_budget = np.zeros(n, dtype=bool)
+    return {"specialty": specialty, "local": local, "within_budget": within_budget}
+
+
+def score_matrix(matrix: CandidateMatrix, terms: RequestTerms) -> Dict[str, np.ndarray]:
+    """Scores plus the per-rule masks that the reasons are built from."""
+    masks = request_masks(matrix, terms)
+    # Python's min(a, b) returns b only when b < a; np.where keeps that for NaN too.
+    experience = matrix.years * 3
+    rating = matrix.ratings * 4
+    scores = np.where(masks["specialty"], 30.0, 0.0) + np.where(masks["local"], 15.0, 0.0)
+    scores = scores + np.where(experience < 25, experience, 25)
+    scores = scores + np.where(rating < 20, rating, 20)
+    scores = scores + np.where(masks["within_budget"], 10.0, 0.0)
+    return {"scores": scores, **masks}
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` best scores, best first; ties go to the lower index."""
+    n = len(scores)
+    if k <= 0 or n == 0:
+        return np.zeros(0, dtype=np.intp)
+    if k < n:
+        kth = scores[np.argpartition(-scores, k - 1)[:k]].min()
+        above = np.flatnonzero(scores > kth)
+        ties = np.flatnonzero(scores == kth)[: k - len(above)]
+        chosen = np.concatenate([above, ties])
+    else:
+        chosen = np.arange(n)
+    return chosen[np.lexsort((chosen, -scores[chosen]))]
+
+
+def _reasons(candidate: Dict[str, Any], specialty: bool, local: bool, within_budget: bool) -> List[str]:
+    reasons: List[str] = []
+    if specialty:
+        reasons.append("Matching specialty")
+    if local:
+        reasons.append("Local match")
+    y = candidate.get("years_experience") or 0
+    if y:
+        reasons.append(f"{y}+ years experience")
+    r = candidate.get("rating") or 0
+    if r and r >= 4.0:
+        reasons.append("High rating")
+    if within_budget:
+        reasons.append("Within budget")
+    return reasons
+
+
+def rank(matrix: CandidateMatrix, service_request: Dict[str, Any], top_k: int) -> List[Dict[str, Any]]:
+    """``[{candidate, score, reasons}]`` for the best ``top_k`` candidates, best first."""
+    scored = score_matrix(matrix, RequestTerms.from_request(service_request))
+    results = []
+    for i in top_k_indices(scored["scores"], top_k):
+        results.append({
+            "candidate": matrix.candidates[i],
+            "score": float(scored["scores"][i]),
+            "reasons": _reasons(
+                matrix.candidates[i], bool(scored["specialty"][i]), bool(scored["local"][i]),
+                bool(scored["within_budget"][i]),
+            ),
+        })
+    return results
+
+
+def filter_matches(matrix: CandidateMatrix, service_request: Dict[str, Any], limit: int) -> List[Dict[str, Any]]:
+    """Candidates passing every rule the request sets, best rated (then most experienced) first.
+
+    The rule-based counterpart of ``rank`` used by auto-suggest: a category,
+    an on-site location preference and a budget each filter instead of
+    adding points. Returns ``[{candidate, specialty, local}]``.
+    """
+    terms = RequestTerms.from_request(service_request)
+    masks = request_masks(matrix, terms)
+    keep = np.ones(len(matrix), dtype=bool)
+    if terms.category:
+        keep &= masks["specialty"]
+    if not terms.remote and terms.location:
+        keep &= masks["local"]
+    if terms.max_hourly is not None:
+        keep &= masks["within_budget"]
+    rows = np.flatnonzero(keep)
+    rows = rows[np.lexsort((rows, -matrix.years[rows], -matrix.ratings[rows]))][: max(limit, 0)]
+    return [
+        {"candidate": matrix.candidates[i], "specialty": bool(masks["specialty"][i]), "local": bool(masks["local"][i])}
+        for i in rows
+    ]
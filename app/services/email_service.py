@@ -1,54 +1,33 @@
 # app/services/email_service.py
-import smtplib
-import ssl
 import secrets
 import json
 from datetime import datetime, timedelta
 import os
-import http.client
 from typing import Optional, Dict, Any
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email import encoders
 import logging
 
-from app.config.settings import settings
+from app.config.settings import load_env_files, settings
+from app.core import redis_pool
 from app.services.email_templates import build_verification_email, frontend_verification_url
-
-# Optional .env loader so server runs pick up root .env without process-level export
-try:
-    from dotenv import load_dotenv  # type: ignore
-    DOTENV_AVAILABLE = True
-except Exception:
-    DOTENV_AVAILABLE = False
+from app.services.mail_queue import MailtrapTransport, OutboundEmail, mail_queue
 
 logger = logging.getLogger(__name__)
 
-try:
-    import redis
-    REDIS_AVAILABLE = True
-except ImportError:
-    REDIS_AVAILABLE = False
-    logger.warning("Redis not installed. Using in-memory storage for email verification.")
-
 # In-memory storage for development mode
 email_storage = {}
 rate_limit_storage = {}
 
 
 class EmailService:
-    def __init__(self):
-        # Best-effort load of .env files if Mailtrap/SMTP envs not already present
-        if DOTENV_AVAILABLE:
-            try:
-                # Load from CWD and project root (two levels up from this file: app/services/.. -> project root)
-                project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
-                load_dotenv(os.path.join(project_root, '.env'), override=False)
-                load_dotenv(os.path.join(project_root, '.env.production'), override=False)
-                load_dotenv(os.path.join(os.getcwd(), '.env'), override=False)
-            except Exception:
-                pass
+    def __init__(self, redis_client=None):
+        """Use ``get_email_service()`` from ``app.core.container`` rather than constructing per call.
+
+        ``redis_client`` defaults to a client on the shared pool when Redis is reachable.
+        """
+        # Pick up Mailtrap/SMTP keys from .env files without process-level export
+        load_env_files()
 
         self.smtp_configured = self._check_smtp_configuration()
         
@@ -78,25 +57,18 @@ class EmailService:
             or getattr(settings, "PROJECT_NAME", "Prozlab Support")
         )
 
+        if self.mailtrap_api_key:
+            mail_queue.register_transport("mailtrap", lambda: MailtrapTransport(self.mailtrap_api_key))
+
         # Treat Mailtrap as production-capable as well
         self.development_mode = not (self.smtp_configured or self.mailtrap_api_key)
 
         # Set up storage (Redis or in-memory)
-        if REDIS_AVAILABLE:
-            try:
-                self.redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
-                self.redis_client.ping()
-                self.use_redis = True
-                logger.info("Redis connection established for email service")
-            except Exception as e:
-                logger.error(f"Redis connection failed: {str(e)}. Using in-memory storage.")
-                self.redis_client = None
-                self.use_redis = False
-        else:
-            self.redis_client = None
-            self.use_redis = False
+        self.redis_client = redis_client if redis_client is not None else redis_pool.reachable_client()
+        self.use_redis = self.redis_client is not None
+        if not self.use_redis:
             logger.info("Using in-memory storage for email verification")
-        
+
         if self.development_mode:
             logger.info("Email service running in DEVELOPMENT MODE")
         else:
@@ -273,13 +245,17 @@ class EmailService:
         reply_to_email: Optional[str] = None,
         reply_to_name: Optional[str] = None,
     ) -> None:
-        """Send email via Mailtrap, SMTP, or log in development mode."""
+        """Queue email for Mailtrap or SMTP delivery, or log it in development mode.
+
+        Returns as soon as the message is queued; use ``mail_queue.batch()``
+        around bulk sends so they share one connection.
+        """
         recipient_name = to_name or to_email
         reply_email = reply_to_email or self.mailtrap_reply_email
         reply_name = reply_to_name or self.mailtrap_reply_name
 
-        if self.mailtrap_api_key:
-            self._send_mailtrap_email(
+        if self.mailtrap_api_key or self.smtp_configured:
+            mail_queue.enqueue(self._outbound_email(
                 to_email=to_email,
                 to_name=recipient_name,
                 subject=subject,
@@ -287,18 +263,7 @@ class EmailService:
                 html_body=html_body,
                 reply_to_email=reply_email,
                 reply_to_name=reply_name,
-            )
-            return
-
-        if self.smtp_configured:
-            self._send_smtp_email(
-                to_email,
-                subject,
-                html_body,
-                text_body,
-                reply_to_email=reply_email,
-                reply_to_name=reply_name,
-            )
+            ))
             return
 
         logger.info("DEVELOPMENT MODE email to %s", to_email)
@@ -306,6 +271,34 @@ class EmailService:
         print(f"DEVELOPMENT MODE email to {to_email}")
         print(f"Subject: {subject}")
 
+    def _outbound_email(
+        self,
+        to_email: str,
+        subject: str,
+        text_body: str,
+        html_body: Optional[str] = None,
+        to_name: Optional[str] = None,
+        reply_to_email: Optional[str] = None,
+        reply_to_name: Optional[str] = None,
+        transport: Optional[str] = None,
+    ) -> OutboundEmail:
+        """Build a queued message for the configured transport (Mailtrap preferred)."""
+        if transport is None:
+            transport = "mailtrap" if self.mailtrap_api_key else "smtp"
+        return OutboundEmail(
+            transport=transport,
+            to_email=to_email,
+            to_name=to_name or to_email,
+            subject=subject,
+            text_body=text_body or "",
+            html_body=html_body,
+            from_email=self.mailtrap_from_email if transport == "mailtrap" else settings.EMAIL_FROM,
+            from_name=self.mailtrap_from_name,
+            reply_to_email=reply_to_email or self.mailtrap_reply_email,
+            reply_to_name=reply_to_name or self.mailtrap_reply_name,
+            category=settings.PROJECT_NAME if hasattr(settings, 'PROJECT_NAME') else "App Email",
+        )
+
     def _send_smtp_email(
         self,
         to_email: str,
@@ -315,30 +308,16 @@ class EmailService:
         reply_to_email: Optional[str] = None,
         reply_to_name: Optional[str] = None,
     ):
-        """Send email via SMTP"""
-        msg = MIMEMultipart('alternative')
-        msg['Subject'] = subject
-        msg['From'] = settings.EMAIL_FROM
-        msg['To'] = to_email
-        reply_email = reply_to_email or self.mailtrap_reply_email
-        reply_name = reply_to_name or self.mailtrap_reply_name
-        if reply_email:
-            msg['Reply-To'] = f"{reply_name} <{reply_email}>" if reply_name else reply_email
-        
-        # Create text and HTML parts
-        text_part = MIMEText(text_body, 'plain')
-        html_part = MIMEText(html_body, 'html')
-        
-        # Add parts to message
-        msg.attach(text_part)
-        msg.attach(html_part)
-        
-        # Create secure connection and send email
-        context = ssl.create_default_context()
-        with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT) as server:
-            server.starttls(context=context)
-            server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-            server.send_message(msg)
+        """Send email via SMTP now, over the pooled SMTP session"""
+        mail_queue.deliver(self._outbound_email(
+            to_email=to_email,
+            subject=subject,
+            text_body=text_body,
+            html_body=html_body,
+            reply_to_email=reply_to_email,
+            reply_to_name=reply_to_name,
+            transport="smtp",
+        ))
 
     def _send_mailtrap_email(
         self,
@@ -352,50 +331,23 @@ class EmailService:
         reply_to_email: Optional[str] = None,
         reply_to_name: Optional[str] = None,
     ):
-        """Send email using Mailtrap Send API if configured."""
+        """Send email now using the Mailtrap Send API, over the pooled connection."""
         if not self.mailtrap_api_key:
             raise RuntimeError("MAILTRAP_APIKEY not configured")
 
-        # Build payload
-        payload = {
-            "to": [{"email": to_email, "name": to_name or to_email}],
-            "from": {
-                "email": self.mailtrap_from_email,
-                "name": self.mailtrap_from_name,
-            },
-            "subject": subject,
-            "text": text_body or "",
-            "category": settings.PROJECT_NAME if hasattr(settings, 'PROJECT_NAME') else "App Email",
-        }
-
-        if html_body:
-            payload["html"] = html_body
-        reply_email = reply_to_email or self.mailtrap_reply_email
-        reply_name = reply_to_name or self.mailtrap_reply_name
-        if reply_email:
-            payload["reply_to"] = {"email": reply_email, "name": reply_name or reply_email}
-        if cc:
-            payload["cc"] = cc
-        if bcc:
-            payload["bcc"] = bcc
-
-        conn = http.client.HTTPSConnection("send.api.mailtrap.io")
-        headers = {
-            'Content-Type': 'application/json',
-            'Accept': 'application/json',
-            'Api-Token': self.mailtrap_api_key,
-        }
-        try:
-            conn.request("POST", "/api/send", json.dumps(payload), headers)
-            res = conn.getresponse()
-            data = res.read()
-            if res.status >= 400:
-                raise RuntimeError(f"Mailtrap send failed: {res.status} {data.decode('utf-8')}")
-        finally:
-            try:
-                conn.close()
-            except Exception:
-                pass
+        email = self._outbound_email(
+            to_email=to_email,
+            to_name=to_name,
+            subject=subject,
+            text_body=text_body,
+            html_body=html_body,
+            reply_to_email=reply_to_email,
+            reply_to_name=reply_to_name,
+            transport="mailtrap",
+        )
+        email.cc = cc
+        email.bcc = bcc
+        mail_queue.deliver(email)
 
     def send_email_to_proz_profile(self, proz_profile, subject: str, text_body: str, html_body: Optional[str] = None) -> Dict[str, Any]:
         """Send an email to a Proz profile using Mailtrap if available, else SMTP.
@@ -411,14 +363,16 @@ class EmailService:
             if not to_email:
                 return {"success": False, "message": "Profile has no email"}
 
-            if self.mailtrap_api_key:
-                self._send_mailtrap_email(to_email=to_email, to_name=to_name, subject=subject, text_body=text_body, html_body=html_body)
-            else:
-                # Fallback to SMTP (build minimal bodies)
-                html_content = html_body or f"<p>{text_body}</p>"
-                self._send_smtp_email(to_email=to_email, subject=subject, html_body=html_content, text_body=text_body)
+            # Queued; Mailtrap if configured, else SMTP (minimal HTML body if none given)
+            self.send_email(
+                to_email=to_email,
+                subject=subject,
+                html_body=html_body or f"<p>{text_body}</p>",
+                text_body=text_body,
+                to_name=to_name,
+            )
 
-            return {"success": True, "message": "Email sent"}
+            return {"success": True, "message": "Email queued"}
 
         except Exception as e:
             logger.error(f"Error sending email to proz profile {getattr(proz_profile, 'email', 'unknown')}: {str(e)}")
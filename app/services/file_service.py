@@ -5,10 +5,11 @@ import shutil
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 from fastapi import UploadFile, HTTPException, status
-from PIL import Image
+from starlette.concurrency import run_in_threadpool
 import logging
 
 from app.config.settings import settings
+from app.services.image_pipeline import STATUS_PROCESSING, STATUS_READY, image_pipeline, render_variants
 
 logger = logging.getLogger(__name__)
 
@@ -94,37 +95,20 @@ class FileService:
         unique_id = str(uuid.uuid4())
         return f"{unique_id}.{file_extension}"
     
-    def _resize_image(self, image_path: Path, size: tuple, output_path: Path):
-        """Resize image to specified dimensions"""
-        try:
-            with Image.open(image_path) as img:
-                # Convert RGBA to RGB if necessary (for JPEG)
-                if img.mode in ('RGBA', 'LA', 'P'):
-                    # Create a white background
-                    background = Image.new('RGB', img.size, (255, 255, 255))
-                    if img.mode == 'P':
-                        img = img.convert('RGBA')
-                    background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
-                    img = background
-                
-                # Resize maintaining aspect ratio
-                img.thumbnail(size, Image.Resampling.LANCZOS)
-                
-                # Create a square image with padding if needed
-                new_img = Image.new('RGB', size, (255, 255, 255))
-                paste_x = (size[0] - img.size[0]) // 2
-                paste_y = (size[1] - img.size[1]) // 2
-                new_img.paste(img, (paste_x, paste_y))
-                
-                # Save with optimization
-                new_img.save(output_path, 'JPEG', quality=85, optimize=True)
-                
-        except Exception as e:
-            logger.error(f"Error resizing image: {str(e)}")
-            raise
-    
-    def upload_profile_image(self, file: UploadFile, user_id: str) -> Dict[str, Any]:
-        """Upload and process profile image"""
+    def _variant_targets(self, unique_filename: str):
+        """(size, path) and URL of every resized version of ``unique_filename``."""
+        outputs = {
+            size_name: (dimensions, self.profile_images_dir / size_name / unique_filename)
+            for size_name, dimensions in IMAGE_SIZES.items()
+        }
+        urls = {
+            size_name: f"/static/profile_images/{size_name}/{unique_filename}"
+            for size_name in IMAGE_SIZES
+        }
+        return outputs, urls
+
+    def save_profile_image_original(self, file: UploadFile, user_id: str) -> Dict[str, Any]:
+        """Validate the upload and write the original to disk (fsynced); variants are not rendered."""
         try:
             # Validate file
             validation = self._validate_image_file(file)
@@ -139,35 +123,20 @@ class FileService:
             unique_filename = self._generate_unique_filename(file.filename)
             original_path = self.profile_images_dir / unique_filename
             
-            # Save original file
+            # Save original file and make sure it is durable before we answer
             with open(original_path, "wb") as buffer:
                 shutil.copyfileobj(file.file, buffer)
+                buffer.flush()
+                os.fsync(buffer.fileno())
             
-            # Get file size
-            file_size = original_path.stat().st_size
-            
-            # Create different sized versions
-            image_urls = {}
-            for size_name, dimensions in IMAGE_SIZES.items():
-                size_dir = self.profile_images_dir / size_name
-                size_path = size_dir / unique_filename
-                
-                self._resize_image(original_path, dimensions, size_path)
-                
-                # Generate URL (adjust based on your serving setup)
-                image_urls[size_name] = f"/static/profile_images/{size_name}/{unique_filename}"
-            
-            # Clean up original if we only want processed versions
-            # os.remove(original_path)  # Uncomment if you don't want to keep originals
-            
-            logger.info(f"Profile image uploaded successfully for user {user_id}: {unique_filename}")
-            
+            _, image_urls = self._variant_targets(unique_filename)
             return {
                 "success": True,
                 "message": "Profile image uploaded successfully",
                 "file_name": unique_filename,
-                "file_size": file_size,
+                "file_size": original_path.stat().st_size,
                 "original_filename": file.filename,
+                "original_path": original_path,
                 "image_urls": image_urls,
                 "primary_url": image_urls["medium"]  # Default size for profiles
             }
@@ -181,6 +150,44 @@ class FileService:
                 "error_details": str(e)
             }
     
+    def upload_profile_image(self, file: UploadFile, user_id: str) -> Dict[str, Any]:
+        """Upload and process profile image, rendering the variants before returning"""
+        result = self.save_profile_image_original(file, user_id)
+        if not result["success"]:
+            return result
+        try:
+            outputs, _ = self._variant_targets(result["file_name"])
+            render_variants(
+                str(result["original_path"]),
+                {name: (size, str(path)) for name, (size, path) in outputs.items()},
+            )
+        except Exception as e:
+            logger.error(f"Error resizing image: {str(e)}")
+            return {
+                "success": False,
+                "message": "Failed to upload image",
+                "error_code": "UPLOAD_FAILED",
+                "error_details": str(e)
+            }
+        logger.info(f"Profile image uploaded successfully for user {user_id}: {result['file_name']}")
+        result["variants_status"] = STATUS_READY
+        return result
+
+    async def upload_profile_image_async(self, file: UploadFile, user_id: str) -> Dict[str, Any]:
+        """Save the original off the event loop and queue its variants on the image pipeline.
+
+        Returns as soon as the original is on disk; ``variants_status`` is
+        ``processing`` until ``image_pipeline.get_status(file_name)`` says otherwise.
+        """
+        result = await run_in_threadpool(self.save_profile_image_original, file, user_id)
+        if not result["success"]:
+            return result
+        outputs, urls = self._variant_targets(result["file_name"])
+        image_pipeline.submit(result["file_name"], result["original_path"], outputs, urls)
+        logger.info(f"Profile image uploaded for user {user_id}: {result['file_name']} (variants queued)")
+        result["variants_status"] = STATUS_PROCESSING
+        return result
+    
     def delete_profile_image(self, filename: str) -> Dict[str, Any]:
         """Delete profile image and all its variants"""
         try:
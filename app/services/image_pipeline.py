@@ -0,0 +1,145 @@
+# app/services/image_pipeline.py
+"""Profile image variants, rendered off the event loop.
+
+``render_variants`` decodes the uploaded original once and derives every
+size from that single decode, largest first, each from the previous one.
+For JPEGs it asks the decoder for a reduced-scale image (``Image.draft``)
+no smaller than the largest variant, so a 12 MP photo is never fully decoded
+just to produce an 800px square.
+
+``ImagePipeline.submit`` runs it in a process pool and records progress in
+``app.core.cache`` under ``status_key(file_name)``. The upload endpoint
+returns once the original is on disk; clients poll the status endpoint (or
+just load the variant URLs) for the resized versions.
+"""
+
+import logging
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from PIL import Image
+
+from app.config.settings import settings
+from app.core.cache import cache
+from app.core.process_pool import LazyProcessPool
+
+logger = logging.getLogger(__name__)
+
+Size = Tuple[int, int]
+
+STATUS_PROCESSING = "processing"
+STATUS_READY = "ready"
+STATUS_FAILED = "failed"
+STATUS_TTL_SECONDS = 24 * 60 * 60
+
+
+def _flatten(img: Image.Image) -> Image.Image:
+    """RGB on a white background, as the JPEG variants need."""
+    if img.mode in ('RGBA', 'LA', 'P'):
+        if img.mode == 'P':
+            img = img.convert('RGBA')
+        background = Image.new('RGB', img.size, (255, 255, 255))
+        background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
+        return background
+    if img.mode != 'RGB':
+        return img.convert('RGB')
+    return img
+
+
+def _square(img: Image.Image, size: Size) -> Image.Image:
+    canvas = Image.new('RGB', size, (255, 255, 255))
+    canvas.paste(img, ((size[0] - img.size[0]) // 2, (size[1] - img.size[1]) // 2))
+    return canvas
+
+
+def render_variants(source_path: str, outputs: Mapping[str, Tuple[Size, str]]) -> Dict[str, int]:
+    """Write a padded square JPEG per ``name -> (size, output_path)``; returns bytes written per name.
+
+    Runs in a worker process, so it only takes and returns picklable values.
+    """
+    ordered = sorted(outputs.items(), key=lambda item: item[1][0][0] * item[1][0][1], reverse=True)
+    largest = ordered[0][1][0]
+    written: Dict[str, int] = {}
+    with Image.open(source_path) as img:
+        if img.format == 'JPEG':
+            img.draft('RGB', largest)
+        current = _flatten(img)
+        current.load()
+        for name, (size, output_path) in ordered:
+            current.thumbnail(size, Image.Resampling.LANCZOS)
+            _square(current, size).save(output_path, 'JPEG', quality=85, optimize=True)
+            written[name] = os.path.getsize(output_path)
+    return written
+
+
+def status_key(file_name: str) -> str:
+    return f"media:variants:{file_name}"
+
+
+def get_status(file_name: str) -> Optional[Dict[str, Any]]:
+    return cache.get_json(status_key(file_name))
+
+
+class ImagePipeline:
+    """Process pool for ``render_variants`` with status reporting through the cache."""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.pool = LazyProcessPool('image-pipeline', lambda: max_workers or settings.IMAGE_PROCESS_WORKERS)
+        self._fallback = None
+
+    def _thread_pool(self) -> ThreadPoolExecutor:
+        if self._fallback is None:
+            self._fallback = ThreadPoolExecutor(max_workers=1, thread_name_prefix='image-pipeline')
+        return self._fallback
+
+    def submit(self, file_name: str, source_path: Path, outputs: Mapping[str, Tuple[Size, Path]],
+               urls: Mapping[str, str]) -> Future:
+        """Queue variant rendering for ``file_name`` and report its progress under ``status_key``."""
+        cache.set_json(status_key(file_name), {"status": STATUS_PROCESSING, "image_urls": dict(urls)},
+                       ttl=STATUS_TTL_SECONDS)
+        started = time.perf_counter()
+        jobs = {name: (size, str(path)) for name, (size, path) in outputs.items()}
+        result: Future = Future()
+
+        def finish(done: Future) -> None:
+            elapsed_ms = round((time.perf_counter() - started) * 1000)
+            error = done.exception()
+            if error is None:
+                status = {"status": STATUS_READY, "image_urls": dict(urls), "duration_ms": elapsed_ms}
+                logger.info(f"Rendered {len(jobs)} variants of {file_name} in {elapsed_ms}ms")
+            else:
+                status = {"status": STATUS_FAILED, "image_urls": dict(urls), "error": str(error)}
+                logger.error(f"Error rendering variants of {file_name}: {error}")
+            cache.set_json(status_key(file_name), status, ttl=STATUS_TTL_SECONDS)
+            if error is None:
+                result.set_result(done.result())
+            else:
+                result.set_exception(error)
+
+        def retry_if_broken(done: Future, executor) -> None:
+            if isinstance(done.exception(), BrokenProcessPool):
+                # A worker died (OOM, decoder crash): start a fresh pool for later uploads
+                # and render this one in a thread rather than failing it.
+                logger.warning(f"Image process pool broke while rendering {file_name}; retrying in a thread")
+                self.pool.discard(executor)
+                self._thread_pool().submit(render_variants, str(source_path), jobs).add_done_callback(finish)
+            else:
+                finish(done)
+
+        executor = self.pool.executor()
+        future = self.pool.submit(render_variants, str(source_path), jobs)
+        future.add_done_callback(lambda done: retry_if_broken(done, executor))
+        return result
+
+    def shutdown(self, wait: bool = True) -> None:
+        self.pool.shutdown(wait)
+        fallback, self._fallback = self._fallback, None
+        if fallback is not None:
+            fallback.shutdown(wait=wait)
+
+
+image_pipeline = ImagePipeline()
@@ -0,0 +1,148 @@
+# app/services/llm_cache.py
+"""Two-tier cache of LLM results, keyed by a digest of the input and a version.
+
+A per-process LRU holds the most recent results, in front of the shared
+``app.core.cache`` (Redis, or the in-process store without it) so every API
+worker sees results computed by the others. Keys include a version, so
+changing the prompt, model or heuristics orphans old entries instead of
+serving them. Concurrent requests for the same input in one process wait for
+the first computation instead of each calling OpenAI (single flight).
+
+Subclasses set ``namespace``: ``resume_cache`` (resume analyses) and
+``review_cache`` (profile reviews).
+"""
+
+import asyncio
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.core.cache import cache
+
+Result = Dict[str, Any]
+
+# The shared tier doesn't expose an entry's remaining TTL, so a value read from it is kept locally this long
+SHARED_HIT_TTL_SECONDS = 600
+
+
+class LLMResultCache:
+    namespace = "llm"
+
+    def __init__(self, max_entries: int, ttl: float, shared_hit_ttl: float = SHARED_HIT_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.shared_hit_ttl = shared_hit_ttl
+        self._local: "OrderedDict[str, Tuple[float, Result]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, threading.Lock] = {}
+        # Async single flight; only touched from the API event loop.
+        self._atasks: Dict[str, "asyncio.Future[Result]"] = {}
+
+    def key(self, digest: str, version: str) -> str:
+        return f"{self.namespace}:{version}:{digest}"
+
+    def _local_get(self, key: str) -> Optional[Result]:
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._local[key]
+                return None
+            self._local.move_to_end(key)
+            return value
+
+    def _local_set(self, key: str, value: Result, ttl: float) -> None:
+        with self._lock:
+            self._local[key] = (time.monotonic() + ttl, value)
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+
+    def get(self, digest: str, version: str) -> Tuple[Optional[Result], str]:
+        """``(result, tier)`` where tier is ``memory``, ``shared`` or ``miss``."""
+        key = self.key(digest, version)
+        value = self._local_get(key)
+        if value is not None:
+            return copy.deepcopy(value), "memory"
+        value = cache.get_json(key)
+        if value is not None:
+            self._local_set(key, value, self.shared_hit_ttl)
+            return copy.deepcopy(value), "shared"
+        return None, "miss"
+
+    def set(self, digest: str, version: str, value: Result, ttl: Optional[float] = None) -> None:
+        key = self.key(digest, version)
+        ttl = ttl or self.ttl
+        self._local_set(key, copy.deepcopy(value), ttl)
+        cache.set_json(key, value, ttl=ttl)
+
+    async def aget(self, digest: str, version: str) -> Tuple[Optional[Result], str]:
+        key = self.key(digest, version)
+        value = self._local_get(key)
+        if value is not None:
+            return copy.deepcopy(value), "memory"
+        value = await cache.aget_json(key)
+        if value is not None:
+            self._local_set(key, value, self.shared_hit_ttl)
+            return copy.deepcopy(value), "shared"
+        return None, "miss"
+
+    async def aset(self, digest: str, version: str, value: Result, ttl: Optional[float] = None) -> None:
+        key = self.key(digest, version)
+        ttl = ttl or self.ttl
+        self._local_set(key, copy.deepcopy(value), ttl)
+        await cache.aset_json(key, value, ttl=ttl)
+
+    def get_or_compute(self, digest: str, version: str,
+                       compute: Callable[[], Tuple[Result, Optional[float]]]) -> Tuple[Result, str]:
+        """Cached result for ``digest`` or ``compute()`` it once; ``compute`` returns ``(result, ttl)``."""
+        value, tier = self.get(digest, version)
+        if value is not None:
+            return value, tier
+        key = self.key(digest, version)
+        with self._lock:
+            flight = self._inflight.setdefault(key, threading.Lock())
+        with flight:
+            try:
+                # Another request may have finished the same input while we waited.
+                value, tier = self.get(digest, version)
+                if value is not None:
+                    return value, tier
+                value, ttl = compute()
+                self.set(digest, version, value, ttl)
+                return copy.deepcopy(value), "miss"
+            finally:
+                with self._lock:
+                    if self._inflight.get(key) is flight:
+                        del self._inflight[key]
+
+    async def aget_or_compute(self, digest: str, version: str,
+                              compute: Callable[[], Awaitable[Tuple[Result, Optional[float]]]]) -> Tuple[Result, str]:
+        """Async ``get_or_compute``; callers that join an in-flight computation get tier ``memory``."""
+        value, tier = await self.aget(digest, version)
+        if value is not None:
+            return value, tier
+        key = self.key(digest, version)
+        task = self._atasks.get(key)
+        tier = "memory"
+        if task is None:
+            async def run() -> Result:
+                result, ttl = await compute()
+                await self.aset(digest, version, result, ttl)
+                return result
+
+            task = asyncio.ensure_future(run())
+            self._atasks[key] = task
+            task.add_done_callback(lambda _: self._atasks.pop(key, None))
+            tier = "miss"
+        # A cancelled request must not cancel the computation other callers are waiting on.
+        value = await asyncio.shield(task)
+        return copy.deepcopy(value), tier
+
+    def clear(self) -> None:
+        with self._lock:
+            self._local.clear()
@@ -0,0 +1,230 @@
+# app/services/llm_client.py
+"""Shared client for the OpenAI chat completions API.
+
+One ``aiohttp`` session with a keep-alive connection pool serves the whole
+process. It lives on a dedicated event-loop thread so that async routes
+(``await llm_client.chat_json(...)``) and code running in worker threads
+(``llm_client.chat_json_sync(...)``, e.g. resume parsing) share the same
+connections, the same ``OPENAI_MAX_CONCURRENCY`` semaphore and the same
+circuit breaker. No caller ever blocks the API event loop on the network.
+
+Every call has a timeout. Failures, timeouts and calls slower than
+``OPENAI_SLOW_CALL_SECONDS`` count against the breaker; after
+``OPENAI_BREAKER_FAILURES`` in a row it opens and calls return ``None``
+immediately (callers fall back to their heuristics) until
+``OPENAI_BREAKER_RESET_SECONDS`` have passed and a trial call succeeds.
+
+``OPENAI_BASE_URL`` points the client at another compatible server, such as
+``scripts/fake_openai.py`` for local runs and benchmarks.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from app.config.settings import settings
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:  # pragma: no cover - aiohttp is in requirements.txt
+    aiohttp = None
+    AIOHTTP_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "gpt-4o-mini"
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker; one trial call is let through after ``reset_seconds``.
+
+    A trial that never reports back (its task was cancelled before it ran)
+    is replaced by a new one after another ``reset_seconds``.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_at = 0.0
+        self.state = BREAKER_CLOSED
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == BREAKER_CLOSED:
+                return True
+            now = time.monotonic()
+            if self.state == BREAKER_OPEN and now - self.opened_at >= self.reset_seconds:
+                self.state = BREAKER_HALF_OPEN
+                self.trial_at = now
+                return True
+            if self.state == BREAKER_HALF_OPEN and now - self.trial_at >= self.reset_seconds:
+                logger.warning(f"LLM circuit breaker trial call did not finish in {self.reset_seconds}s; trying again")
+                self.trial_at = now
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != BREAKER_CLOSED:
+                logger.info("LLM circuit breaker closed")
+            self.failures = 0
+            self.state = BREAKER_CLOSED
+
+    def record_failure(self, reason: str) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == BREAKER_HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != BREAKER_OPEN:
+                    logger.warning(f"LLM circuit breaker open for {self.reset_seconds}s after: {reason}")
+                self.state = BREAKER_OPEN
+                self.opened_at = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"state": self.state, "consecutive_failures": self.failures}
+
+
+class LLMClient:
+    def __init__(self, base_url: Optional[str] = None, timeout: Optional[float] = None,
+                 max_concurrency: Optional[int] = None):
+        self.base_url = (base_url or settings.OPENAI_BASE_URL).rstrip("/")
+        self.timeout = timeout or settings.OPENAI_TIMEOUT_SECONDS
+        self.max_concurrency = max_concurrency or settings.OPENAI_MAX_CONCURRENCY
+        self.breaker = CircuitBreaker(settings.OPENAI_BREAKER_FAILURES, settings.OPENAI_BREAKER_RESET_SECONDS)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._session = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+
+    # -- event loop thread ----------------------------------------------------
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run() -> None:
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                self._thread = threading.Thread(target=run, name="llm-client", daemon=True)
+                self._thread.start()
+                ready.wait()
+                self._loop = loop
+            return self._loop
+
+    def _get_session(self):
+        # Only called on the client loop.
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    # -- calls ------------------------------------------------------------------
+
+    async def _request(self, api_key: str, messages: List[Dict[str, str]], model: str,
+                       timeout: float, purpose: str) -> Optional[Dict[str, Any]]:
+        try:
+            return await self._call(api_key, messages, model, timeout, purpose)
+        except BaseException as e:
+            # Cancelled or failed unexpectedly: still a failed call, so a half-open trial reopens the breaker.
+            self.breaker.record_failure(f"{purpose} aborted: {e!r}")
+            raise
+
+    async def _call(self, api_key: str, messages: List[Dict[str, str]], model: str,
+                    timeout: float, purpose: str) -> Optional[Dict[str, Any]]:
+        session = self._get_session()
+        payload = {"model": model, "messages": messages, "response_format": {"type": "json_object"}}
+        headers = {"Content-Type": "application/json", "Authorization": f"Bearer {api_key}"}
+        try:
+            async with self._semaphore:
+                # Time the call itself, not the wait for a slot.
+                started = time.monotonic()
+                async with session.post(f"{self.base_url}/chat/completions", json=payload, headers=headers,
+                                        timeout=aiohttp.ClientTimeout(total=timeout)) as res:
+                    status, body = res.status, await res.text()
+        except asyncio.TimeoutError:
+            self.breaker.record_failure(f"timeout after {timeout}s")
+            logger.error(f"OpenAI {purpose} timed out after {timeout}s")
+            return None
+        except aiohttp.ClientError as e:
+            self.breaker.record_failure(str(e))
+            logger.error(f"OpenAI {purpose} failed: {e}")
+            return None
+
+        elapsed = time.monotonic() - started
+        if status == 429 or status >= 500:
+            self.breaker.record_failure(f"HTTP {status}")
+        elif elapsed > settings.OPENAI_SLOW_CALL_SECONDS:
+            self.breaker.record_failure(f"slow response ({elapsed:.1f}s)")
+        else:
+            # Other 4xx are about our request, not the provider's health.
+            self.breaker.record_success()
+        if status >= 400:
+            logger.error(f"OpenAI {purpose} error {status}: {body[:500]}")
+            return None
+        try:
+            return json.loads(json.loads(body)["choices"][0]["message"]["content"])
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            logger.error(f"OpenAI {purpose} returned an unexpected body: {e}")
+            return None
+
+    def _submit(self, api_key: Optional[str], messages: List[Dict[str, str]], model: Optional[str],
+                timeout: Optional[float], purpose: str):
+        if not api_key or not AIOHTTP_AVAILABLE:
+            return None
+        if not self.breaker.allow():
+            logger.info(f"OpenAI {purpose} skipped: circuit breaker open")
+            return None
+        coro = self._request(api_key, messages, model or DEFAULT_MODEL, timeout or self.timeout, purpose)
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    async def chat_json(self, api_key: Optional[str], messages: List[Dict[str, str]], model: Optional[str] = None,
+                        timeout: Optional[float] = None, purpose: str = "call") -> Optional[Dict[str, Any]]:
+        """Chat completion in JSON mode; the parsed JSON content, or ``None`` to fall back."""
+        future = self._submit(api_key, messages, model, timeout, purpose)
+        if future is None:
+            return None
+        return await asyncio.wrap_future(future)
+
+    def chat_json_sync(self, api_key: Optional[str], messages: List[Dict[str, str]], model: Optional[str] = None,
+                       timeout: Optional[float] = None, purpose: str = "call") -> Optional[Dict[str, Any]]:
+        """Blocking ``chat_json`` for worker threads; never call it on an event loop."""
+        future = self._submit(api_key, messages, model, timeout, purpose)
+        if future is None:
+            return None
+        return future.result()
+
+    def status(self) -> Dict[str, Any]:
+        return {"base_url": self.base_url, "max_concurrency": self.max_concurrency, "breaker": self.breaker.snapshot()}
+
+    def close(self) -> None:
+        """Close pooled connections and stop the loop thread; the next call starts them again."""
+        with self._lock:
+            loop, thread, self._loop, self._thread = self._loop, self._thread, None, None
+        if loop is None:
+            return
+        session, self._session = self._session, None
+        if session is not None:
+            asyncio.run_coroutine_threadsafe(session.close(), loop).result(timeout=5)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        loop.close()
+
+
+llm_client = LLMClient()
@@ -0,0 +1,452 @@
+# app/services/mail_queue.py
+"""Outbound mail queue with pooled transports.
+
+Request handlers enqueue an ``OutboundEmail`` and return; a background
+worker thread drains the queue in batches, delivering each batch over one
+long-lived SMTP session or keep-alive HTTPS connection per transport.
+Transient failures are retried with exponential backoff; permanent ones
+(5xx SMTP replies, 4xx API responses) are logged and dropped.
+
+Bulk senders wrap their loop in ``mail_queue.batch()`` so the messages reach
+the worker together and go out over a single connection. ``deliver()``
+sends synchronously over the same pooled connection for callers that need
+the outcome.
+
+``scripts/smtp_sink.py`` is a local SMTP server for trying this out.
+"""
+
+import atexit
+import heapq
+import http.client
+import itertools
+import json
+import logging
+import random
+import smtplib
+import ssl
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PermanentMailError(Exception):
+    """Delivery failed in a way retrying cannot fix (bad recipient, rejected payload)."""
+
+
+@dataclass
+class OutboundEmail:
+    transport: str  # "smtp" or "mailtrap"
+    to_email: str
+    subject: str
+    text_body: str
+    html_body: Optional[str] = None
+    to_name: Optional[str] = None
+    from_email: Optional[str] = None
+    from_name: Optional[str] = None
+    reply_to_email: Optional[str] = None
+    reply_to_name: Optional[str] = None
+    category: Optional[str] = None
+    cc: Optional[List[dict]] = None  # Mailtrap only
+    bcc: Optional[List[dict]] = None  # Mailtrap only
+    attempts: int = 0
+    last_error: Optional[str] = field(default=None, repr=False)
+
+
+def build_mime_message(email: OutboundEmail) -> MIMEMultipart:
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = email.subject
+    msg['From'] = email.from_email or settings.EMAIL_FROM
+    msg['To'] = email.to_email
+    if email.reply_to_email:
+        msg['Reply-To'] = (
+            f"{email.reply_to_name} <{email.reply_to_email}>" if email.reply_to_name else email.reply_to_email
+        )
+    msg.attach(MIMEText(email.text_body or "", 'plain'))
+    msg.attach(MIMEText(email.html_body or f"<p>{email.text_body or ''}</p>", 'html'))
+    return msg
+
+
+def build_mailtrap_payload(email: OutboundEmail) -> dict:
+    payload = {
+        "to": [{"email": email.to_email, "name": email.to_name or email.to_email}],
+        "from": {"email": email.from_email, "name": email.from_name},
+        "subject": email.subject,
+        "text": email.text_body or "",
+        "category": email.category or "App Email",
+    }
+    if email.html_body:
+        payload["html"] = email.html_body
+    if email.reply_to_email:
+        payload["reply_to"] = {"email": email.reply_to_email, "name": email.reply_to_name or email.reply_to_email}
+    if email.cc:
+        payload["cc"] = email.cc
+    if email.bcc:
+        payload["bcc"] = email.bcc
+    return payload
+
+
+class SMTPTransport:
+    """One authenticated SMTP session, reused across messages and batches."""
+
+    # Servers drop idle sessions; probe with NOOP after this long.
+    idle_check_seconds = 30.0
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        use_tls: bool = True,
+        timeout: float = 30.0,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.connections_opened = 0
+        self._server: Optional[smtplib.SMTP] = None
+        self._last_used = 0.0
+
+    @classmethod
+    def from_settings(cls) -> "SMTPTransport":
+        return cls(
+            host=settings.SMTP_HOST,
+            port=settings.SMTP_PORT,
+            username=settings.SMTP_USER,
+            password=settings.SMTP_PASSWORD,
+            use_tls=settings.SMTP_USE_TLS,
+            timeout=settings.SMTP_TIMEOUT,
+        )
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            server.ehlo()
+            if self.use_tls:
+                server.starttls(context=ssl.create_default_context())
+                server.ehlo()
+            if self.username:
+                server.login(self.username, self.password or "")
+        except Exception:
+            server.close()
+            raise
+        self.connections_opened += 1
+        return server
+
+    def _session(self) -> smtplib.SMTP:
+        if self._server is not None and time.monotonic() - self._last_used > self.idle_check_seconds:
+            try:
+                if self._server.noop()[0] != 250:
+                    self.close()
+            except (smtplib.SMTPException, OSError):
+                self.close()
+        if self._server is None:
+            self._server = self._connect()
+        return self._server
+
+    def _send_one(self, email: OutboundEmail) -> None:
+        try:
+            self._session().send_message(build_mime_message(email))
+        except smtplib.SMTPServerDisconnected:
+            # Stale pooled session: reconnect once before treating it as a failure.
+            self.close()
+            self._session().send_message(build_mime_message(email))
+        self._last_used = time.monotonic()
+
+    def send(self, emails: Sequence[OutboundEmail]) -> List[Optional[Exception]]:
+        """Deliver ``emails`` in order; returns one error (or None) per message."""
+        results: List[Optional[Exception]] = []
+        with self.lock:
+            for email in emails:
+                try:
+                    self._send_one(email)
+                    results.append(None)
+                except smtplib.SMTPRecipientsRefused as exc:
+                    results.append(PermanentMailError(str(exc.recipients)))
+                except smtplib.SMTPResponseException as exc:
+                    if 500 <= exc.smtp_code < 600:
+                        results.append(PermanentMailError(f"{exc.smtp_code} {exc.smtp_error!r}"))
+                    else:
+                        results.append(exc)
+                except (smtplib.SMTPException, OSError) as exc:
+                    self.close()
+                    results.append(exc)
+        return results
+
+    def close(self) -> None:
+        server, self._server = self._server, None
+        if server is not None:
+            try:
+                server.quit()
+            except (smtplib.SMTPException, OSError):
+                server.close()
+
+
+class MailtrapTransport:
+    """Mailtrap Send API over one keep-alive HTTPS connection."""
+
+    host = "send.api.mailtrap.io"
+
+    def __init__(self, api_key: str, timeout: float = 30.0):
+        self.api_key = api_key
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.connections_opened = 0
+        self._conn: Optional[http.client.HTTPSConnection] = None
+
+    def _connection(self) -> http.client.HTTPSConnection:
+        if self._conn is None:
+            self._conn = http.client.HTTPSConnection(self.host, timeout=self.timeout)
+            self.connections_opened += 1
+        return self._conn
+
+    def _post(self, payload: dict):
+        headers = {
+            'Content-Type': 'application/json',
+            'Accept': 'application/json',
+            'Api-Token': self.api_key,
+        }
+        conn = self._connection()
+        conn.request("POST", "/api/send", json.dumps(payload), headers)
+        res = conn.getresponse()
+        # Drain the body so the connection can be reused.
+        return res.status, res.read()
+
+    def _send_one(self, email: OutboundEmail) -> None:
+        payload = build_mailtrap_payload(email)
+        try:
+            status, data = self._post(payload)
+        except (http.client.RemoteDisconnected, http.client.CannotSendRequest, BrokenPipeError, ConnectionResetError):
+            self.close()
+            status, data = self._post(payload)
+        if status == 429 or status >= 500:
+            raise RuntimeError(f"Mailtrap send failed: {status} {data.decode('utf-8', 'replace')}")
+        if status >= 400:
+            raise PermanentMailError(f"Mailtrap send failed: {status} {data.decode('utf-8', 'replace')}")
+
+    def send(self, emails: Sequence[OutboundEmail]) -> List[Optional[Exception]]:
+        results: List[Optional[Exception]] = []
+        with self.lock:
+            for email in emails:
+                try:
+                    self._send_one(email)
+                    results.append(None)
+                except PermanentMailError as exc:
+                    results.append(exc)
+                except (http.client.HTTPException, OSError, RuntimeError) as exc:
+                    self.close()
+                    results.append(exc)
+        return results
+
+    def close(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            conn.close()
+
+
+class MailQueue:
+    """In-process outbound queue drained by a daemon worker thread."""
+
+    def __init__(
+        self,
+        batch_size: int = 50,
+        batch_window: float = 0.05,
+        max_attempts: int = 5,
+        backoff_base: float = 2.0,
+        backoff_max: float = 300.0,
+    ):
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.dead_letters: Deque[OutboundEmail] = deque(maxlen=100)
+        self._factories: Dict[str, Callable[[], object]] = {}
+        self._transports: Dict[str, object] = {}
+        self._ready: Deque[OutboundEmail] = deque()
+        self._retries: List = []  # heap of (due, seq, email)
+        self._seq = itertools.count()
+        self._in_flight = 0
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        self._worker: Optional[threading.Thread] = None
+        self._stopping = False
+
+    # -- transports ---------------------------------------------------------
+
+    def register_transport(self, name: str, factory: Callable[[], object]) -> None:
+        with self._cond:
+            self._factories[name] = factory
+
+    def transport(self, name: str):
+        with self._cond:
+            transport = self._transports.get(name)
+            if transport is None:
+                transport = self._transports[name] = self._factories[name]()
+            return transport
+
+    # -- producers ----------------------------------------------------------
+
+    def enqueue(self, email: OutboundEmail) -> None:
+        self.enqueue_many([email])
+
+    def enqueue_many(self, emails: Iterable[OutboundEmail]) -> None:
+        emails = list(emails)
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is not None:
+            buffer.extend(emails)
+            return
+        if not emails:
+            return
+        with self._cond:
+            self._ready.extend(emails)
+            self._ensure_worker()
+            self._cond.notify_all()
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Hold messages enqueued by this thread and hand them over together on exit."""
+        outer = getattr(self._local, "buffer", None)
+        if outer is not None:
+            yield
+            return
+        self._local.buffer = []
+        try:
+            yield
+        finally:
+            emails, self._local.buffer = self._local.buffer, None
+            self.enqueue_many(emails)
+
+    def deliver(self, email: OutboundEmail) -> None:
+        """Send now over the pooled connection; raises if delivery fails."""
+        error = self.transport(email.transport).send([email])[0]
+        if error is not None:
+            raise error
+
+    # -- worker -------------------------------------------------------------
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or not self._worker.is_alive():
+            self._stopping = False
+            self._worker = threading.Thread(target=self._run, name="mail-queue", daemon=True)
+            self._worker.start()
+
+    def _next_batch(self) -> Optional[List[OutboundEmail]]:
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                while self._retries and self._retries[0][0] <= now:
+                    self._ready.append(heapq.heappop(self._retries)[2])
+                if self._ready:
+                    break
+                if self._stopping:
+                    return None
+                timeout = self._retries[0][0] - now if self._retries else None
+                self._cond.wait(timeout)
+        if self.batch_window and len(self._ready) < self.batch_size:
+            # Let a burst of enqueues land so it shares one connection.
+            time.sleep(self.batch_window)
+        with self._cond:
+            batch = [self._ready.popleft() for _ in range(min(self.batch_size, len(self._ready)))]
+            self._in_flight += len(batch)
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            try:
+                self._send_batch(batch)
+            except Exception:
+                logger.exception("Mail queue worker failed on a batch of %d", len(batch))
+            finally:
+                with self._cond:
+                    self._in_flight -= len(batch)
+                    self._cond.notify_all()
+
+    def _send_batch(self, batch: List[OutboundEmail]) -> None:
+        by_transport: Dict[str, List[OutboundEmail]] = {}
+        for email in batch:
+            by_transport.setdefault(email.transport, []).append(email)
+        for name, emails in by_transport.items():
+            try:
+                errors = self.transport(name).send(emails)
+            except Exception as exc:
+                errors = [exc] * len(emails)
+            for email, error in zip(emails, errors):
+                if error is None:
+                    logger.info("Email '%s' delivered to %s", email.subject, email.to_email)
+                else:
+                    self._failed(email, error)
+
+    def _failed(self, email: OutboundEmail, error: Exception) -> None:
+        email.attempts += 1
+        email.last_error = str(error)
+        if isinstance(error, PermanentMailError) or email.attempts >= self.max_attempts:
+            logger.error(
+                "Giving up on email '%s' to %s after %d attempt(s): %s",
+                email.subject, email.to_email, email.attempts, error,
+            )
+            self.dead_letters.append(email)
+            return
+        delay = min(self.backoff_max, self.backoff_base ** email.attempts) * random.uniform(0.8, 1.2)
+        logger.warning("Email to %s failed (%s); retry %d in %.1fs", email.to_email, error, email.attempts, delay)
+        with self._cond:
+            heapq.heappush(self._retries, (time.monotonic() + delay, next(self._seq), email))
+            self._cond.notify_all()
+
+    # -- lifecycle ----------------------------------------------------------
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._ready) + len(self._retries) + self._in_flight
+
+    def flush(self, timeout: Optional[float] = None, include_retries: bool = False) -> bool:
+        """Wait until queued messages are sent; returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._ready or self._in_flight or (include_retries and self._retries):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Send what is ready, stop the worker and close pooled connections."""
+        self.flush(timeout)
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            worker = self._worker
+        if worker is not None:
+            worker.join(timeout)
+        with self._cond:
+            transports, self._transports = list(self._transports.values()), {}
+        for transport in transports:
+            try:
+                transport.close()
+            except Exception:
+                logger.exception("Error closing mail transport %r", transport)
+
+
+mail_queue = MailQueue(
+    batch_size=settings.MAIL_QUEUE_BATCH_SIZE,
+    max_attempts=settings.MAIL_QUEUE_MAX_ATTEMPTS,
+)
+mail_queue.register_transport("smtp", SMTPTransport.from_settings)
+atexit.register(mail_queue.stop)
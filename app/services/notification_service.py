@@ -17,8 +17,8 @@ logger = logging.getLogger(__name__)
 class NotificationService:
     """Service for sending various types of email notifications"""
     
-    def __init__(self):
-        self.email_service = EmailService()
+    def __init__(self, email_service: Optional[EmailService] = None):
+        self.email_service = email_service or EmailService()
     
     def _create_email_template(self, template_type: str, **kwargs) -> tuple:
         """Create email templates for different notification types"""
@@ -0,0 +1,190 @@
+# app/services/pdf_text.py
+"""Resume PDF text extraction from in-memory bytes, for long documents across worker processes.
+
+Each page gets the same fallback chain the resume parser always used
+(PyPDF2, then pdfplumber, then pdfminer.six), so one scanned page no longer
+sends the whole document through the slower parsers. Documents of up to
+``PDF_INLINE_MAX_PAGES`` pages (most resumes) are extracted in the calling
+thread: shipping them to a worker costs more than it saves. Longer ones are
+split into one contiguous share of pages per ``pdf-text`` worker, so each
+worker receives and parses the document once. Shares are consumed in page
+order and extraction stops once ``RESUME_TARGET_TEXT_CHARS`` have been
+read; documents are capped at ``RESUME_MAX_BYTES`` and ``RESUME_MAX_PAGES``.
+
+A document whose page tree neither PyPDF2 nor pdfplumber can read is
+extracted whole, inline, by pdfplumber or pdfminer.six as before.
+"""
+
+import io
+import logging
+from collections import deque
+from concurrent.futures.process import BrokenProcessPool
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config.settings import settings
+from app.core.process_pool import LazyProcessPool
+
+logger = logging.getLogger(__name__)
+
+METHODS = ("pypdf2", "pdfplumber", "pdfminer.six")
+
+
+class PDFTooLargeError(ValueError):
+    pass
+
+
+def extract_pages(data: bytes, pages: Sequence[int],
+                  target_chars: Optional[int] = None) -> List[Tuple[int, str, str]]:
+    """``(page_index, text, method)`` for each of ``pages`` (0-based).
+
+    Each page gets the first non-empty result of PyPDF2, pdfplumber and
+    pdfminer.six; pages none of them can read come back as ``("", "none")``.
+    With ``target_chars``, pages after the one where PyPDF2's text reaches it
+    are left out.
+    """
+    found: Dict[int, Tuple[str, str]] = {}
+    pages = list(pages)
+
+    try:
+        from PyPDF2 import PdfReader  # type: ignore
+        reader = PdfReader(io.BytesIO(data))
+        chars = 0
+        for position, index in enumerate(pages):
+            text = reader.pages[index].extract_text() or ""
+            if text.strip():
+                found[index] = (text, "pypdf2")
+                chars += len(text.strip())
+            if target_chars is not None and chars >= target_chars:
+                pages = pages[:position + 1]
+                break
+    except Exception as e:
+        logger.warning(f"PyPDF2 failed: {e}")
+
+    missing = [index for index in pages if index not in found]
+    if missing:
+        try:
+            import pdfplumber  # type: ignore
+            with pdfplumber.open(io.BytesIO(data), pages=[index + 1 for index in missing]) as pdf:
+                for page in pdf.pages:
+                    text = page.extract_text() or ""
+                    if text.strip():
+                        found[page.page_number - 1] = (text, "pdfplumber")
+        except Exception as e:
+            logger.warning(f"pdfplumber failed: {e}")
+
+    missing = [index for index in pages if index not in found]
+    if missing:
+        try:
+            from pdfminer.high_level import extract_text  # type: ignore
+            for index in missing:
+                text = extract_text(io.BytesIO(data), page_numbers=[index]) or ""
+                if text.strip():
+                    found[index] = (text, "pdfminer.six")
+        except Exception as e:
+            logger.warning(f"pdfminer failed: {e}")
+
+    return [(index, *found.get(index, ("", "none"))) for index in pages]
+
+
+def count_pages(data: bytes) -> int:
+    """Page count from PyPDF2, or from pdfplumber when PyPDF2 cannot read the page tree."""
+    try:
+        from PyPDF2 import PdfReader  # type: ignore
+        return len(PdfReader(io.BytesIO(data)).pages)
+    except Exception as e:
+        logger.warning(f"PyPDF2 could not count PDF pages: {e}")
+    import pdfplumber  # type: ignore
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        return len(pdf.pages)
+
+
+def extract_document(data: bytes, max_pages: int) -> Tuple[str, str]:
+    """Whole-document pdfplumber, then pdfminer.six, over the first ``max_pages`` pages."""
+    try:
+        import pdfplumber  # type: ignore
+        with pdfplumber.open(io.BytesIO(data)) as pdf:
+            text = "\n".join(page.extract_text() or "" for page in pdf.pages[:max_pages]).strip()
+        if text:
+            return text, "pdfplumber"
+    except Exception as e:
+        logger.warning(f"pdfplumber failed: {e}")
+    try:
+        from pdfminer.high_level import extract_text  # type: ignore
+        text = (extract_text(io.BytesIO(data), maxpages=max_pages) or "").strip()
+        if text:
+            return text, "pdfminer.six"
+    except Exception as e:
+        logger.warning(f"pdfminer failed: {e}")
+    return "", "none"
+
+
+class PDFTextExtractor:
+    def __init__(self):
+        self.pool = LazyProcessPool('pdf-text', lambda: settings.PDF_EXTRACT_WORKERS)
+
+    def extract(self, data: bytes) -> Tuple[str, str]:
+        """Return ``(text, method)``; ``method`` lists the parsers that produced text, e.g. ``pypdf2+pdfminer.six``."""
+        if len(data) > settings.RESUME_MAX_BYTES:
+            raise PDFTooLargeError(
+                f"PDF is {len(data) / (1024 * 1024):.1f}MB; the limit is {settings.RESUME_MAX_BYTES / (1024 * 1024):.0f}MB"
+            )
+        try:
+            page_count = min(count_pages(data), settings.RESUME_MAX_PAGES)
+        except Exception as e:
+            logger.warning(f"Could not count PDF pages: {e}; extracting the document whole")
+            return extract_document(data, settings.RESUME_MAX_PAGES)
+
+        target = settings.RESUME_TARGET_TEXT_CHARS
+        workers = min(max(1, settings.PDF_EXTRACT_WORKERS), page_count)
+        if page_count <= settings.PDF_INLINE_MAX_PAGES or workers == 1:
+            shares = [list(range(page_count))]
+        else:
+            # One contiguous share per worker, so each receives and parses the document once.
+            bounds = [page_count * i // workers for i in range(workers + 1)]
+            shares = [list(range(bounds[i], bounds[i + 1])) for i in range(workers)]
+
+        if len(shares) == 1:
+            extracted = extract_pages(data, shares[0], target)
+        else:
+            extracted = self._extract_shares(data, shares, target)
+
+        text = "\n".join(page_text for _, page_text, _ in extracted).strip()
+        used = {method for _, _, method in extracted}
+        method = "+".join(name for name in METHODS if name in used) if text else "none"
+        return text, method
+
+    def _extract_shares(self, data: bytes, shares: List[List[int]], target: int) -> List[Tuple[int, str, str]]:
+        """Extract each share in the pool, in page order, until ``target`` characters have been read."""
+        extracted: List[Tuple[int, str, str]] = []
+        chars = 0
+        in_flight: Deque = deque()
+        try:
+            for share in shares:
+                executor = self.pool.executor()
+                in_flight.append((share, executor, self.pool.submit(extract_pages, data, share, target)))
+            while in_flight and chars < target:
+                share, executor, future = in_flight.popleft()
+                try:
+                    pages = future.result()
+                except BrokenProcessPool:
+                    # A worker died mid-document: replace the pool and finish this share here.
+                    logger.warning("PDF text worker pool broke; extracting inline")
+                    self.pool.discard(executor)
+                    pages = extract_pages(data, share, target - chars)
+                extracted.extend(pages)
+                chars += sum(len(page_text.strip()) for _, page_text, _ in pages)
+        finally:
+            for _, _, future in in_flight:
+                future.cancel()
+        return extracted
+
+    async def extract_async(self, data: bytes) -> Tuple[str, str]:
+        return await run_in_threadpool(self.extract, data)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self.pool.shutdown(wait)
+
+
+pdf_text_extractor = PDFTextExtractor()
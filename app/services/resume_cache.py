@@ -0,0 +1,31 @@
+# app/services/resume_cache.py
+"""Resume analysis results keyed by the SHA-256 of the uploaded PDF.
+
+An ``LLMResultCache`` (see ``app.services.llm_cache``) whose version is the
+analyzer version. Concurrent uploads of the same document in one process
+wait for the first analysis instead of each calling OpenAI.
+"""
+
+import hashlib
+from typing import Optional
+
+from app.config.settings import settings
+from app.services.llm_cache import LLMResultCache
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class ResumeAnalysisCache(LLMResultCache):
+    namespace = "resume:analysis"
+
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[float] = None):
+        super().__init__(
+            max_entries=max_entries or settings.RESUME_CACHE_LOCAL_ENTRIES,
+            ttl=ttl or settings.RESUME_CACHE_TTL_SECONDS,
+            shared_hit_ttl=settings.RESUME_CACHE_FALLBACK_TTL_SECONDS,
+        )
+
+
+resume_analysis_cache = ResumeAnalysisCache()
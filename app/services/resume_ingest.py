@@ -0,0 +1,321 @@
+# app/services/resume_ingest.py
+"""Bulk resume ingestion: a zip (or directory) of PDFs to draft Proz profiles.
+
+Archive members are read one at a time, in order, and handed to a bounded
+thread pool that runs ``AIProfileService.analyze_resume_bytes`` (so the content-hash
+cache and the PDF worker processes apply). At most ``concurrency * 2``
+documents are held in memory at once. Results are written in batches of
+``batch_size``: one query finds the existing profiles for the batch's emails,
+new ones are inserted together and existing ones only have their empty
+fields filled in, so a recruiter's re-import never overwrites a profile a
+candidate has edited.
+
+New profiles are drafts: ``verification_status`` "pending", no user account
+and ``onboarding_completed`` false.
+"""
+
+import logging
+import os
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, BinaryIO, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from sqlalchemy import func
+
+from app.config.settings import settings
+from app.database.session import SessionLocal
+from app.modules.proz.models.proz import ProzProfile
+from app.modules.proz.services import platform_stats
+
+logger = logging.getLogger(__name__)
+
+STATUS_CREATED = "created"
+STATUS_UPDATED = "updated"
+STATUS_UNCHANGED = "unchanged"
+STATUS_SKIPPED = "skipped"
+STATUS_FAILED = "failed"
+NOT_A_PDF = "Not a PDF"
+
+# Column lengths on ProzProfile; parsed values are cut to fit rather than failing the batch.
+_LIMITS = {"first_name": 100, "last_name": 100, "email": 255, "phone_number": 20, "location": 255,
+           "website": 255, "linkedin": 255}
+_FILL_FIELDS = ("phone_number", "bio", "location", "years_experience", "education", "certifications",
+                "website", "linkedin", "skills")
+
+@dataclass
+class IngestResult:
+    file_name: str
+    status: str
+    email: Optional[str] = None
+    profile_id: Optional[str] = None
+    extraction_method: Optional[str] = None
+    analyzer: Optional[str] = None
+    error: Optional[str] = None
+    duration_ms: int = 0
+
+
+@dataclass
+class IngestReport:
+    results: List[IngestResult] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+    total_bytes: int = 0
+
+    def summary(self) -> Dict[str, Any]:
+        counts = {status: 0 for status in (STATUS_CREATED, STATUS_UPDATED, STATUS_UNCHANGED, STATUS_SKIPPED, STATUS_FAILED)}
+        for result in self.results:
+            counts[result.status] = counts.get(result.status, 0) + 1
+        elapsed = self.elapsed_seconds or 1e-9
+        return {
+            "files": len(self.results),
+            "pdfs": sum(1 for result in self.results if result.error != NOT_A_PDF),
+            **counts,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "files_per_second": round(len(self.results) / elapsed, 2),
+            "megabytes": round(self.total_bytes / (1024 * 1024), 2),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"summary": self.summary(), "results": [asdict(result) for result in self.results]}
+
+
+def _clean(value: Any, name: str) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, (list, tuple)):
+        value = ", ".join(str(v) for v in value if v)
+    text = str(value).strip()
+    if not text:
+        return None
+    limit = _LIMITS.get(name)
+    return text[:limit] if limit else text
+
+
+def profile_fields(analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """Map an ``analyze_resume`` result (heuristic or OpenAI) onto ``ProzProfile`` columns."""
+    extracted = analysis.get("extracted") or {}
+    first_name, last_name = extracted.get("first_name"), extracted.get("last_name")
+    if not (first_name or last_name) and extracted.get("name"):
+        # OpenAI tends to return a single "name"
+        parts = str(extracted["name"]).split()
+        first_name, last_name = parts[0], " ".join(parts[1:])
+
+    years = extracted.get("years_experience")
+    try:
+        years = int(float(years)) if years not in (None, "") else None
+    except (TypeError, ValueError):
+        years = None
+    skills = extracted.get("skills")
+    if isinstance(skills, str):
+        skills = [s.strip() for s in skills.split(",")]
+    skills = [str(s).strip() for s in skills or [] if str(s).strip()][:50] or None
+
+    email = _clean(extracted.get("email"), "email")
+    return {
+        "first_name": _clean(first_name, "first_name") or "",
+        "last_name": _clean(last_name, "last_name") or "",
+        "email": email.lower() if email else None,
+        "phone_number": _clean(extracted.get("phone_number") or extracted.get("phone"), "phone_number"),
+        "bio": _clean(extracted.get("bio") or extracted.get("summary"), "bio"),
+        "location": _clean(extracted.get("location"), "location"),
+        "years_experience": years,
+        "education": _clean(extracted.get("education"), "education"),
+        "certifications": _clean(extracted.get("certifications"), "certifications"),
+        "website": _clean(extracted.get("website"), "website"),
+        "linkedin": _clean(extracted.get("linkedin"), "linkedin"),
+        "skills": skills,
+    }
+
+
+def zip_members(source: Union[str, BinaryIO], max_files: Optional[int] = None) -> Iterator[Tuple[str, Any]]:
+    """``(name, loader_or_error)`` for each PDF in the archive, read lazily and size-capped.
+
+    ``loader_or_error`` is a zero-argument callable returning the bytes, or an
+    error string for members that are rejected without being read.
+    """
+    max_files = max_files or settings.RESUME_INGEST_MAX_FILES
+    with zipfile.ZipFile(source) as archive:
+        seen = 0
+        for info in archive.infolist():
+            name = info.filename
+            base = os.path.basename(name)
+            if info.is_dir() or name.startswith("__MACOSX/") or base.startswith("."):
+                continue
+            if not base.lower().endswith(".pdf"):
+                yield name, NOT_A_PDF
+                continue
+            seen += 1
+            if seen > max_files:
+                yield name, f"Archive holds more than {max_files} PDFs"
+                continue
+            if info.file_size > settings.RESUME_MAX_BYTES:
+                yield name, f"PDF is larger than {settings.RESUME_MAX_BYTES // (1024 * 1024)}MB"
+                continue
+
+            def load(info=info) -> bytes:
+                with archive.open(info) as fh:
+                    # Bounded read: declared sizes in the zip directory can lie.
+                    data = fh.read(settings.RESUME_MAX_BYTES + 1)
+                if len(data) > settings.RESUME_MAX_BYTES:
+                    raise ValueError(f"PDF is larger than {settings.RESUME_MAX_BYTES // (1024 * 1024)}MB")
+                return data
+
+            yield name, load
+
+
+def directory_members(path: str, max_files: Optional[int] = None) -> Iterator[Tuple[str, Any]]:
+    max_files = max_files or settings.RESUME_INGEST_MAX_FILES
+    names = sorted(n for n in os.listdir(path) if n.lower().endswith(".pdf"))
+    for index, name in enumerate(names):
+        full = os.path.join(path, name)
+        if index >= max_files:
+            yield name, f"Directory holds more than {max_files} PDFs"
+        elif os.path.getsize(full) > settings.RESUME_MAX_BYTES:
+            yield name, f"PDF is larger than {settings.RESUME_MAX_BYTES // (1024 * 1024)}MB"
+        else:
+            yield name, (lambda full=full: _read_file(full))
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as fh:
+        return fh.read()
+
+
+class ResumeIngestor:
+    def __init__(self, ai_service, session_factory=SessionLocal, concurrency: Optional[int] = None,
+                 batch_size: Optional[int] = None, on_result: Optional[Callable[[IngestResult], None]] = None):
+        self.ai_service = ai_service
+        self.session_factory = session_factory
+        self.concurrency = max(1, concurrency or settings.RESUME_INGEST_CONCURRENCY)
+        self.batch_size = max(1, batch_size or settings.RESUME_INGEST_BATCH_SIZE)
+        self.on_result = on_result
+
+    def _analyze(self, name: str, data: bytes) -> Tuple[IngestResult, Optional[Dict[str, Any]], int]:
+        started = time.perf_counter()
+        try:
+            analysis = self.ai_service.analyze_resume_bytes(data)
+        except Exception as e:
+            logger.warning(f"Could not parse {name}: {e}")
+            elapsed = round((time.perf_counter() - started) * 1000)
+            return IngestResult(name, STATUS_FAILED, error=str(e), duration_ms=elapsed), None, len(data)
+        meta = analysis.get("meta") or {}
+        if not meta.get("text_chars"):
+            # Without text the analyzer only returns a template; never turn that into a profile.
+            elapsed = round((time.perf_counter() - started) * 1000)
+            return IngestResult(name, STATUS_FAILED, extraction_method=meta.get("extraction_method"),
+                                error="Could not read PDF text", duration_ms=elapsed), None, len(data)
+        result = IngestResult(
+            name, STATUS_SKIPPED,
+            extraction_method=meta.get("extraction_method"), analyzer=meta.get("analyzer"),
+            duration_ms=round((time.perf_counter() - started) * 1000),
+        )
+        return result, profile_fields(analysis), len(data)
+
+    def ingest(self, members: Iterable[Tuple[str, Any]]) -> IngestReport:
+        """Parse ``members`` (as yielded by ``zip_members``/``directory_members``) and upsert drafts."""
+        report = IngestReport()
+        started = time.perf_counter()
+        pending: List[Tuple[IngestResult, Dict[str, Any]]] = []
+        in_flight: Deque[Future] = deque()
+
+        def collect(future: Future) -> None:
+            result, fields, size = future.result()
+            report.total_bytes += size
+            if fields is None:
+                self._emit(report, result)
+                return
+            pending.append((result, fields))
+            if len(pending) >= self.batch_size:
+                self._write_batch(report, pending)
+                pending.clear()
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="resume-ingest") as pool:
+            for name, load in members:
+                if not callable(load):
+                    self._emit(report, IngestResult(name, STATUS_SKIPPED, error=load))
+                    continue
+                try:
+                    # Members are read here, in archive order; only parsing fans out.
+                    data = load()
+                except Exception as e:
+                    self._emit(report, IngestResult(name, STATUS_FAILED, error=str(e)))
+                    continue
+                in_flight.append(pool.submit(self._analyze, name, data))
+                # Bound the documents held in memory; results are consumed in archive order.
+                while len(in_flight) >= self.concurrency * 2:
+                    collect(in_flight.popleft())
+            while in_flight:
+                collect(in_flight.popleft())
+        if pending:
+            self._write_batch(report, pending)
+        report.elapsed_seconds = time.perf_counter() - started
+        logger.info(f"Resume ingest finished: {report.summary()}")
+        return report
+
+    def ingest_zip(self, source: Union[str, BinaryIO]) -> IngestReport:
+        return self.ingest(zip_members(source))
+
+    def ingest_directory(self, path: str) -> IngestReport:
+        return self.ingest(directory_members(path))
+
+    def _emit(self, report: IngestReport, result: IngestResult) -> None:
+        report.results.append(result)
+        if self.on_result:
+            self.on_result(result)
+
+    def _write_batch(self, report: IngestReport, batch: List[Tuple[IngestResult, Dict[str, Any]]]) -> None:
+        """Insert new drafts and fill empty fields of existing profiles, one transaction per batch."""
+        db = self.session_factory()
+        try:
+            emails = {fields["email"] for _, fields in batch if fields["email"]}
+            existing = {
+                p.email.lower(): p
+                for p in db.query(ProzProfile).filter(func.lower(ProzProfile.email).in_(emails)).all()
+            } if emails else {}
+            created: Dict[str, ProzProfile] = {}
+            outcomes = []
+            for result, fields in batch:
+                email = fields["email"]
+                if not email:
+                    result.error = "No email address found in resume"
+                    outcomes.append((result, None))
+                    continue
+                result.email = email
+                if email in created:
+                    result.error = "Duplicate of an earlier resume in this import"
+                    outcomes.append((result, created[email]))
+                    continue
+                profile = existing.get(email)
+                if profile is None:
+                    profile = ProzProfile(**fields, verification_status="pending", onboarding_completed=False)
+                    db.add(profile)
+                    created[email] = profile
+                    result.status = STATUS_CREATED
+                else:
+                    filled = False
+                    for name in _FILL_FIELDS:
+                        if fields.get(name) not in (None, "", []) and getattr(profile, name) in (None, "", []):
+                            setattr(profile, name, fields[name])
+                            filled = True
+                    result.status = STATUS_UPDATED if filled else STATUS_UNCHANGED
+                    # Later resumes for the same email in this batch are duplicates too.
+                    created[email] = profile
+                outcomes.append((result, profile))
+            db.commit()
+            for result, profile in outcomes:
+                if profile is not None:
+                    result.profile_id = str(profile.id)
+            if any(result.status == STATUS_CREATED for result, _ in outcomes):
+                # Cheaper to rebuild the homepage snapshot once than to patch it per row.
+                platform_stats.invalidate()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Resume ingest batch failed: {e}")
+            for result, _ in batch:
+                result.status, result.error = STATUS_FAILED, f"Database write failed: {e}"
+        finally:
+            db.close()
+        for result, _ in batch:
+            self._emit(report, result)
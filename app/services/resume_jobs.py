@@ -0,0 +1,133 @@
+# app/services/resume_jobs.py
+"""Background resume parsing jobs with staged progress.
+
+``ResumeJobManager.submit`` returns a job id straight away and runs
+``AIProfileService.analyze_resume_bytes`` on a small thread pool (text
+extraction itself fans out to the PDF worker processes). Each stage is
+appended to the job document in ``app.core.cache`` under ``job_key(job_id)``,
+so any API worker can answer status polls and stream the stages as
+Server-Sent Events, whichever process ran the job.
+
+Stages, in order: ``queued``, ``extracted``, ``analyzed``, then ``done`` with
+the result, or ``failed`` with an error at any point.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, Optional
+
+from app.config.settings import settings
+from app.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+STAGE_QUEUED = "queued"
+STAGE_EXTRACTED = "extracted"
+STAGE_ANALYZED = "analyzed"
+STAGE_DONE = "done"
+STAGE_FAILED = "failed"
+FINAL_STAGES = (STAGE_DONE, STAGE_FAILED)
+
+
+def job_key(job_id: str) -> str:
+    return f"resume:job:{job_id}"
+
+
+def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    return cache.get_json(job_key(job_id))
+
+
+async def aget_job(job_id: str) -> Optional[Dict[str, Any]]:
+    return await cache.aget_json(job_key(job_id))
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+class ResumeJobManager:
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers or settings.RESUME_JOB_WORKERS, thread_name_prefix='resume-jobs'
+                )
+            return self._executor
+
+    def _record(self, job: Dict[str, Any], stage: str, details: Optional[Dict[str, Any]] = None,
+                **fields: Any) -> None:
+        """Append ``stage`` (with ``details``) to the job's history and store ``fields`` on the job."""
+        # Only the worker running the job writes it after submit, so no read-modify-write race.
+        job["stage"] = stage
+        job["updated_at"] = time.time()
+        job["stages"].append({"stage": stage, "at": job["updated_at"], **(details or {})})
+        job.update(fields)
+        cache.set_json(job_key(job["job_id"]), job, ttl=settings.RESUME_JOB_TTL_SECONDS)
+
+    def submit(self, ai_service, user_id: str, data: bytes, file_name: str = "") -> Dict[str, Any]:
+        """Queue ``data`` for analysis on behalf of ``user_id``; returns the initial job document."""
+        job = {"job_id": uuid.uuid4().hex, "user_id": user_id, "file_name": file_name, "stages": []}
+        self._record(job, STAGE_QUEUED)
+
+        def progress(stage: str, details: Dict[str, Any]) -> None:
+            self._record(job, stage, details)
+
+        def run() -> None:
+            started = time.perf_counter()
+            try:
+                result = ai_service.analyze_resume_bytes(data, progress=progress)
+            except Exception as e:
+                logger.error(f"Resume job {job['job_id']} failed: {e}")
+                self._record(job, STAGE_FAILED, {"error": str(e)}, error=str(e))
+                return
+            elapsed_ms = round((time.perf_counter() - started) * 1000)
+            logger.info(f"Resume job {job['job_id']} done in {elapsed_ms}ms")
+            self._record(job, STAGE_DONE, {"duration_ms": elapsed_ms}, result=result)
+
+        snapshot = dict(job, stages=list(job["stages"]))
+        self._pool().submit(run)
+        return snapshot
+
+    async def stream(self, job_id: str, poll_seconds: float = 0.5,
+                     keepalive_seconds: float = 15.0) -> AsyncIterator[str]:
+        """SSE frames for each stage of ``job_id`` as it is recorded, ending after ``done``/``failed``."""
+        sent = 0
+        last_frame = time.monotonic()
+        while True:
+            job = await aget_job(job_id)
+            if job is None:
+                yield _sse(STAGE_FAILED, {"job_id": job_id, "error": "Job not found or expired"})
+                return
+            for entry in job["stages"][sent:]:
+                payload = {"job_id": job_id, **entry}
+                if entry["stage"] == STAGE_DONE:
+                    payload["result"] = job.get("result")
+                yield _sse(entry["stage"], payload)
+                last_frame = time.monotonic()
+            sent = len(job["stages"])
+            if job["stage"] in FINAL_STAGES:
+                return
+            if time.monotonic() - last_frame >= keepalive_seconds:
+                # Comment frame: keeps proxies from closing an idle stream.
+                yield ": keep-alive\n\n"
+                last_frame = time.monotonic()
+            await asyncio.sleep(poll_seconds)
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+resume_jobs = ResumeJobManager()
@@ -0,0 +1,211 @@
+# app/services/resume_segmenter.py
+"""Resume text segmentation and field extraction for the heuristic analyzer.
+
+``segment`` walks the resume lines once and collects the education,
+certifications and experience sections together, using patterns compiled at
+import time. The section rules are the ones ``heuristic_analyze`` has always
+used, quirks included:
+
+- a header is any line that *starts* with one of the section titles (the
+  title alternation is not grouped, so ``^education`` matches "Educational
+  background" and only the last title needs a following ``:``/space);
+- a section runs until a line starting ``experience``, ``work experience``,
+  ``skills``, ``projects``, ``summary`` or ``objective`` followed by ``:`` or
+  whitespace, so a bare "Skills" line does not end it;
+- a repeated header inside a section adds the text after its colon and
+  carries on.
+
+The field extractors below read from the resulting ``ResumeSections``.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+EDUCATION_TITLES = "education|education and qualifications|qualifications"
+CERTIFICATION_TITLES = "certifications|certification|licenses|licences|licensing"
+EXPERIENCE_TITLES = "experience|work experience|employment history|professional experience"
+
+
+def _header(titles: str) -> Tuple["re.Pattern[str]", "re.Pattern[str]"]:
+    return re.compile(fr"^{titles}[:\s]*$", re.I), re.compile(fr"^{titles}[:\s]", re.I)
+
+
+SECTION_HEADERS = {
+    "education": _header(EDUCATION_TITLES),
+    "certifications": _header(CERTIFICATION_TITLES),
+    "experience": _header(EXPERIENCE_TITLES),
+}
+SECTION_END = re.compile(r"^(experience|work experience|skills|projects|summary|objective)[:\s]", re.I)
+
+NAME_SKIP = re.compile(r"^(education|experience|skills|summary|objective)[:\s]", re.I)
+NAME_REJECT = re.compile(r"@|\d")
+WHITESPACE = re.compile(r"\s+")
+EMAIL = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+PHONE = re.compile(r"(\+?\d[\d \-()]{7,}\d)")
+LOCATION_LABEL = re.compile(r"location\s*[:\-]\s*(.+)", re.I)
+LOCATION_PLACE = re.compile(r",\s*[A-Za-z]{2,}($|[^A-Za-z])")
+LOCATION_REJECT = re.compile(r"@|\d{3,}")
+LOCATION_BULLETS = re.compile(r"^[•■\-\s]+")
+YEARS = re.compile(r"(\d{1,2})\+?\s+years?", re.I)
+SKILL_SPLIT = re.compile(r",|\u2022|\|")
+SKILL_REJECT = re.compile(r"^skills", re.I)
+EXPERIENCE_SPLIT = re.compile(r"\n\s*(?:[•\u2022\-\*]|\d+\.)\s+|\n\s*\n")
+ROLE_COMPANY = re.compile(r"^(?P<role>[^\n\-–—]{3,}?)\s*[\-–—]\s*(?P<company>[^\n(]{2,}?)(?:\s*\((?P<period>[^)]+)\))?")
+PERIOD = re.compile(r"(\d{4}[^\n]{0,20}?\d{4}|\d{4}\s*[-–]\s*Present|Present)", re.I)
+ROLE_AT = re.compile(r"^(?P<role>[^@\nat]{3,}?)(?:\s+at\s+|\s+@\s+)(?P<company>[^\n]+)$", re.I)
+EDUCATION_ENTRY = re.compile(r"^(?P<institution>[^\u2014\-–—(]{3,}?)[\s\-–—]+(?P<degree>[^()\n]{2,}?)(?:\s*\((?P<period>[^)]+)\))?")
+EDUCATION_KEYWORDS = re.compile(r"university|college|school|institute", re.I)
+WEBSITE = re.compile(r"https?://[\w\-\./?#%&=]+", re.I)
+LINKEDIN = re.compile(r"https?://(www\.)?linkedin\.com/[^\s]+", re.I)
+
+
+@dataclass
+class ResumeSections:
+    """The resume's non-empty stripped lines and its captured section bodies."""
+
+    text: str
+    lines: List[str]
+    sections: Dict[str, str] = field(default_factory=dict)
+
+
+def segment(resume_text: str) -> ResumeSections:
+    lines = [l.strip() for l in resume_text.splitlines() if l.strip()]
+    content: Dict[str, Optional[List[str]]] = {name: None for name in SECTION_HEADERS}
+    open_sections = set(SECTION_HEADERS)
+    for l in lines:
+        if not open_sections:
+            break
+        ends = None
+        for name in tuple(open_sections):
+            exact, prefix = SECTION_HEADERS[name]
+            if exact.match(l) or prefix.match(l):
+                if content[name] is None:
+                    content[name] = []
+                # keep text after ':' if on same line
+                after = l.split(":", 1)
+                if len(after) == 2 and after[1].strip():
+                    content[name].append(after[1].strip())
+                continue
+            if content[name] is not None:
+                if ends is None:
+                    ends = bool(SECTION_END.match(l))
+                if ends:
+                    open_sections.discard(name)
+                else:
+                    content[name].append(l)
+    sections = {name: "\n".join(parts or []).strip() for name, parts in content.items()}
+    return ResumeSections(text=resume_text, lines=lines, sections=sections)
+
+
+def name_parts(doc: ResumeSections) -> Tuple[str, str]:
+    """First and last name from the first non-header line that looks like a name."""
+    name_line = ""
+    for l in doc.lines:
+        if NAME_SKIP.search(l):
+            continue
+        if len(l.split()) >= 2 and len(l) <= 80:
+            name_line = l
+            break
+    if name_line and not NAME_REJECT.search(name_line):
+        parts = WHITESPACE.sub(" ", name_line).split(" ")
+        if 2 <= len(parts) <= 4:
+            return parts[0].strip(",()[]{}"), parts[-1].strip(",()[]{}")
+    return "", ""
+
+
+def location(doc: ResumeSections) -> str:
+    """'Location:' value or the first 'City, Country' line in the first 30 lines."""
+    found = ""
+    for l in doc.lines[:30]:
+        m = LOCATION_LABEL.search(l)
+        if m:
+            found = m.group(1).strip()
+            break
+        if LOCATION_PLACE.search(l) and not LOCATION_REJECT.search(l):
+            found = l
+            break
+    # Clean composite lines like: '■ Kigali, Rwanda | ■ 8+ Years ...'
+    if found and '|' in found:
+        found = found.split('|')[0]
+    return LOCATION_BULLETS.sub("", found).strip()
+
+
+def years_experience(doc: ResumeSections) -> Optional[float]:
+    ym = YEARS.search(doc.text)
+    if ym:
+        try:
+            return float(ym.group(1))
+        except Exception:
+            return None
+    return None
+
+
+def skills(doc: ResumeSections) -> List[str]:
+    """Items from 'Skills'/'Technologies' lines and the three lines after each."""
+    found: List[str] = []
+    lines = doc.lines
+    for idx, l in enumerate(lines):
+        l = l.lower()
+        if l.startswith("skills") or l.startswith("technical skills") or "technologies" in l:
+            for bl in lines[idx: idx + 4]:
+                after_colon = bl.split(":", 1)[-1] if ":" in bl else bl
+                for p in SKILL_SPLIT.split(after_colon):
+                    p = p.strip(" ,;•\t")
+                    if p and 2 <= len(p) <= 40 and not SKILL_REJECT.search(p):
+                        found.append(p)
+    return list(dict.fromkeys(found))[:50]
+
+
+def experience_items(doc: ResumeSections) -> List[dict]:
+    block = doc.sections["experience"]
+    if not block:
+        return []
+    items: List[dict] = []
+    for it in EXPERIENCE_SPLIT.split(block):
+        t = it.strip()
+        if not t:
+            continue
+        role = company = period = ""
+        # Common pattern: Role — Company (YYYY–YYYY)
+        m = ROLE_COMPANY.search(t)
+        if m:
+            role = m.group('role').strip()
+            company = m.group('company').strip()
+            period = (m.group('period') or '').strip()
+        else:
+            pm = PERIOD.search(t)
+            if pm:
+                period = pm.group(0).strip()
+            # Heuristic split by ' at ' or ' @ '
+            hm = ROLE_AT.search(t)
+            if hm:
+                role = hm.group('role').strip()
+                company = hm.group('company').strip()
+        items.append({"role": role, "company": company, "period": period, "description": t})
+    return items
+
+
+def education_items(doc: ResumeSections) -> List[dict]:
+    results: List[dict] = []
+    txt = doc.sections["education"]
+    if not txt:
+        return results
+    for line in [l.strip() for l in txt.splitlines() if l.strip()]:
+        # Expect patterns like 'University — Degree (years)'
+        em = EDUCATION_ENTRY.search(line)
+        if em:
+            results.append({
+                "institution": em.group('institution').strip(),
+                "degree": em.group('degree').strip(),
+                "period": (em.group('period') or '').strip(),
+                "raw": line,
+            })
+        elif EDUCATION_KEYWORDS.search(line):
+            results.append({"institution": "", "degree": "", "period": "", "raw": line})
+    return results
+
+
+def first_match(pattern: "re.Pattern[str]", doc: ResumeSections) -> str:
+    m = pattern.search(doc.text)
+    return m.group(0) if m else ""
@@ -0,0 +1,62 @@
+# app/services/review_cache.py
+"""Profile reviews keyed by a fingerprint of the fields that are reviewed.
+
+``/ai/review-profile``, ``/ai/review-draft`` and ``/ai/rephrase-apply`` send
+the same fields to the model. The fingerprint is the SHA-256 of those fields
+in canonical form, so an unchanged profile (or a draft with identical
+values) reuses the last review, and any edit produces a new key; nothing has
+to be invalidated explicitly.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Mapping
+
+from app.config.settings import settings
+from app.services.llm_cache import LLMResultCache
+
+REVIEW_FIELDS = (
+    "first_name",
+    "last_name",
+    "email",
+    "phone_number",
+    "location",
+    "years_experience",
+    "hourly_rate",
+    "availability",
+    "bio",
+    "education",
+    "certifications",
+    "website",
+    "linkedin",
+    "preferred_contact_method",
+)
+
+
+def review_payload(profile: Any) -> Dict[str, Any]:
+    """The reviewed fields of a ``ProzProfile`` (or any object with those attributes)."""
+    return {field: getattr(profile, field, None) for field in REVIEW_FIELDS}
+
+
+def review_fingerprint(fields: Mapping[str, Any]) -> str:
+    canonical = {}
+    for field in REVIEW_FIELDS:
+        value = fields.get(field)
+        if isinstance(value, str):
+            # Whitespace-only edits and empty strings don't change what the model sees.
+            value = value.strip() or None
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        canonical[field] = value
+    encoded = json.dumps(canonical, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class ProfileReviewCache(LLMResultCache):
+    namespace = "proz:review"
+
+
+profile_review_cache = ProfileReviewCache(
+    max_entries=settings.PROFILE_REVIEW_CACHE_LOCAL_ENTRIES,
+    ttl=settings.PROFILE_REVIEW_CACHE_TTL_SECONDS,
+)
@@ -7,14 +7,12 @@ from typing import Optional
 import logging
 
 from app.config.settings import settings
+from app.core import redis_pool
+from app.core.redis_pool import REDIS_AVAILABLE
 
 logger = logging.getLogger(__name__)
 
-try:
-    import redis
-    REDIS_AVAILABLE = True
-except ImportError:
-    REDIS_AVAILABLE = False
+if not REDIS_AVAILABLE:
     logger.warning("Redis not installed. Using in-memory storage for OTP.")
 
 try:
@@ -31,7 +29,7 @@ rate_limit_storage = {}
 
 
 class SMSService:
-    def __init__(self):
+    def __init__(self, redis_client=None):
         self.twilio_configured = settings.is_sms_enabled() and TWILIO_AVAILABLE
         self.development_mode = not self.twilio_configured
         
@@ -44,21 +42,10 @@ class SMSService:
             self.from_number = None
             logger.info("SMS service running in DEVELOPMENT MODE")
         
-        # Set up storage (Redis or in-memory)
-        if REDIS_AVAILABLE:
-            try:
-                self.redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
-                # Test Redis connection
-                self.redis_client.ping()
-                self.use_redis = True
-                logger.info("Redis connection established successfully")
-            except Exception as e:
-                logger.error(f"Redis connection failed: {str(e)}. Using in-memory storage.")
-                self.redis_client = None
-                self.use_redis = False
-        else:
-            self.redis_client = None
-            self.use_redis = False
+        # Set up storage (Redis or in-memory), sharing the process-wide pool
+        self.redis_client = redis_client if redis_client is not None else redis_pool.reachable_client()
+        self.use_redis = self.redis_client is not None
+        if not self.use_redis:
             logger.info("Using in-memory storage for OTP (development mode)")
     
     def generate_otp(self, length: int = None) -> str:
@@ -0,0 +1,138 @@
+# app/services/stats_service.py
+"""Single-pass aggregates behind the dashboard and statistics endpoints.
+
+Each builder returns one ``SELECT`` that computes every counter for a table
+with ``SUM(CASE WHEN ... THEN 1 ELSE 0 END)`` columns, so a statistics
+response costs one round trip per table instead of one ``COUNT(*)`` per
+status. The builders are plain statements: execute them on a ``Session`` or
+an ``AsyncSession`` and read the labelled columns from ``.one()``; the
+``*_stats`` / ``*_stats_async`` helpers do exactly that and return a dict.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.modules.proz.models.proz import ProzProfile, Specialty
+from app.modules.tasks.models.task import ServiceRequest, TaskAssignment, TaskNotification, TaskPriority, TaskStatus
+
+ACTIVE_REQUEST_STATUSES = (TaskStatus.ASSIGNED, TaskStatus.ACCEPTED, TaskStatus.IN_PROGRESS)
+ACTIVE_ASSIGNMENT_STATUSES = (TaskStatus.ACCEPTED, TaskStatus.IN_PROGRESS)
+
+
+def count_when(condition):
+    """Number of rows matching ``condition``; 0 (not NULL) on an empty table."""
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def profile_stats_stmt(now: Optional[datetime] = None):
+    """Every ``proz_profiles`` counter used by the public and admin statistics."""
+    week_ago = (now or datetime.utcnow()) - timedelta(days=7)
+    status = ProzProfile.verification_status
+    verified = status == "verified"
+    return select(
+        func.count(ProzProfile.id).label("total_profiles"),
+        count_when(status == "pending").label("pending_profiles"),
+        count_when(verified).label("verified_profiles"),
+        count_when(status == "rejected").label("rejected_profiles"),
+        count_when(and_(verified, ProzProfile.is_featured == True)).label("featured_profiles"),
+        func.avg(case((verified, ProzProfile.rating))).label("average_rating"),
+        func.count(func.distinct(case((verified, ProzProfile.location)))).label("locations_count"),
+        count_when(ProzProfile.created_at >= week_ago).label("profiles_this_week"),
+        count_when(
+            and_(ProzProfile.updated_at >= week_ago, status.in_(["verified", "rejected"]))
+        ).label("verifications_this_week"),
+        func.min(case((status == "pending", ProzProfile.created_at))).label("pending_oldest_date"),
+        count_when(ProzProfile.skill_verification_status == "pending_review").label("pending_skill_reviews"),
+        count_when(ProzProfile.skill_verification_status == "verified").label("verified_skills"),
+        count_when(
+            ProzProfile.skill_verification_status.in_(["rejected", "needs_revision"])
+        ).label("rejected_skills"),
+        select(func.count(Specialty.id)).scalar_subquery().label("specialties_count"),
+    )
+
+
+def task_request_stats_stmt(now: Optional[datetime] = None):
+    """``service_requests`` counters for the admin task dashboard."""
+    now = now or datetime.utcnow()
+    week_ago = now - timedelta(days=7)
+    thirty_days_ago = now - timedelta(days=30)
+    pending = ServiceRequest.status == TaskStatus.PENDING
+    active_professionals = (
+        select(func.count(func.distinct(TaskAssignment.proz_id)))
+        .join(ProzProfile, ProzProfile.id == TaskAssignment.proz_id)
+        .where(TaskAssignment.assigned_at >= thirty_days_ago)
+        .scalar_subquery()
+    )
+    return select(
+        func.count(ServiceRequest.id).label("total_requests"),
+        count_when(pending).label("pending_requests"),
+        count_when(ServiceRequest.status.in_(ACTIVE_REQUEST_STATUSES)).label("assigned_requests"),
+        count_when(ServiceRequest.status == TaskStatus.COMPLETED).label("completed_requests"),
+        count_when(ServiceRequest.priority == TaskPriority.URGENT).label("urgent_requests"),
+        count_when(and_(pending, ~ServiceRequest.assignments.any())).label("unassigned_requests"),
+        count_when(ServiceRequest.created_at >= week_ago).label("requests_this_week"),
+        active_professionals.label("active_professionals"),
+    )
+
+
+def professional_stats_stmt(proz_id: Any, now: Optional[datetime] = None):
+    """One professional's assignment counters and completed-task earnings.
+
+    Earnings are estimated_hours * proposed_rate summed in SQL over completed
+    assignments, as the dashboard has no payment records yet.
+    """
+    now = now or datetime.utcnow()
+    completed = TaskAssignment.status == TaskStatus.COMPLETED
+    value = func.coalesce(TaskAssignment.estimated_hours, 0) * func.coalesce(TaskAssignment.proposed_rate, 0)
+
+    def earnings_since(since: datetime):
+        return func.coalesce(
+            func.sum(case((and_(completed, TaskAssignment.completed_at >= since), value), else_=0)), 0
+        )
+
+    unread_notifications = (
+        select(func.count(TaskNotification.id))
+        .where(TaskNotification.proz_id == proz_id, TaskNotification.is_read == False)
+        .scalar_subquery()
+    )
+    return select(
+        func.count(TaskAssignment.id).label("total_assignments"),
+        count_when(TaskAssignment.status == TaskStatus.ASSIGNED).label("pending_assignments"),
+        count_when(TaskAssignment.status.in_(ACTIVE_ASSIGNMENT_STATUSES)).label("active_assignments"),
+        count_when(completed).label("completed_assignments"),
+        earnings_since(now - timedelta(days=7)).label("this_week_earnings"),
+        earnings_since(now - timedelta(days=30)).label("this_month_earnings"),
+        unread_notifications.label("unread_notifications"),
+    ).where(TaskAssignment.proz_id == proz_id)
+
+
+def _as_dict(row) -> Dict[str, Any]:
+    return dict(row._mapping)
+
+
+def profile_stats(db: Session, now: Optional[datetime] = None) -> Dict[str, Any]:
+    return _as_dict(db.execute(profile_stats_stmt(now)).one())
+
+
+async def profile_stats_async(db: AsyncSession, now: Optional[datetime] = None) -> Dict[str, Any]:
+    return _as_dict((await db.execute(profile_stats_stmt(now))).one())
+
+
+def task_request_stats(db: Session, now: Optional[datetime] = None) -> Dict[str, Any]:
+    return _as_dict(db.execute(task_request_stats_stmt(now)).one())
+
+
+async def task_request_stats_async(db: AsyncSession, now: Optional[datetime] = None) -> Dict[str, Any]:
+    return _as_dict((await db.execute(task_request_stats_stmt(now))).one())
+
+
+def professional_stats(db: Session, proz_id: Any, now: Optional[datetime] = None) -> Dict[str, Any]:
+    return _as_dict(db.execute(professional_stats_stmt(proz_id, now)).one())
+
+
+async def professional_stats_async(db: AsyncSession, proz_id: Any, now: Optional[datetime] = None) -> Dict[str, Any]:
+    return _as_dict((await db.execute(professional_stats_stmt(proz_id, now))).one())
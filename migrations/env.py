@@ -10,7 +10,8 @@ from app.modules.proz.models.proz import ProzProfile, Specialty, ProzSpecialty,
 from app.modules.auth.models.user import User  # Import all models
 from app.modules.auth.models.otp import OTPVerification
 from app.modules.auth.models.password_reset import PasswordResetToken
-from app.modules.tasks.models.task import ServiceRequest, TaskAssignment, TaskNotification
+from app.modules.auth.models.fraud_scan import FraudRescanKey, FraudRescanMark, FraudScanJob
+from app.modules.tasks.models.task import ServiceRequest, TaskAssignment, TaskNotification, MatchPoolSweep
 from app.modules.onboarding.models.onboarding import OnboardingProgress
 from logging.config import fileConfig
 
@@ -0,0 +1,33 @@
+"""Add composite indexes for keyset pagination
+
+Revision ID: a3c5e7f9b1d2
+Revises: f1a9c3d5e7b2
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+
+revision = "a3c5e7f9b1d2"
+down_revision = "f1a9c3d5e7b2"
+branch_labels = None
+depends_on = None
+
+# (name, table, columns): each ends with the sort key(s) and id used by app/core/pagination.py
+INDEXES = [
+    ("ix_proz_profiles_status_rating_id", "proz_profiles", ["verification_status", "rating", "id"]),
+    ("ix_proz_profiles_status_created_id", "proz_profiles", ["verification_status", "created_at", "id"]),
+    ("ix_proz_profiles_created_id", "proz_profiles", ["created_at", "id"]),
+    ("ix_service_requests_created_id", "service_requests", ["created_at", "id"]),
+    ("ix_service_requests_status_created_id", "service_requests", ["status", "created_at", "id"]),
+    ("ix_task_assignments_assigned_id", "task_assignments", ["assigned_at", "id"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,30 @@
+"""Add match_pool_sweeps and service_request_matches.input_fingerprint
+
+Revision ID: a7c9e1b3d5f8
+Revises: f3b5d7e9a1c2
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "a7c9e1b3d5f8"
+down_revision = "f3b5d7e9a1c2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "match_pool_sweeps",
+        sa.Column("name", sa.String(length=50), nullable=False),
+        sa.Column("pool_fingerprint", sa.String(length=64), nullable=False),
+        sa.Column("swept_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    op.add_column("service_request_matches", sa.Column("input_fingerprint", sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("service_request_matches", "input_fingerprint")
+    op.drop_table("match_pool_sweeps")
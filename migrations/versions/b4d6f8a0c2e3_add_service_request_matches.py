@@ -0,0 +1,41 @@
+"""Add service_request_matches for precomputed professional shortlists
+
+Revision ID: b4d6f8a0c2e3
+Revises: a3c5e7f9b1d2
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "b4d6f8a0c2e3"
+down_revision = "a3c5e7f9b1d2"
+branch_labels = None
+depends_on = None
+
+# MySQL stores UUIDs as varchar(36) (matches PortableUUID in app models)
+UUID_COL = sa.String(36)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "service_request_matches",
+        sa.Column("id", UUID_COL, nullable=False),
+        sa.Column("service_request_id", UUID_COL, nullable=False),
+        sa.Column("kind", sa.String(length=20), nullable=False),
+        sa.Column("matches", sa.JSON(), nullable=False),
+        sa.Column("analyzer", sa.String(length=50), nullable=True),
+        sa.Column("request_fingerprint", sa.String(length=64), nullable=False),
+        sa.Column("pool_size", sa.Integer(), nullable=True),
+        sa.Column("duration_ms", sa.Integer(), nullable=True),
+        sa.Column("computed_at", sa.DateTime(), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.ForeignKeyConstraint(["service_request_id"], ["service_requests.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("service_request_id", "kind", name="uq_service_request_matches_request_kind"),
+    )
+    op.create_index("ix_service_request_matches_service_request_id", "service_request_matches", ["service_request_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_service_request_matches_service_request_id", table_name="service_request_matches")
+    op.drop_table("service_request_matches")
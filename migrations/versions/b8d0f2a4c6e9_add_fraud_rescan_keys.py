@@ -0,0 +1,32 @@
+"""Add fraud_rescan_keys: shared links and text buckets resolved to users at scan time
+
+Revision ID: b8d0f2a4c6e9
+Revises: a7c9e1b3d5f8
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "b8d0f2a4c6e9"
+down_revision = "a7c9e1b3d5f8"
+branch_labels = None
+depends_on = None
+
+# MySQL stores UUIDs as varchar(36) (matches PortableUUID in app models)
+UUID_COL = sa.String(36)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "fraud_rescan_keys",
+        sa.Column("id", UUID_COL, nullable=False),
+        sa.Column("reason", sa.String(length=30), nullable=False),
+        sa.Column("key", sa.String(length=64), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("fraud_rescan_keys")
@@ -0,0 +1,43 @@
+"""Add profile_url_fingerprints for duplicate-link fraud detection
+
+Revision ID: c5e7a9b1d3f4
+Revises: b4d6f8a0c2e3
+Create Date: 2026-10-17
+
+Existing profiles are fingerprinted by ``python -m app.scripts.rebuild_profile_index links``
+(run once after upgrading); later writes keep the table current.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "c5e7a9b1d3f4"
+down_revision = "b4d6f8a0c2e3"
+branch_labels = None
+depends_on = None
+
+# MySQL stores UUIDs as varchar(36) (matches PortableUUID in app models)
+UUID_COL = sa.String(36)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "profile_url_fingerprints",
+        sa.Column("id", UUID_COL, nullable=False),
+        sa.Column("proz_id", UUID_COL, nullable=False),
+        sa.Column("url_hash", sa.String(length=64), nullable=False),
+        sa.Column("url", sa.String(length=500), nullable=False),
+        sa.Column("source", sa.String(length=20), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=True),
+        sa.ForeignKeyConstraint(["proz_id"], ["proz_profiles.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("proz_id", "url_hash", name="uq_profile_url_fingerprints_proz_hash"),
+    )
+    op.create_index("ix_profile_url_fingerprints_proz_id", "profile_url_fingerprints", ["proz_id"])
+    op.create_index("ix_profile_url_fingerprints_url_hash", "profile_url_fingerprints", ["url_hash"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_profile_url_fingerprints_url_hash", table_name="profile_url_fingerprints")
+    op.drop_index("ix_profile_url_fingerprints_proz_id", table_name="profile_url_fingerprints")
+    op.drop_table("profile_url_fingerprints")
@@ -0,0 +1,47 @@
+"""Add fraud_scan_jobs for chunked background fraud scans
+
+Revision ID: d6f8b0c2e4a5
+Revises: c5e7a9b1d3f4
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "d6f8b0c2e4a5"
+down_revision = "c5e7a9b1d3f4"
+branch_labels = None
+depends_on = None
+
+# MySQL stores UUIDs as varchar(36) (matches PortableUUID in app models)
+UUID_COL = sa.String(36)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "fraud_scan_jobs",
+        sa.Column("id", UUID_COL, nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("auto_flag", sa.Boolean(), nullable=False),
+        sa.Column("started_by", UUID_COL, nullable=True),
+        sa.Column("total", sa.Integer(), nullable=False),
+        sa.Column("processed", sa.Integer(), nullable=False),
+        sa.Column("flagged", sa.Integer(), nullable=False),
+        sa.Column("high_risk", sa.Integer(), nullable=False),
+        sa.Column("checkpoint_user_id", UUID_COL, nullable=True),
+        sa.Column("cancel_requested", sa.Boolean(), nullable=False),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_fraud_scan_jobs_id", "fraud_scan_jobs", ["id"])
+    op.create_index("ix_fraud_scan_jobs_status", "fraud_scan_jobs", ["status"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_fraud_scan_jobs_status", table_name="fraud_scan_jobs")
+    op.drop_index("ix_fraud_scan_jobs_id", table_name="fraud_scan_jobs")
+    op.drop_table("fraud_scan_jobs")
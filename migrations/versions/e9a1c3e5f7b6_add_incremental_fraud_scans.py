@@ -0,0 +1,55 @@
+"""Add fraud_rescan_marks, scan job watermarks and updated_at indexes for incremental fraud scans
+
+Revision ID: e9a1c3e5f7b6
+Revises: d6f8b0c2e4a5
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "e9a1c3e5f7b6"
+down_revision = "d6f8b0c2e4a5"
+branch_labels = None
+depends_on = None
+
+# MySQL stores UUIDs as varchar(36) (matches PortableUUID in app models)
+UUID_COL = sa.String(36)
+
+# (name, table, columns): range scans from the last scan's watermark
+INDEXES = [
+    ("ix_users_updated_at", "users", ["updated_at"]),
+    ("ix_users_created_at", "users", ["created_at"]),
+    ("ix_users_fraud_scanned_at", "users", ["fraud_scanned_at"]),
+    ("ix_proz_profiles_updated_at", "proz_profiles", ["updated_at"]),
+]
+
+
+def upgrade() -> None:
+    op.add_column("fraud_scan_jobs", sa.Column("mode", sa.String(length=20), nullable=False, server_default="full"))
+    op.add_column("fraud_scan_jobs", sa.Column("watermark", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("fraud_scan_jobs", sa.Column("since", sa.DateTime(timezone=True), nullable=True))
+
+    op.create_table(
+        "fraud_rescan_marks",
+        sa.Column("id", UUID_COL, nullable=False),
+        sa.Column("user_id", UUID_COL, nullable=False),
+        sa.Column("reason", sa.String(length=30), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_fraud_rescan_marks_user_id", "fraud_rescan_marks", ["user_id"])
+
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+    op.drop_index("ix_fraud_rescan_marks_user_id", table_name="fraud_rescan_marks")
+    op.drop_table("fraud_rescan_marks")
+    op.drop_column("fraud_scan_jobs", "since")
+    op.drop_column("fraud_scan_jobs", "watermark")
+    op.drop_column("fraud_scan_jobs", "mode")
@@ -0,0 +1,52 @@
+"""Add full-text search indexes on proz_profiles
+
+Revision ID: f1a9c3d5e7b2
+Revises: e8f1a2b3c4d5
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+
+revision = "f1a9c3d5e7b2"
+down_revision = "e8f1a2b3c4d5"
+branch_labels = None
+depends_on = None
+
+# One index per field group in app/modules/proz/services/profile_search.py
+FIELD_GROUPS = {
+    "profile": ["first_name", "last_name", "bio", "location"],
+    "name": ["first_name", "last_name"],
+    "location": ["location"],
+}
+
+
+def _pg_document(columns) -> str:
+    # Must match PostgresFullTextBackend.document() so the planner uses the index.
+    return "to_tsvector('simple', " + " || ' ' || ".join(f"coalesce({c}, '')" for c in columns) + ")"
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    for group, columns in FIELD_GROUPS.items():
+        if dialect in ("mysql", "mariadb"):
+            op.create_index(
+                f"ft_proz_profiles_{group}",
+                "proz_profiles",
+                columns,
+                mysql_prefix="FULLTEXT",
+            )
+        elif dialect == "postgresql":
+            op.execute(
+                f"CREATE INDEX IF NOT EXISTS ix_proz_profiles_fts_{group} "
+                f"ON proz_profiles USING gin ({_pg_document(columns)})"
+            )
+        # Other databases use the in-process index (PROFILE_SEARCH_BACKEND=memory).
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    for group in reversed(list(FIELD_GROUPS)):
+        if dialect in ("mysql", "mariadb"):
+            op.drop_index(f"ft_proz_profiles_{group}", table_name="proz_profiles")
+        elif dialect == "postgresql":
+            op.execute(f"DROP INDEX IF EXISTS ix_proz_profiles_fts_{group}")
@@ -0,0 +1,42 @@
+"""Add profile_text_bands (MinHash LSH) for near-duplicate profile text detection
+
+Revision ID: f3b5d7e9a1c2
+Revises: e9a1c3e5f7b6
+Create Date: 2026-10-17
+
+Existing profiles are indexed by ``python -m app.scripts.rebuild_profile_index text``
+(run once after upgrading); later writes keep the table current.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "f3b5d7e9a1c2"
+down_revision = "e9a1c3e5f7b6"
+branch_labels = None
+depends_on = None
+
+# MySQL stores UUIDs as varchar(36) (matches PortableUUID in app models)
+UUID_COL = sa.String(36)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "profile_text_bands",
+        sa.Column("id", UUID_COL, nullable=False),
+        sa.Column("proz_id", UUID_COL, nullable=False),
+        sa.Column("field", sa.String(length=20), nullable=False),
+        sa.Column("bucket", sa.String(length=16), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=True),
+        sa.ForeignKeyConstraint(["proz_id"], ["proz_profiles.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("proz_id", "bucket", name="uq_profile_text_bands_proz_bucket"),
+    )
+    op.create_index("ix_profile_text_bands_proz_id", "profile_text_bands", ["proz_id"])
+    op.create_index("ix_profile_text_bands_bucket", "profile_text_bands", ["bucket"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_profile_text_bands_bucket", table_name="profile_text_bands")
+    op.drop_index("ix_profile_text_bands_proz_id", table_name="profile_text_bands")
+    op.drop_table("profile_text_bands")
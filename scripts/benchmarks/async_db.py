@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Concurrent-request throughput of the public read endpoints, sync vs async session.
+
+The "sync" rows are the previous handlers (``async def`` bodies issuing blocking
+``Session`` queries); the "async" rows are the live routes on ``AsyncSession``.
+A per-statement delay stands in for network round trips to MySQL, which is
+where a blocking call stalls every other request on the event loop.
+
+    python scripts/benchmarks/async_db.py --profiles 500 --concurrency 10 --latency 0.002
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+import common
+
+
+def add_legacy_routes(app) -> None:
+    from fastapi import Depends
+    from sqlalchemy import and_, func
+    from sqlalchemy.orm import Session
+
+    from app.database.session import get_db
+    from app.modules.proz.models.proz import ProzProfile, ProzSpecialty, Specialty
+
+    @app.get("/bench/sync/featured")
+    async def legacy_featured(db: Session = Depends(get_db)):
+        featured = and_(ProzProfile.is_featured == True, ProzProfile.verification_status == "verified")
+        profiles = db.query(ProzProfile).filter(featured).order_by(ProzProfile.rating.desc()).limit(6).all()
+        cards = []
+        for profile in profiles:
+            names = db.query(Specialty.name).join(ProzSpecialty).filter(ProzSpecialty.proz_id == profile.id).all()
+            cards.append({"id": profile.id, "specialties": [n.name for n in names]})
+        return {"featured_profiles": cards, "total_featured": db.query(ProzProfile).filter(featured).count()}
+
+    @app.get("/bench/sync/stats")
+    async def legacy_stats(db: Session = Depends(get_db)):
+        verified = ProzProfile.verification_status == "verified"
+        return {
+            "total_profiles": db.query(ProzProfile).count(),
+            "verified_profiles": db.query(ProzProfile).filter(verified).count(),
+            "pending_profiles": db.query(ProzProfile).filter(ProzProfile.verification_status == "pending").count(),
+            "rejected_profiles": db.query(ProzProfile).filter(ProzProfile.verification_status == "rejected").count(),
+            "featured_profiles": db.query(ProzProfile).filter(and_(ProzProfile.is_featured == True, verified)).count(),
+            "specialties_count": db.query(Specialty).count(),
+            "average_rating": db.query(func.avg(ProzProfile.rating)).filter(verified).scalar(),
+            "locations_count": db.query(ProzProfile.location).filter(verified).distinct().count(),
+        }
+
+
+async def hammer(client, path: str, requests: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            response = await client.get(path)
+            response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return requests / (time.perf_counter() - started)
+
+
+async def run(args) -> None:
+    import httpx
+
+    from app.main import app
+
+    add_legacy_routes(app)
+    paths = {
+        "featured": ("/bench/sync/featured", "/api/v1/proz/public/featured"),
+        "stats": ("/bench/sync/stats", "/api/v1/proz/public/stats"),
+    }
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        for name, (sync_path, async_path) in paths.items():
+            await client.get(sync_path)
+            await client.get(async_path)
+            sync_rps = await hammer(client, sync_path, args.requests, args.concurrency)
+            async_rps = await hammer(client, async_path, args.requests, args.concurrency)
+            print(
+                f"{name:<10} sync={sync_rps:8.1f} req/s  async={async_rps:8.1f} req/s  "
+                f"speedup={async_rps / sync_rps:5.2f}x"
+            )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10, help="Keep within the sync pool size (5 + 10 overflow)")
+    parser.add_argument("--latency", type=float, default=0.002, help="Seconds added to every SQL statement")
+    args = parser.parse_args()
+
+    common.bootstrap()
+    common.seed_profiles(args.profiles)
+    common.install_query_latency(args.latency)
+    print(f"{args.profiles} profiles, {args.requests} requests, concurrency {args.concurrency}, latency {args.latency}s")
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
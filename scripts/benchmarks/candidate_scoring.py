@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Professional ranking heuristic: per-candidate Python loop vs the NumPy scorer.
+
+Generates --sizes candidate pools (missing fields, mixed-case specialties,
+ties) and a set of service requests covering every rule, checks that
+``candidate_scorer.rank`` returns exactly what the old loop returned (same
+candidates, order, scores and reasons), then times the loop, pack + score,
+and score alone on a pool packed in advance.
+
+    python scripts/benchmarks/candidate_scoring.py --sizes 1000 10000 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+
+import common
+
+CATEGORIES = ["python", "Data", "design", "cctv", "devops", "accounting", "writer", ""]
+
+
+def legacy_rank(service_request, candidates, top_k):
+    """AIProfileService._rank_heuristic before the NumPy scorer, verbatim."""
+    results = []
+    req_cat = (service_request.get("service_category") or "").lower()
+    loc_pref = (service_request.get("location_preference") or "").lower()
+    remote = bool(service_request.get("remote_work_allowed"))
+    budget_max = service_request.get("budget_max")
+    estimated_hours = 40
+    max_hourly = (budget_max / estimated_hours) if budget_max else None
+
+    for c in candidates:
+        score = 0.0
+        reasons = []
+        specialties = [s.lower() for s in (c.get("specialties") or [])]
+        if req_cat and any(req_cat in s for s in specialties):
+            score += 30
+            reasons.append("Matching specialty")
+        if not remote and loc_pref and c.get("location"):
+            if loc_pref in c["location"].lower():
+                score += 15
+                reasons.append("Local match")
+        y = c.get("years_experience") or 0
+        score += min(25, (y or 0) * 3)
+        if y:
+            reasons.append(f"{y}+ years experience")
+        r = c.get("rating") or 0
+        score += min(20, (r or 0) * 4)
+        if r and r >= 4.0:
+            reasons.append("High rating")
+        hr = c.get("hourly_rate")
+        if max_hourly is not None:
+            if hr is None or hr <= max_hourly:
+                score += 10
+                reasons.append("Within budget")
+        results.append({"candidate": c, "score": score, "reasons": reasons})
+
+    results.sort(key=lambda x: x["score"], reverse=True)
+    return results[:top_k]
+
+
+def make_candidates(count: int, seed: int = 11) -> list[dict]:
+    rng = random.Random(seed)
+    out = []
+    for i in range(count):
+        out.append({
+            "id": str(i),
+            "first_name": f"First{i}",
+            "last_name": f"Last{i}",
+            "email": f"pro{i}@bench.example",
+            "location": rng.choice(common.LOCATIONS + [None, "KIGALI"]),
+            "years_experience": rng.choice([None, 0, 1, 2, 5, 8, 9, 12, 20]),
+            "hourly_rate": rng.choice([None, 10.0, 25.0, 37.5, 50.0, 80.0, 150.0]),
+            "rating": rng.choice([None, 0.0, 3.3, 3.7, 4.0, 4.6, 5.0]),
+            "specialties": rng.sample(common.SPECIALTIES, rng.randint(0, 3)),
+        })
+    return out
+
+
+def make_requests(seed: int = 5) -> list[dict]:
+    rng = random.Random(seed)
+    return [{
+        "service_category": rng.choice(CATEGORIES),
+        "location_preference": rng.choice(["kigali", "Texas", "", None, "nairobi"]),
+        "remote_work_allowed": rng.random() < 0.5,
+        "budget_max": rng.choice([None, 0, 1000.0, 2000.0, 4000.0]),
+    } for _ in range(12)]
+
+
+def same(a: list[dict], b: list[dict]) -> bool:
+    return [(r["candidate"]["id"], r["score"], r["reasons"]) for r in a] == \
+           [(r["candidate"]["id"], r["score"], r["reasons"]) for r in b]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    common.bootstrap()
+    from app.services.candidate_scorer import CandidateMatrix, rank
+
+    requests = make_requests()
+    ok = True
+    for size in args.sizes:
+        candidates = make_candidates(size)
+        matrix = CandidateMatrix.from_candidates(candidates)
+        for req in requests:
+            for k in (args.top_k, size):
+                if not same(legacy_rank(req, candidates, k), rank(matrix, req, k)):
+                    print(f"MISMATCH size={size} k={k} request={req}", file=sys.stderr)
+                    ok = False
+
+        def per_request(fn):
+            started = time.perf_counter()
+            for req in requests:
+                fn(req)
+            return (time.perf_counter() - started) / len(requests) * 1000
+
+        legacy = min(per_request(lambda req: legacy_rank(req, candidates, args.top_k)) for _ in range(args.repeat))
+        packed = min(per_request(lambda req: rank(CandidateMatrix.from_candidates(candidates), req, args.top_k))
+                     for _ in range(args.repeat))
+        scored = min(per_request(lambda req: rank(matrix, req, args.top_k)) for _ in range(args.repeat))
+        common.report(f"{size} candidates, top {args.top_k}, ms per request", {
+            "python loop": {"ms": legacy, "speedup": 1.0},
+            "numpy pack + score": {"ms": packed, "speedup": legacy / packed},
+            "numpy score (pre-packed)": {"ms": scored, "speedup": legacy / scored},
+        })
+
+    print(f"\nidentical rankings (ids, order, scores, reasons) for {len(requests)} requests x 2 k values: {ok}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Matching pool: candidate rows and specialties from the database per click vs the in-memory feature store.
+
+Seeds --profiles profiles (two specialties each) into SQLite, then per
+request builds the pool the way ai-match used to (ORM rows, one batched
+specialty-name query, candidate dicts) and ranks it, against
+``candidate_features.snapshot()`` plus the same ranking. Also times the
+initial load and how long a profile write takes to become visible through
+the incremental refresh, and checks the store ranks the same candidates.
+
+    python scripts/benchmarks/candidate_store.py --profiles 10000 --db-latency 0.0005
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import common
+
+
+def database_pool(db, limit):
+    """ai_match_professionals' pool before the feature store."""
+    from sqlalchemy import desc
+
+    from app.modules.proz.models.proz import ProzProfile
+    from app.modules.proz.repositories.proz_repository import SpecialtyRepository
+
+    query = db.query(ProzProfile).filter(ProzProfile.verification_status == "verified") \
+        .order_by(desc(ProzProfile.rating), desc(ProzProfile.years_experience))
+    pool = (query.limit(limit) if limit else query).all()
+    specialties_by_id = SpecialtyRepository().get_names_by_profile_ids(db, [p.id for p in pool])
+    return [{
+        "id": str(p.id), "first_name": p.first_name, "last_name": p.last_name, "email": p.email,
+        "location": p.location, "years_experience": p.years_experience, "hourly_rate": p.hourly_rate,
+        "rating": p.rating, "specialties": specialties_by_id.get(str(p.id), []),
+        "profile_image_url": p.profile_image_url,
+    } for p in pool]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", type=int, default=10000)
+    parser.add_argument("--db-latency", type=float, default=0.0, help="Seconds added to every SQL statement")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    common.bootstrap()
+    common.seed_profiles(args.profiles)
+    common.install_query_latency(args.db_latency)
+
+    from app.database.session import SessionLocal
+    from app.modules.proz.models.proz import ProzProfile
+    from app.services.candidate_features import CandidateFeatureStore
+    from app.services.candidate_scorer import CandidateMatrix, rank
+
+    request = {"service_category": "python", "location_preference": "kigali",
+               "remote_work_allowed": False, "budget_max": 2400.0}
+    store = CandidateFeatureStore(reload_seconds=0)
+    started = time.perf_counter()
+    store.load()
+    load_seconds = time.perf_counter() - started
+
+    db = SessionLocal()
+    rows = {
+        "database pool, 100 (old cap)": common.timed(lambda: rank(CandidateMatrix.from_candidates(database_pool(db, 100)), request, 10), args.repeat),
+        "database pool, all verified": common.timed(lambda: rank(CandidateMatrix.from_candidates(database_pool(db, None)), request, 10), args.repeat),
+        "feature store, all verified": common.timed(lambda: rank(store.snapshot(), request, 10), args.repeat),
+    }
+    db_ranked = [r["candidate"]["id"] for r in rank(CandidateMatrix.from_candidates(database_pool(db, None)), request, 10)]
+    store_ranked = [r["candidate"]["id"] for r in rank(store.snapshot(), request, 10)]
+
+    # A write becomes visible after one incremental refresh of the changed ids.
+    profile = db.query(ProzProfile).filter(ProzProfile.verification_status == "verified").first()
+    profile.rating, profile.years_experience, profile.location = 5.0, 15, "Kigali, Rwanda"
+    db.commit()
+    edited_id = str(profile.id)
+    started = time.perf_counter()
+    refreshed = store.refresh()
+    refresh_ms = (time.perf_counter() - started) * 1000
+    edited = next(c for c in store.snapshot().candidates if c["id"] == edited_id)
+    visible = (edited["rating"], edited["years_experience"], edited["location"]) == (5.0, 15, "Kigali, Rwanda")
+    db.close()
+
+    verified = len(store.snapshot())
+    common.report(f"{args.profiles} profiles ({verified} verified), db latency {args.db_latency * 1000:.1f} ms/statement; seconds per ranking", rows)
+    print(f"\n  initial load: {load_seconds:.2f}s; one profile write visible after a {refresh_ms:.1f} ms refresh ({refreshed} id)")
+    print(f"  same top 10 as the full database pool: {db_ranked == store_ranked}; edit visible: {visible}")
+    return 0 if db_ranked == store_ranked and visible else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
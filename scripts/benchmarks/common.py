@@ -0,0 +1,136 @@
+"""Shared bootstrap for the benchmark scripts in this directory.
+
+Benchmarks run against a throwaway SQLite database so they need no MySQL or
+Redis. ``bootstrap()`` must be called before anything under ``app`` is
+imported, because the engines are created from settings at import time.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT))
+
+LOCATIONS = ["Kigali, Rwanda", "Austin, Texas", "Lagos, Nigeria", "Nairobi, Kenya", "Remote"]
+SPECIALTIES = [
+    "Python Developer", "Data Engineer", "Product Designer", "CCTV Installer",
+    "DevOps Engineer", "Accountant", "Copywriter", "Network Technician",
+]
+STATUSES = ["verified", "verified", "verified", "pending", "rejected"]
+
+
+def bootstrap(db_path: str | None = None) -> str:
+    """Point the app at a fresh SQLite file and create every table."""
+    if db_path is None:
+        db_path = os.path.join(tempfile.mkdtemp(prefix="prozlab-bench-"), "bench.db")
+    for key in ("DB_HOST", "DB_NAME", "DB_USER", "DB_PASSWORD"):
+        os.environ.setdefault(key, "bench")
+    os.environ.setdefault("DB_PORT", "3306")
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ.setdefault("REDIS_URL", "redis://127.0.0.1:1/0")
+
+    from app.config.database import engine
+    from app.database.base_class import Base
+    from app.modules.auth.models.user import User  # noqa: F401
+    from app.modules.auth.models.otp import OTPVerification  # noqa: F401
+    from app.modules.auth.models.password_reset import PasswordResetToken  # noqa: F401
+    from app.modules.onboarding.models.onboarding import OnboardingProgress  # noqa: F401
+    from app.modules.proz.models.proz import ProzProfile  # noqa: F401
+    from app.modules.tasks.models.task import ServiceRequest  # noqa: F401
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    return db_path
+
+
+def seed_profiles(count: int, *, seed: int = 7) -> None:
+    """Insert ``count`` profiles with specialties and approved reviews."""
+    from app.database.session import SessionLocal
+    from app.modules.proz.models.proz import ProzProfile, ProzSpecialty, Review, Specialty
+
+    rng = random.Random(seed)
+    db = SessionLocal()
+    try:
+        specialties = [Specialty(name=name) for name in SPECIALTIES]
+        db.add_all(specialties)
+        db.flush()
+        for i in range(count):
+            profile = ProzProfile(
+                first_name=f"First{i}",
+                last_name=f"Last{i}",
+                email=f"pro{i}@bench.example",
+                bio=f"Professional {i} with experience in {rng.choice(SPECIALTIES).lower()} projects",
+                location=rng.choice(LOCATIONS),
+                years_experience=rng.randint(0, 15),
+                hourly_rate=float(rng.randint(15, 150)),
+                availability=rng.choice(["full-time", "part-time", "contract"]),
+                rating=round(rng.uniform(0, 5), 1),
+                review_count=1,
+                verification_status=rng.choice(STATUSES),
+                is_featured=(i % 9 == 0),
+            )
+            db.add(profile)
+            db.flush()
+            for specialty in rng.sample(specialties, 2):
+                db.add(ProzSpecialty(proz_id=profile.id, specialty_id=specialty.id))
+            db.add(Review(proz_id=profile.id, client_name="Client", rating=rng.randint(3, 5), is_approved=True))
+        db.commit()
+    finally:
+        db.close()
+
+
+def install_query_latency(seconds: float) -> None:
+    """Add a fixed per-statement delay on both engines to mimic a remote database.
+
+    The delay runs on whichever thread executes the statement: the event loop
+    thread for the sync engine, the aiosqlite worker thread for the async one.
+    """
+    if seconds <= 0:
+        return
+    from sqlalchemy import event
+
+    from app.config.database import async_engine, engine
+
+    def delay(_statement):
+        time.sleep(seconds)
+
+    @event.listens_for(engine, "connect")
+    def _sync_connect(dbapi_connection, _record):
+        dbapi_connection.set_trace_callback(delay)
+
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def _async_connect(dbapi_connection, _record):
+        dbapi_connection.run_async(lambda conn: conn.set_trace_callback(delay))
+
+    engine.dispose()
+    async_engine.sync_engine.dispose()
+
+
+def timed(fn: Callable[[], object], repeat: int = 5) -> Dict[str, float]:
+    """Run ``fn`` ``repeat`` times and summarise wall-clock seconds."""
+    samples: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "max": max(samples),
+    }
+
+
+def report(title: str, rows: Dict[str, Dict[str, float]]) -> None:
+    print(f"\n{title}")
+    width = max(len(name) for name in rows)
+    for name, stats in rows.items():
+        cells = "  ".join(f"{key}={value:.4f}" for key, value in stats.items())
+        print(f"  {name.ljust(width)}  {cells}")
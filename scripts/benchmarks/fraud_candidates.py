@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Admin fraud candidate listing: load every user + one profile query each vs SQL filters, one grouped count, one page.
+
+Seeds --users users with profiles and spreads fraud scores, flags and bans
+over them. "previous" is the old ``GET /admin/fraud/candidates`` body: load
+all users, one ``_get_profile`` query per user, filter and count in Python.
+"paged" is the endpoint now, asked for its first --page-size candidates.
+For every tab (all, flagged, banned, high_risk) the totals must match the
+old filtered lists, and the page must be the top of the old list.
+
+    python scripts/benchmarks/fraud_candidates.py --users 5000 --db-latency 0.001
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+
+import common
+from fraud_scan_job import seed_users
+
+TABS = (None, "flagged", "banned", "high_risk")
+
+
+def legacy_list(db, filter):
+    """fraud_controller.list_fraud_candidates before SQL filtering."""
+    from app.modules.auth.models.user import User
+    from app.modules.auth.services.fraud_detection_service import AUTO_FLAG_THRESHOLD, to_candidate_item
+
+    users = db.query(User).filter(User.is_superuser == False).order_by(  # noqa: E712
+        User.fraud_score.desc(), User.updated_at.desc()).all()
+    candidates = [to_candidate_item(db, u) for u in users]
+    if filter == "flagged":
+        candidates = [c for c in candidates if c["is_flagged"] and not c["is_banned"]]
+    elif filter == "banned":
+        candidates = [c for c in candidates if c["is_banned"]]
+    elif filter == "high_risk":
+        candidates = [c for c in candidates if c["fraud_score"] >= AUTO_FLAG_THRESHOLD and not c["is_banned"]]
+    return candidates
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--db-latency", type=float, default=0.001, help="Seconds added to every SQL statement")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    common.bootstrap()
+    common.seed_profiles(args.users)
+    seed_users(args.users)
+
+    from app.database.session import SessionLocal
+    from app.modules.auth.controllers.fraud_controller import list_fraud_candidates
+    from app.modules.auth.models.user import User
+
+    rng = random.Random(11)
+    db = SessionLocal()
+    for user in db.query(User).all():
+        user.fraud_score = rng.choice([0, 0, 0, 10, 20, 35, 45, 55, 70, 85, 100])
+        user.is_flagged = rng.random() < 0.08
+        user.is_banned = rng.random() < 0.03
+    db.commit()
+    common.install_query_latency(args.db_latency)
+
+    def paged(filter):
+        return asyncio.run(list_fraud_candidates(
+            filter=filter, search=None, min_risk=None, page=1, page_size=args.page_size, cursor=None,
+            db=db, current_user=None,
+        ))
+
+    rows, matches = {}, []
+    for tab in TABS:
+        name = tab or "all"
+        rows[f"{name}, previous"] = common.timed(lambda: legacy_list(db, tab), args.repeat)
+        rows[f"{name}, paged"] = common.timed(lambda: paged(tab), args.repeat)
+        old, new = legacy_list(db, tab), paged(tab)
+        old_ids = {str(c["user_id"]) for c in old}
+        matches.append(
+            new.total == len(old)
+            and [c.fraud_score for c in new.candidates] == [c["fraud_score"] for c in old[:args.page_size]]
+            and all(str(c.user_id) in old_ids for c in new.candidates)
+        )
+        if tab is None:
+            matches.append((new.flagged_count, new.banned_count, new.high_risk_count) == (
+                sum(1 for c in old if c["is_flagged"] and not c["is_banned"]),
+                sum(1 for c in old if c["is_banned"]),
+                sum(1 for c in old if c["fraud_score"] >= 55),
+            ))
+    db.close()
+
+    common.report(f"{args.users} users, page of {args.page_size}, db latency {args.db_latency * 1000:.1f} ms/statement; "
+                  "seconds per request", rows)
+    print(f"\n  totals, summary counts and first pages match the previous listing: {all(matches)}")
+    return 0 if all(matches) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
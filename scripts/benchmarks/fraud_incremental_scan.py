@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Scheduled fraud rescans: full scan vs incremental scan after a small amount of churn.
+
+Seeds --users users with profiles and runs a full scan. Then it changes
+--churn of the users in the ways that matter to the score:
+
+- profile edits through the ORM (verification rejected);
+- an admin flag on the user;
+- a profile that starts using another profile's link (both owners' scores change);
+- a Core UPDATE that bypasses the session hooks, seen only through ``updated_at``.
+
+"incremental" is ``start(..., incremental=True)`` after that churn, and
+"incremental, no churn" is the next one. After the incremental run every
+stored score must equal what a full scan would compute now. Both scans run
+with auto_flag off so the comparison is not moved by their own flags; a
+last full scan with auto_flag on must leave no marks behind (its flags are
+its own writes, not changes to rescan).
+
+    python scripts/benchmarks/fraud_incremental_scan.py --users 5000 --churn 0.01
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import common
+from fraud_scan_job import seed_users
+
+
+def run(manager, db, incremental: bool, auto_flag: bool = False):
+    started = time.perf_counter()
+    job = manager.start(db, auto_flag=auto_flag, incremental=incremental)
+    manager.wait(job.id)
+    db.refresh(job)
+    seconds = time.perf_counter() - started
+    db.commit()
+    return job, {"seconds": seconds, "users_scored": float(job.processed)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--churn", type=float, default=0.01, help="Share of users changed between scans")
+    parser.add_argument("--db-latency", type=float, default=0.001, help="Seconds added to every SQL statement")
+    args = parser.parse_args()
+
+    common.bootstrap()
+    common.seed_profiles(args.users)
+    seed_users(args.users)
+
+    from sqlalchemy import update
+
+    from app.config.database import engine
+    from app.database.session import SessionLocal
+    from app.modules.auth.models.fraud_scan import FraudRescanMark
+    from app.modules.auth.models.user import User
+    from app.modules.auth.services.fraud_detection_service import scan_user
+    from app.modules.auth.services.fraud_scan_jobs import FraudScanJobManager
+    from app.modules.proz.models.proz import ProzProfile
+
+    db = SessionLocal()
+    profiles = db.query(ProzProfile).order_by(ProzProfile.email).all()
+    for i, profile in enumerate(profiles):
+        profile.linkedin = f"https://www.linkedin.com/in/person-{i}"
+    db.commit()
+
+    common.install_query_latency(args.db_latency)
+    manager = FraudScanJobManager()
+    rows = {}
+    _, rows["full scan"] = run(manager, db, incremental=False)
+    # Give the churn a later updated_at than the scan on databases that store whole seconds.
+    time.sleep(1.1)
+
+    step = max(1, int(1 / args.churn)) * 4
+    profiles = db.query(ProzProfile).order_by(ProzProfile.email).all()
+    changed = set()
+    for i in range(0, len(profiles), step):
+        if profiles[i].verification_status != "rejected":  # some are seeded rejected already
+            profiles[i].verification_status = "rejected"
+            changed.add(profiles[i].user_id)
+    for i in range(1, len(profiles), step):
+        db.get(User, profiles[i].user_id).is_flagged = True
+        changed.add(profiles[i].user_id)
+    for i in range(2, len(profiles), step):
+        source = profiles[(i + 7) % len(profiles)]
+        profiles[i].portfolio_links = [source.linkedin.replace("https://www.", "http://")]
+        changed.update((profiles[i].user_id, source.user_id))
+    db.commit()
+    bypassed = [profiles[i].id for i in range(3, len(profiles), step)]
+    with engine.begin() as connection:
+        connection.execute(update(ProzProfile.__table__).where(ProzProfile.__table__.c.id.in_(bypassed))
+                           .values(skill_verification_status="rejected"))
+    changed.update(profiles[i].user_id for i in range(3, len(profiles), step))
+    marks = db.query(FraudRescanMark).count()
+    db.commit()
+
+    _, rows["incremental"] = run(manager, db, incremental=True)
+    users = db.query(User).filter(User.is_superuser == False).all()  # noqa: E712
+    stale = [u.email for u in users if scan_user(db, u)[0] != (u.fraud_score or 0)]
+    db.commit()
+    _, rows["incremental, no churn"] = run(manager, db, incremental=True)
+    flagged = run(manager, db, incremental=False, auto_flag=True)[0].flagged
+    left_behind = db.query(FraudRescanMark).count()
+    db.commit()
+    db.close()
+
+    common.report(f"{args.users} users, {len(changed)} changed (about {args.churn:.0%} churn), "
+                  f"db latency {args.db_latency * 1000:.1f} ms/statement", rows)
+    print(f"\n  marks written by the session hooks during the churn: {marks} (the Core UPDATE wrote none)")
+    print(f"  users whose stored score differs from a fresh scan after the incremental run: {len(stale)}")
+    print(f"  marks left behind by a full scan that auto-flagged {flagged} users: {left_behind}")
+    ok = not stale and not left_behind and rows["incremental"]["users_scored"] == len(changed) and rows["incremental, no churn"]["users_scored"] == 0
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
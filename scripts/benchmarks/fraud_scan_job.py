@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""Full fraud scan: the old in-request loop (one profile query and commit per user) vs the chunked background job.
+
+Seeds --users users, each with a profile, and adds --db-latency seconds to
+every SQL statement to stand in for a database across the network. Then:
+
+- "in-request loop" replays the previous ``POST /admin/fraud/scan`` body:
+  load every user, then ``apply_scan_result`` per user;
+- "background job" is ``fraud_scan_jobs.start`` run to completion;
+- a cancel/resume drill: cancel a job partway, resume it, and check that
+  every user was scored and the checkpoint reached the last user id.
+
+Both paths must leave every user with the same fraud score.
+
+    python scripts/benchmarks/fraud_scan_job.py --users 2000 --db-latency 0.001
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import common
+
+
+def seed_users(count: int) -> None:
+    """One user per seeded profile, linked by user_id; every 40th uses a disposable domain."""
+    import uuid
+
+    from app.database.session import SessionLocal
+    from app.modules.auth.models.user import User
+    from app.modules.proz.models.proz import ProzProfile
+
+    db = SessionLocal()
+    try:
+        profiles = db.query(ProzProfile).order_by(ProzProfile.email).all()
+        for i, profile in enumerate(profiles[:count]):
+            email = profile.email if i % 40 else f"pro{i}@mailinator.com"
+            user = User(id=uuid.uuid4(), email=email, hashed_password="x", first_name=profile.first_name,
+                        last_name=profile.last_name)
+            db.add(user)
+            profile.user_id = user.id
+            if i % 25 == 0:
+                profile.years_experience, profile.bio = 12, None
+        db.commit()
+    finally:
+        db.close()
+
+
+def legacy_scan(auto_flag: bool = True) -> int:
+    """fraud_controller.scan_candidates (all users) before the background job."""
+    from app.database.session import SessionLocal
+    from app.modules.auth.models.user import User
+    from app.modules.auth.services.fraud_detection_service import apply_scan_result
+
+    db = SessionLocal()
+    try:
+        users = db.query(User).filter(User.is_superuser == False).all()  # noqa: E712
+        for user in users:
+            apply_scan_result(db, user, auto_flag=auto_flag)
+        return len(users)
+    finally:
+        db.close()
+
+
+def scores() -> dict:
+    from app.database.session import SessionLocal
+    from app.modules.auth.models.user import User
+
+    db = SessionLocal()
+    try:
+        return {str(i): (s, bool(f)) for i, s, f in db.query(User.id, User.fraud_score, User.is_flagged)}
+    finally:
+        db.close()
+
+
+def reset_scores() -> None:
+    from app.database.session import SessionLocal
+    from app.modules.auth.models.user import User
+
+    db = SessionLocal()
+    try:
+        db.query(User).update({User.fraud_score: 0, User.fraud_signals: None, User.is_flagged: False,
+                               User.flagged_at: None, User.fraud_scanned_at: None})
+        db.commit()
+    finally:
+        db.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--db-latency", type=float, default=0.001, help="Seconds added to every SQL statement")
+    parser.add_argument("--chunk-size", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    common.bootstrap()
+    common.seed_profiles(args.users)
+    seed_users(args.users)
+    common.install_query_latency(args.db_latency)
+
+    from app.database.session import SessionLocal
+    from app.modules.auth.models.fraud_scan import FraudScanJob
+    from app.modules.auth.models.user import User
+    from app.modules.auth.services.fraud_scan_jobs import FraudScanJobManager
+
+    manager = FraudScanJobManager(chunk_size=args.chunk_size, workers=args.workers)
+    rows = {}
+
+    started = time.perf_counter()
+    scanned = legacy_scan()
+    rows["in-request loop (previous)"] = {"seconds": time.perf_counter() - started, "users": float(scanned)}
+    legacy_scores = scores()
+    reset_scores()
+
+    db = SessionLocal()
+    started = time.perf_counter()
+    job = manager.start(db)
+    returned_after = time.perf_counter() - started
+    manager.wait(job.id)
+    db.refresh(job)
+    rows["background job"] = {"seconds": time.perf_counter() - started, "users": float(job.processed)}
+    job_scores = scores()
+    same_scores = job_scores == legacy_scores
+
+    # Cancel partway through, then resume from the checkpoint. Smaller chunks,
+    # so the chunks in flight are well short of the whole table.
+    reset_scores()
+    drill = FraudScanJobManager(chunk_size=max(5, args.users // 40), workers=args.workers)
+    job = drill.start(db)
+    while True:
+        db.refresh(job)
+        processed = job.processed
+        db.commit()  # SQLite: no read transaction left open while the workers write
+        if processed >= args.users // 4:
+            break
+        time.sleep(0.01)
+    drill.cancel(db, job.id)
+    drill.wait(job.id)
+    db.refresh(job)
+    cancelled = (job.status, job.processed, job.checkpoint_user_id)
+    unscanned = db.query(User).filter(User.fraud_scanned_at.is_(None)).count()
+    drill.resume(db, job.id)
+    drill.wait(job.id)
+    db.refresh(job)
+    last_id = db.query(User.id).filter(User.is_superuser == False).order_by(User.id.desc()).first()[0]  # noqa: E712
+    resumed_ok = (
+        job.status == "completed"
+        and db.query(User).filter(User.fraud_scanned_at.is_(None)).count() == 0
+        and str(job.checkpoint_user_id) == str(last_id)
+        and scores() == legacy_scores
+    )
+    jobs = db.query(FraudScanJob).count()
+    db.close()
+
+    common.report(f"{args.users} users, db latency {args.db_latency * 1000:.1f} ms/statement, "
+                  f"{args.workers} workers x {args.chunk_size}-user chunks", rows)
+    print(f"\n  start() returned after {returned_after * 1000:.0f} ms; same scores and flags as the old loop: {same_scores}")
+    print(f"  cancel drill: stopped {cancelled[0]} at {cancelled[1]}/{args.users} with {unscanned} users unscanned; "
+          f"resume completed from the checkpoint: {resumed_ok} ({jobs} job rows)")
+    return 0 if same_scores and resumed_ok and cancelled[0] == "cancelled" else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
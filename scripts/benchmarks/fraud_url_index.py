@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Duplicate-link fraud check: ILIKE '%url%' per profile URL vs the indexed URL fingerprint table.
+
+Seeds --profiles profiles, then gives them linkedin / website / portfolio /
+evidence URLs through the ORM, so the session hooks write the fingerprints.
+Every --dup-every-th profile reuses an earlier profile's link, written
+differently: another field, scheme, ``www.``, case, trailing slash, query
+string. Then it times the duplicate-link check over every profile, the
+way a full ``/admin/fraud/scan`` runs it: the previous query against
+``_duplicate_urls`` now. It also checks that each planted pair is found.
+
+    python scripts/benchmarks/fraud_url_index.py --profiles 3000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import common
+
+VARIANTS = [
+    ("linkedin", lambda n: f"https://www.linkedin.com/in/person-{n}"),
+    ("website", lambda n: f"http://person{n}.dev/"),
+    ("portfolio_links", lambda n: [f"https://github.com/person{n}"]),
+    ("verification_evidences", lambda n: [{"id": f"e{n}", "type": "work_sample", "url": f"https://dribbble.com/shots/{n}"}]),
+]
+# How a duplicate restates each VARIANTS link of the profile it copies
+REWRITES = [
+    [("linkedin", lambda n: f"linkedin.com/in/Person-{n}/"),
+     ("verification_evidences", lambda n: [{"id": f"d{n}", "type": "linkedin", "url": f"https://uk.linkedin.com/in/person-{n}?trk=share"}])],
+    [("portfolio_links", lambda n: [f"https://person{n}.dev"])],
+    [("website", lambda n: f"https://github.com/person{n}/")],
+    [("linkedin", lambda n: f"HTTP://WWW.DRIBBBLE.COM/shots/{n}#top")],
+]
+
+
+def legacy_duplicate_urls(db, profile):
+    """fraud_detection_service._duplicate_urls before the fingerprint table."""
+    from app.modules.proz.models.proz import ProzProfile
+    from app.modules.proz.services.verification_helpers import evidences
+
+    urls = set()
+    for field in ("linkedin", "website"):
+        val = getattr(profile, field, None)
+        if val and val.startswith("http"):
+            urls.add(val.strip().lower())
+    for item in evidences(profile):
+        url = item.get("url")
+        if url and url.startswith("http"):
+            urls.add(url.strip().lower())
+    found = []
+    for url in urls:
+        others = (
+            db.query(ProzProfile)
+            .filter(ProzProfile.id != profile.id)
+            .filter((ProzProfile.linkedin.ilike(f"%{url}%")) | (ProzProfile.website.ilike(f"%{url}%")))
+            .count()
+        )
+        if others > 0:
+            found.append(url)
+    return found
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", type=int, default=3000)
+    parser.add_argument("--dup-every", type=int, default=50)
+    args = parser.parse_args()
+
+    common.bootstrap()
+    common.seed_profiles(args.profiles)
+
+    from app.database.session import SessionLocal
+    from app.modules.auth.services.fraud_detection_service import _duplicate_urls
+    from app.modules.proz import url_fingerprints
+    from app.modules.proz.models.proz import ProfileUrlFingerprint, ProzProfile
+
+    db = SessionLocal()
+    profiles = db.query(ProzProfile).order_by(ProzProfile.email).all()
+    planted = {}
+    started = time.perf_counter()
+    for i, profile in enumerate(profiles):
+        if i and i % args.dup_every == 0:
+            source = i - 1
+            choices = REWRITES[source % len(VARIANTS)]
+            field, value = choices[(i // args.dup_every) % len(choices)]
+            setattr(profile, field, value(source))
+            planted[profile.id] = profiles[source].id
+        else:
+            field, value = VARIANTS[i % len(VARIANTS)]
+            setattr(profile, field, value(i))
+    db.commit()
+    write_seconds = time.perf_counter() - started
+    fingerprints = db.query(ProfileUrlFingerprint).count()
+
+    started = time.perf_counter()
+    legacy_hits = {p.id for p in profiles if legacy_duplicate_urls(db, p)}
+    legacy_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    indexed_hits = {p.id for p in profiles if _duplicate_urls(db, p, p.user_id)}
+    indexed_seconds = time.perf_counter() - started
+
+    # The rebuild path must produce the same table the hooks maintain.
+    before = {(str(r.proz_id), r.url_hash) for r in db.query(ProfileUrlFingerprint)}
+    started = time.perf_counter()
+    url_fingerprints.rebuild(db)
+    rebuild_seconds = time.perf_counter() - started
+    after = {(str(r.proz_id), r.url_hash) for r in db.query(ProfileUrlFingerprint)}
+    db.close()
+
+    expected = set(planted) | set(planted.values())
+    rows = {
+        "ILIKE per url (previous)": {"seconds": legacy_seconds, "per_profile_ms": legacy_seconds / len(profiles) * 1000,
+                                     "planted_found": float(len(expected & legacy_hits))},
+        "fingerprint lookup": {"seconds": indexed_seconds, "per_profile_ms": indexed_seconds / len(profiles) * 1000,
+                               "planted_found": float(len(expected & indexed_hits))},
+    }
+    common.report(f"{len(profiles)} profiles, {len(planted)} planted duplicate pairs ({len(expected)} profiles); full scan", rows)
+    print(f"\n  {fingerprints} fingerprints written by the session hooks while updating all profiles in {write_seconds:.2f}s")
+    print(f"  rebuild: {rebuild_seconds:.2f}s, same rows as the hooks wrote: {before == after}")
+    print(f"  false positives: previous {len(legacy_hits - expected)}, fingerprints {len(indexed_hits - expected)}")
+    ok = expected <= indexed_hits and not (indexed_hits - expected) and before == after
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
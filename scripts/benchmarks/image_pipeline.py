@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Profile image variant rendering: three decodes per upload vs one, inline vs a process pool.
+
+"legacy" replays the previous ``FileService._resize_image`` (open, decode,
+LANCZOS and save once per size); "single-decode" is
+``image_pipeline.render_variants`` inline; "pool" submits the whole batch to
+``ImagePipeline``. "respond" is what the upload endpoint now waits for
+before answering: writing the original to disk.
+
+Each single-decode variant is compared with its legacy counterpart; the
+script exits non-zero if any differs by more than --max-diff on average
+(0-255 per channel).
+
+    python scripts/benchmarks/image_pipeline.py --images 12 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import common
+
+
+def make_inputs(directory: Path, count: int, seed: int = 5) -> list[Path]:
+    """Large photos: alternately a 4000x3000 JPEG and a 2400x2400 RGBA PNG."""
+    from PIL import Image, ImageDraw, ImageFilter
+
+    rng = random.Random(seed)
+    paths = []
+    for i in range(count):
+        jpeg = i % 2 == 0
+        size = (4000, 3000) if jpeg else (2400, 2400)
+        img = Image.radial_gradient("L").resize(size).convert("RGB")
+        draw = ImageDraw.Draw(img)
+        for _ in range(60):
+            x, y = rng.randrange(size[0]), rng.randrange(size[1])
+            r = rng.randrange(40, 400)
+            draw.ellipse((x - r, y - r, x + r, y + r), fill=tuple(rng.randrange(256) for _ in range(3)))
+        noise = Image.effect_noise(size, 40).convert("RGB")
+        img = Image.blend(img, noise, 0.15).filter(ImageFilter.SMOOTH)
+        path = directory / f"input{i}.{'jpg' if jpeg else 'png'}"
+        if jpeg:
+            img.save(path, "JPEG", quality=92)
+        else:
+            img.putalpha(Image.linear_gradient("L").resize(size))
+            img.save(path, "PNG")
+        paths.append(path)
+    return paths
+
+
+def legacy_resize(image_path: Path, size: tuple, output_path: Path) -> None:
+    """The previous FileService._resize_image, verbatim."""
+    from PIL import Image
+
+    with Image.open(image_path) as img:
+        if img.mode in ('RGBA', 'LA', 'P'):
+            background = Image.new('RGB', img.size, (255, 255, 255))
+            if img.mode == 'P':
+                img = img.convert('RGBA')
+            background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
+            img = background
+        img.thumbnail(size, Image.Resampling.LANCZOS)
+        new_img = Image.new('RGB', size, (255, 255, 255))
+        new_img.paste(img, ((size[0] - img.size[0]) // 2, (size[1] - img.size[1]) // 2))
+        new_img.save(output_path, 'JPEG', quality=85, optimize=True)
+
+
+def mean_diff(a: Path, b: Path) -> float:
+    from PIL import Image, ImageChops, ImageStat
+
+    with Image.open(a) as left, Image.open(b) as right:
+        if left.size != right.size:
+            return float("inf")
+        return sum(ImageStat.Stat(ImageChops.difference(left, right)).mean) / 3
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--images", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--max-diff", type=float, default=3.0)
+    args = parser.parse_args()
+
+    common.bootstrap()
+    from app.services.file_service import IMAGE_SIZES
+    from app.services.image_pipeline import ImagePipeline, render_variants
+
+    work = Path(tempfile.mkdtemp(prefix="prozlab-images-"))
+    inputs = make_inputs(work, args.images)
+    megabytes = sum(p.stat().st_size for p in inputs) / 1e6
+    out = {name: work / name for name in ("legacy", "single", "pool")}
+    for directory in out.values():
+        directory.mkdir()
+
+    def outputs(kind: str, source: Path) -> dict:
+        return {name: (size, str(out[kind] / f"{source.stem}-{name}.jpg")) for name, size in IMAGE_SIZES.items()}
+
+    def respond() -> None:
+        for source in inputs:
+            with open(source, "rb") as upload, open(work / f"copy-{source.name}", "wb") as buffer:
+                shutil.copyfileobj(upload, buffer)
+                buffer.flush()
+                os.fsync(buffer.fileno())
+
+    def legacy() -> None:
+        for source in inputs:
+            for name, (size, path) in outputs("legacy", source).items():
+                legacy_resize(source, size, Path(path))
+
+    def single() -> None:
+        for source in inputs:
+            render_variants(str(source), outputs("single", source))
+
+    pipeline = ImagePipeline(max_workers=args.workers)
+    # Start the workers outside the timed region; spawning is a one-off at app startup.
+    list(pipeline.pool.executor().map(abs, range(args.workers)))
+
+    def pooled() -> None:
+        futures = [
+            pipeline.pool.executor().submit(render_variants, str(source), outputs("pool", source)) for source in inputs
+        ]
+        for future in futures:
+            future.result()
+
+    rows = {}
+    for name, fn in (("legacy", legacy), ("single-decode", single), (f"pool x{args.workers}", pooled), ("respond", respond)):
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        rows[name] = {"seconds": elapsed, "per_image_ms": elapsed / len(inputs) * 1000}
+    pipeline.shutdown()
+
+    worst = max(
+        mean_diff(Path(outputs("legacy", source)[name][1]), Path(outputs("single", source)[name][1]))
+        for source in inputs
+        for name in IMAGE_SIZES
+    )
+    common.report(f"{len(inputs)} images ({megabytes:.1f} MB), 3 variants each; worst mean diff vs legacy {worst:.2f}", rows)
+    shutil.rmtree(work, ignore_errors=True)
+    if worst > args.max_diff:
+        print(f"MISMATCH: variants differ from legacy by {worst:.2f} > {args.max_diff}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
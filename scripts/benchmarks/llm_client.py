@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""OpenAI calls: a new HTTPS connection per call on the caller's thread vs the shared pooled client.
+
+Runs against ``scripts/fake_openai.py`` with --latency seconds of simulated
+model time. "legacy" replays the previous ``http.client`` code path (one new
+connection per call, no timeout); "pooled" is ``LLMClient``. Three checks:
+
+- throughput for --calls sequential and --concurrency-way concurrent calls,
+  with the number of TCP connections the fake server saw;
+- event-loop stall: the longest gap a 10 ms ticker sees while an async route
+  makes five calls (legacy blocks the loop, pooled awaits);
+- circuit breaker: upstream stalls past the timeout; after the threshold the
+  remaining calls must return (``None``) without waiting.
+
+    python scripts/benchmarks/llm_client.py --calls 40 --latency 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import http.client
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import common
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from fake_openai import FakeOpenAI  # noqa: E402
+
+MESSAGES = [{"role": "user", "content": "Resume text:\n\nJane Doe, Python developer"}]
+
+
+def legacy_call(port: int) -> dict | None:
+    """The previous AIProfileService._call_openai transport, against the fake server."""
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    payload = {"model": "gpt-4o-mini", "messages": MESSAGES, "response_format": {"type": "json_object"}}
+    headers = {"Content-Type": "application/json", "Authorization": "Bearer fake"}
+    conn.request("POST", "/v1/chat/completions", body=json.dumps(payload), headers=headers)
+    res = conn.getresponse()
+    data = res.read()
+    if res.status >= 400:
+        return None
+    return json.loads(json.loads(data.decode("utf-8"))["choices"][0]["message"]["content"])
+
+
+async def max_loop_gap(work) -> float:
+    """Run ``work()`` (a coroutine) next to a 10 ms ticker; return the ticker's longest gap."""
+    gaps = []
+    done = asyncio.Event()
+
+    async def ticker() -> None:
+        last = time.perf_counter()
+        while not done.is_set():
+            await asyncio.sleep(0.01)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    tick = asyncio.create_task(ticker())
+    await asyncio.sleep(0)  # let the ticker take its first timestamp
+    await work()
+    done.set()
+    await tick
+    return max(gaps) if gaps else float("inf")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    common.bootstrap()
+    from app.services.llm_client import BREAKER_OPEN, CircuitBreaker, LLMClient
+
+    fake = FakeOpenAI(latency=args.latency)
+    port = fake.start_in_thread()
+    base_url = f"http://127.0.0.1:{port}/v1"
+    client = LLMClient(base_url=base_url, timeout=5, max_concurrency=args.concurrency)
+    rows = {}
+
+    def measure(name: str, fn) -> None:
+        before = fake.connections
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        rows[name] = {"seconds": elapsed, "calls_per_s": args.calls / elapsed,
+                      "connections": float(fake.connections - before)}
+
+    measure("legacy sequential", lambda: [legacy_call(port) for _ in range(args.calls)])
+    measure("pooled sequential", lambda: [client.chat_json_sync("fake", MESSAGES) for _ in range(args.calls)])
+
+    def legacy_concurrent() -> None:
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            list(pool.map(lambda _: legacy_call(port), range(args.calls)))
+
+    async def pooled_concurrent() -> None:
+        await asyncio.gather(*(client.chat_json("fake", MESSAGES) for _ in range(args.calls)))
+
+    measure(f"legacy x{args.concurrency} threads", legacy_concurrent)
+    measure(f"pooled x{args.calls} awaits", lambda: asyncio.run(pooled_concurrent()))
+
+    async def legacy_route() -> None:
+        for _ in range(5):
+            legacy_call(port)
+
+    async def pooled_route() -> None:
+        for _ in range(5):
+            await client.chat_json("fake", MESSAGES)
+
+    stall_legacy = asyncio.run(max_loop_gap(legacy_route))
+    stall_pooled = asyncio.run(max_loop_gap(pooled_route))
+
+    # Breaker drill: upstream stalls for 2s, calls time out at 0.3s, breaker opens after 3.
+    client.breaker = CircuitBreaker(failure_threshold=3, reset_seconds=1.0)
+    fake.latency = 2.0
+    timings = []
+    for _ in range(10):
+        started = time.perf_counter()
+        result = client.chat_json_sync("fake", MESSAGES, timeout=0.3)
+        timings.append((time.perf_counter() - started, result))
+    opened = client.breaker.snapshot()["state"] == BREAKER_OPEN
+    fake.latency = args.latency
+    time.sleep(1.1)
+    recovered = client.chat_json_sync("fake", MESSAGES) is not None
+    state_after = client.breaker.snapshot()["state"]
+    client.close()
+
+    common.report(f"{args.calls} calls, simulated model latency {args.latency}s", rows)
+    print(f"\n  longest event-loop gap during 5 calls: legacy {stall_legacy * 1000:.0f} ms, pooled {stall_pooled * 1000:.0f} ms")
+    print("  breaker drill (upstream 2s, timeout 0.3s): " + ", ".join(f"{t * 1000:.0f}ms" for t, _ in timings))
+    print(f"  breaker opened: {opened}; after reset: recovered={recovered}, state={state_after}")
+
+    fast_fallbacks = all(t < 0.05 and r is None for t, r in timings[3:])
+    if not (opened and fast_fallbacks and recovered and stall_pooled < stall_legacy):
+        print("FAILED: breaker or event-loop checks did not hold", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Bulk email delivery: one SMTP connection per message vs the pooled mail queue.
+
+Runs ``scripts/smtp_sink.py`` in a thread with a per-command delay to mimic
+a remote relay, then sends the same burst both ways. "per-message" replays
+the previous ``_send_smtp_email`` (connect, EHLO, AUTH, send, QUIT each
+time); "queued" enqueues the burst inside ``mail_queue.batch()`` and waits
+for the worker to drain it. The script exits non-zero if the sink did not
+receive every message.
+
+    python scripts/benchmarks/mail_delivery.py --messages 200 --latency 0.002
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import smtplib
+import sys
+import time
+
+import common
+
+sys.path.insert(0, str(common.ROOT / "scripts"))
+
+from smtp_sink import SMTPSink  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.002, help="Sink delay per SMTP reply, seconds")
+    args = parser.parse_args()
+
+    sink = SMTPSink(quiet=True, delay=args.latency)
+    port = sink.start_in_thread()
+    os.environ.update(
+        SMTP_HOST="127.0.0.1", SMTP_PORT=str(port), SMTP_USER="bench", SMTP_PASSWORD="bench",
+        SMTP_USE_TLS="false", EMAIL_FROM="noreply@bench.example",
+    )
+    common.bootstrap()
+
+    from app.services.mail_queue import OutboundEmail, build_mime_message, mail_queue
+
+    def message(i: int) -> OutboundEmail:
+        return OutboundEmail(
+            transport="smtp", to_email=f"pro{i}@bench.example", subject=f"Verification update {i}",
+            text_body="Your profile has been verified.", html_body="<p>Your profile has been verified.</p>",
+            from_email="noreply@bench.example", from_name="ProzLab",
+        )
+
+    def per_message() -> None:
+        for i in range(args.messages):
+            with smtplib.SMTP("127.0.0.1", port, timeout=30) as server:
+                server.login("bench", "bench")
+                server.send_message(build_mime_message(message(i)))
+
+    def queued() -> None:
+        with mail_queue.batch():
+            for i in range(args.messages):
+                mail_queue.enqueue(message(i))
+        mail_queue.flush(timeout=120)
+
+    rows = {}
+    for name, fn in (("per-message", per_message), ("queued", queued)):
+        connections, received = sink.connections, len(sink.messages)
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        rows[name] = {
+            "seconds": elapsed,
+            "msgs/s": args.messages / elapsed,
+            "connections": float(sink.connections - connections),
+            "received": float(len(sink.messages) - received),
+        }
+    mail_queue.stop()
+
+    common.report(f"{args.messages} messages, {args.latency * 1000:.1f} ms per SMTP reply", rows)
+    if any(row["received"] != args.messages for row in rows.values()):
+        print("MISMATCH: the sink did not receive every message", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
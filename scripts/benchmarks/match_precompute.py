@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Admin match endpoints: ranking on the click vs reading the shortlist precomputed at request creation.
+
+Seeds --profiles profiles into SQLite and points the ranking model at
+``scripts/fake_openai.py`` with --latency seconds of simulated model time.
+"interactive" is what ai-match / auto-suggest did per click (pool snapshot,
+rank, build the list); "stored" is ``match_precomputer.shortlist()`` reading
+the row written in the background. Also times how long after a service
+request's commit its shortlists are stored, and checks that a read returns
+the same top --limit as ranking on the spot.
+
+    python scripts/benchmarks/match_precompute.py --profiles 10000 --latency 0.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import common
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from fake_openai import FakeOpenAI  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", type=int, default=10000)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    common.bootstrap()
+    common.seed_profiles(args.profiles)
+
+    from app.database.session import SessionLocal
+    from app.modules.tasks.models.task import ServiceRequest, ServiceRequestMatch
+    from app.modules.tasks.services.service_request_matches import (
+        AI_MATCH, AUTO_SUGGEST, match_precomputer, request_terms,
+    )
+    from app.services import candidate_scorer
+    from app.services.ai_profile_service import AIProfileService
+    from app.services.candidate_features import candidate_features
+    from app.services.llm_client import LLMClient
+
+    fake = FakeOpenAI(latency=args.latency)
+    port = fake.start_in_thread()
+    client = LLMClient(base_url=f"http://127.0.0.1:{port}/v1", timeout=10)
+    ai_service = AIProfileService(llm=client)
+    ai_service.openai_api_key = "fake"
+
+    candidate_features.load()
+    match_precomputer.start(ai_service)
+
+    db = SessionLocal()
+    started = time.perf_counter()
+    service_request = ServiceRequest(
+        company_name="Acme", client_name="Ann", client_email="ann@example.com",
+        service_title="Payments API", service_description="Build a Python payments API",
+        service_category="python", location_preference="kigali", budget_max=2400.0, remote_work_allowed=False,
+    )
+    db.add(service_request)
+    db.commit()
+    request_id = service_request.id
+    while db.query(ServiceRequestMatch).filter(ServiceRequestMatch.service_request_id == request_id).count() < 2:
+        time.sleep(0.01)
+    background_seconds = time.perf_counter() - started
+    service_request = db.get(ServiceRequest, request_id)
+
+    def interactive_ai_match():
+        pool = candidate_features.snapshot()
+        return ai_service.rank_professionals(request_terms(service_request), pool, top_k=args.limit)
+
+    def interactive_auto_suggest():
+        return candidate_scorer.filter_matches(candidate_features.snapshot(), request_terms(service_request), args.limit)
+
+    calls_before = fake.requests
+    rows = {
+        "ai-match, interactive": common.timed(interactive_ai_match, args.repeat),
+        "ai-match, stored": common.timed(
+            lambda: match_precomputer.shortlist(db, service_request, AI_MATCH, args.limit, ai_service), args.repeat),
+        "auto-suggest, interactive": common.timed(interactive_auto_suggest, args.repeat),
+        "auto-suggest, stored": common.timed(
+            lambda: match_precomputer.shortlist(db, service_request, AUTO_SUGGEST, args.limit, ai_service), args.repeat),
+    }
+    model_calls = fake.requests - calls_before
+
+    live = [r["candidate"]["id"] for r in interactive_ai_match()]
+    stored = [r["candidate"]["id"] for r in match_precomputer.shortlist(db, service_request, AI_MATCH, args.limit, ai_service)[0]]
+    live_suggest = [m["candidate"]["id"] for m in interactive_auto_suggest()]
+    stored_suggest = [m["candidate"]["id"] for m in match_precomputer.shortlist(db, service_request, AUTO_SUGGEST, args.limit, ai_service)[0]]
+    match_precomputer.stop()
+    db.close()
+    client.close()
+
+    common.report(f"{args.profiles} profiles, model latency {args.latency}s; seconds per click", rows)
+    print(f"\n  shortlists stored {background_seconds:.2f}s after the request committed (off the request path)")
+    print(f"  model calls while timing: {model_calls} (all from the {args.repeat} interactive ai-match runs)")
+    same = live == stored and live_suggest == stored_suggest
+    print(f"  stored reads return the same top {args.limit} as ranking on the click: {same}")
+    return 0 if same and model_calls == args.repeat else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
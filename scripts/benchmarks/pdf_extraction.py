@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""Resume PDF text extraction: serial temp-file chain vs in-memory, per-page, pooled.
+
+"legacy" replays the previous ``AIProfileService._extract_text`` on a temp
+file (PyPDF2 over the whole document, then pdfplumber, then pdfminer.six);
+"inline" is ``extract_pages`` over every page in-process; "extractor" is
+``PDFTextExtractor`` with its worker processes already started (it extracts
+documents of up to PDF_INLINE_MAX_PAGES pages inline and splits longer ones
+into one share per worker). Each mode runs
+in a fresh interpreter so peak RSS (self and children) is attributable to it.
+
+The corpus is generated text PDFs of --pages pages. Documents whose text fits
+under RESUME_TARGET_TEXT_CHARS must come back identical to the legacy output;
+the script exits non-zero otherwise.
+
+    python scripts/benchmarks/pdf_extraction.py --docs 20 --pages 6 --workers 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import common
+
+WORDS = (
+    "python django fastapi postgres kubernetes docker terraform aws react typescript "
+    "led migrated designed reduced latency pipeline team mentored delivered platform "
+    "customers revenue analytics dashboards reliability on-call incident automation"
+).split()
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(pages: list[list[str]]) -> bytes:
+    """A minimal text PDF (Helvetica, one Tj per line); no PDF writer needed."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for lines in pages:
+        ops = ["BT", "/F1 10 Tf", "14 TL", "50 780 Td"]
+        for line in lines:
+            ops.append(f"({_escape(line)}) Tj T*")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % k for k in kids), len(kids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def make_corpus(directory: Path, docs: int, pages: int, seed: int = 11) -> list[Path]:
+    rng = random.Random(seed)
+    paths = []
+    for i in range(docs):
+        body = [
+            [f"Candidate {i} - page {p + 1}"] + [" ".join(rng.choices(WORDS, k=12)) for _ in range(50)]
+            for p in range(pages)
+        ]
+        path = directory / f"resume{i}.pdf"
+        path.write_bytes(make_pdf(body))
+        paths.append(path)
+    return paths
+
+
+def legacy_extract(file_path: str) -> tuple[str, str]:
+    """The previous AIProfileService._extract_text, verbatim."""
+    try:
+        from PyPDF2 import PdfReader  # type: ignore
+        reader = PdfReader(file_path)
+        text_parts = []
+        for page in reader.pages:
+            text_parts.append(page.extract_text() or "")
+        extracted = "\n".join(text_parts).strip()
+        if extracted:
+            return extracted, "pypdf2"
+    except Exception:
+        pass
+    try:
+        import pdfplumber  # type: ignore
+        text_parts = []
+        with pdfplumber.open(file_path) as pdf:
+            for page in pdf.pages:
+                text_parts.append(page.extract_text() or "")
+        extracted = "\n".join(text_parts).strip()
+        if extracted:
+            return extracted, "pdfplumber"
+    except Exception:
+        pass
+    try:
+        from pdfminer.high_level import extract_text  # type: ignore
+        mined = (extract_text(file_path) or "").strip()
+        if mined:
+            return mined, "pdfminer.six"
+    except Exception:
+        pass
+    return "", "none"
+
+
+def run_mode(mode: str, corpus: list[Path], workers: int) -> dict:
+    """Extract every document with ``mode``; runs in its own interpreter."""
+    common.bootstrap()
+    from app.services.pdf_text import PDFTextExtractor, count_pages, extract_pages
+
+    extractor = PDFTextExtractor()
+    if mode == "extractor":
+        # Spawning workers is a one-off at app startup, not part of a request.
+        list(extractor.pool.executor().map(abs, range(workers)))
+
+    texts = []
+    latencies = []
+    for path in corpus:
+        started = time.perf_counter()
+        if mode == "legacy":
+            # The old endpoint spooled the upload to a temp file first.
+            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
+                tmp.write(path.read_bytes())
+            try:
+                text, _ = legacy_extract(tmp.name)
+            finally:
+                os.remove(tmp.name)
+        elif mode == "inline":
+            data = path.read_bytes()
+            pages = extract_pages(data, range(count_pages(data)))
+            text = "\n".join(page_text for _, page_text, _ in pages).strip()
+        else:
+            text, _ = extractor.extract(path.read_bytes())
+        latencies.append(time.perf_counter() - started)
+        texts.append(text)
+    extractor.shutdown()
+
+    # ru_maxrss is KiB on Linux, bytes on macOS.
+    to_mb = 1024 if sys.platform != "darwin" else 1024 * 1024
+    return {
+        "texts": texts,
+        "seconds": sum(latencies),
+        "p50_ms": sorted(latencies)[len(latencies) // 2] * 1000,
+        "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / to_mb,
+        "children_rss_mb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / to_mb,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=6)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--mode", help=argparse.SUPPRESS)
+    parser.add_argument("--corpus", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    os.environ["PDF_EXTRACT_WORKERS"] = str(args.workers)
+    if args.mode:
+        corpus = sorted(Path(args.corpus).glob("*.pdf"), key=lambda p: int(p.stem[6:]))
+        print(json.dumps(run_mode(args.mode, corpus, args.workers)))
+        return 0
+
+    work = Path(tempfile.mkdtemp(prefix="prozlab-pdfs-"))
+    corpus = make_corpus(work, args.docs, args.pages)
+    kilobytes = sum(p.stat().st_size for p in corpus) / 1e3
+
+    results = {}
+    for mode in ("legacy", "inline", "extractor"):
+        proc = subprocess.run(
+            [sys.executable, __file__, "--mode", mode, "--corpus", str(work), "--workers", str(args.workers)],
+            check=True, capture_output=True, text=True,
+        )
+        results[mode] = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    common.bootstrap()
+    from app.config.settings import settings
+
+    mismatches = 0
+    for i, legacy_text in enumerate(results["legacy"]["texts"]):
+        if len(legacy_text) >= settings.RESUME_TARGET_TEXT_CHARS:
+            continue  # the extractor stops early on long documents by design
+        for mode in ("inline", "extractor"):
+            if results[mode]["texts"][i] != legacy_text:
+                mismatches += 1
+                print(f"MISMATCH: {mode} differs from legacy on resume{i}.pdf", file=sys.stderr)
+
+    rows = {
+        mode if mode != "extractor" else f"extractor x{args.workers}": {
+            key: value for key, value in result.items() if key != "texts"
+        }
+        for mode, result in results.items()
+    }
+    common.report(f"{len(corpus)} resumes x {args.pages} pages ({kilobytes:.0f} KB)", rows)
+    for path in corpus:
+        path.unlink()
+    work.rmdir()
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Profile review: every click a model round trip vs reviews cached by field fingerprint.
+
+Replays a click stream against ``scripts/fake_openai.py`` (--latency seconds
+per call): --profiles users each press review/rephrase --clicks times in
+total, with a Zipf-like skew, double clicks arriving together, and an edit
+to the bio on --edit-rate of the clicks (which must miss). Reports wall time,
+p50/p95 per click and how many calls reached the model.
+
+    python scripts/benchmarks/profile_review_cache.py --clicks 200 --latency 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import common
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from fake_openai import FakeOpenAI  # noqa: E402
+
+
+def click_stream(profiles: int, clicks: int, edit_rate: float, seed: int = 3) -> list[tuple[int, bool, int]]:
+    """``(profile, edited, burst)``: burst > 1 is a double click sent concurrently."""
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(profiles)]
+    stream = []
+    while len(stream) < clicks:
+        stream.append((rng.choices(range(profiles), weights)[0], rng.random() < edit_rate, 2 if rng.random() < 0.2 else 1))
+    return stream
+
+
+async def replay(service, stream, profiles: list[dict], refresh: bool) -> list[float]:
+    latencies = []
+    for index, edited, burst in stream:
+        if edited:
+            profiles[index]["bio"] = f"{profiles[index]['bio']} Edited."
+        started = time.perf_counter()
+        await asyncio.gather(*(service.review_profile_async(dict(profiles[index]), refresh=refresh) for _ in range(burst)))
+        latencies.extend([time.perf_counter() - started] * burst)
+    return latencies
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", type=int, default=40)
+    parser.add_argument("--clicks", type=int, default=200)
+    parser.add_argument("--edit-rate", type=float, default=0.1)
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    common.bootstrap()
+    from app.core.cache import cache
+    from app.services.ai_profile_service import AIProfileService
+    from app.services.llm_client import LLMClient
+    from app.services.review_cache import profile_review_cache
+
+    fake = FakeOpenAI(latency=args.latency)
+    port = fake.start_in_thread()
+    client = LLMClient(base_url=f"http://127.0.0.1:{port}/v1")
+    service = AIProfileService(llm=client)
+    service.openai_api_key = "fake"
+
+    stream = click_stream(args.profiles, args.clicks, args.edit_rate)
+    base = [{"first_name": f"First{i}", "last_name": f"Last{i}", "email": f"pro{i}@bench.example",
+             "bio": f"Professional {i} building reliable systems.", "hourly_rate": 40.0 + i}
+            for i in range(args.profiles)]
+    edits = sum(1 for _, edited, _ in stream if edited)
+
+    rows = {}
+    for name, refresh in (("uncached (every click)", True), ("fingerprint cache", False)):
+        profile_review_cache.clear()
+        cache.clear()
+        before = fake.requests
+        started = time.perf_counter()
+        latencies = asyncio.run(replay(service, stream, [dict(p) for p in base], refresh))
+        elapsed = time.perf_counter() - started
+        ordered = sorted(latencies)
+        rows[name] = {
+            "seconds": elapsed,
+            "p50_ms": statistics.median(ordered) * 1000,
+            "p95_ms": ordered[int(len(ordered) * 0.95) - 1] * 1000,
+            "model_calls": float(fake.requests - before),
+        }
+    client.close()
+
+    clicks = sum(burst for _, _, burst in stream)
+    common.report(f"{clicks} review clicks over {args.profiles} profiles ({edits} after an edit), model latency {args.latency}s", rows)
+    cached_calls = rows["fingerprint cache"]["model_calls"]
+    # Each profile version (first click, then after every edit) is reviewed once.
+    versions, edit_counts = set(), [0] * args.profiles
+    for index, edited, _ in stream:
+        edit_counts[index] += edited
+        versions.add((index, edit_counts[index]))
+    expected = len(versions)
+    print(f"\n  profile versions reviewed: {expected}")
+    if cached_calls != expected:
+        print("FAILED: the cache should call the model once per profile version", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""Near-duplicate profile text: comparing with every profile vs the MinHash LSH index.
+
+Inserts --profiles profiles with generated bios (some opening with shared
+template sentences) and plants --rings groups of 2-4 profiles whose bio,
+and sometimes certifications, are copies with a few words changed. Then:
+
+- builds the index with ``text_similarity.rebuild`` (existing profiles);
+- "every profile" compares one profile's shingles with all others' (held
+  in memory, so it pays no query cost), timed on --sample profiles;
+- "LSH" is ``near_duplicates_many`` in scan-sized batches over every profile;
+- checks every planted profile with a Jaccard >= threshold match is found,
+  and that nothing else is reported;
+- edits bios through the ORM to check the session hooks keep the index current.
+
+    python scripts/benchmarks/profile_text_lsh.py --profiles 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+import common
+
+TEMPLATES = [
+    "I am a hardworking and reliable professional with many years of experience in",
+    "Passionate about delivering quality results on time and within budget for every client in",
+    "Experienced specialist who loves solving problems and helping businesses grow through",
+]
+
+
+def words(rng: random.Random, count: int) -> list:
+    return [f"{rng.choice('bcdfghjklmnprstvz')}{rng.choice('aeiou')}{rng.randint(0, 4999)}" for _ in range(count)]
+
+
+def mutate(rng: random.Random, text: str, changes: int) -> str:
+    parts = text.split()
+    for _ in range(changes):
+        parts[rng.randrange(len(parts))] = words(rng, 1)[0]
+    return " ".join(parts)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", type=int, default=100000)
+    parser.add_argument("--rings", type=int, default=500)
+    parser.add_argument("--sample", type=int, default=20, help="Profiles timed for the compare-with-everyone baseline")
+    parser.add_argument("--batch", type=int, default=200, help="Profiles per LSH lookup (a fraud scan chunk)")
+    args = parser.parse_args()
+
+    common.bootstrap()
+
+    from sqlalchemy import insert, select
+
+    from app.database.session import SessionLocal
+    from app.modules.proz import text_similarity
+    from app.modules.proz.models.proz import ProfileTextBand, ProzProfile
+
+    rng = random.Random(5)
+    rows = []
+    for i in range(args.profiles):
+        body = " ".join(words(rng, rng.randint(30, 60)))
+        bio = f"{rng.choice(TEMPLATES)} {body}" if i % 3 == 0 else body
+        rows.append({"first_name": f"First{i}", "last_name": f"Last{i}", "email": f"pro{i}@bench.example", "bio": bio,
+                     "certifications": None, "education": "BSc Computer Science"})
+    # Rings: members 1.. copy member 0's bio with 0-3 words changed; every 3rd ring copies certifications too
+    rings = []
+    for r in range(args.rings):
+        start = rng.randrange(0, args.profiles - 4)
+        members = list(range(start, start + rng.randint(2, 4)))
+        if any(m in ring for ring in rings for m in members):
+            continue
+        rings.append(members)
+        source = rows[members[0]]
+        if r % 3 == 0:
+            source["certifications"] = " ".join(["Certified"] + words(rng, 20))
+        for m in members[1:]:
+            rows[m]["bio"] = mutate(rng, source["bio"], rng.randint(0, 3))
+            if source["certifications"]:
+                rows[m]["certifications"] = mutate(rng, source["certifications"], rng.randint(0, 1))
+
+    db = SessionLocal()
+    for i in range(0, len(rows), 5000):
+        db.execute(insert(ProzProfile.__table__), rows[i:i + 5000])  # Core: no hooks, like a legacy table
+    db.commit()
+    by_email = {email: pid for pid, email in db.execute(select(ProzProfile.id, ProzProfile.email))}
+    ids = [by_email[row["email"]] for row in rows]
+
+    started = time.perf_counter()
+    text_similarity.rebuild(db)
+    build_seconds = time.perf_counter() - started
+    bands = db.query(ProfileTextBand).count()
+
+    # Ground truth from exact Jaccard inside each ring (texts elsewhere are random)
+    texts = [text_similarity.profile_shingles(type("Row", (), row)) for row in rows]
+    truth = {}
+    for members in rings:
+        for a in members:
+            for b in members:
+                if a == b:
+                    continue
+                for field in text_similarity.TEXT_FIELDS:
+                    if text_similarity.jaccard(texts[a].get(field, frozenset()), texts[b].get(field, frozenset())) \
+                            >= text_similarity.NEAR_DUPLICATE_THRESHOLD:
+                        truth.setdefault(ids[a], set()).add(field)
+
+    # Baseline: one profile against every other profile's shingles
+    sample = rng.sample(range(args.profiles), args.sample)
+    started = time.perf_counter()
+    for a in sample:
+        for field, mine in texts[a].items():
+            sum(1 for b, other in enumerate(texts)
+                if b != a and text_similarity.jaccard(mine, other.get(field, frozenset()))
+                >= text_similarity.NEAR_DUPLICATE_THRESHOLD)
+    brute_per_profile = (time.perf_counter() - started) / args.sample
+
+    profiles = db.query(ProzProfile).all()
+    found = {}
+    started = time.perf_counter()
+    for i in range(0, len(profiles), args.batch):
+        for proz_id, fields in text_similarity.near_duplicates_many(db, profiles[i:i + args.batch]).items():
+            if fields:
+                found[proz_id] = set(fields)
+    lsh_seconds = time.perf_counter() - started
+    db.expunge_all()
+
+    missed = [pid for pid, fields in truth.items() if not fields <= found.get(pid, set())]
+    extra = [pid for pid in found if pid not in truth]
+
+    # Incremental maintenance: a saved copy is found at once, and the index follows edits
+    target, source = db.get(ProzProfile, ids[1]), db.get(ProzProfile, ids[2])
+    started = time.perf_counter()
+    target.bio = mutate(rng, source.bio, 1)
+    db.commit()
+    save_ms = (time.perf_counter() - started) * 1000
+    copied = text_similarity.near_duplicates(db, target).get("bio", 0) >= 1
+    target.bio = " ".join(words(rng, 40))
+    db.commit()
+    reverted = text_similarity.near_duplicates(db, target) == {}
+    db.close()
+
+    n = args.profiles
+    common.report(f"{n} profiles, {len(rings)} rings, {len(truth)} profiles with a near-duplicate", {
+        "compare with every profile": {"per_profile_ms": brute_per_profile * 1000, "full_scan_s": brute_per_profile * n},
+        "LSH lookup": {"per_profile_ms": lsh_seconds / n * 1000, "full_scan_s": lsh_seconds},
+    })
+    print(f"\n  index build (rebuild): {build_seconds:.1f}s, {bands} band rows "
+          f"({text_similarity.BANDS} per indexed field)")
+    print(f"  planted near-duplicates missed: {len(missed)}/{len(truth)}; reported without a planted match: {len(extra)}")
+    print(f"  ORM save with the hooks: {save_ms:.1f} ms; copy found right after saving: {copied}; "
+          f"index follows the next edit: {reverted}")
+    ok = copied and reverted and not extra and len(missed) <= len(truth) * 0.01
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
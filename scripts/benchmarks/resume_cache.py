@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Repeat resume uploads: full analysis vs the content-hash cache tiers.
+
+The OpenAI call is replaced by a counter that sleeps --api-latency seconds,
+so the numbers show what a re-upload costs without spending API credit.
+"memory" is a repeat upload in the same process; "shared" drops the local
+LRU first, as a different API worker would see it. "concurrent" uploads one
+new document from --threads threads at once. The script exits non-zero if
+any document reached the API more than once.
+
+    python scripts/benchmarks/resume_cache.py --api-latency 0.8 --threads 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import common
+from pdf_extraction import make_pdf
+
+
+def resume(i: int) -> bytes:
+    lines = [f"Candidate {i} Example", f"candidate{i}@example.com", "Location: Kigali, Rwanda",
+             "Skills: Python, FastAPI, SQL, Docker", "Experience", "Senior Engineer at Acme 2019 - 2024"]
+    return make_pdf([lines * 8] * 4)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--api-latency", type=float, default=0.8)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    common.bootstrap()
+    from app.services.ai_profile_service import AIProfileService
+    from app.services.resume_cache import content_hash, resume_analysis_cache
+
+    api_calls: dict[str, int] = {}
+
+    def fake_openai(text: str):
+        api_calls[text[:40]] = api_calls.get(text[:40], 0) + 1
+        time.sleep(args.api_latency)
+        return {"extracted": {"first_name": text.split()[1]}, "suggestions": [], "rephrased_summaries": []}
+
+    service = AIProfileService()
+    service.openai_api_key = "bench"
+    service._call_openai = fake_openai
+
+    def timed_once(fn) -> dict:
+        started = time.perf_counter()
+        result = fn()
+        return {"ms": (time.perf_counter() - started) * 1000, "result": result}
+
+    first = resume(1)
+    rows = {}
+    cold = timed_once(lambda: service.analyze_resume_bytes(first))
+    memory = timed_once(lambda: service.analyze_resume_bytes(first))
+    resume_analysis_cache.clear()
+    shared = timed_once(lambda: service.analyze_resume_bytes(first))
+    for name, run in (("cold", cold), ("memory", memory), ("shared", shared)):
+        rows[name] = {"ms": run["ms"], "api_calls": float(sum(api_calls.values()))}
+        if run["result"]["meta"]["cache"] != ("miss" if name == "cold" else name):
+            print(f"UNEXPECTED: {name} served from {run['result']['meta']['cache']}", file=sys.stderr)
+            return 1
+
+    second = resume(2)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        tiers = list(pool.map(lambda _: service.analyze_resume_bytes(second)["meta"]["cache"], range(args.threads)))
+    rows[f"concurrent x{args.threads}"] = {
+        "ms": (time.perf_counter() - started) * 1000, "api_calls": float(sum(api_calls.values())),
+    }
+
+    started = time.perf_counter()
+    for _ in range(1000):
+        content_hash(first)
+    rows["sha256 only"] = {"ms": (time.perf_counter() - started), "api_calls": 0.0}
+
+    common.report(
+        f"{len(first) / 1e3:.0f} KB resume, simulated API latency {args.api_latency}s; "
+        f"concurrent tiers {sorted(set(tiers))}", rows,
+    )
+    if any(count > 1 for count in api_calls.values()):
+        print(f"DUPLICATE API CALLS: {api_calls}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
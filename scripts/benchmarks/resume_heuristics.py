@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""Heuristic resume analysis throughput: per-section rescans vs one compiled segmentation pass.
+
+"legacy" is the previous ``AIProfileService.heuristic_analyze``, verbatim
+below; "segmented" is the current one. The synthetic corpus mixes the
+layouts the heuristics have to cope with, including the section-matching
+quirks (unanchored title alternation, bare "Skills" lines that do not end a
+section, repeated headers, certifications nested under education).
+
+Every resume's output must equal the legacy output; the script exits
+non-zero on the first difference.
+
+    python scripts/benchmarks/resume_heuristics.py --resumes 3000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+
+import common
+
+FIRST = ["Jane", "Amani", "Carlos", "Wei", "Fatima", "John", "Grace", "Olu"]
+LAST = ["Doe", "Uwase", "Mendez", "Chen", "Bello", "Smith", "Mutesi", "Adeyemi"]
+PLACES = ["Kigali, Rwanda", "Austin, Texas", "Lagos, Nigeria", "Nairobi, Kenya"]
+SKILLS = ["Python", "FastAPI", "SQL", "Docker", "Kubernetes", "React", "AWS", "Terraform", "Excel", "CCTV"]
+ROLES = ["Senior Engineer", "Data Analyst", "Network Technician", "Product Designer", "Accountant"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Ltd", "Stark Industries"]
+SCHOOLS = ["University of Rwanda", "MIT", "Lagos State College", "Nairobi Institute of Technology"]
+FILLER = ("delivered reliable systems for customers across the region while mentoring junior staff "
+          "and improving processes with measurable results").split()
+
+
+def synthetic_resume(rng: random.Random) -> str:
+    lines = [f"{rng.choice(FIRST)} {rng.choice(LAST)}"]
+    if rng.random() < 0.5:
+        lines.append(f"■ {rng.choice(PLACES)} | ■ {rng.randint(2, 15)}+ Years Experience")
+    else:
+        lines.append(f"Location: {rng.choice(PLACES)}")
+    lines.append(f"{lines[0].split()[0].lower()}@example.com | +250 78{rng.randint(1000000, 9999999)}")
+    if rng.random() < 0.6:
+        lines.append("https://www.linkedin.com/in/" + lines[0].replace(" ", "-").lower())
+    lines.append(rng.choice(["Summary", "Summary: ", "Objective:"]) + " " + " ".join(rng.choices(FILLER, k=20)))
+    for _ in range(rng.randint(2, 12)):
+        lines.append(" ".join(rng.choices(FILLER, k=rng.randint(6, 14))))
+
+    sections = []
+    skills_header = rng.choice(["Skills:", "Technical Skills:", "Skills", "Tools & Technologies:"])
+    sections.append([f"{skills_header} " + ", ".join(rng.sample(SKILLS, 4)), " • ".join(rng.sample(SKILLS, 3))])
+    experience = [rng.choice(["Experience", "Work Experience:", "Professional Experience", "Employment History:"])]
+    for _ in range(rng.randint(1, 5)):
+        start = rng.randint(2005, 2020)
+        style = rng.random()
+        if style < 0.4:
+            experience.append(f"• {rng.choice(ROLES)} — {rng.choice(COMPANIES)} ({start}–{start + rng.randint(1, 4)})")
+        elif style < 0.7:
+            experience.append(f"- {rng.choice(ROLES)} at {rng.choice(COMPANIES)}")
+        else:
+            experience.append(f"{rng.randint(1, 5)}. {rng.choice(ROLES)}, {rng.choice(COMPANIES)} {start} - Present")
+        experience.append(" ".join(rng.choices(FILLER, k=rng.randint(8, 18))))
+    sections.append(experience)
+    education = [rng.choice(["Education", "Education:", "EDUCATION AND QUALIFICATIONS", "Educational Background",
+                             "Qualifications"])]
+    for _ in range(rng.randint(1, 3)):
+        education.append(f"{rng.choice(SCHOOLS)} — BSc Computer Science ({rng.randint(2000, 2018)}–{rng.randint(2019, 2023)})")
+    if rng.random() < 0.3:
+        education.append("Education: continuing studies in data science")
+    sections.append(education)
+    if rng.random() < 0.7:
+        sections.append([rng.choice(["Certifications", "Certification:", "Licenses & Certifications", "Licensing:"]),
+                         "AWS Certified Solutions Architect", "CCNA (2019)"])
+    if rng.random() < 0.4:
+        sections.append(["Projects: open source contributions", " ".join(rng.choices(FILLER, k=12))])
+    rng.shuffle(sections)
+    for section in sections:
+        lines.extend(section)
+        if rng.random() < 0.3:
+            lines.append("")
+    return "\n".join(lines)
+
+
+def legacy_heuristic_analyze(resume_text: str) -> dict:
+    """The previous AIProfileService.heuristic_analyze, verbatim."""
+    # Enhanced heuristic extraction for common profile fields
+    import re
+    lines = [l.strip() for l in resume_text.splitlines() if l.strip()]
+
+    def first_nonempty() -> str:
+        for l in lines:
+            # skip lines that are section headers
+            if re.search(r"^(education|experience|skills|summary|objective)[:\s]", l, re.I):
+                continue
+            if len(l.split()) >= 2 and len(l) <= 80:
+                return l
+        return ""
+
+    # Name (best-effort): take first non-empty, non-header line that looks like a name
+    name_line = first_nonempty()
+    first_name = last_name = ""
+    if name_line and not re.search(r"@|\d", name_line):
+        parts = re.sub(r"\s+", " ", name_line).split(" ")
+        if 2 <= len(parts) <= 4:
+            first_name = parts[0].strip(",()[]{}")
+            last_name = parts[-1].strip(",()[]{}")
+
+    # Email
+    email_match = re.search(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}", resume_text)
+    email = email_match.group(0) if email_match else ""
+
+    # Phone (supports +, spaces, dashes, parentheses)
+    phone_match = re.search(r"(\+?\d[\d \-()]{7,}\d)", resume_text)
+    phone = phone_match.group(0).strip() if phone_match else ""
+
+    # Location: look for 'Location:' or a line with City, Country pattern
+    location = ""
+    for l in lines[:30]:
+        m = re.search(r"location\s*[:\-]\s*(.+)", l, re.I)
+        if m:
+            location = m.group(1).strip()
+            break
+        if re.search(r",\s*[A-Za-z]{2,}($|[^A-Za-z])", l) and not re.search(r"@|\d{3,}", l):
+            # looks like 'City, Country/State'
+            location = l
+            break
+    # Clean composite lines like: '■ Kigali, Rwanda | ■ 8+ Years ...'
+    if location and '|' in location:
+        location = location.split('|')[0]
+    location = re.sub(r"^[•■\-\s]+", "", location).strip()
+
+    # Years of experience
+    years_experience = None
+    ym = re.search(r"(\d{1,2})\+?\s+years?", resume_text, re.I)
+    if ym:
+        try:
+            years_experience = float(ym.group(1))
+        except Exception:
+            years_experience = None
+
+    # Skills: collect from 'Skills'/'Technologies' sections and comma lists following
+    skills: list[str] = []
+    lower = [l.lower() for l in lines]
+    for idx, l in enumerate(lower):
+        if l.startswith("skills") or l.startswith("technical skills") or "technologies" in l:
+            # take current line after ':' and next 3 lines for lists
+            block = lines[idx: idx + 4]
+            for bl in block:
+                after_colon = bl.split(":", 1)[-1] if ":" in bl else bl
+                parts = [p.strip(" ,;•\t") for p in re.split(r",|\u2022|\|", after_colon)]
+                for p in parts:
+                    if p and 2 <= len(p) <= 40 and not re.search(r"^skills", p, re.I):
+                        skills.append(p)
+    skills = list(dict.fromkeys(skills))[:50]
+
+    # Education and Certifications sections (simple block capture)
+    def capture_section(title: str) -> str:
+        content: list[str] = []
+        start = False
+        for l in lines:
+            if re.match(fr"^{title}[:\s]*$", l, re.I) or re.match(fr"^{title}[:\s]", l, re.I):
+                start = True
+                # keep text after ':' if on same line
+                after = l.split(":", 1)
+                if len(after) == 2 and after[1].strip():
+                    content.append(after[1].strip())
+                continue
+            if start:
+                if re.match(r"^(experience|work experience|skills|projects|summary|objective)[:\s]", l, re.I):
+                    break
+                content.append(l)
+        return "\n".join(content).strip()
+
+    education = capture_section("education|education and qualifications|qualifications")
+    certifications = capture_section("certifications|certification|licenses|licences|licensing")
+
+    # Parse experience section into items
+    def capture_experience_items() -> list[dict]:
+        block = capture_section("experience|work experience|employment history|professional experience")
+        if not block:
+            return []
+        items: list[dict] = []
+        # Split on bullet/blank lines
+        raw_items = re.split(r"\n\s*(?:[•\u2022\-\*]|\d+\.)\s+|\n\s*\n", block)
+        for it in raw_items:
+            t = it.strip()
+            if not t:
+                continue
+            # Try to extract role — company (dates)
+            role = company = period = ""
+            # Common pattern: Role — Company (YYYY–YYYY)
+            m = re.search(r"^(?P<role>[^\n\-–—]{3,}?)\s*[\-–—]\s*(?P<company>[^\n(]{2,}?)(?:\s*\((?P<period>[^)]+)\))?", t)
+            if m:
+                role = m.group('role').strip()
+                company = m.group('company').strip()
+                period = (m.group('period') or '').strip()
+            else:
+                # Fallback: detect date-like spans for period
+                pm = re.search(r"(\d{4}[^\n]{0,20}?\d{4}|\d{4}\s*[-–]\s*Present|Present)", t, re.I)
+                if pm:
+                    period = pm.group(0).strip()
+                # Heuristic split by ' at ' or ' @ '
+                hm = re.search(r"^(?P<role>[^@\nat]{3,}?)(?:\s+at\s+|\s+@\s+)(?P<company>[^\n]+)$", t, re.I)
+                if hm:
+                    role = hm.group('role').strip()
+                    company = hm.group('company').strip()
+            items.append({
+                "role": role,
+                "company": company,
+                "period": period,
+                "description": t,
+            })
+        return items
+
+    experiences = capture_experience_items()
+
+    # Parse education into items by splitting lines that look like entries
+    def education_items_from_text(txt: str) -> list[dict]:
+        results: list[dict] = []
+        if not txt:
+            return results
+        for line in [l.strip() for l in txt.splitlines() if l.strip()]:
+            # Expect patterns like 'University — Degree (years)'
+            em = re.search(r"^(?P<institution>[^\u2014\-–—(]{3,}?)[\s\-–—]+(?P<degree>[^()\n]{2,}?)(?:\s*\((?P<period>[^)]+)\))?", line)
+            if em:
+                results.append({
+                    "institution": em.group('institution').strip(),
+                    "degree": em.group('degree').strip(),
+                    "period": (em.group('period') or '').strip(),
+                    "raw": line,
+                })
+            else:
+                # Add as raw if contains university/college keywords
+                if re.search(r"university|college|school|institute", line, re.I):
+                    results.append({"institution": "", "degree": "", "period": "", "raw": line})
+        return results
+
+    education_items = education_items_from_text(education)
+
+    # Websites
+    website_match = re.search(r"https?://[\w\-\./?#%&=]+", resume_text, re.I)
+    website = website_match.group(0) if website_match else ""
+
+    linkedin_match = re.search(r"https?://(www\.)?linkedin\.com/[^\s]+", resume_text, re.I)
+    linkedin = linkedin_match.group(0) if linkedin_match else ""
+
+    # Bio summary: first few non-header lines
+    summary = " ".join(lines[:5])[:600]
+
+    return {
+        "extracted": {
+            "first_name": first_name,
+            "last_name": last_name,
+            "email": email,
+            "phone_number": phone,
+            "location": location,
+            "years_experience": years_experience,
+            "skills": skills,
+            "bio": summary or "Experienced professional seeking opportunities.",
+            "education": education,
+            "education_items": education_items,
+            "certifications": certifications,
+            "website": website,
+            "linkedin": linkedin,
+            "experiences": experiences,
+        },
+        "suggestions": [
+            "Quantify achievements (e.g., reduced costs by 20%).",
+            "Include modern tools and frameworks you’ve used in the last 2-3 years.",
+            "Add concise, role-specific keywords to pass ATS filters.",
+        ],
+        "rephrased_summaries": [
+            "Results-driven professional with a proven track record delivering impactful solutions across multiple domains.",
+            "Detail-oriented specialist focused on quality, efficiency, and measurable outcomes in every engagement.",
+        ],
+    }
+
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=3000)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    common.bootstrap()
+    from app.services.ai_profile_service import AIProfileService
+
+    rng = random.Random(args.seed)
+    corpus = [synthetic_resume(rng) for _ in range(args.resumes)]
+    service = AIProfileService()
+
+    for i, text in enumerate(corpus):
+        expected, actual = legacy_heuristic_analyze(text), service.heuristic_analyze(text)
+        if expected != actual:
+            print(f"MISMATCH on resume {i}:\n{text}\n--- legacy\n{expected}\n--- segmented\n{actual}", file=sys.stderr)
+            return 1
+
+    rows = {}
+    for name, fn in (("legacy", legacy_heuristic_analyze), ("segmented", service.heuristic_analyze)):
+        started = time.perf_counter()
+        for text in corpus:
+            fn(text)
+        elapsed = time.perf_counter() - started
+        rows[name] = {"seconds": elapsed, "resumes_per_s": len(corpus) / elapsed}
+    speedup = rows["legacy"]["seconds"] / rows["segmented"]["seconds"]
+    lines = sum(text.count("\n") + 1 for text in corpus) / len(corpus)
+    common.report(f"{len(corpus)} synthetic resumes (~{lines:.0f} lines), identical output; {speedup:.2f}x", rows)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
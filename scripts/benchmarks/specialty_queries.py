@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Round trips per profile-card listing, as a function of page size.
+
+Specialty names are batch-loaded, so a page of 50 cards must issue the same
+number of SQL statements as a page of 5. Exits non-zero if that stops holding.
+
+    python scripts/benchmarks/specialty_queries.py
+"""
+
+from __future__ import annotations
+
+import sys
+
+import common
+
+# Featured listings cap ``limit`` at 20.
+PAGE_SIZES = {"search": (5, 20, 50), "featured": (5, 12, 20)}
+
+
+def main() -> int:
+    common.bootstrap()
+    common.seed_profiles(300)
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+
+    from app.config.database import async_engine, engine
+    from app.main import app
+
+    statements = []
+
+    def count(*_args, **_kwargs):
+        statements.append(1)
+
+    event.listen(engine, "before_cursor_execute", count)
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+
+    client = TestClient(app)
+    paths = {
+        "search": "/api/v1/proz/public/profiles?verification_status=all&page_size={n}",
+        "featured": "/api/v1/proz/public/featured?limit={n}",
+    }
+    failed = False
+    for name, template in paths.items():
+        counts = []
+        for size in PAGE_SIZES[name]:
+            statements.clear()
+            response = client.get(template.format(n=size))
+            response.raise_for_status()
+            counts.append(len(statements))
+            print(f"{name:<9} page={size:<3} statements={len(statements)}")
+        if len(set(counts)) != 1:
+            print(f"  !! {name}: statement count grows with page size: {counts}")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""Round trips and latency of the statistics endpoints' queries, per-status COUNT vs single pass.
+
+The "legacy" rows replay the previous handlers (one ``COUNT(*)`` per status,
+earnings summed in Python); the "single-pass" rows are ``app.services.stats_service``.
+Both must produce identical numbers; the script exits non-zero if they differ.
+
+    python scripts/benchmarks/stats_queries.py --profiles 2000 --requests 500 --latency 0.002
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+from datetime import datetime, timedelta
+
+import common
+
+
+def seed_tasks(count: int, seed: int = 11) -> str:
+    """Insert service requests with assignments; returns the busiest professional's id."""
+    from app.database.session import SessionLocal
+    from app.modules.proz.models.proz import ProzProfile
+    from app.modules.tasks.models.task import ServiceRequest, TaskAssignment, TaskNotification, TaskPriority, TaskStatus
+
+    rng = random.Random(seed)
+    db = SessionLocal()
+    try:
+        profile_ids = [pid for (pid,) in db.query(ProzProfile.id).limit(20)]
+        now = datetime.utcnow()
+        for i in range(count):
+            request = ServiceRequest(
+                company_name="Bench Co", client_name="Client", client_email=f"c{i}@bench.example",
+                service_title=f"Task {i}", service_description="Benchmark task", service_category="IT",
+                status=rng.choice(list(TaskStatus)), priority=rng.choice(list(TaskPriority)),
+            )
+            db.add(request)
+            db.flush()
+            if i % 3:
+                status = rng.choice(list(TaskStatus))
+                db.add(TaskAssignment(
+                    service_request_id=request.id, proz_id=rng.choice(profile_ids), status=status,
+                    estimated_hours=rng.choice([None, 4.0, 10.0]), proposed_rate=rng.choice([None, 25.0, 60.0]),
+                    completed_at=now - timedelta(days=rng.randint(0, 40)) if status == TaskStatus.COMPLETED else None,
+                ))
+            if i % 5 == 0:
+                db.add(TaskNotification(
+                    proz_id=rng.choice(profile_ids), notification_type="task_assigned",
+                    title="New task", message="Benchmark", is_read=rng.random() < 0.5,
+                ))
+        db.commit()
+        return str(profile_ids[0])
+    finally:
+        db.close()
+
+
+def legacy_profile_stats(db, now):
+    from sqlalchemy import and_, func
+
+    from app.modules.proz.models.proz import ProzProfile, Specialty
+
+    status = ProzProfile.verification_status
+    week_ago = now - timedelta(days=7)
+    oldest = db.query(ProzProfile).filter(status == "pending").order_by(ProzProfile.created_at.asc()).first()
+    skill = ProzProfile.skill_verification_status
+    return {
+        "total_profiles": db.query(ProzProfile).count(),
+        "pending_profiles": db.query(ProzProfile).filter(status == "pending").count(),
+        "verified_profiles": db.query(ProzProfile).filter(status == "verified").count(),
+        "rejected_profiles": db.query(ProzProfile).filter(status == "rejected").count(),
+        "featured_profiles": db.query(ProzProfile).filter(and_(ProzProfile.is_featured == True, status == "verified")).count(),
+        "average_rating": db.query(func.avg(ProzProfile.rating)).filter(status == "verified").scalar(),
+        "locations_count": db.query(func.count(func.distinct(ProzProfile.location))).filter(
+            ProzProfile.location.isnot(None), status == "verified").scalar(),
+        "profiles_this_week": db.query(ProzProfile).filter(ProzProfile.created_at >= week_ago).count(),
+        "verifications_this_week": db.query(ProzProfile).filter(
+            ProzProfile.updated_at >= week_ago, status.in_(["verified", "rejected"])).count(),
+        "pending_oldest_date": oldest.created_at if oldest else None,
+        "pending_skill_reviews": db.query(ProzProfile).filter(skill == "pending_review").count(),
+        "verified_skills": db.query(ProzProfile).filter(skill == "verified").count(),
+        "rejected_skills": db.query(ProzProfile).filter(skill.in_(["rejected", "needs_revision"])).count(),
+        "specialties_count": db.query(Specialty).count(),
+    }
+
+
+def legacy_task_request_stats(db, now):
+    from app.modules.proz.models.proz import ProzProfile
+    from app.modules.tasks.models.task import ServiceRequest, TaskAssignment, TaskPriority, TaskStatus
+
+    return {
+        "total_requests": db.query(ServiceRequest).count(),
+        "pending_requests": db.query(ServiceRequest).filter(ServiceRequest.status == TaskStatus.PENDING).count(),
+        "assigned_requests": db.query(ServiceRequest).filter(ServiceRequest.status.in_(
+            [TaskStatus.ASSIGNED, TaskStatus.ACCEPTED, TaskStatus.IN_PROGRESS])).count(),
+        "completed_requests": db.query(ServiceRequest).filter(ServiceRequest.status == TaskStatus.COMPLETED).count(),
+        "urgent_requests": db.query(ServiceRequest).filter(ServiceRequest.priority == TaskPriority.URGENT).count(),
+        "unassigned_requests": db.query(ServiceRequest).filter(
+            ServiceRequest.status == TaskStatus.PENDING, ~ServiceRequest.assignments.any()).count(),
+        "requests_this_week": db.query(ServiceRequest).filter(ServiceRequest.created_at >= now - timedelta(days=7)).count(),
+        "active_professionals": db.query(ProzProfile).join(TaskAssignment).filter(
+            TaskAssignment.assigned_at >= now - timedelta(days=30)).distinct().count(),
+    }
+
+
+def legacy_professional_stats(db, proz_id, now):
+    from app.modules.tasks.models.task import TaskAssignment, TaskNotification, TaskStatus
+
+    mine = db.query(TaskAssignment).filter(TaskAssignment.proz_id == proz_id)
+
+    def earnings(since):
+        rows = mine.filter(TaskAssignment.status == TaskStatus.COMPLETED, TaskAssignment.completed_at >= since).all()
+        return sum((a.estimated_hours or 0) * (a.proposed_rate or 0) for a in rows)
+
+    return {
+        "total_assignments": mine.count(),
+        "pending_assignments": mine.filter(TaskAssignment.status == TaskStatus.ASSIGNED).count(),
+        "active_assignments": mine.filter(TaskAssignment.status.in_([TaskStatus.ACCEPTED, TaskStatus.IN_PROGRESS])).count(),
+        "completed_assignments": mine.filter(TaskAssignment.status == TaskStatus.COMPLETED).count(),
+        "this_week_earnings": earnings(now - timedelta(days=7)),
+        "this_month_earnings": earnings(now - timedelta(days=30)),
+        "unread_notifications": db.query(TaskNotification).filter(
+            TaskNotification.proz_id == proz_id, TaskNotification.is_read == False).count(),
+    }
+
+
+def same(a: dict, b: dict) -> bool:
+    def norm(value):
+        return round(float(value), 6) if isinstance(value, (int, float)) and not isinstance(value, bool) else value
+    return {k: norm(v) for k, v in a.items()} == {k: norm(v) for k, v in b.items()}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.002, help="Seconds added to every SQL statement")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    common.bootstrap()
+    common.seed_profiles(args.profiles)
+    proz_id = seed_tasks(args.requests)
+    common.install_query_latency(args.latency)
+
+    from sqlalchemy import event
+
+    from app.config.database import engine
+    from app.database.session import SessionLocal
+    from app.services import stats_service
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *a, **k: statements.append(1))
+
+    now = datetime.utcnow()
+    cases = {
+        "profiles": (lambda db: legacy_profile_stats(db, now), lambda db: stats_service.profile_stats(db, now)),
+        "task requests": (lambda db: legacy_task_request_stats(db, now), lambda db: stats_service.task_request_stats(db, now)),
+        "professional": (
+            lambda db: legacy_professional_stats(db, proz_id, now),
+            lambda db: stats_service.professional_stats(db, proz_id, now),
+        ),
+    }
+    print(f"{args.profiles} profiles, {args.requests} service requests, latency {args.latency}s")
+    failed = False
+    db = SessionLocal()
+    try:
+        for name, (legacy, single_pass) in cases.items():
+            rows = {}
+            results = {}
+            for label, fn in (("legacy", legacy), ("single-pass", single_pass)):
+                statements.clear()
+                results[label] = fn(db)
+                round_trips = len(statements)
+                rows[f"{label} ({round_trips} statements)"] = common.timed(lambda: fn(db), args.repeat)
+            common.report(name, rows)
+            if not same(results["legacy"], results["single-pass"]):
+                print(f"  !! {name}: results differ\n     legacy={results['legacy']}\n     single={results['single-pass']}")
+                failed = True
+    finally:
+        db.close()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
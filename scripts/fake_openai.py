@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Local stand-in for the OpenAI chat completions API, for latency and failure drills.
+
+Answers ``POST /v1/chat/completions`` with a canned JSON-mode completion
+after --latency seconds, fails a --error-rate fraction of calls with a 500,
+and counts requests and TCP connections so keep-alive reuse is visible.
+Point the app at it with:
+
+    OPENAI_BASE_URL=http://127.0.0.1:8099/v1 OPENAI_API_KEY=fake
+
+    python scripts/fake_openai.py --port 8099 --latency 0.4
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+
+from aiohttp import web
+
+# Per prompt shape: resume analysis, profile review, ranking.
+RESUME = {
+    "extracted": {"name": "Jane Doe", "email": "jane@example.com", "skills": ["Python", "SQL"]},
+    "suggestions": ["Quantify achievements."],
+    "rephrased_summaries": ["Engineer focused on reliable systems.", "Builder of data products."],
+}
+REVIEW = {"suggested_updates": {}, "suggestions": ["Add a LinkedIn URL."], "rephrased_bio": ["Reliable engineer."]}
+
+
+class FakeOpenAI:
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.requests = 0
+        self._peers: set = set()
+        self._rng = random.Random(seed)
+
+    def _content(self, messages: list) -> dict:
+        prompt = messages[-1]["content"] if messages else ""
+        if prompt.startswith("Resume text:"):
+            return RESUME
+        if '"candidates"' in prompt:
+            count = len(json.loads(prompt).get("candidates", []))
+            return {"ranking": [{"index": i, "score": 90 - i, "reasons": ["fake"]} for i in range(count)]}
+        return REVIEW
+
+    @property
+    def connections(self) -> int:
+        return len(self._peers)
+
+    async def completions(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        # One client (host, port) pair per TCP connection.
+        self._peers.add(request.transport.get_extra_info("peername") if request.transport else None)
+        body = await request.json()
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self._rng.random() < self.error_rate:
+            return web.json_response({"error": {"message": "fake upstream error"}}, status=500)
+        return web.json_response({
+            "id": f"chatcmpl-fake-{self.requests}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model"),
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {
+                "role": "assistant", "content": json.dumps(self._content(body.get("messages", []))),
+            }}],
+        })
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self.completions)
+        return app
+
+    async def serve(self, host: str, port: int) -> web.TCPSite:
+        runner = web.AppRunner(self.app(), handle_signals=False)
+        await runner.setup()
+        self._site = web.TCPSite(runner, host, port)
+        await self._site.start()
+        return self._site
+
+    def start_in_thread(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Serve from a daemon thread; returns the bound port."""
+        ready = threading.Event()
+        bound = {}
+
+        def run() -> None:
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            loop.run_until_complete(self.serve(host, port))
+            bound["port"] = self._site._server.sockets[0].getsockname()[1]
+            ready.set()
+            loop.run_forever()
+
+        threading.Thread(target=run, name="fake-openai", daemon=True).start()
+        ready.wait()
+        return bound["port"]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds before each response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of calls answered with HTTP 500")
+    args = parser.parse_args()
+
+    fake = FakeOpenAI(latency=args.latency, error_rate=args.error_rate)
+
+    async def run() -> None:
+        await fake.serve(args.host, args.port)
+        print(f"Fake OpenAI listening on http://{args.host}:{args.port}/v1", flush=True)
+        while True:
+            await asyncio.sleep(3600)
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Local SMTP server that accepts every message, for exercising outbound mail.
+
+Speaks enough SMTP for ``smtplib`` (EHLO, AUTH PLAIN/LOGIN with any
+credentials, MAIL, RCPT, DATA, RSET, NOOP, QUIT) and prints one line per
+message, optionally saving each as an .eml file. It has no STARTTLS, so
+point the app at it with:
+
+    SMTP_HOST=127.0.0.1 SMTP_PORT=1025 SMTP_USER=sink SMTP_PASSWORD=sink \\
+    SMTP_USE_TLS=false EMAIL_FROM=noreply@example.com
+
+    python scripts/smtp_sink.py --port 1025 --maildir /tmp/mail
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import email
+import threading
+import time
+from email import policy
+from pathlib import Path
+from typing import List, Optional
+
+
+class SMTPSink:
+    def __init__(self, maildir: Optional[str] = None, quiet: bool = False, delay: float = 0.0):
+        self.maildir = Path(maildir) if maildir else None
+        self.quiet = quiet
+        # Artificial per-command latency, to mimic a remote relay.
+        self.delay = delay
+        self.connections = 0
+        self.messages: List[email.message.EmailMessage] = []
+        if self.maildir:
+            self.maildir.mkdir(parents=True, exist_ok=True)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+
+        async def reply(line: str) -> None:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            writer.write(line.encode() + b"\r\n")
+            await writer.drain()
+
+        await reply("220 smtp-sink ready")
+        recipients: List[str] = []
+        try:
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    break
+                command = raw.decode(errors="replace").rstrip("\r\n")
+                verb = command.split(" ", 1)[0].upper()
+                if verb in ("EHLO", "HELO"):
+                    if verb == "EHLO":
+                        writer.write(b"250-smtp-sink\r\n250-8BITMIME\r\n")
+                        await reply("250 AUTH PLAIN LOGIN")
+                    else:
+                        await reply("250 smtp-sink")
+                elif verb == "AUTH":
+                    parts = command.split()
+                    mechanism = parts[1].upper() if len(parts) > 1 else ""
+                    if mechanism == "LOGIN":
+                        if len(parts) < 3:
+                            await reply("334 VXNlcm5hbWU6")
+                            await reader.readline()
+                        await reply("334 UGFzc3dvcmQ6")
+                        await reader.readline()
+                    elif mechanism == "PLAIN" and len(parts) < 3:
+                        await reply("334 ")
+                        await reader.readline()
+                    await reply("235 2.7.0 Authentication successful")
+                elif verb == "MAIL":
+                    recipients = []
+                    await reply("250 OK")
+                elif verb == "RCPT":
+                    recipients.append(command.split(":", 1)[-1].strip(" <>"))
+                    await reply("250 OK")
+                elif verb == "DATA":
+                    await reply("354 End data with <CR><LF>.<CR><LF>")
+                    lines = []
+                    while True:
+                        line = await reader.readline()
+                        if line in (b".\r\n", b".\n", b""):
+                            break
+                        lines.append(line[1:] if line.startswith(b"..") else line)
+                    self._store(b"".join(lines), recipients)
+                    await reply("250 OK: queued")
+                elif verb in ("RSET", "NOOP"):
+                    await reply("250 OK")
+                elif verb == "QUIT":
+                    await reply("221 Bye")
+                    break
+                else:
+                    await reply("502 Command not implemented")
+        finally:
+            writer.close()
+
+    def _store(self, data: bytes, recipients: List[str]) -> None:
+        message = email.message_from_bytes(data, policy=policy.default)
+        self.messages.append(message)
+        if self.maildir:
+            name = f"{time.time():.6f}-{len(self.messages)}.eml"
+            (self.maildir / name).write_bytes(data)
+        if not self.quiet:
+            print(f"[{len(self.messages)}] to={','.join(recipients)} subject={message['Subject']!r}", flush=True)
+
+    async def serve(self, host: str, port: int) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self.handle, host, port)
+
+    def start_in_thread(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Serve from a daemon thread; returns the bound port."""
+        ready = threading.Event()
+        bound = {}
+
+        def run() -> None:
+            loop = asyncio.new_event_loop()
+            server = loop.run_until_complete(self.serve(host, port))
+            bound["port"] = server.sockets[0].getsockname()[1]
+            ready.set()
+            loop.run_forever()
+
+        threading.Thread(target=run, name="smtp-sink", daemon=True).start()
+        ready.wait()
+        return bound["port"]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1025)
+    parser.add_argument("--maildir", help="Directory to save each message as an .eml file")
+    parser.add_argument("--quiet", action="store_true")
+    args = parser.parse_args()
+
+    sink = SMTPSink(maildir=args.maildir, quiet=args.quiet)
+
+    async def run() -> None:
+        server = await sink.serve(args.host, args.port)
+        print(f"SMTP sink listening on {args.host}:{args.port}", flush=True)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())